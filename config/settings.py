@@ -1026,6 +1026,56 @@ class Settings(BaseSettings):
     )
     AGENT_QWEN_CLI_PATH: str = Field(default="qwen", description="Path to qwen CLI executable")
     AGENT_TIMEOUT: int = Field(default=300, description="Timeout in seconds for agent operations")
+    AGENT_MAX_PARALLEL_TOOL_CALLS: int = Field(
+        default=4,
+        description="Read-only tool calls of one LLM response run concurrently (1 = sequential)",
+    )
+    AGENT_HISTORY_MAX_TOKENS: int = Field(
+        default=8000, description="Token budget of the tool-call history the agent sends to the LLM"
+    )
+    AGENT_TOOL_RESULT_MAX_TOKENS: int = Field(
+        default=2000, description="Token limit of one tool result of the agent's latest step"
+    )
+    AGENT_STREAM_ANSWERS: bool = Field(
+        default=True, description="Show the answer in ask mode while the LLM is generating it"
+    )
+    AGENT_STREAM_EDIT_INTERVAL: float = Field(
+        default=1.0, description="Minimum seconds between two edits of a streamed answer"
+    )
+    LLM_MAX_CONCURRENT_REQUESTS: int = Field(
+        default=8, description="Maximum concurrent LLM API requests across all users"
+    )
+    LLM_TOKENS_PER_MINUTE: int = Field(
+        default=0, description="Estimated LLM tokens allowed per minute (0 = no budget)"
+    )
+    LLM_MAX_RETRIES: int = Field(
+        default=3, description="Retries of an LLM request after 429/5xx/connection errors"
+    )
+    LLM_RETRY_BASE_DELAY: float = Field(
+        default=1.0, description="First retry backoff in seconds (doubles per retry, jittered)"
+    )
+    LLM_RETRY_MAX_DELAY: float = Field(default=30.0, description="Maximum retry backoff in seconds")
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=5, description="Consecutive LLM server errors after which requests fail fast"
+    )
+    LLM_CIRCUIT_RECOVERY_TIMEOUT: float = Field(
+        default=30.0, description="Seconds LLM requests fail fast before a trial request"
+    )
+    LLM_RESPONSE_CACHE_ENABLED: bool = Field(
+        default=False, description="Cache temperature 0 LLM responses on disk"
+    )
+    LLM_RESPONSE_CACHE_PATH: str = Field(
+        default="./data/cache/llm_responses.db", description="SQLite file of the LLM response cache"
+    )
+    LLM_RESPONSE_CACHE_TTL: int = Field(
+        default=7 * 24 * 3600, description="Seconds a cached LLM response stays valid (0 = forever)"
+    )
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=10000, description="Maximum cached LLM responses (least recently used evicted)"
+    )
+    LLM_RESPONSE_CACHE_MAX_MB: int = Field(
+        default=100, description="Maximum total size of cached LLM responses in MB"
+    )
     AGENT_MODEL: str = Field(
         default="qwen-max", description="Model to use for agent (e.g., qwen-max, qwen-plus)"
     )
@@ -1057,11 +1107,57 @@ class Settings(BaseSettings):
     MCP_TIMEOUT: int = Field(
         default=600, description="Timeout in seconds for MCP requests (default: 600 seconds)"
     )
+    MCP_CONNECT_TIMEOUT: int = Field(
+        default=30,
+        description="Seconds each MCP server may take to connect on agent startup (0 = no limit)",
+    )
+    MCP_CIRCUIT_FAILURE_THRESHOLD: int = Field(
+        default=3, description="Consecutive failed connects after which an MCP server is skipped"
+    )
+    MCP_CIRCUIT_RECOVERY_TIMEOUT: int = Field(
+        default=60, description="Seconds a failing MCP server is skipped before a retry"
+    )
+    MCP_REGISTRY_RECHECK_INTERVAL: float = Field(
+        default=2.0,
+        description="Seconds MCP server config files are trusted before checking them for changes",
+    )
+    MCP_TOOLS_CACHE_TTL: int = Field(
+        default=300,
+        description="Seconds MCP server tool listings are reused across agents (0 = no caching)",
+    )
+    MCP_SESSION_POOL_SIZE: int = Field(
+        default=4, description="Maximum concurrent pooled sessions (and calls) per MCP server"
+    )
+    MCP_SESSION_IDLE_TIMEOUT: int = Field(
+        default=300, description="Seconds after which an unused pooled MCP session is closed"
+    )
+    MCP_HUB_WARMUP_ENABLED: bool = Field(
+        default=True,
+        description="Preload embedder and recently used vector indexes in MCP Hub after startup",
+    )
+    MCP_HUB_WARMUP_KB_LIMIT: int = Field(
+        default=3, description="Number of most recently used KB indexes preloaded on warmup"
+    )
+    MCP_HUB_MEMORY_WORKERS: int = Field(
+        default=4,
+        description="Threads running memory storage calls in MCP Hub (calls are serialized per user)",
+    )
+    MCP_HUB_MEMORY_CACHE_SIZE: int = Field(
+        default=100,
+        description="Maximum number of per-user memory storages kept loaded in MCP Hub (0 = unlimited)",
+    )
+    MCP_HUB_MEMORY_CACHE_TTL: int = Field(
+        default=3600,
+        description="Seconds of inactivity after which a user's memory storage is unloaded (0 = never)",
+    )
 
     # Memory Agent Settings (can be in YAML)
     MEM_AGENT_STORAGE_TYPE: str = Field(
         default="json",
-        description="Memory storage type: json (simple, fast) or vector (AI-powered semantic search)",
+        description=(
+            "Memory storage type: json (simple, fast), sqlite (FTS5, large memories) "
+            "or vector (AI-powered semantic search)"
+        ),
     )
     MEM_AGENT_MODEL: str = Field(
         default="BAAI/bge-m3",
@@ -1080,12 +1176,27 @@ class Settings(BaseSettings):
         default=None,
         description="API key for mem-agent endpoint (use 'lm-studio' for local servers)",
     )
+    MEM_AGENT_TEMPERATURE: Optional[float] = Field(
+        default=None,
+        description="Sampling temperature of mem-agent requests (empty = provider default)",
+    )
     MEM_AGENT_MAX_TOOL_TURNS: int = Field(
         default=20, description="Maximum number of tool execution turns"
     )
     MEM_AGENT_TIMEOUT: int = Field(
         default=20, description="Timeout for sandboxed code execution (seconds)"
     )
+    MEM_AGENT_SANDBOX_POOL_SIZE: int = Field(
+        default=2,
+        description="Pre-started sandbox worker processes (0 = new subprocess per code block)",
+    )
+    MEM_AGENT_SANDBOX_MAX_EXECUTIONS: int = Field(
+        default=100, description="Code blocks a sandbox worker runs before it is replaced"
+    )
+    MEM_AGENT_RETRIEVAL_CACHE_SIZE: int = Field(
+        default=128,
+        description="Cached retrieval answers per user, invalidated by any memory write (0 = off)",
+    )
     MEM_AGENT_FILE_SIZE_LIMIT: int = Field(
         default=1024 * 1024, description="Maximum file size in bytes"  # 1MB
     )
@@ -1153,6 +1264,14 @@ class Settings(BaseSettings):
         default=5, description="Number of results to return in vector search"
     )
 
+    # Indexing Job Settings
+    VECTOR_INDEXING_MAX_WORKERS: int = Field(
+        default=2, description="Maximum number of indexing jobs running concurrently in MCP Hub"
+    )
+    VECTOR_INDEXING_BATCH_SIZE: int = Field(
+        default=100, description="Documents processed per batch inside an indexing job"
+    )
+
     # Knowledge Base Settings (can be in YAML)
     KB_PATH: Path = Field(
         default=Path("./knowledge_base"), description="Root directory for all knowledge bases"
@@ -1240,6 +1359,14 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
     LOG_FILE: Optional[Path] = Field(default=Path("./logs/bot.log"), description="Log file path")
 
+    # Metrics Settings (can be in YAML)
+    BOT_METRICS_HOST: str = Field(
+        default="127.0.0.1", description="Interface of the bot's Prometheus /metrics endpoint"
+    )
+    BOT_METRICS_PORT: int = Field(
+        default=8766, description="Port of the bot's Prometheus /metrics endpoint (0 = disabled)"
+    )
+
     # Media Processing Settings (can be in YAML)
     MEDIA_PROCESSING_ENABLED: bool = Field(
         default=True, description="Enable media file processing (master switch)"
@@ -1613,7 +1740,17 @@ MEMORY_SIZE_LIMIT = int(
     os.getenv("MEM_AGENT_MEMORY_SIZE_LIMIT", str(settings.MEM_AGENT_MEMORY_SIZE_LIMIT))
 )
 SANDBOX_TIMEOUT = int(os.getenv("MEM_AGENT_TIMEOUT", str(settings.MEM_AGENT_TIMEOUT)))
+SANDBOX_POOL_SIZE = int(
+    os.getenv("MEM_AGENT_SANDBOX_POOL_SIZE", str(settings.MEM_AGENT_SANDBOX_POOL_SIZE))
+)
+SANDBOX_MAX_EXECUTIONS = int(
+    os.getenv("MEM_AGENT_SANDBOX_MAX_EXECUTIONS", str(settings.MEM_AGENT_SANDBOX_MAX_EXECUTIONS))
+)
+RETRIEVAL_CACHE_SIZE = int(
+    os.getenv("MEM_AGENT_RETRIEVAL_CACHE_SIZE", str(settings.MEM_AGENT_RETRIEVAL_CACHE_SIZE))
+)
 MEM_AGENT_MODEL = settings.MEM_AGENT_MODEL
+MEM_AGENT_TEMPERATURE = settings.MEM_AGENT_TEMPERATURE
 
 # Memory path - will be set dynamically by the agent based on KB path
 MEMORY_PATH = "memory"
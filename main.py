@@ -11,6 +11,7 @@ from loguru import logger
 
 from config import settings
 from config.logging_config import setup_logging
+from src.core.metrics_server import start_metrics_server
 from src.core.service_container import create_service_container
 
 
@@ -49,7 +50,12 @@ async def main():
 
     telegram_bot = None
     mcp_server_manager = None
+    metrics_runner = None
     try:
+        metrics_runner = await start_metrics_server(
+            settings.BOT_METRICS_HOST, settings.BOT_METRICS_PORT
+        )
+
         # Create and configure service container
         container = create_service_container()
         logger.info("Service container created and configured")
@@ -185,12 +191,16 @@ async def main():
             await mcp_server_manager.cleanup()
         if telegram_bot:
             await telegram_bot.stop()
+        if metrics_runner:
+            await metrics_runner.cleanup()
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
         if mcp_server_manager:
             await mcp_server_manager.cleanup()
         if telegram_bot:
             await telegram_bot.stop()
+        if metrics_runner:
+            await metrics_runner.cleanup()
         sys.exit(1)
 
 
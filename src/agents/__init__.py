@@ -8,6 +8,7 @@ from .autonomous_agent import (
     ActionType,
     AgentContext,
     AgentDecision,
+    AgentTurn,
     AutonomousAgent,
     AutonomousAgentResult,
     TodoPlan,
@@ -29,6 +30,7 @@ __all__ = [
     "ActionType",
     "AgentContext",
     "AgentDecision",
+    "AgentTurn",
     "ToolExecution",
     "AutonomousAgentResult",
     "TodoPlan",
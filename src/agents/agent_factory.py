@@ -80,6 +80,9 @@ class AgentFactory:
             "enable_mcp_memory": settings.AGENT_ENABLE_MCP_MEMORY,
             "qwen_cli_path": settings.AGENT_QWEN_CLI_PATH,
             "timeout": settings.AGENT_TIMEOUT,
+            "max_parallel_tool_calls": settings.AGENT_MAX_PARALLEL_TOOL_CALLS,
+            "history_max_tokens": settings.AGENT_HISTORY_MAX_TOKENS,
+            "tool_result_max_tokens": settings.AGENT_TOOL_RESULT_MAX_TOKENS,
             "kb_path": settings.KB_PATH,
             "kb_topics_only": settings.KB_TOPICS_ONLY,
             "user_id": user_id,
@@ -173,6 +176,9 @@ def _create_autonomous_agent(config: Dict) -> AutonomousAgent:
         ),  # AICODE-NOTE: Vector search via MCP
         enable_mcp=config.get("enable_mcp", False),
         enable_mcp_memory=config.get("enable_mcp_memory", False),
+        max_parallel_tool_calls=config.get("max_parallel_tool_calls", 4),
+        history_max_tokens=config.get("history_max_tokens", 8000),
+        tool_result_max_tokens=config.get("tool_result_max_tokens", 2000),
         kb_root_path=kb_root_path,
     )
 
@@ -0,0 +1,138 @@
+"""
+Agent History
+Builds the autonomous agent's tool-call history as structured LLM messages within a token budget
+"""
+
+import json
+from typing import Any, Dict, List, Sequence
+
+# Characters kept of tool results from earlier turns
+PREVIEW_CHARS = 300
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate token count of a text
+
+    Simple estimation: ~4 characters per token (as in ConversationMessage)
+    """
+    return len(text) // 4 + 1
+
+
+def _message_tokens(message: Dict[str, Any]) -> int:
+    text = message.get("content") or ""
+    for tool_call in message.get("tool_calls") or []:
+        text += tool_call["function"]["name"] + tool_call["function"]["arguments"]
+    return estimate_tokens(text) + 10  # +10 for role and formatting
+
+
+def format_tool_output(execution: Any) -> str:
+    """
+    Serialize the full output of a tool execution
+
+    Args:
+        execution: ToolExecution
+
+    Returns:
+        Result as JSON (or the error message of a failed execution)
+    """
+    if not execution.success:
+        return json.dumps({"success": False, "error": execution.error}, ensure_ascii=False)
+    if isinstance(execution.result, str):
+        return execution.result
+    return json.dumps(execution.result, ensure_ascii=False, default=str)
+
+
+def _clip(text: str, limit: int, number: int) -> str:
+    if len(text) <= limit:
+        return text
+    return (
+        f"{text[:limit]}\n…[truncated: {limit} of {len(text)} chars shown; "
+        f"full output is kept as execution #{number}]"
+    )
+
+
+def build_history_messages(
+    turns: Sequence[Any], max_tokens: int, result_max_tokens: int
+) -> List[Dict[str, Any]]:
+    """
+    Build chat messages for the executed tool calls
+
+    AICODE-NOTE: The agent used to re-send one ever-growing text with every tool
+    result verbatim, so long runs sent quadratically more tokens and eventually
+    overflowed the context. Each turn is now an assistant message with its
+    tool_calls followed by one "tool" message per result, and the history is
+    bounded:
+    - results of the latest turn are sent in full up to result_max_tokens;
+    - results of earlier turns are cut to a short preview;
+    - if the history still exceeds max_tokens, the oldest turns are dropped and
+      replaced by a one-line note.
+    Truncated results reference their execution number; the full outputs stay
+    in AgentContext.executions (and in the agent result metadata).
+
+    Args:
+        turns: AgentTurn list (reasoning + executions with call_id), oldest first
+        max_tokens: Token budget of the whole history
+        result_max_tokens: Token limit of one result of the latest turn
+
+    Returns:
+        Messages to append after the system and task messages
+    """
+    turn_messages: List[List[Dict[str, Any]]] = []
+    number = 0
+    for index, turn in enumerate(turns):
+        limit = result_max_tokens * 4 if index == len(turns) - 1 else PREVIEW_CHARS
+        messages: List[Dict[str, Any]] = [
+            {
+                "role": "assistant",
+                "content": turn.reasoning or None,
+                "tool_calls": [
+                    {
+                        "id": execution.call_id,
+                        "type": "function",
+                        "function": {
+                            "name": execution.tool_name,
+                            "arguments": json.dumps(
+                                execution.params, ensure_ascii=False, default=str
+                            ),
+                        },
+                    }
+                    for execution in turn.executions
+                ],
+            }
+        ]
+        for execution in turn.executions:
+            number += 1
+            messages.append(
+                {
+                    "role": "tool",
+                    "tool_call_id": execution.call_id,
+                    "content": _clip(format_tool_output(execution), limit, number),
+                }
+            )
+        turn_messages.append(messages)
+
+    total = sum(_message_tokens(m) for messages in turn_messages for m in messages)
+    dropped: List[List[Dict[str, Any]]] = []
+    while total > max_tokens and len(turn_messages) > 1:
+        messages = turn_messages.pop(0)
+        total -= sum(_message_tokens(m) for m in messages)
+        dropped.append(messages)
+
+    result: List[Dict[str, Any]] = []
+    if dropped:
+        tools_used = sorted(
+            {call["function"]["name"] for messages in dropped for call in messages[0]["tool_calls"]}
+        )
+        result.append(
+            {
+                "role": "user",
+                "content": (
+                    f"[{len(dropped)} earlier step(s) omitted to fit the context budget; "
+                    f"tools used there: {', '.join(tools_used)}]"
+                ),
+            }
+        )
+    for messages in turn_messages:
+        result.extend(messages)
+    return result
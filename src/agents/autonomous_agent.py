@@ -4,18 +4,21 @@ Autonomous Agent
 Использует LLM коннекторы для взаимодействия с различными LLM API
 """
 
+import asyncio
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 from promptic import render
 
 # from .base_agent import AgentResult as BaseAgentResult
+from .agent_history import build_history_messages, estimate_tokens
 from .base_agent import BaseAgent, KBStructure
-from .llm_connectors import BaseLLMConnector
+from .llm_connectors import BaseLLMConnector, LLMResponse, TextDeltaCallback
 from .tools import ToolManager, build_default_tool_manager
 
 
@@ -35,6 +38,17 @@ class AgentDecision:
     tool_name: Optional[str] = None
     tool_params: Optional[Dict[str, Any]] = None
     final_result: Optional[str] = None
+    # All (tool_name, tool_params) calls of one LLM response; tool_name/tool_params
+    # hold the first one
+    tool_calls: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+    # LLM tool call IDs, aligned with tool_calls
+    tool_call_ids: List[Optional[str]] = field(default_factory=list)
+
+    def get_tool_calls(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get the tool calls to execute"""
+        if self.tool_calls:
+            return self.tool_calls
+        return [(self.tool_name, self.tool_params or {})]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -43,6 +57,9 @@ class AgentDecision:
             "reasoning": self.reasoning,
             "tool_name": self.tool_name,
             "tool_params": self.tool_params,
+            "tool_calls": [
+                {"tool_name": name, "tool_params": params} for name, params in self.tool_calls
+            ],
             "final_result": self.final_result,
         }
 
@@ -57,6 +74,7 @@ class ToolExecution:
     success: bool
     error: Optional[str] = None
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    call_id: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -67,9 +85,18 @@ class ToolExecution:
             "success": self.success,
             "error": self.error,
             "timestamp": self.timestamp,
+            "call_id": self.call_id,
         }
 
 
+@dataclass
+class AgentTurn:
+    """Один шаг агента: решение LLM и выполненные вызовы тулзов"""
+
+    reasoning: str
+    executions: List[ToolExecution]
+
+
 @dataclass
 class AgentContext:
     """Контекст выполнения агента"""
@@ -77,10 +104,23 @@ class AgentContext:
     task: str
     executions: List[ToolExecution] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    turns: List[AgentTurn] = field(default_factory=list)
+    # Estimated input tokens sent to the LLM during the task
+    prompt_tokens: int = 0
+    # Receives the text of the current LLM response while it is streamed
+    stream_callback: Optional[TextDeltaCallback] = None
 
     def add_execution(self, execution: ToolExecution) -> None:
         """Добавить выполнение тулза"""
-        self.executions.append(execution)
+        self.add_turn("", [execution])
+
+    def add_turn(self, reasoning: str, executions: List[ToolExecution]) -> None:
+        """Добавить шаг: все вызовы тулзов из одного ответа LLM"""
+        for execution in executions:
+            if execution.call_id is None:
+                execution.call_id = f"call_{len(self.executions) + 1}"
+            self.executions.append(execution)
+        self.turns.append(AgentTurn(reasoning=reasoning, executions=list(executions)))
 
     def add_error(self, error: str) -> None:
         """Добавить ошибку"""
@@ -114,6 +154,7 @@ class AgentContext:
             "executions": [exec.to_dict() for exec in self.executions],
             "errors": self.errors,
             "tools_used": self.get_tools_used(),
+            "prompt_tokens": self.prompt_tokens,
         }
 
 
@@ -261,6 +302,9 @@ class AutonomousAgent(BaseAgent):
         vector_search_manager: Optional["VectorSearchManager"] = None,
         enable_mcp: bool = False,
         enable_mcp_memory: bool = False,
+        max_parallel_tool_calls: int = 4,
+        history_max_tokens: int = 8000,
+        tool_result_max_tokens: int = 2000,
     ):
         """
         Initialize autonomous agent
@@ -281,6 +325,10 @@ class AutonomousAgent(BaseAgent):
             vector_search_manager: Optional pre-configured vector search manager
             enable_mcp: Enable MCP (Model Context Protocol) support
             enable_mcp_memory: Enable MCP memory agent tool (memory HTTP server)
+            max_parallel_tool_calls: Maximum parallel-safe tool calls of one LLM response
+                run at the same time (1 = run all calls sequentially)
+            history_max_tokens: Token budget of the tool-call history sent to the LLM
+            tool_result_max_tokens: Token limit of one tool result of the latest step
         """
         super().__init__(config)
 
@@ -298,6 +346,9 @@ class AutonomousAgent(BaseAgent):
         self.instruction = instruction or default_instruction_with_formatter
         self.llm_connector = llm_connector
         self.max_iterations = max_iterations
+        self.max_parallel_tool_calls = max(1, max_parallel_tool_calls)
+        self.history_max_tokens = history_max_tokens
+        self.tool_result_max_tokens = tool_result_max_tokens
         self.tools: Dict[str, callable] = {}
 
         # Tool enablement flags
@@ -463,7 +514,7 @@ class AutonomousAgent(BaseAgent):
         task = self._prepare_task(content)
 
         # Запустить агентский цикл
-        result = await self._agent_loop(task)
+        result = await self._agent_loop(task, stream_callback=content.get("stream_callback"))
 
         logger.info(f"[AutonomousAgent] Completed in {result.iterations} iterations")
 
@@ -532,17 +583,21 @@ class AutonomousAgent(BaseAgent):
 
         return task
 
-    async def _agent_loop(self, task: str) -> AutonomousAgentResult:
+    async def _agent_loop(
+        self, task: str, stream_callback: Optional[TextDeltaCallback] = None
+    ) -> AutonomousAgentResult:
         """
         Основной цикл агента
 
         Args:
             task: Task description
+            stream_callback: Optional async callback receiving the text deltas of
+                the LLM responses while they are generated
 
         Returns:
             AutonomousAgentResult with final output
         """
-        context = AgentContext(task=task)
+        context = AgentContext(task=task, stream_callback=stream_callback)
         iteration = 0
 
         logger.info(f"[AutonomousAgent] Starting agent loop with task: {task[:50]}...")
@@ -560,13 +615,18 @@ class AutonomousAgent(BaseAgent):
                 logger.info("[AutonomousAgent] Agent decided to END")
                 return await self._finalize_result(context, decision, iteration)
 
-            # Выполнить тулз
+            # Выполнить тулзы (все вызовы из одного ответа LLM)
             if decision.action == ActionType.TOOL_CALL:
-                execution = await self._execute_tool(decision)
-                context.add_execution(execution)
+                executions = await self._execute_tool_calls(decision)
+                for execution, call_id in zip(executions, decision.tool_call_ids):
+                    execution.call_id = call_id
+                context.add_turn(decision.reasoning, executions)
 
-                if not execution.success:
-                    logger.warning(f"[AutonomousAgent] Tool execution failed: {execution.error}")
+                for execution in executions:
+                    if not execution.success:
+                        logger.warning(
+                            f"[AutonomousAgent] Tool execution failed: {execution.error}"
+                        )
 
         # Превышен лимит итераций
         logger.warning(f"[AutonomousAgent] Max iterations ({self.max_iterations}) reached")
@@ -680,35 +740,52 @@ class AutonomousAgent(BaseAgent):
             {"role": "user", "content": context.task},
         ]
 
-        # Добавить историю выполнения
-        if context.executions:
-            history = context.get_history()
-            messages.append({"role": "assistant", "content": f"История выполнения:\n{history}"})
+        # Добавить историю выполнения (структурированные сообщения в пределах бюджета токенов)
+        messages.extend(
+            build_history_messages(
+                context.turns, self.history_max_tokens, self.tool_result_max_tokens
+            )
+        )
 
         # Вызвать LLM через коннектор
         try:
             tools_schema = self._build_tools_schema()
 
-            logger.debug(f"[AutonomousAgent] Calling LLM with {len(tools_schema)} tools")
-
-            response = await self.llm_connector.chat_completion(
-                messages=messages, tools=tools_schema, temperature=0.7
+            prompt_tokens = sum(
+                estimate_tokens(json.dumps(message, ensure_ascii=False)) for message in messages
+            )
+            context.prompt_tokens += prompt_tokens
+            logger.debug(
+                f"[AutonomousAgent] Calling LLM with {len(tools_schema)} tools, "
+                f"{len(messages)} messages (~{prompt_tokens} tokens)"
             )
 
+            if context.stream_callback:
+                response = await self._stream_llm_response(context, messages, tools_schema)
+            else:
+                response = await self.llm_connector.chat_completion(
+                    messages=messages, tools=tools_schema, temperature=0.7
+                )
+
             # Проверка function calling
             if response.has_tool_calls():
-                tool_call = response.tool_calls[0]  # Берем первый вызов
+                tool_calls = [
+                    (tool_call["function"]["name"], tool_call["function"]["arguments"])
+                    for tool_call in response.tool_calls
+                ]
 
                 logger.info(
-                    f"[AutonomousAgent] LLM decided to call tool: "
-                    f"{tool_call['function']['name']}"
+                    f"[AutonomousAgent] LLM decided to call tools: "
+                    f"{[name for name, _ in tool_calls]}"
                 )
 
                 return AgentDecision(
                     action=ActionType.TOOL_CALL,
                     reasoning=response.content or "LLM decided to use a tool",
-                    tool_name=tool_call["function"]["name"],
-                    tool_params=tool_call["function"]["arguments"],
+                    tool_name=tool_calls[0][0],
+                    tool_params=tool_calls[0][1],
+                    tool_calls=tool_calls,
+                    tool_call_ids=[tool_call.get("id") for tool_call in response.tool_calls],
                 )
 
             # LLM решил завершить работу
@@ -737,6 +814,39 @@ class AutonomousAgent(BaseAgent):
                 final_result=await self._generate_fallback_markdown(context),
             )
 
+    async def _stream_llm_response(
+        self,
+        context: AgentContext,
+        messages: List[Dict[str, Any]],
+        tools_schema: List[Dict[str, Any]],
+    ) -> LLMResponse:
+        """
+        Call the LLM with streaming, passing each text delta to the stream callback
+
+        AICODE-NOTE: The callback receives deltas, not the text so far: handing
+        over the whole text would re-join it on every token, which is quadratic
+        in the answer length. Consumers accumulate what they need (see
+        AnswerStreamer). Callback errors are logged and never interrupt the LLM call.
+
+        Args:
+            context: Current agent context (with stream_callback)
+            messages: Chat messages
+            tools_schema: Tools in OpenAI function calling format
+
+        Returns:
+            LLMResponse
+        """
+
+        async def on_text(delta: str) -> None:
+            try:
+                await context.stream_callback(delta)
+            except Exception as e:
+                logger.warning(f"[AutonomousAgent] Stream callback failed: {e}")
+
+        return await self.llm_connector.stream_chat_completion(
+            messages=messages, tools=tools_schema, temperature=0.7, on_text=on_text
+        )
+
     def _extract_text_from_task(self, task: str) -> str:
         """Extract content text from task description"""
         if "ТЕКСТ:" in task:
@@ -790,6 +900,45 @@ class AutonomousAgent(BaseAgent):
             text = self._extract_text_from_task(context.task)
             return "analyze_content", {"text": text}
 
+    async def _execute_tool_calls(self, decision: AgentDecision) -> List[ToolExecution]:
+        """
+        Выполнить все вызовы тулзов из решения
+
+        AICODE-NOTE: A model response may contain several tool calls (read three
+        files, run two searches). They are all executed in this iteration and
+        their results go back to the model in one turn, instead of costing one
+        LLM round-trip each. Consecutive calls of parallel-safe tools run
+        concurrently (at most max_parallel_tool_calls at a time); any other call
+        is a barrier and runs alone, so state-changing calls keep their order.
+
+        Args:
+            decision: Agent decision with tool calls
+
+        Returns:
+            ToolExecution per call, in the order of the calls
+        """
+        calls = decision.get_tool_calls()
+        semaphore = asyncio.Semaphore(self.max_parallel_tool_calls)
+
+        async def run(tool_name: str, params: Dict[str, Any]) -> ToolExecution:
+            async with semaphore:
+                return await self._run_tool(tool_name, params)
+
+        executions: List[ToolExecution] = []
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        for tool_name, params in calls + [(None, {})]:
+            if tool_name is not None and self.tool_manager.is_parallel_safe(tool_name):
+                batch.append((tool_name, params))
+                continue
+            if batch:
+                if len(batch) > 1:
+                    logger.info(f"[AutonomousAgent] Running {len(batch)} tool calls in parallel")
+                executions.extend(await asyncio.gather(*(run(*call) for call in batch)))
+                batch = []
+            if tool_name is not None:
+                executions.append(await self._run_tool(tool_name, params))
+        return executions
+
     async def _execute_tool(self, decision: AgentDecision) -> ToolExecution:
         """
         Выполнить тулз
@@ -800,8 +949,20 @@ class AutonomousAgent(BaseAgent):
         Returns:
             ToolExecution with result
         """
-        tool_name = decision.tool_name
-        params = decision.tool_params or {}
+        return await self._run_tool(decision.tool_name, decision.tool_params or {})
+
+    async def _run_tool(self, tool_name: str, params: Dict[str, Any]) -> ToolExecution:
+        """
+        Выполнить один вызов тулза
+
+        Args:
+            tool_name: Tool name
+            params: Tool parameters
+
+        Returns:
+            ToolExecution with result
+        """
+        params = params or {}
 
         logger.info(f"[AutonomousAgent] Executing tool: {tool_name} with params: {params}")
 
@@ -870,6 +1031,7 @@ class AutonomousAgent(BaseAgent):
             "tools_used": context.get_tools_used(),
             "executions": [exec.to_dict() for exec in context.executions],
             "errors": context.errors,
+            "prompt_tokens": context.prompt_tokens,
         }
 
         return AutonomousAgentResult(
@@ -3,11 +3,16 @@ LLM Connectors
 Unified interface for different LLM APIs
 """
 
-from .base_connector import BaseLLMConnector, LLMResponse
+from .base_connector import BaseLLMConnector, LLMResponse, TextDeltaCallback
+from .llm_gateway import LLMGateway, LLMUnavailableError, get_llm_gateway
 from .openai_connector import OpenAIConnector
 
 __all__ = [
     "BaseLLMConnector",
+    "LLMGateway",
     "LLMResponse",
+    "LLMUnavailableError",
     "OpenAIConnector",
+    "TextDeltaCallback",
+    "get_llm_gateway",
 ]
@@ -5,10 +5,13 @@ Abstract interface for LLM API calls
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from loguru import logger
 
+# Receives each piece of text while a response is streamed
+TextDeltaCallback = Callable[[str], Awaitable[None]]
+
 
 @dataclass
 class LLMResponse:
@@ -66,6 +69,40 @@ class BaseLLMConnector(ABC):
         """
         pass
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        on_text: Optional[TextDeltaCallback] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """
+        Make a chat completion request, reporting text while it is generated
+
+        AICODE-NOTE: Connectors that support streaming override this and call
+        on_text with every content delta. The default makes a regular request
+        and reports the whole text once, so callers can always use this method.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            tools: Optional list of tool definitions (OpenAI function calling format)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            on_text: Optional async callback receiving each content delta
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            LLMResponse with the complete content and/or tool calls
+        """
+        response = await self.chat_completion(
+            messages, tools=tools, temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+        if on_text and response.content and not response.has_tool_calls():
+            await on_text(response.content)
+        return response
+
     @abstractmethod
     def get_model_name(self) -> str:
         """
@@ -0,0 +1,388 @@
+"""
+LLM Gateway
+Shared admission control for LLM API calls: concurrency, token budget, retries, circuit breaking
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from src.core.circuit_breaker import CircuitBreaker
+from src.core.metrics import metrics
+
+try:
+    from openai import APIConnectionError
+
+    _CONNECTION_ERRORS: tuple = (asyncio.TimeoutError, ConnectionError, APIConnectionError)
+except ImportError:
+    _CONNECTION_ERRORS = (asyncio.TimeoutError, ConnectionError)
+
+T = TypeVar("T")
+
+# Window of the tokens-per-minute budget
+BUDGET_WINDOW = 60.0
+
+# Gateway metrics are recorded in the bot process and served by start_metrics_server
+_REQUESTS = metrics.counter("llm_gateway_requests_total", "LLM requests", ("outcome",))
+_RETRIES = metrics.counter("llm_gateway_retries_total", "LLM request retries", ("reason",))
+_QUEUE_WAIT = metrics.histogram(
+    "llm_gateway_queue_wait_seconds", "Time an LLM request waited for a slot and token budget"
+)
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised without calling the provider while its circuit is open"""
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Read the delay requested by the provider from an error response
+
+    Args:
+        error: Exception raised by the API client
+
+    Returns:
+        Seconds from the Retry-After (or retry-after-ms) header, or None
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        milliseconds = headers.get("retry-after-ms")
+        if milliseconds:
+            return max(0.0, float(milliseconds) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    Classify an API error for retrying
+
+    Args:
+        error: Exception raised by the API client
+
+    Returns:
+        "rate_limit" (429), "server" (5xx, connection errors, timeouts)
+        or None for errors that retrying cannot fix
+    """
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        return "rate_limit"
+    if isinstance(status, int) and status >= 500:
+        return "server"
+    if isinstance(error, _CONNECTION_ERRORS):
+        return "server"
+    return None
+
+
+class LLMGateway:
+    """
+    Shared gate in front of the LLM provider
+
+    AICODE-NOTE: Every agent owns its connector, so without a shared gate a
+    burst of users sends unbounded concurrent requests and gets 429s. The
+    gateway is shared by all connectors of an event loop (get_llm_gateway) and
+    applies, per request:
+    - fair queuing: at most max_concurrency requests run and estimated tokens
+      of the last minute stay within tokens_per_minute (0 = no budget).
+      Waiting requests are admitted round-robin across users, and a request
+      takes its tokens only when its turn comes, so one user's burst cannot
+      claim the budget ahead of the others. While the user whose turn it is
+      waits for tokens, no slot is held and only requests without a token
+      estimate may go ahead (they do not delay it);
+    - retries: 429/5xx/connection errors are retried up to max_retries times
+      after the provider's Retry-After, or a full-jitter exponential backoff;
+      the slot is released while waiting;
+    - circuit breaker (per provider): after repeated server errors requests
+      fail fast with LLMUnavailableError until a trial request succeeds.
+      Rate limits do not open the circuit.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        tokens_per_minute: int = 0,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 30.0,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        """
+        Initialize gateway
+
+        Args:
+            max_concurrency: Maximum concurrent requests
+            tokens_per_minute: Token budget per minute (0 = unlimited)
+            max_retries: Retries of a failed request
+            retry_base_delay: First backoff delay in seconds
+            retry_max_delay: Maximum backoff delay in seconds
+            failure_threshold: Consecutive server errors that open a provider's circuit
+            recovery_timeout: Seconds the circuit stays open
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = max(0, tokens_per_minute)
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.active = 0
+        # user -> waiting requests; the order of users is the round-robin order
+        self._waiters: "OrderedDict[Any, Deque[Tuple[asyncio.Future, int]]]" = OrderedDict()
+        # (timestamp, tokens) of requests admitted within the budget window
+        self._spent: Deque[Tuple[float, int]] = deque()
+        # Re-admits waiting requests once the budget window frees tokens
+        self._budget_timer: Optional[asyncio.TimerHandle] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable[T]],
+        provider: str = "default",
+        user_id: Optional[Any] = None,
+        estimated_tokens: int = 0,
+        can_retry: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """
+        Run an LLM request through the gateway
+
+        Args:
+            request: Factory of the API call (called again on every retry)
+            provider: Provider key of the circuit breaker (e.g. the base URL)
+            user_id: User the request is made for (fair queuing key)
+            estimated_tokens: Tokens the request is expected to use
+            can_retry: Optional check whether a failed request may be repeated
+                (e.g. not after part of a stream was already delivered)
+
+        Returns:
+            Result of the request
+
+        Raises:
+            LLMUnavailableError: If the provider's circuit is open
+        """
+        breaker = self._get_breaker(provider)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                _REQUESTS.inc("circuit_open")
+                raise LLMUnavailableError(
+                    f"LLM provider is unavailable after repeated errors, "
+                    f"retry in {breaker.retry_in():.0f}s"
+                )
+
+            waited = time.monotonic()
+            try:
+                await self._acquire(user_id, estimated_tokens)
+            except asyncio.CancelledError:
+                breaker.cancel_trial()
+                raise
+            _QUEUE_WAIT.observe(time.monotonic() - waited)
+            try:
+                result = await request()
+            except asyncio.CancelledError:
+                breaker.cancel_trial()
+                raise
+            except Exception as e:
+                error = e
+                reason = classify_error(e)
+                if reason == "server":
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                retryable = reason and attempt < self.max_retries
+                if not retryable or (can_retry is not None and not can_retry()):
+                    _REQUESTS.inc("error")
+                    raise
+            else:
+                breaker.record_success()
+                _REQUESTS.inc("success")
+                return result
+            finally:
+                self._release()
+
+            attempt += 1
+            delay = self._retry_delay(error, attempt)
+            _RETRIES.inc(reason)
+            logger.warning(
+                f"[LLMGateway] 🔁 {reason} error from {provider} ({error}), "
+                f"retry {attempt}/{self.max_retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load of the gateway"""
+        return {
+            "active": self.active,
+            "queued": sum(len(waiters) for waiters in self._waiters.values()),
+            "tokens_last_minute": sum(tokens for _, tokens in self._spent),
+            "circuits": {key: breaker.stats() for key, breaker in self._breakers.items()},
+        }
+
+    def _get_breaker(self, provider: str) -> CircuitBreaker:
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = self._breakers[provider] = CircuitBreaker(
+                f"LLM provider {provider}",
+                failure_threshold=self.failure_threshold,
+                recovery_timeout=self.recovery_timeout,
+            )
+        return breaker
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            # Small jitter so clients told the same delay do not return at once
+            return retry_after + random.uniform(0, min(1.0, retry_after * 0.1 + 0.1))
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    async def _acquire(self, user_id: Any, tokens: int) -> None:
+        if (
+            not self._waiters
+            and self.active < self.max_concurrency
+            and not self._budget_wait(tokens)
+        ):
+            self._admit(tokens)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user_id, deque()).append((future, tokens))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            else:
+                self._remove_waiter(user_id, future)
+                self._dispatch()
+            raise
+
+    def _admit(self, tokens: int) -> None:
+        self.active += 1
+        if self.tokens_per_minute and tokens > 0:
+            self._spent.append((time.monotonic(), tokens))
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting requests in round-robin order of users"""
+        admitted = True
+        while admitted and self._waiters:
+            admitted = False
+            blocked = False
+            for user_id in list(self._waiters):
+                if self.active >= self.max_concurrency:
+                    return
+                waiters = self._waiters[user_id]
+                while waiters and waiters[0][0].done():
+                    waiters.popleft()  # cancelled while waiting
+                if not waiters:
+                    del self._waiters[user_id]
+                    continue
+
+                future, tokens = waiters[0]
+                wait = self._budget_wait(tokens)
+                if wait or (blocked and tokens > 0):
+                    # Keeps its turn; later users may only send requests that need no tokens
+                    if wait:
+                        self._schedule_dispatch(wait)
+                    blocked = True
+                    continue
+
+                waiters.popleft()
+                del self._waiters[user_id]
+                if waiters:
+                    self._waiters[user_id] = waiters  # back of the line
+                self._admit(tokens)
+                future.set_result(None)
+                admitted = True
+
+    def _budget_wait(self, tokens: int) -> float:
+        """Seconds until the budget has room for tokens (0 = it fits now)"""
+        if not self.tokens_per_minute or tokens <= 0:
+            return 0.0
+        now = time.monotonic()
+        while self._spent and now - self._spent[0][0] >= BUDGET_WINDOW:
+            self._spent.popleft()
+        used = sum(spent for _, spent in self._spent)
+        # A request larger than the whole budget runs alone in the window
+        if used + tokens <= self.tokens_per_minute or not self._spent:
+            return 0.0
+        return max(BUDGET_WINDOW - (now - self._spent[0][0]), 0.001)
+
+    def _schedule_dispatch(self, delay: float) -> None:
+        if self._budget_timer is not None:
+            return
+
+        def on_timer() -> None:
+            self._budget_timer = None
+            self._dispatch()
+
+        self._budget_timer = asyncio.get_running_loop().call_later(delay, on_timer)
+
+    def _remove_waiter(self, user_id: Any, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(user_id)
+        if not waiters:
+            return
+        for entry in waiters:
+            if entry[0] is future:
+                waiters.remove(entry)
+                break
+        if not waiters:
+            del self._waiters[user_id]
+
+
+_gateways: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMGateway]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Get the LLM gateway of the running event loop (created from settings on first use)
+
+    AICODE-NOTE: The gateway's futures and lock belong to one event loop, so
+    like get_session_pool it is kept per running loop instead of per process.
+
+    Returns:
+        LLMGateway instance
+    """
+    loop = asyncio.get_running_loop()
+    gateway = _gateways.get(loop)
+    if gateway is None:
+        from config.settings import settings
+
+        gateway = _gateways[loop] = LLMGateway(
+            max_concurrency=settings.LLM_MAX_CONCURRENT_REQUESTS,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            max_retries=settings.LLM_MAX_RETRIES,
+            retry_base_delay=settings.LLM_RETRY_BASE_DELAY,
+            retry_max_delay=settings.LLM_RETRY_MAX_DELAY,
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.LLM_CIRCUIT_RECOVERY_TIMEOUT,
+        )
+        logger.info(
+            f"[LLMGateway] Initialized: max_concurrency={gateway.max_concurrency}, "
+            f"tokens_per_minute={gateway.tokens_per_minute or 'unlimited'}"
+        )
+    return gateway
@@ -3,11 +3,16 @@ OpenAI API Connector
 Connector for OpenAI-compatible APIs (OpenAI, Qwen, etc.)
 """
 
+import asyncio
 import json
+import time
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from src.core.llm_response_cache import get_llm_response_cache, is_cacheable, make_cache_key
+from src.core.metrics import metrics
+
 try:
     from openai import AsyncOpenAI
 
@@ -16,7 +21,15 @@ except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("openai package not installed. OpenAIConnector will not work.")
 
-from .base_connector import BaseLLMConnector, LLMResponse
+from ..agent_history import estimate_tokens
+from .base_connector import BaseLLMConnector, LLMResponse, TextDeltaCallback
+from .llm_gateway import get_llm_gateway
+
+# Time from sending a streamed request until the first chunk arrives
+# (recorded in the bot process, served by its /metrics: see start_metrics_server)
+_TIME_TO_FIRST_TOKEN = metrics.histogram(
+    "llm_time_to_first_token_seconds", "Time to the first streamed LLM chunk", ("model",)
+)
 
 
 class OpenAIConnector(BaseLLMConnector):
@@ -59,7 +72,9 @@ class OpenAIConnector(BaseLLMConnector):
         self.model = model
 
         # Initialize OpenAI client
-        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        # AICODE-NOTE: Retries are made by the LLM gateway (Retry-After, jitter,
+        # circuit breaker), so the client's own retries are disabled
+        self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
 
         logger.info(
             f"OpenAIConnector initialized: model={model}, " f"base_url={base_url or 'default'}"
@@ -87,35 +102,20 @@ class OpenAIConnector(BaseLLMConnector):
             LLMResponse with content and/or tool calls
         """
         try:
-            # Validate tools if provided
-            if tools and not self.validate_tools_schema(tools):
-                logger.warning("[OpenAIConnector] Invalid tools schema")
-                tools = None
-
-            # Prepare API call parameters
-            api_params = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-            }
-
-            if max_tokens:
-                api_params["max_tokens"] = max_tokens
-
-            if tools:
-                api_params["tools"] = tools
-                api_params["tool_choice"] = kwargs.pop("tool_choice", "auto")
-
-            # Add any additional kwargs
-            api_params.update(kwargs)
-
-            logger.debug(
-                f"[OpenAIConnector] Calling API: model={self.model}, "
-                f"messages={len(messages)}, tools={len(tools) if tools else 0}"
-            )
+            cache_key = self._cache_key(messages, tools, temperature, max_tokens, kwargs)
+            cached = await self._cache_lookup(cache_key)
+            if cached is not None:
+                return cached
 
-            # Make API call
-            response = await self.client.chat.completions.create(**api_params)
+            api_params = self._build_api_params(messages, tools, temperature, max_tokens, kwargs)
+
+            # Make API call (through the shared gateway: concurrency, budget, retries)
+            response = await get_llm_gateway().call(
+                lambda: self.client.chat.completions.create(**api_params),
+                provider=self._provider_key(),
+                user_id=self.config.get("user_id"),
+                estimated_tokens=self._estimate_tokens(messages, max_tokens),
+            )
 
             # Parse response
             message = response.choices[0].message
@@ -151,12 +151,223 @@ class OpenAIConnector(BaseLLMConnector):
                     f"{len(message.content) if message.content else 0} chars"
                 )
 
+            await self._cache_store(cache_key, llm_response)
             return llm_response
 
         except Exception as e:
             logger.error(f"[OpenAIConnector] API call failed: {e}", exc_info=True)
             raise
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        on_text: Optional[TextDeltaCallback] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """
+        Make a streamed chat completion request using OpenAI API
+
+        AICODE-NOTE: Content deltas are passed to on_text as they arrive; tool
+        call deltas are accumulated by index (id and name come first, arguments
+        arrive in pieces) and parsed when the stream ends. Time to the first
+        chunk is recorded as llm_time_to_first_token_seconds.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            on_text: Optional async callback receiving each content delta
+            **kwargs: Additional parameters for OpenAI API
+
+        Returns:
+            LLMResponse with the complete content and/or tool calls
+        """
+        try:
+            cache_key = self._cache_key(messages, tools, temperature, max_tokens, kwargs)
+            cached = await self._cache_lookup(cache_key)
+            if cached is not None:
+                if on_text and cached.content and not cached.has_tool_calls():
+                    await on_text(cached.content)
+                return cached
+
+            api_params = self._build_api_params(messages, tools, temperature, max_tokens, kwargs)
+            api_params["stream"] = True
+
+            # Text already passed to on_text cannot be taken back, so such a request is not retried
+            delivered = [False]
+
+            async def request() -> LLMResponse:
+                started = time.monotonic()
+                first_chunk = True
+                content_parts: List[str] = []
+                tool_call_parts: Dict[int, Dict[str, Any]] = {}
+                finish_reason = "stop"
+
+                stream = await self.client.chat.completions.create(**api_params)
+                async for chunk in stream:
+                    if first_chunk:
+                        _TIME_TO_FIRST_TOKEN.observe(time.monotonic() - started, self.model)
+                        first_chunk = False
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+                    delta = choice.delta
+                    if delta is None:
+                        continue
+
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        delivered[0] = True
+                        if on_text:
+                            await on_text(delta.content)
+
+                    for tool_call in delta.tool_calls or []:
+                        part = tool_call_parts.setdefault(
+                            tool_call.index, {"id": None, "name": "", "arguments": ""}
+                        )
+                        if tool_call.id:
+                            part["id"] = tool_call.id
+                        if tool_call.function and tool_call.function.name:
+                            part["name"] += tool_call.function.name
+                        if tool_call.function and tool_call.function.arguments:
+                            part["arguments"] += tool_call.function.arguments
+
+                tool_calls_list = None
+                if tool_call_parts:
+                    tool_calls_list = [
+                        {
+                            "id": part["id"],
+                            "type": "function",
+                            "function": {
+                                "name": part["name"],
+                                "arguments": json.loads(part["arguments"] or "{}"),
+                            },
+                        }
+                        for _, part in sorted(tool_call_parts.items())
+                    ]
+
+                content = "".join(content_parts) or None
+                logger.debug(
+                    f"[OpenAIConnector] Streamed response: {len(content) if content else 0} chars, "
+                    f"{len(tool_calls_list) if tool_calls_list else 0} tool call(s)"
+                )
+
+                return LLMResponse(
+                    content=content, tool_calls=tool_calls_list, finish_reason=finish_reason
+                )
+
+            llm_response = await get_llm_gateway().call(
+                request,
+                provider=self._provider_key(),
+                user_id=self.config.get("user_id"),
+                estimated_tokens=self._estimate_tokens(messages, max_tokens),
+                can_retry=lambda: not delivered[0],
+            )
+            await self._cache_store(cache_key, llm_response)
+            return llm_response
+
+        except Exception as e:
+            logger.error(f"[OpenAIConnector] Streamed API call failed: {e}", exc_info=True)
+            raise
+
+    def _cache_key(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Key of the request in the response cache
+
+        AICODE-NOTE: Only temperature 0 requests are cached, and only when
+        LLM_RESPONSE_CACHE_ENABLED is on; the agent loop (temperature 0.7) is
+        never served from the cache.
+
+        Returns:
+            Cache key, or None if the request is not cached
+        """
+        if not is_cacheable(temperature) or get_llm_response_cache() is None:
+            return None
+        params = {"temperature": temperature, "max_tokens": max_tokens, **kwargs}
+        return make_cache_key(self._provider_key(), self.model, messages, tools, params)
+
+    async def _cache_lookup(self, cache_key: Optional[str]) -> Optional[LLMResponse]:
+        """Get a cached response (None on a miss or if the request is not cached)"""
+        if cache_key is None:
+            return None
+        cached = await asyncio.to_thread(get_llm_response_cache().get, cache_key)
+        if cached is None:
+            return None
+        logger.debug("[OpenAIConnector] 💾 Response served from cache")
+        return LLMResponse(**cached)
+
+    async def _cache_store(self, cache_key: Optional[str], response: LLMResponse) -> None:
+        """Store a response in the cache if the request is cached"""
+        if cache_key is None:
+            return
+        value = {
+            "content": response.content,
+            "tool_calls": response.tool_calls,
+            "finish_reason": response.finish_reason,
+        }
+        await asyncio.to_thread(get_llm_response_cache().set, cache_key, value)
+
+    def _provider_key(self) -> str:
+        """Circuit breaker key of the provider"""
+        return self.base_url or "openai"
+
+    @staticmethod
+    def _estimate_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int]) -> int:
+        """Tokens a request may use (prompt estimate plus completion limit)"""
+        prompt = json.dumps(messages, ensure_ascii=False, default=str)
+        return estimate_tokens(prompt) + (max_tokens or 0)
+
+    def _build_api_params(
+        self,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict[str, Any]]],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Prepare parameters of a chat completion call"""
+        # Validate tools if provided
+        if tools and not self.validate_tools_schema(tools):
+            logger.warning("[OpenAIConnector] Invalid tools schema")
+            tools = None
+
+        # Prepare API call parameters
+        api_params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+
+        if max_tokens:
+            api_params["max_tokens"] = max_tokens
+
+        if tools:
+            api_params["tools"] = tools
+            api_params["tool_choice"] = kwargs.pop("tool_choice", "auto")
+
+        # Add any additional kwargs
+        api_params.update(kwargs)
+
+        logger.debug(
+            f"[OpenAIConnector] Calling API: model={self.model}, "
+            f"messages={len(messages)}, tools={len(tools) if tools else 0}"
+        )
+        return api_params
+
     def get_model_name(self) -> str:
         """
         Get the model name being used
@@ -46,6 +46,12 @@ class BaseTool(ABC):
     their metadata and implementation.
     """
 
+    # AICODE-NOTE: Tools that only read (KB files, searches, web) set
+    # parallel_safe = True, so the agent may run several of their calls from one
+    # LLM response concurrently. Tools that change state (files, folders, git,
+    # plan) keep the default and run one at a time, in the order requested.
+    parallel_safe: bool = False
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -52,6 +52,8 @@ def _validate_safe_path(kb_root_path: Path, relative_path: str) -> tuple[bool, O
 class KBReadFileTool(BaseTool):
     """Tool for reading one or multiple files from knowledge base"""
 
+    parallel_safe = True
+
     @property
     def name(self) -> str:
         return "kb_read_file"
@@ -135,6 +137,8 @@ class KBReadFileTool(BaseTool):
 class KBListDirectoryTool(BaseTool):
     """Tool for listing contents of a directory in knowledge base"""
 
+    parallel_safe = True
+
     @property
     def name(self) -> str:
         return "kb_list_directory"
@@ -243,6 +247,8 @@ class KBListDirectoryTool(BaseTool):
 class KBSearchFilesTool(BaseTool):
     """Tool for searching files and directories by name or pattern"""
 
+    parallel_safe = True
+
     @property
     def name(self) -> str:
         return "kb_search_files"
@@ -366,6 +372,8 @@ class KBSearchFilesTool(BaseTool):
 class KBSearchContentTool(BaseTool):
     """Tool for searching by file contents in knowledge base"""
 
+    parallel_safe = True
+
     @property
     def name(self) -> str:
         return "kb_search_content"
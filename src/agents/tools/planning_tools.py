@@ -60,6 +60,8 @@ class PlanTodoTool(BaseTool):
 class AnalyzeContentTool(BaseTool):
     """Tool for analyzing content and extracting key information"""
 
+    parallel_safe = True
+
     @property
     def name(self) -> str:
         return "analyze_content"
@@ -77,6 +77,19 @@ class ToolManager:
         """
         return name in self._tools
 
+    def is_parallel_safe(self, name: str) -> bool:
+        """
+        Check if a tool may run concurrently with other parallel-safe calls
+
+        Args:
+            name: Tool name
+
+        Returns:
+            True if the tool is registered and declared parallel-safe
+        """
+        tool = self._tools.get(name)
+        return tool is not None and tool.parallel_safe
+
     def names(self) -> List[str]:
         """
         Get list of registered tool names
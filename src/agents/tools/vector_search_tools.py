@@ -21,6 +21,8 @@ from .base_tool import BaseTool, ToolContext
 class VectorSearchTool(BaseTool):
     """Tool for semantic vector search in knowledge base"""
 
+    parallel_safe = True
+
     @property
     def name(self) -> str:
         return "kb_vector_search"
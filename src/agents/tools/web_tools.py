@@ -16,6 +16,8 @@ from .base_tool import BaseTool, ToolContext
 class WebSearchTool(BaseTool):
     """Tool for web search and URL fetching"""
 
+    parallel_safe = True
+
     @property
     def name(self) -> str:
         return "web_search"
@@ -21,6 +21,9 @@ Usage:
     result = await client.vector_delete_documents(document_ids)
     result = await client.vector_update_documents(documents)
 
+    # Indexing runs as a background job on the hub
+    job = await client.vector_wait_for_job(result["job_id"])
+
     # Registry operations
     servers = await client.registry_list_servers()
     await client.registry_register_server(server_config)
@@ -32,13 +35,15 @@ Usage:
 
 import asyncio
 import json
-from typing import Any, Dict, List, Optional, Union
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import aiohttp
 from loguru import logger
 
 from config import settings
+from src.core.compression import GZIP, ZSTD, compress, supported_encodings
 
 
 class MCPHubError(Exception):
@@ -73,6 +78,9 @@ class MCPHubClient:
         timeout: Optional[float] = None,
         retry_attempts: int = 3,
         retry_delay: float = 1.0,
+        compress_min_bytes: int = 1024,
+        batch_max_bytes: int = 4 * 1024 * 1024,
+        max_concurrent_batches: int = 4,
     ):
         """
         Initialize MCP Hub client
@@ -82,11 +90,20 @@ class MCPHubClient:
             timeout: Request timeout in seconds (default: settings.MCP_TIMEOUT)
             retry_attempts: Number of retry attempts for failed requests
             retry_delay: Delay between retry attempts in seconds
+            compress_min_bytes: Compress request bodies at least this large (zstd or gzip)
+            batch_max_bytes: Maximum serialized size of documents sent in one request
+            max_concurrent_batches: Maximum document batches in flight at once
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout or settings.MCP_TIMEOUT
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
+        self.compress_min_bytes = compress_min_bytes
+        self.batch_max_bytes = batch_max_bytes
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+
+        # Best available encoding; downgraded to gzip if the hub rejects zstd
+        self._request_encoding = supported_encodings()[0]
 
         # Session will be created on first use
         self._session: Optional[aiohttp.ClientSession] = None
@@ -144,21 +161,31 @@ class MCPHubClient:
         url = urljoin(self.base_url, endpoint)
         session = await self._get_session()
 
+        body, headers = await self._encode_json(json_data)
         last_error = None
 
-        for attempt in range(self.retry_attempts):
+        attempt = 0
+        while attempt < self.retry_attempts:
             try:
                 logger.debug(f"🌐 {method} {url} (attempt {attempt + 1}/{self.retry_attempts})")
 
                 async with session.request(
                     method=method,
                     url=url,
-                    json=json_data,
+                    data=body,
+                    headers=headers,
                     params=params,
                 ) as response:
                     # Log response status
                     logger.debug(f"📊 Response: {response.status}")
 
+                    if response.status == 415 and headers.get("Content-Encoding") == ZSTD:
+                        # Hub cannot decode zstd: fall back to gzip for this client
+                        logger.info("📦 MCP Hub does not accept zstd, switching to gzip")
+                        self._request_encoding = GZIP
+                        body, headers = await self._encode_json(json_data)
+                        continue
+
                     # Handle different status codes
                     if response.status == expected_status:
                         try:
@@ -205,7 +232,8 @@ class MCPHubClient:
                 logger.warning(f"❌ Unexpected error on attempt {attempt + 1}: {e}")
 
             # Wait before retry (except on last attempt)
-            if attempt < self.retry_attempts - 1:
+            attempt += 1
+            if attempt < self.retry_attempts:
                 logger.debug(f"⏳ Waiting {self.retry_delay}s before retry...")
                 await asyncio.sleep(self.retry_delay)
 
@@ -213,6 +241,117 @@ class MCPHubClient:
         logger.error(f"❌ All {self.retry_attempts} attempts failed for {method} {endpoint}")
         raise last_error or MCPHubError("All retry attempts failed")
 
+    async def _encode_json(
+        self, json_data: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """
+        Serialize a JSON payload, compressing it when it is large enough
+
+        Args:
+            json_data: JSON payload (None for requests without body)
+
+        Returns:
+            Request body and headers
+        """
+        if json_data is None:
+            return None, {}
+
+        body = json.dumps(json_data, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if len(body) < self.compress_min_bytes:
+            return body, headers
+
+        # Compression of multi-megabyte bodies should not block the event loop
+        encoding = self._request_encoding
+        compressed = await asyncio.to_thread(compress, body, encoding)
+        logger.debug(
+            f"📦 Compressed request body with {encoding}: {len(body)} -> {len(compressed)}"
+        )
+        headers["Content-Encoding"] = encoding
+        return compressed, headers
+
+    def _split_documents(self, documents: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Split documents into batches of bounded serialized size
+
+        A single document larger than the bound gets its own batch.
+
+        Args:
+            documents: Documents to send
+
+        Returns:
+            List of batches (order preserved)
+        """
+        batches: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_size = 0
+        for document in documents:
+            size = len(json.dumps(document, ensure_ascii=False).encode("utf-8"))
+            if current and current_size + size > self.batch_max_bytes:
+                batches.append(current)
+                current, current_size = [], 0
+            current.append(document)
+            current_size += size
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _send_document_batches(
+        self,
+        method: str,
+        endpoint: str,
+        batches: List[List[Dict[str, Any]]],
+        base_payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Send document batches as parts of one upload and merge the responses
+
+        AICODE-NOTE: Every batch carries the same upload id with its part index,
+        so the parts can be sent concurrently (bounded by max_concurrent_batches)
+        and the hub queues a single job once the last part arrives. A large
+        reindex therefore publishes one complete index generation.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            batches: Document batches
+            base_payload: Payload fields shared by all batches (kb_id, user_id, force)
+
+        Returns:
+            Merged response with the job_id of the assembled request
+        """
+        logger.info(f"📦 Sending {sum(map(len, batches))} documents in {len(batches)} batches")
+
+        upload_id = uuid.uuid4().hex
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+
+        async def send(part: int, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._make_request(
+                    method,
+                    endpoint,
+                    json_data={
+                        **base_payload,
+                        "documents": batch,
+                        "upload": {"id": upload_id, "part": part, "parts": len(batches)},
+                    },
+                )
+
+        responses = await asyncio.gather(*(send(i, b) for i, b in enumerate(batches)))
+
+        errors = [r.get("error") for r in responses if not r.get("success")]
+        job_ids = [r["job_id"] for r in responses if r.get("job_id")]
+        if not errors and not job_ids:
+            errors.append(f"Upload {upload_id} was not queued by the hub")
+        return {
+            "success": not errors,
+            "job_id": job_ids[0] if job_ids else None,
+            "job_ids": job_ids,
+            "batches": len(batches),
+            "message": f"Sent {len(batches)} batches",
+            "error": "; ".join(str(e) for e in errors) if errors else None,
+        }
+
     # ============================================================================
     # Health Check
     # ============================================================================
@@ -260,6 +399,13 @@ class MCPHubClient:
         if user_id is not None:
             payload["user_id"] = user_id
 
+        batches = self._split_documents(documents)
+        if len(batches) > 1:
+            base_payload = {k: v for k, v in payload.items() if k != "documents"}
+            return await self._send_document_batches(
+                "POST", "/vector/reindex", batches, base_payload
+            )
+
         return await self._make_request("POST", "/vector/reindex", json_data=payload)
 
     async def vector_add_documents(
@@ -288,6 +434,13 @@ class MCPHubClient:
         if user_id is not None:
             payload["user_id"] = user_id
 
+        batches = self._split_documents(documents)
+        if len(batches) > 1:
+            base_payload = {k: v for k, v in payload.items() if k != "documents"}
+            return await self._send_document_batches(
+                "POST", "/vector/documents", batches, base_payload
+            )
+
         return await self._make_request("POST", "/vector/documents", json_data=payload)
 
     async def vector_delete_documents(
@@ -344,8 +497,66 @@ class MCPHubClient:
         if user_id is not None:
             payload["user_id"] = user_id
 
+        batches = self._split_documents(documents)
+        if len(batches) > 1:
+            base_payload = {k: v for k, v in payload.items() if k != "documents"}
+            return await self._send_document_batches(
+                "PUT", "/vector/documents", batches, base_payload
+            )
+
         return await self._make_request("PUT", "/vector/documents", json_data=payload)
 
+    async def vector_job_status(self, job_id: str, wait: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get status and progress of a background indexing job
+
+        Args:
+            job_id: Job ID returned by an indexing request
+            wait: Hold the request up to this many seconds until the job finishes
+
+        Returns:
+            Job status response ({"success": True, "job": {...}})
+        """
+        params = {"wait": wait} if wait else None
+        return await self._make_request("GET", f"/vector/jobs/{job_id}", params=params)
+
+    async def vector_wait_for_job(
+        self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 30.0
+    ) -> Dict[str, Any]:
+        """
+        Wait until a background indexing job finishes
+
+        AICODE-NOTE: Uses long-polling (?wait=) so the hub answers as soon as the
+        job finishes; each poll stays well below the HTTP request timeout.
+
+        Args:
+            job_id: Job ID returned by an indexing request
+            timeout: Maximum total wait in seconds (None waits indefinitely)
+            poll_interval: Maximum duration of a single long-poll request
+
+        Returns:
+            Final job state (status "completed" or "failed")
+
+        Raises:
+            MCPHubTimeoutError: If the job does not finish within timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        wait = max(1.0, min(poll_interval, self.timeout / 2))
+
+        while True:
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise MCPHubTimeoutError(f"Indexing job {job_id} did not finish in {timeout}s")
+                wait = max(1.0, min(wait, remaining))
+
+            response = await self.vector_job_status(job_id, wait=wait)
+            job = response.get("job", {})
+            if job.get("status") in ("completed", "failed"):
+                return job
+            logger.debug(f"⏳ Indexing job {job_id}: {job.get('status')} {job.get('progress')}")
+
     # ============================================================================
     # Registry API
     # ============================================================================
@@ -437,6 +437,41 @@ class BotVectorSearchManager:
 
         logger.info("📡 Subscribed to KB change events for reactive reindexing")
 
+    async def _await_indexing_job(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wait for the background indexing jobs queued by an MCP Hub request
+
+        AICODE-NOTE: MCP Hub replies to indexing requests immediately with a job_id
+        and runs the work in the background. The change detection flow relies on the
+        outcome (file hashes are saved only after success), so we wait here.
+
+        Args:
+            result: Response of an indexing request
+
+        Returns:
+            Result with "success" reflecting the finished job
+        """
+        # Batched requests are assembled by the hub into one job (job_ids has one entry)
+        job_ids = result.get("job_ids") or ([result["job_id"]] if result.get("job_id") else [])
+        if not result.get("success") or not job_ids:
+            return result
+
+        succeeded = True
+        errors: List[str] = []
+        for job_id in job_ids:
+            job = await self._mcp_client.vector_wait_for_job(job_id)
+            stats = job.get("result") or {}
+            if job.get("status") != "completed" or not stats.get("success", True):
+                succeeded = False
+                errors.append(job.get("error") or "; ".join(stats.get("errors", [])))
+
+        return {
+            "success": succeeded,
+            "job_ids": job_ids,
+            "message": f"{len(job_ids)} indexing job(s) finished",
+            "error": "; ".join(errors),
+        }
+
     async def _call_mcp_reindex(self, documents: List[Dict[str, Any]], force: bool = False) -> bool:
         """
         Call MCP Hub reindex_vector via HTTP API.
@@ -452,6 +487,7 @@ class BotVectorSearchManager:
                 kb_id="default",  # TODO: Make configurable per user
                 user_id=None,  # TODO: Add user_id support
             )
+            result = await self._await_indexing_job(result)
 
             if result.get("success"):
                 logger.info("✅ HTTP reindex_vector completed successfully")
@@ -484,6 +520,7 @@ class BotVectorSearchManager:
                 kb_id="default",  # TODO: Make configurable per user
                 user_id=None,  # TODO: Add user_id support
             )
+            result = await self._await_indexing_job(result)
 
             if result.get("success"):
                 logger.info(f"✅ HTTP add_vector_documents completed: {result.get('message')}")
@@ -518,6 +555,7 @@ class BotVectorSearchManager:
                 kb_id="default",  # TODO: Make configurable per user
                 user_id=None,  # TODO: Add user_id support
             )
+            result = await self._await_indexing_job(result)
 
             if result.get("success"):
                 logger.info(f"✅ HTTP delete_vector_documents completed: {result.get('message')}")
@@ -552,6 +590,7 @@ class BotVectorSearchManager:
                 kb_id="default",  # TODO: Make configurable per user
                 user_id=None,  # TODO: Add user_id support
             )
+            result = await self._await_indexing_job(result)
 
             if result.get("success"):
                 logger.info(f"✅ HTTP update_vector_documents completed: {result.get('message')}")
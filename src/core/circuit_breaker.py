@@ -0,0 +1,112 @@
+"""
+Circuit Breaker
+Skips calls to a dependency that keeps failing until it had time to recover
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    AICODE-NOTE: States follow the classic pattern:
+    - closed: calls are allowed; failure_threshold consecutive failures open it;
+    - open: calls are refused (allow() is False) for recovery_timeout seconds;
+    - half-open: after the timeout one trial call is allowed; its success closes
+      the circuit, its failure opens it again for another recovery_timeout.
+    The breaker only tracks state, callers decide what a failure is and report
+    it with record_success()/record_failure().
+
+    Example:
+        breaker = CircuitBreaker("mcp:docling", failure_threshold=3, recovery_timeout=60)
+        if breaker.allow():
+            ok = await connect()
+            breaker.record_success() if ok else breaker.record_failure()
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, recovery_timeout: float = 60.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Name of the protected dependency (for logs)
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until a trial call is allowed (0 if calls are allowed now)"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be made
+
+        In half-open state only the first caller gets the trial call.
+
+        Returns:
+            True if the call may be made
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Report a successful call: closes the circuit"""
+        if self.opened_at is not None:
+            logger.info(f"[CircuitBreaker] {self.name} recovered, circuit closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Report a failed call: opens the circuit after failure_threshold failures"""
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            logger.warning(
+                f"[CircuitBreaker] {self.name} is down after {self.failures} failure(s), "
+                f"skipping it for {self.recovery_timeout:.0f}s"
+            )
+
+    def cancel_trial(self) -> None:
+        """Give back an allowed call that ended without a result (e.g. it was cancelled)"""
+        self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state"""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in(), 1),
+        }
@@ -0,0 +1,144 @@
+"""
+HTTP Body Compression
+Shared request body encoding between the bot (MCPHubClient) and MCP Hub
+"""
+
+import gzip
+import zlib
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: gzip is always available
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+IDENTITY = "identity"
+
+# Fast levels: request bodies are compressed on the fly for each send
+_GZIP_LEVEL = 5
+_ZSTD_LEVEL = 3
+
+# Output produced per decompression step
+_CHUNK_SIZE = 1024 * 1024
+
+
+class UnsupportedEncodingError(ValueError):
+    """Content-Encoding that this process cannot decode"""
+
+    pass
+
+
+class CorruptBodyError(ValueError):
+    """Body that is not valid data for its Content-Encoding"""
+
+    pass
+
+
+class BodyTooLargeError(ValueError):
+    """Body that decodes to more than the allowed size"""
+
+    pass
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this process can compress and decompress, best first"""
+    return ([ZSTD] if zstandard is not None else []) + [GZIP]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with the given content encoding
+
+    Args:
+        data: Raw body
+        encoding: "zstd", "gzip" or "identity"
+
+    Returns:
+        Encoded body
+
+    Raises:
+        UnsupportedEncodingError: If the encoding is not available
+    """
+    if encoding == IDENTITY:
+        return data
+    if encoding == GZIP:
+        return gzip.compress(data, compresslevel=_GZIP_LEVEL)
+    if encoding == ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str, max_size: Optional[int] = None) -> bytes:
+    """
+    Decode a body sent with the given content encoding
+
+    AICODE-NOTE: Bodies are decoded in bounded steps and rejected as soon as the
+    output passes max_size, so a small gzip/zstd bomb cannot exhaust memory.
+
+    Args:
+        data: Encoded body
+        encoding: Value of the Content-Encoding header
+        max_size: Maximum decoded size in bytes (None = unlimited)
+
+    Returns:
+        Raw body
+
+    Raises:
+        UnsupportedEncodingError: If the encoding is not available
+        CorruptBodyError: If the body is not valid for the encoding
+        BodyTooLargeError: If the decoded body exceeds max_size
+    """
+    encoding = (encoding or IDENTITY).strip().lower()
+    if encoding == IDENTITY:
+        output = data
+    elif encoding == GZIP:
+        output = _gunzip(data, max_size)
+    elif encoding == ZSTD and zstandard is not None:
+        output = _unzstd(data, max_size)
+    else:
+        raise UnsupportedEncodingError(f"Unsupported content encoding: {encoding}")
+    _check_size(len(output), max_size)
+    return output
+
+
+def _check_size(size: int, max_size: Optional[int]) -> None:
+    if max_size is not None and size > max_size:
+        raise BodyTooLargeError(f"Decoded body exceeds {max_size} bytes")
+
+
+def _gunzip(data: bytes, max_size: Optional[int]) -> bytes:
+    """Decode all gzip members of a body (like gzip.decompress) with an output limit"""
+    output = bytearray()
+    try:
+        while data:
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            pending = data
+            while not decoder.eof:
+                chunk = decoder.decompress(pending, _CHUNK_SIZE)
+                pending = decoder.unconsumed_tail
+                if not chunk and not pending and not decoder.eof:
+                    raise CorruptBodyError("Truncated gzip body")
+                output += chunk
+                _check_size(len(output), max_size)
+            data = decoder.unused_data
+    except zlib.error as e:
+        raise CorruptBodyError(f"Invalid gzip body: {e}")
+    return bytes(output)
+
+
+def _unzstd(data: bytes, max_size: Optional[int]) -> bytes:
+    """Decode a zstd body with an output limit"""
+    output = bytearray()
+    try:
+        with zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True) as reader:
+            while True:
+                chunk = reader.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                output += chunk
+                _check_size(len(output), max_size)
+    except zstandard.ZstdError as e:
+        raise CorruptBodyError(f"Invalid zstd body: {e}")
+    return bytes(output)
@@ -0,0 +1,106 @@
+"""
+Keyed Executor
+Runs blocking calls on a bounded thread pool, serialized per key
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class KeyedExecutor:
+    """
+    Bounded thread pool with per-key serialization
+
+    AICODE-NOTE: Calls with the same key (e.g. user ID) run one at a time in
+    submission order, so a storage object never sees concurrent calls; calls
+    with different keys run in parallel up to max_workers threads. A waiting
+    call holds no thread: it waits on the key's asyncio.Lock before it is
+    submitted to the pool. Locks are dropped once no call for the key is pending.
+
+    Example:
+        executor = KeyedExecutor("memory", max_workers=4)
+        result = await executor.run(user_id, storage.store, content="...")
+    """
+
+    def __init__(self, name: str, max_workers: int = 4):
+        """
+        Initialize keyed executor
+
+        Args:
+            name: Executor name (thread name prefix, statistics)
+            max_workers: Maximum number of calls running at the same time
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # key -> [lock, number of calls holding or waiting for it]
+        self._locks: Dict[Hashable, list] = {}
+        # Calls submitted to the pool (running or waiting for a free thread)
+        self._in_pool = 0
+        self.completed = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name
+            )
+        return self._pool
+
+    async def run(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run fn(*args, **kwargs) in the pool after earlier calls with the same key
+
+        Args:
+            key: Serialization key
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn
+        """
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                self._in_pool += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    future = loop.run_in_executor(
+                        self._get_pool(), functools.partial(fn, *args, **kwargs)
+                    )
+                    try:
+                        return await asyncio.shield(future)
+                    except asyncio.CancelledError:
+                        # The thread cannot be interrupted: keep the key busy until it ends
+                        await asyncio.wait([future])
+                        raise
+                finally:
+                    self._in_pool -= 1
+                    self.completed += 1
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._locks.get(key) is entry:
+                del self._locks[key]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the thread pool (it is recreated on next use)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    def stats(self) -> Dict[str, int]:
+        """Get executor statistics"""
+        return {
+            "max_workers": self.max_workers,
+            "in_pool": self._in_pool,
+            "waiting": sum(count for _, count in self._locks.values()) - self._in_pool,
+            "active_keys": len(self._locks),
+            "completed": self.completed,
+        }
@@ -0,0 +1,258 @@
+"""
+LLM Response Cache
+Disk-backed cache of deterministic (temperature 0) LLM responses
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from src.core.metrics import metrics
+
+_LOOKUPS = metrics.counter(
+    "llm_response_cache_lookups_total", "LLM response cache lookups", ("result",)
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses(accessed_at);
+"""
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(temperature: Optional[float]) -> bool:
+    """
+    Check whether a request is deterministic enough to be cached
+
+    Args:
+        temperature: Sampling temperature of the request
+
+    Returns:
+        True for temperature 0 requests
+    """
+    return temperature is not None and float(temperature) == 0.0
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    tools: Optional[List[Dict[str, Any]]] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build the cache key of a request
+
+    Args:
+        provider: Endpoint of the provider (base URL)
+        model: Model name
+        messages: Chat messages
+        tools: Tool definitions
+        params: Remaining generation parameters (temperature, max_tokens, ...)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    return _digest(
+        {
+            "provider": provider,
+            "model": model,
+            "messages": _digest(messages),
+            "tools": _digest(tools or []),
+            "params": params or {},
+        }
+    )
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed LLM response cache with TTL and size bounds
+
+    AICODE-NOTE: Only temperature 0 requests are cached (see is_cacheable):
+    their output depends on the inputs alone, so reprocessing the same content
+    (a re-sent or twice-forwarded message, a repeated mem-agent query) is
+    answered from disk without an LLM call. Entries expire after ttl seconds;
+    when the cache exceeds max_entries or max_bytes, least recently used
+    entries are evicted. Values are JSON chosen by the caller.
+    """
+
+    def __init__(
+        self,
+        db_file: Path,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+        max_bytes: int = 100 * 1024 * 1024,
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            db_file: Path of the SQLite database
+            ttl: Seconds an entry stays valid (0 = no expiry)
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of cached values
+        """
+        self.db_file = Path(db_file)
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by worker threads; sqlite3 calls are serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key (make_cache_key)
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and self.ttl and now - row[1] >= self.ttl:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"[LLMResponseCache] Lookup failed: {e}")
+            row = None
+
+        if row is None:
+            _LOOKUPS.inc("miss")
+            return None
+
+        _LOOKUPS.inc("hit")
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value and evict entries over the bounds
+
+        Database errors are logged and ignored: the cache is an optimization.
+
+        Args:
+            key: Cache key (make_cache_key)
+            value: JSON-serializable value
+        """
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses "
+                        "(key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                        (key, data, size, now, now),
+                    )
+                    if self.ttl:
+                        self._conn.execute(
+                            "DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,)
+                        )
+                    self._evict()
+        except sqlite3.Error as e:
+            logger.warning(f"[LLMResponseCache] Failed to store response: {e}")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries over the bounds (caller holds the lock)"""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at, rowid"
+        ).fetchall()
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+        logger.debug(f"[LLMResponseCache] Evicted {evicted} entries ({count} left)")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit counts"""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": _LOOKUPS.value("hit"),
+            "misses": _LOOKUPS.value("miss"),
+        }
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide response cache
+
+    Returns:
+        LLMResponseCache, or None if LLM_RESPONSE_CACHE_ENABLED is off
+    """
+    global _cache
+    from config.settings import settings
+
+    if not settings.LLM_RESPONSE_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(
+                Path(settings.LLM_RESPONSE_CACHE_PATH),
+                ttl=settings.LLM_RESPONSE_CACHE_TTL,
+                max_entries=settings.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+                max_bytes=settings.LLM_RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+            )
+            logger.info(
+                f"[LLMResponseCache] 💾 Caching temperature 0 responses in {_cache.db_file}"
+            )
+    return _cache
@@ -0,0 +1,239 @@
+"""
+Metrics
+Lightweight in-process counters, gauges and histograms with Prometheus text exposition
+"""
+
+import bisect
+import os
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds (from fast cache hits to slow LLM/indexing calls)
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Default buckets for batch/item sizes
+DEFAULT_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+LabelValues = Tuple[str, ...]
+
+# A collector returns samples of one gauge: [(label values, value), ...]
+GaugeCollector = Callable[[], Iterable[Tuple[LabelValues, float]]]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a Prometheus label set"""
+    parts = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{escaped}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        """
+        Increment the counter
+
+        Args:
+            *labelvalues: Label values in labelnames order
+            amount: Increment (must be non-negative)
+        """
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Current value for a label set"""
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram:
+    """Histogram with fixed buckets and optional labels"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """
+        Record an observation
+
+        Args:
+            value: Observed value
+            *labelvalues: Label values in labelnames order
+        """
+        series = self._values.get(labelvalues)
+        if series is None:
+            series = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        """Number of observations for a label set"""
+        series = self._values.get(labelvalues)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, (bucket_counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are collected lazily at scrape time"""
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        collector: GaugeCollector,
+        labelnames: Sequence[str] = (),
+    ):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._collector = collector
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._collector()
+        ]
+
+
+class MetricsRegistry:
+    """
+    Registry of process metrics
+
+    AICODE-NOTE: Recording is a dict lookup plus a few integer updates and takes
+    no locks, so it is cheap enough for every tool call and HTTP request.
+    Everything expensive (sizes of indexes and storages, RSS) is computed by gauge
+    collectors only when /metrics is scraped.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._get_or_create(name, lambda: Counter(name, description, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram"""
+        return self._get_or_create(
+            name, lambda: Histogram(name, description, labelnames, buckets=buckets)
+        )
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        collector: GaugeCollector,
+        labelnames: Sequence[str] = (),
+    ) -> Gauge:
+        """Register (or replace) a gauge computed by collector at scrape time"""
+        gauge = Gauge(name, description, collector, labelnames)
+        self._metrics[name] = gauge
+        return gauge
+
+    def get(self, name: str) -> Optional[object]:
+        """Get a registered metric by name"""
+        return self._metrics.get(name)
+
+    def _get_or_create(self, name: str, factory: Callable[[], object]):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = factory()
+        return metric
+
+    def render(self) -> str:
+        """
+        Render all metrics in Prometheus text exposition format
+
+        Returns:
+            Metrics text (version 0.0.4)
+        """
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            try:
+                samples = metric.render()
+            except Exception as e:
+                # A failing collector must not break the whole scrape
+                lines.append(f"# {name} collection failed: {type(e).__name__}")
+                continue
+            lines.append(f"# HELP {name} {metric.description}")
+            lines.append(f"# TYPE {name} {metric.metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def process_rss_bytes() -> float:
+    """
+    Resident set size of the current process in bytes
+
+    Reads /proc on Linux; falls back to peak RSS from getrusage elsewhere.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return float(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return float(peak if sys.platform == "darwin" else peak * 1024)
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
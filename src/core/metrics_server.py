@@ -0,0 +1,56 @@
+"""
+Metrics Server
+Serves the in-process metrics registry of the bot over HTTP
+"""
+
+from typing import Any, Optional
+
+from loguru import logger
+
+from src.core.metrics import MetricsRegistry, metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def start_metrics_server(
+    host: str, port: int, registry: MetricsRegistry = metrics
+) -> Optional[Any]:
+    """
+    Start a /metrics endpoint for the current process
+
+    AICODE-NOTE: The MCP Hub serves its own registry on its /metrics route. The
+    bot process records separate metrics (ask time to first visible output, LLM
+    time to first token, llm_gateway_* requests, retries and queue wait), which
+    only this endpoint exposes.
+
+    Args:
+        host: Interface to bind to
+        port: Port to listen on (0 = disabled)
+        registry: Registry to render
+
+    Returns:
+        aiohttp AppRunner (call cleanup() on shutdown), or None if disabled or failed
+    """
+    if not port:
+        return None
+
+    from aiohttp import web
+
+    async def handle_metrics(request: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        logger.warning(f"[MetricsServer] ⚠️ Cannot serve metrics on {host}:{port}: {e}")
+        await runner.cleanup()
+        return None
+
+    logger.info(f"[MetricsServer] 📊 Serving bot metrics on http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,110 @@
+"""
+Single Flight
+Coalesces concurrent identical async calls into one in-flight computation
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+def make_key(operation: str, scope: Any, **arguments: Any) -> str:
+    """
+    Build a normalized coalescing key
+
+    String arguments are whitespace-normalized and lists are kept in order;
+    None arguments are dropped so omitted and explicit defaults match.
+
+    Args:
+        operation: Operation name (e.g. "vector_search")
+        scope: Isolation scope (knowledge base ID, user ID)
+        **arguments: Operation arguments
+
+    Returns:
+        Stable key string
+    """
+
+    def normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, (list, tuple)):
+            return [normalize(item) for item in value]
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items()}
+        return value
+
+    normalized = {name: normalize(value) for name, value in arguments.items() if value is not None}
+    return json.dumps([operation, scope, normalized], sort_keys=True, default=str)
+
+
+class SingleFlight:
+    """
+    Request coalescing for async operations
+
+    AICODE-NOTE: The first caller for a key starts the computation as a task;
+    concurrent callers with the same key await that task instead of starting
+    their own. The key is forgotten as soon as the task finishes, so results are
+    never cached beyond the in-flight window. The task is shielded: a cancelled
+    caller does not cancel the computation other callers are waiting for.
+
+    Example:
+        flight = SingleFlight("vector_search")
+        key = make_key("vector_search", kb_id, query=query, top_k=top_k)
+        results = await flight.do(key, lambda: manager.search(query, top_k))
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize single flight group
+
+        Args:
+            name: Group name used in logs and statistics
+        """
+        self.name = name
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Coalescing key (see make_key)
+            fn: Zero-argument coroutine factory performing the work
+
+        Returns:
+            Result of the shared computation (exceptions are shared too)
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.debug(
+                f"🔗 [{self.name}] Joined in-flight call ({len(self._inflight)} in flight)"
+            )
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda finished: self._forget(key, finished))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: "asyncio.Task[Any]") -> None:
+        """Drop finished task and mark its exception as retrieved"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing statistics"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
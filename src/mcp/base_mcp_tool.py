@@ -6,12 +6,13 @@ as autonomous agent tools.
 """
 
 from abc import abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 
 from loguru import logger
 
 from ..agents.tools.base_tool import BaseTool, ToolContext
-from .client import MCPClient, MCPServerConfig
+from .client import MCPServerConfig
+from .session_pool import MCPServerUnavailable, get_session_pool
 
 
 class BaseMCPTool(BaseTool):
@@ -20,6 +21,11 @@ class BaseMCPTool(BaseTool):
 
     This class wraps an MCP server and exposes its tools as agent tools.
     Subclasses should configure the MCP server and handle tool execution.
+
+    AICODE-NOTE: Calls borrow a connected session from the session pool of the
+    running event loop (see session_pool.py) instead of keeping a private
+    client per tool instance, so tool instances shared by several agents and
+    event loops reuse the same few connections per server.
     """
 
     def __init__(self, timeout: int = 600):
@@ -29,9 +35,7 @@ class BaseMCPTool(BaseTool):
         Args:
             timeout: Timeout in seconds for MCP requests (default: 600 seconds)
         """
-        self.client: Optional[MCPClient] = None
         self.enabled = False
-        self._connected = False
         self.timeout = timeout
 
     @property
@@ -56,22 +60,6 @@ class BaseMCPTool(BaseTool):
         """
         pass
 
-    async def _ensure_connected(self) -> bool:
-        """
-        Ensure MCP client is connected
-
-        Returns:
-            True if connected successfully
-        """
-        if self._connected and self.client and self.client.is_connected:
-            return True
-
-        if not self.client:
-            self.client = MCPClient(self.mcp_server_config, timeout=self.timeout)
-
-        self._connected = await self.client.connect()
-        return self._connected
-
     async def execute(self, params: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
         """
         Execute the MCP tool
@@ -89,21 +77,18 @@ class BaseMCPTool(BaseTool):
                 "error": f"MCP tool {self.name} is disabled. Enable it in configuration.",
             }
 
-        # Ensure connection
-        if not await self._ensure_connected():
-            return {"success": False, "error": f"Failed to connect to MCP server for {self.name}"}
-
-        # Validate that the tool exists in MCP server
-        available_tools = [tool.name for tool in self.client.get_tools()]
-        if self.mcp_tool_name not in available_tools:
-            return {
-                "success": False,
-                "error": f"Tool '{self.mcp_tool_name}' not found in MCP server. Available: {available_tools}",
-            }
-
-        # Call the MCP tool
         try:
-            result = await self.client.call_tool(self.mcp_tool_name, params)
+            async with get_session_pool().session(self.mcp_server_config, self.timeout) as client:
+                # Validate that the tool exists in MCP server
+                available_tools = [tool.name for tool in client.get_tools()]
+                if self.mcp_tool_name not in available_tools:
+                    return {
+                        "success": False,
+                        "error": f"Tool '{self.mcp_tool_name}' not found in MCP server. Available: {available_tools}",
+                    }
+
+                # Call the MCP tool
+                result = await client.call_tool(self.mcp_tool_name, params, timeout=self.timeout)
 
             if result.get("success"):
                 logger.info(f"[{self.name}] ✓ MCP tool executed successfully")
@@ -112,16 +97,13 @@ class BaseMCPTool(BaseTool):
 
             return result
 
+        except MCPServerUnavailable as e:
+            logger.warning(f"[{self.name}] {e}")
+            return {"success": False, "error": f"Failed to connect to MCP server for {self.name}"}
         except Exception as e:
             logger.error(f"[{self.name}] MCP tool execution error: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
-    async def disconnect(self) -> None:
-        """Disconnect from MCP server"""
-        if self.client:
-            await self.client.disconnect()
-            self._connected = False
-
     def enable(self) -> None:
         """Enable this MCP tool"""
         self.enabled = True
@@ -130,19 +112,4 @@ class BaseMCPTool(BaseTool):
     def disable(self) -> None:
         """Disable this MCP tool"""
         self.enabled = False
-        if self.client:
-            # Disconnect when disabled
-            import asyncio
-
-            asyncio.create_task(self.disconnect())
         logger.info(f"[{self.name}] MCP tool disabled")
-
-    def __del__(self):
-        """Cleanup on deletion"""
-        if self.client:
-            try:
-                import asyncio
-
-                asyncio.create_task(self.disconnect())
-            except:
-                pass
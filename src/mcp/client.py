@@ -272,6 +272,21 @@ class MCPClient:
         self.is_connected = False
         logger.info("[MCPClient] Disconnected")
 
+    async def ping(self) -> bool:
+        """
+        Check that the session is still alive
+
+        Returns:
+            True if the server answered the ping
+        """
+        if not self.is_connected or not self._client:
+            return False
+        try:
+            return bool(await self._client.ping())
+        except Exception as e:
+            logger.debug(f"[MCPClient] Ping failed: {e}")
+            return False
+
     async def call_tool(
         self, tool_name: str, arguments: Dict[str, Any], timeout: Optional[float] = None
     ) -> Dict[str, Any]:
@@ -5,7 +5,6 @@ Auto-discovers MCP servers from the registry and creates tools for them.
 Supports both shared and per-user MCP servers.
 """
 
-import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -14,8 +13,9 @@ from loguru import logger
 from config.settings import settings
 
 from ..agents.tools.base_tool import BaseTool, ToolContext
-from .client import MCPClient, MCPServerConfig
-from .registry_client import MCPRegistryClient
+from .client import MCPServerConfig
+from .session_pool import get_session_pool
+from .tools_description import get_all_server_tools, get_mcp_server_configs
 
 
 class DynamicMCPTool(BaseTool):
@@ -23,11 +23,17 @@ class DynamicMCPTool(BaseTool):
     Dynamic MCP tool that wraps a specific tool from an MCP server
 
     This tool is created at runtime based on discovered MCP servers.
-    It connects to the MCP server and forwards tool calls to it.
+    It forwards tool calls to the MCP server over a session borrowed from the
+    session pool of the running event loop.
     """
 
     def __init__(
-        self, tool_name: str, server_name: str, mcp_client: MCPClient, tool_schema: Dict[str, Any]
+        self,
+        tool_name: str,
+        server_name: str,
+        server_config: MCPServerConfig,
+        tool_schema: Dict[str, Any],
+        timeout: Optional[int] = None,
     ):
         """
         Initialize dynamic MCP tool
@@ -35,13 +41,15 @@ class DynamicMCPTool(BaseTool):
         Args:
             tool_name: Name of the tool in the MCP server
             server_name: Name of the MCP server
-            mcp_client: Connected MCP client
+            server_config: Client configuration of the MCP server
             tool_schema: Tool schema from MCP server
+            timeout: Request timeout in seconds (default: MCP_TIMEOUT)
         """
         self._tool_name = f"mcp_{server_name}_{tool_name}"
         self._original_tool_name = tool_name
         self._server_name = server_name
-        self._mcp_client = mcp_client
+        self._server_config = server_config
+        self._timeout = timeout or settings.MCP_TIMEOUT
         self._tool_schema = tool_schema
         self._description = tool_schema.get("description", f"Tool from MCP server {server_name}")
         self._parameters = tool_schema.get(
@@ -73,7 +81,9 @@ class DynamicMCPTool(BaseTool):
         """
         try:
             # Call the MCP server tool
-            result = await self._mcp_client.call_tool(self._original_tool_name, params)
+            result = await get_session_pool().call_tool(
+                self._server_config, self._original_tool_name, params, timeout=self._timeout
+            )
 
             if result.get("success"):
                 return {
@@ -104,9 +114,9 @@ async def discover_and_create_mcp_tools(
 
     This function:
     1. Discovers available MCP servers (shared + per-user if user_id is provided)
-    2. Connects to enabled servers
-    3. Queries each server for available tools
-    4. Creates DynamicMCPTool instances for each tool
+    2. Gets the servers' tools from the process-wide tools cache (listing them
+       concurrently on pooled sessions on miss)
+    3. Creates DynamicMCPTool instances for each tool
 
     Args:
         user_id: Optional user ID for per-user MCP server discovery
@@ -118,42 +128,23 @@ async def discover_and_create_mcp_tools(
     tools = []
 
     try:
-        connected_clients: Dict[str, MCPClient] = {}
+        server_configs = get_mcp_server_configs(user_id, servers_dir)
+        server_tools: Dict[str, List[Dict[str, Any]]] = {}
+        listings = await get_all_server_tools(server_configs, user_id)
+        for server_name, available_tools in listings.items():
+            if available_tools is None:
+                logger.warning(f"[DynamicMCPTools] Failed to connect to MCP server {server_name}")
+            else:
+                server_tools[server_name] = available_tools
 
-        # Docker mode: connect directly to MCP Hub via HTTP/SSE and avoid local registry
-        mcp_hub_url = os.getenv("MCP_HUB_URL")
-        if mcp_hub_url:
-            try:
-                client = MCPClient(
-                    MCPServerConfig(url=mcp_hub_url), timeout=settings.MCP_TIMEOUT
-                )  # fastmcp.Client auto-detects transport from URL
-                if await client.connect():
-                    connected_clients["mcp-hub"] = client
-                else:
-                    logger.warning(
-                        f"[DynamicMCPTools] Failed to connect to MCP Hub at {mcp_hub_url}"
-                    )
-            except Exception as e:
-                logger.error(
-                    f"[DynamicMCPTools] Error connecting to MCP Hub at {mcp_hub_url}: {e}",
-                    exc_info=True,
-                )
-        else:
-            # Standalone mode: discover via local registry
-            registry_client = MCPRegistryClient(servers_dir=servers_dir, user_id=user_id)
-            registry_client.initialize()
-            connected_clients = await registry_client.connect_all_enabled()
-
-        if not connected_clients:
+        if not server_tools:
             logger.info("[DynamicMCPTools] No MCP servers connected")
             return tools
 
-        # For each connected server, discover its tools
-        for server_name, client in connected_clients.items():
+        # For each connected server, create its tools
+        for server_name, available_tools in server_tools.items():
+            config, timeout = server_configs[server_name]
             try:
-                # List available tools from the MCP server
-                available_tools = await client.list_tools()
-
                 if not available_tools:
                     logger.debug(f"[DynamicMCPTools] Server {server_name} has no tools")
                     continue
@@ -171,8 +162,9 @@ async def discover_and_create_mcp_tools(
                         mcp_tool = DynamicMCPTool(
                             tool_name=tool_name,
                             server_name=server_name,
-                            mcp_client=client,
+                            server_config=config,
                             tool_schema=tool_schema,
+                            timeout=timeout,
                         )
                         tools.append(mcp_tool)
                         logger.info(f"[DynamicMCPTools] Created tool: {mcp_tool.name}")
@@ -183,7 +175,7 @@ async def discover_and_create_mcp_tools(
                 logger.error(f"[DynamicMCPTools] Failed to discover tools from {server_name}: {e}")
 
         logger.info(
-            f"[DynamicMCPTools] Created {len(tools)} MCP tools from {len(connected_clients)} servers"
+            f"[DynamicMCPTools] Created {len(tools)} MCP tools from {len(server_tools)} servers"
         )
 
     except Exception as e:
@@ -22,35 +22,57 @@ Default:
 """
 
 import argparse
+import asyncio
+import functools
+import importlib.util
 import json
 import os
 import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from loguru import logger
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 
 try:
     from fastmcp import FastMCP
+    from fastmcp.server.middleware import Middleware, MiddlewareContext
 except ImportError:
     print("Error: fastmcp not installed. Install with: pip install fastmcp")
     sys.exit(1)
 
 # Import logging utilities
+from src.core.compression import (
+    IDENTITY,
+    BodyTooLargeError,
+    CorruptBodyError,
+    UnsupportedEncodingError,
+    decompress,
+)
+from src.core.keyed_executor import KeyedExecutor
 from src.core.log_utils import truncate_for_log
-from src.mcp.docling_integration import ensure_docling_mcp_spec
+from src.core.metrics import metrics, process_rss_bytes
+from src.core.singleflight import SingleFlight, make_key
 
 # Import memory storage components
 from src.mcp.memory.memory_factory import MemoryStorageFactory
 from src.mcp.memory.memory_storage import MemoryStorage
+from src.mcp.memory.storage_cache import UserStorageCache
 
 # Import registry components
 from src.mcp.registry.registry import MCPServerRegistry, MCPServerSpec
 
 # Import vector search components
-from src.mcp.vector_search import VectorSearchManager
+from src.mcp.vector_search import (
+    IndexingJob,
+    IndexingJobQueue,
+    IndexingUploads,
+    VectorIndexGenerations,
+    VectorSearchManager,
+)
+from src.mcp.vector_search.jobs import ProgressCallback
 
 # Configure logger
 log_dir = Path("logs")
@@ -93,15 +115,144 @@ logger.add(
 # Initialize FastMCP server
 mcp = FastMCP("mcp-hub", version="1.0.0")
 
-# Per-user storage instances (user_id -> MemoryStorage)
-_storages: Dict[int, MemoryStorage] = {}
+# ============================================================================
+# Metrics
+# ============================================================================
+# AICODE-NOTE: Every MCP tool call (via middleware) and every HTTP route (via
+# http_route) records a counter and a latency histogram. Sizes of indexes,
+# storages and queues are gauges collected only when /metrics is scraped.
+
+_TOOL_CALLS = metrics.counter("mcp_tool_calls_total", "MCP tool calls", ("tool", "outcome"))
+_TOOL_LATENCY = metrics.histogram("mcp_tool_latency_seconds", "MCP tool call latency", ("tool",))
+_HTTP_REQUESTS = metrics.counter("http_requests_total", "HTTP API requests", ("route", "status"))
+_HTTP_LATENCY = metrics.histogram(
+    "http_request_latency_seconds", "HTTP API request latency", ("route",)
+)
+_STORAGE_EVICTIONS = metrics.counter(
+    "memory_storage_cache_evictions_total", "Memory storages evicted from the per-user cache"
+)
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Count and time every MCP tool call"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool = context.message.name
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call_next(context)
+            outcome = "ok"
+            return result
+        finally:
+            _TOOL_LATENCY.observe(time.perf_counter() - started, tool)
+            _TOOL_CALLS.inc(tool, outcome)
+
+
+mcp.add_middleware(ToolMetricsMiddleware())
+
+
+# Largest decoded request body (MCPHubClient sends batches of at most 4 MiB)
+MAX_DECODED_BODY_SIZE = 64 * 1024 * 1024
+
+# HTTP status for request bodies that cannot be decoded
+_BODY_ERROR_STATUS = {
+    UnsupportedEncodingError: 415,
+    CorruptBodyError: 400,
+    BodyTooLargeError: 413,
+}
+
+
+async def _decode_request_body(request: Request, encoding: str) -> None:
+    """
+    Replace a compressed request body with its decoded bytes
+
+    AICODE-NOTE: Starlette caches the body in request._body, so after this
+    handlers read the decoded payload through the usual request.json().
+    """
+    body = await request.body()
+    request._body = await asyncio.to_thread(decompress, body, encoding, MAX_DECODED_BODY_SIZE)
+    logger.debug(f"📦 Decoded {encoding} request body: {len(body)} -> {len(request._body)} bytes")
+
+
+def http_route(path: str, methods: List[str]):
+    """
+    Register a custom HTTP route with request metrics
+
+    Same as mcp.custom_route; the route label is the path template (not the
+    concrete path) to keep metric cardinality bounded. Request bodies sent with
+    Content-Encoding gzip/zstd are decoded before the handler runs.
+    """
+    route = f"{','.join(methods)} {path}"
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def timed_handler(request: Request):
+            started = time.perf_counter()
+            status = 500
+            try:
+                encoding = request.headers.get("content-encoding")
+                if encoding and encoding.lower() != IDENTITY:
+                    try:
+                        await _decode_request_body(request, encoding)
+                    except tuple(_BODY_ERROR_STATUS) as e:
+                        status = _BODY_ERROR_STATUS[type(e)]
+                        logger.warning(f"⚠️ Rejected {encoding} request body on {route}: {e}")
+                        return JSONResponse({"success": False, "error": str(e)}, status_code=status)
+                response = await handler(request)
+                status = response.status_code
+                return response
+            finally:
+                _HTTP_LATENCY.observe(time.perf_counter() - started, route)
+                _HTTP_REQUESTS.inc(route, str(status))
+
+        return mcp.custom_route(path, methods=methods)(timed_handler)
+
+    return decorator
+
+
+# Per-user storage instances (user_id -> MemoryStorage), bounded LRU/TTL cache
+# (created lazily with configured limits)
+_storages: Optional[UserStorageCache] = None
+
+# Background close of evicted storages (kept referenced until done)
+_storage_close_tasks: Set["asyncio.Task[Any]"] = set()
+
+# Executor for memory storage calls (created lazily)
+# AICODE-NOTE: Storage calls do file I/O and, for vector/mem-agent storages, model
+# inference. They run on a bounded thread pool, serialized per user (storages are
+# not thread-safe), so one user's slow store no longer stalls other tools and
+# different users' memory operations run in parallel.
+_memory_executor: Optional[KeyedExecutor] = None
 
 # Global registry instance
 _registry: Optional[MCPServerRegistry] = None
 
 # Global vector search manager (shared across users)
-# Per-knowledge base vector search managers (kb_id -> VectorSearchManager)
-_vector_search_managers: Dict[str, VectorSearchManager] = {}
+# Per-knowledge base index generations (kb_id -> published VectorSearchManager)
+# AICODE-NOTE: Searches read the published generation without locking; indexing
+# routes stage changes on a clone under a per-KB writer lock and swap it in.
+_vector_indexes = VectorIndexGenerations()
+
+# Background indexing job queue (created lazily, started with the server)
+_indexing_jobs: Optional[IndexingJobQueue] = None
+
+# Multi-part indexing requests waiting for their remaining parts
+_indexing_uploads = IndexingUploads()
+
+# Last use time of each KB index (kb_id -> unix time), persisted for warmup
+_RECENT_KBS_PATH = Path("data/vector_recent_kbs.json")
+_kb_last_used: Dict[str, float] = {}
+
+# Background warmup progress (reported in /health)
+_warmup_status: Dict[str, Any] = {"state": "pending", "kbs": []}
+
+# Request coalescing for identical concurrent calls
+# AICODE-NOTE: Concurrent duplicates (same operation, KB/user and normalized
+# arguments) await one in-flight computation instead of repeating embedder,
+# index and LLM work. Duplicate indexing requests are coalesced by the job queue.
+_search_flights = SingleFlight("vector_search")
+_memory_retrieve_flights = SingleFlight("retrieve_memory")
 
 # Vector search availability cache
 _vector_search_available: Optional[bool] = None
@@ -110,6 +261,14 @@ _vector_search_available: Optional[bool] = None
 _memory_tools_available: Optional[bool] = None
 
 
+def _is_installed(module_name: str) -> bool:
+    """Check whether a module can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 def check_memory_tools_availability() -> bool:
     """
     Check if memory tools are available based on configuration.
@@ -187,14 +346,13 @@ def check_vector_search_availability() -> bool:
         # Check 2: Embedding provider dependencies
         if embedding_provider == "sentence_transformers":
             # Local provider - requires sentence-transformers package
-            try:
-                import sentence_transformers  # noqa: F401
-
+            # AICODE-NOTE: find_spec checks installation without importing torch
+            if _is_installed("sentence_transformers"):
                 logger.info("  ✓ sentence-transformers is installed")
-            except ImportError as e:
+            else:
                 logger.warning(
-                    f"⚠️  Vector search uses sentence_transformers provider but package is missing: {e}. "
-                    f"Install dependencies: pip install sentence-transformers"
+                    "⚠️  Vector search uses sentence_transformers provider but package is missing. "
+                    "Install dependencies: pip install sentence-transformers"
                 )
                 _vector_search_available = False
                 return False
@@ -215,20 +373,16 @@ def check_vector_search_availability() -> bool:
         faiss_available = False
         qdrant_available = False
 
-        try:
-            import faiss  # noqa: F401
-
+        if _is_installed("faiss"):
             faiss_available = True
             logger.info("  ✓ faiss-cpu is installed")
-        except ImportError:
+        else:
             logger.debug("  ✗ faiss-cpu not available")
 
-        try:
-            import qdrant_client  # noqa: F401
-
+        if _is_installed("qdrant_client"):
             qdrant_available = True
             logger.info("  ✓ qdrant-client is installed")
-        except ImportError:
+        else:
             logger.debug("  ✗ qdrant-client not available")
 
         if not (faiss_available or qdrant_available):
@@ -309,6 +463,7 @@ def get_registry() -> MCPServerRegistry:
         # Ensure Docling MCP server specification is up to date before discovery
         try:
             from config import settings as app_settings
+            from src.mcp.docling_integration import ensure_docling_mcp_spec
 
             ensure_docling_mcp_spec(app_settings.MEDIA_PROCESSING_DOCLING, servers_dir=servers_dir)
         except Exception as e:
@@ -319,9 +474,100 @@ def get_registry() -> MCPServerRegistry:
         logger.info(
             f"📋 Registry initialized: {len(_registry.get_all_servers())} servers discovered"
         )
+    else:
+        # Cheap: picks up edited/added/removed config files, parsing only changed ones
+        _registry.discover_servers()
     return _registry
 
 
+def _get_setting(name: str, default: int) -> int:
+    """Read a numeric setting from config, falling back to default"""
+    try:
+        from config import settings as app_settings
+
+        return int(getattr(app_settings, name, default))
+    except Exception:
+        return default
+
+
+def get_memory_executor() -> KeyedExecutor:
+    """Get or create the per-user memory executor"""
+    global _memory_executor
+
+    if _memory_executor is None:
+        _memory_executor = KeyedExecutor(
+            "memory", max_workers=_get_setting("MCP_HUB_MEMORY_WORKERS", 4)
+        )
+    return _memory_executor
+
+
+def get_storage_cache() -> UserStorageCache:
+    """Get or create the per-user storage cache"""
+    global _storages
+
+    if _storages is None:
+        _storages = UserStorageCache(
+            max_size=_get_setting("MCP_HUB_MEMORY_CACHE_SIZE", 100),
+            ttl_seconds=_get_setting("MCP_HUB_MEMORY_CACHE_TTL", 3600),
+        )
+    return _storages
+
+
+async def call_storage(user_id: int, method: str, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Call a storage method for a user on the memory executor
+
+    Loading (or reloading) the storage and the call itself run in one executor
+    job under the user's key, so an eviction can never close the storage
+    between the two. Storages evicted by this call are closed in the background,
+    each serialized with its own user's calls.
+
+    Args:
+        user_id: User ID
+        method: Storage method name (store, retrieve, list_categories, ...)
+        **kwargs: Method arguments
+
+    Returns:
+        Method result
+    """
+    executor = get_memory_executor()
+
+    def run() -> Dict[str, Any]:
+        try:
+            storage = get_storage(user_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to get storage for user {user_id}: {e}", exc_info=True)
+            raise
+        return getattr(storage, method)(**kwargs)
+
+    try:
+        return await executor.run(user_id, run)
+    finally:
+        _close_evicted_storages()
+
+
+def _close_evicted_storages() -> None:
+    """Evict over-capacity and idle storages and close them in the background"""
+    executor = get_memory_executor()
+    cache = get_storage_cache()
+    evicted = cache.collect_evictions()
+    if evicted:
+        _STORAGE_EVICTIONS.inc(amount=len(evicted))
+    for evicted_user_id in evicted:
+        task = asyncio.ensure_future(
+            executor.run(evicted_user_id, cache.close_evicted, evicted_user_id)
+        )
+        _storage_close_tasks.add(task)
+        task.add_done_callback(_storage_close_tasks.discard)
+
+
+async def _sweep_idle_storages(interval: float = 60.0) -> None:
+    """Periodically evict idle storages even when no memory tool is called"""
+    while True:
+        await asyncio.sleep(interval)
+        _close_evicted_storages()
+
+
 def get_storage(user_id: int) -> MemoryStorage:
     """
     Get or create memory storage for a specific user
@@ -333,9 +579,11 @@ def get_storage(user_id: int) -> MemoryStorage:
         Initialized memory storage (type depends on MEM_AGENT_STORAGE_TYPE env var)
     """
     # Return existing storage if already initialized
-    if user_id in _storages:
+    cache = get_storage_cache()
+    storage = cache.get(user_id)
+    if storage is not None:
         logger.debug(f"♻️ Reusing existing storage for user {user_id}")
-        return _storages[user_id]
+        return storage
 
     # Create new storage for this user
     logger.info("=" * 60)
@@ -386,21 +634,21 @@ def get_storage(user_id: int) -> MemoryStorage:
                 backend=backend,
             )
             logger.info(f"✅ Successfully created {storage_type} storage for user {user_id}")
-            _storages[user_id] = storage
+            cache.put(user_id, storage)
             logger.info("=" * 60)
             return storage
         except Exception as e:
             logger.error(f"❌ Failed to create {storage_type} storage: {e}", exc_info=True)
             logger.warning("⚠️  Falling back to JSON storage")
             storage = MemoryStorage(data_dir)
-            _storages[user_id] = storage
+            cache.put(user_id, storage)
             logger.info("=" * 60)
             return storage
     else:
         # Use legacy wrapper for JSON (default)
         logger.info("🔧 Creating JSON storage (default)...")
         storage = MemoryStorage(data_dir)
-        _storages[user_id] = storage
+        cache.put(user_id, storage)
         logger.info(f"✅ JSON storage created successfully for user {user_id}")
         logger.info("=" * 60)
         return storage
@@ -411,7 +659,7 @@ def get_storage(user_id: int) -> MemoryStorage:
 # ============================================================================
 
 
-@mcp.custom_route("/health", methods=["GET"])
+@http_route("/health", methods=["GET"])
 async def health_check(request):
     """Health check endpoint for container orchestration
 
@@ -441,15 +689,26 @@ async def health_check(request):
                         "POST /vector/documents",
                         "DELETE /vector/documents",
                         "PUT /vector/documents",
+                        "GET /vector/jobs",
+                        "GET /vector/jobs/{job_id}",
                     ],
-                    "description": "Vector search indexing operations via HTTP API",
+                    "description": "Vector search indexing operations via HTTP API (background jobs)",
+                    "indexing_jobs": get_indexing_jobs().stats(),
                 },
                 "registry": {
                     "servers_total": len(registry.get_all_servers()),
                     "servers_enabled": len(registry.get_enabled_servers()),
                 },
                 "storage": {
-                    "active_users": len(_storages),
+                    "active_users": len(get_storage_cache()),
+                    "cache": get_storage_cache().stats(),
+                    "executor": get_memory_executor().stats(),
+                    "retrieval_cache": _retrieval_cache_summary(),
+                },
+                "warmup": _warmup_status,
+                "coalescing": {
+                    "vector_search": _search_flights.stats(),
+                    "retrieve_memory": _memory_retrieve_flights.stats(),
                 },
                 # Ready once registry initialized and discovered
                 "ready": True,
@@ -469,6 +728,137 @@ async def health_check(request):
         )
 
 
+# ============================================================================
+# Metrics Endpoint
+# ============================================================================
+
+
+def _collect_vector_index_documents():
+    for kb_id in _vector_indexes.kb_ids():
+        yield (kb_id,), _vector_indexes.get(kb_id).document_count
+
+
+def _collect_vector_index_chunks():
+    for kb_id in _vector_indexes.kb_ids():
+        yield (kb_id,), _vector_indexes.get(kb_id).chunk_count
+
+
+def _collect_memory_counts():
+    for user_id, storage in get_storage_cache().items():
+        # mem-agent (files) and SQLite storages keep no in-memory index and are skipped
+        count = storage.memory_count()
+        if count is not None:
+            yield (str(user_id), type(storage).__name__), count
+
+
+def _retrieval_cache_stats():
+    for user_id, storage in get_storage_cache().items():
+        get_stats = getattr(storage, "retrieval_cache_stats", None)
+        stats = get_stats() if get_stats else None
+        if stats is not None:
+            yield user_id, stats
+
+
+def _collect_retrieval_cache(field: str):
+    def collect():
+        for user_id, stats in _retrieval_cache_stats():
+            yield (str(user_id),), stats[field]
+
+    return collect
+
+
+def _retrieval_cache_summary() -> Dict[str, Any]:
+    """Retrieval cache totals over loaded storages that cache retrievals"""
+    hits = misses = saved = 0
+    for _, stats in _retrieval_cache_stats():
+        hits += stats["hits"]
+        misses += stats["misses"]
+        saved += stats["saved_llm_calls"]
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        "saved_llm_calls": saved,
+    }
+
+
+def _collect_indexing_jobs():
+    if _indexing_jobs is not None:
+        for status, count in _indexing_jobs.stats()["jobs"].items():
+            yield (status,), count
+
+
+def _collect_coalesced_calls():
+    for flight in (_search_flights, _memory_retrieve_flights):
+        yield (flight.name,), flight.coalesced
+
+
+metrics.gauge(
+    "vector_index_documents",
+    "Documents in the published vector index",
+    _collect_vector_index_documents,
+    ("kb_id",),
+)
+metrics.gauge(
+    "vector_index_chunks",
+    "Unique chunks in the published vector index",
+    _collect_vector_index_chunks,
+    ("kb_id",),
+)
+metrics.gauge(
+    "memory_storage_users",
+    "Users with a loaded memory storage",
+    lambda: [((), len(get_storage_cache()))],
+)
+metrics.gauge(
+    "memory_storage_memories",
+    "Memories per loaded user storage",
+    _collect_memory_counts,
+    ("user_id", "storage"),
+)
+metrics.gauge(
+    "memory_retrieval_cache_hits",
+    "Retrievals answered from the per-user retrieval cache",
+    _collect_retrieval_cache("hits"),
+    ("user_id",),
+)
+metrics.gauge(
+    "memory_retrieval_cache_misses",
+    "Retrievals that ran the memory agent",
+    _collect_retrieval_cache("misses"),
+    ("user_id",),
+)
+metrics.gauge(
+    "memory_retrieval_cache_saved_llm_calls",
+    "LLM calls saved by retrieval cache hits",
+    _collect_retrieval_cache("saved_llm_calls"),
+    ("user_id",),
+)
+metrics.gauge(
+    "vector_indexing_jobs", "Indexing jobs by status", _collect_indexing_jobs, ("status",)
+)
+metrics.gauge(
+    "request_coalesced_calls",
+    "Calls served by joining an identical in-flight call",
+    _collect_coalesced_calls,
+    ("operation",),
+)
+metrics.gauge(
+    "process_resident_memory_bytes",
+    "Resident memory size in bytes",
+    lambda: [((), process_rss_bytes())],
+)
+
+
+@http_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request):
+    """Prometheus metrics endpoint (text exposition format)"""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ============================================================================
 # Memory Tools - Built-in MCP Tools
 # ============================================================================
@@ -482,7 +872,7 @@ async def health_check(request):
 
 
 @mcp.tool()
-def store_memory(
+async def store_memory(
     content: str,
     user_id: int,
     category: str = "general",
@@ -517,14 +907,13 @@ def store_memory(
     logger.debug(f"  Tags: {tags}")
 
     try:
-        storage = get_storage(user_id)
-    except Exception as e:
-        logger.error(f"❌ Failed to get storage for user {user_id}: {e}", exc_info=True)
-        return {"success": False, "error": str(e)}
-
-    try:
-        result = storage.store(
-            content=content, category=category, tags=tags or [], metadata=metadata or {}
+        result = await call_storage(
+            user_id,
+            "store",
+            content=content,
+            category=category,
+            tags=tags or [],
+            metadata=metadata or {},
         )
         logger.info(f"✅ Store successful: ID={result.get('id', 'N/A')}")
         logger.debug(
@@ -537,7 +926,7 @@ def store_memory(
 
 
 @mcp.tool()
-def retrieve_memory(
+async def retrieve_memory(
     user_id: int, query: str = None, category: str = None, tags: list[str] = None, limit: int = 10
 ) -> dict:
     """
@@ -568,13 +957,16 @@ def retrieve_memory(
     logger.info(f"  Limit: {limit}")
 
     try:
-        storage = get_storage(user_id)
-    except Exception as e:
-        logger.error(f"❌ Failed to get storage for user {user_id}: {e}", exc_info=True)
-        return {"success": False, "error": str(e)}
-
-    try:
-        result = storage.retrieve(query=query, category=category, tags=tags, limit=limit)
+        # Run retrieval on the memory executor; identical concurrent calls share one run
+        key = make_key(
+            "retrieve_memory", user_id, query=query, category=category, tags=tags, limit=limit
+        )
+        result = await _memory_retrieve_flights.do(
+            key,
+            lambda: call_storage(
+                user_id, "retrieve", query=query, category=category, tags=tags, limit=limit
+            ),
+        )
         count = result.get("count", 0)
         logger.info(f"✅ Retrieve successful: found {count} memories")
         if count > 0:
@@ -586,7 +978,7 @@ def retrieve_memory(
 
 
 @mcp.tool()
-def list_categories(user_id: int) -> dict:
+async def list_categories(user_id: int) -> dict:
     """
     List all memory categories with counts
 
@@ -607,16 +999,10 @@ def list_categories(user_id: int) -> dict:
     logger.info(f"  User: {user_id}")
 
     try:
-        storage = get_storage(user_id)
-    except Exception as e:
-        logger.error(f"❌ Failed to get storage for user {user_id}: {e}", exc_info=True)
-        return {"success": False, "error": str(e)}
-
-    try:
-        result = storage.list_categories()
+        result = await call_storage(user_id, "list_categories")
         categories = result.get("categories", {})
         logger.info(f"✅ Categories retrieved: {len(categories)} categories")
-        logger.debug(f"  Categories: {list(categories.keys())}")
+        logger.debug(f"  Categories: {categories}")
         return result
     except Exception as e:
         logger.error(f"❌ Error listing categories: {e}", exc_info=True)
@@ -645,11 +1031,25 @@ async def get_vector_search_manager(kb_id: str = "default") -> Optional[VectorSe
     Returns:
         VectorSearchManager instance or None if disabled/failed
     """
-    global _vector_search_managers
+    _kb_last_used[kb_id] = time.time()
+    manager = _vector_indexes.get(kb_id)
+    if manager:
+        return manager
+
+    # Serialize initialization with writers so the index is loaded only once
+    async with _vector_indexes.write_lock(kb_id):
+        manager = _vector_indexes.get(kb_id)
+        if manager:
+            return manager
+        manager = await _create_vector_search_manager(kb_id)
 
-    if kb_id in _vector_search_managers:
-        return _vector_search_managers[kb_id]
+    if manager:
+        await asyncio.to_thread(_save_recent_kbs)
+    return manager
 
+
+async def _create_vector_search_manager(kb_id: str) -> Optional[VectorSearchManager]:
+    """Create, initialize and publish the first index generation for a knowledge base"""
     # Get settings from config.yaml or environment
     try:
         from config import settings as app_settings
@@ -671,21 +1071,17 @@ async def get_vector_search_manager(kb_id: str = "default") -> Optional[VectorSe
         index_path = Path(f"data/vector_index{kb_suffix}")
         logger.info(f"📁 Vector Index Path: {index_path.absolute()}")
 
-        # Initialize vector search manager
-        from src.mcp.vector_search import VectorSearchFactory
-
-        manager = VectorSearchFactory.create_from_settings(
-            settings=app_settings, index_path=index_path, kb_id=kb_id
+        # AICODE-NOTE: Creating the manager probes the embedding dimension (which
+        # loads a local model) and initialize() reads the index files; both block,
+        # so they run in a worker thread and /health keeps answering meanwhile.
+        manager = await asyncio.to_thread(
+            _build_vector_search_manager, app_settings, index_path, kb_id
         )
 
         if manager:
-            # AICODE-NOTE: Initialize the vector search manager
-            # This loads existing index or prepares for indexing
-            logger.info("🔄 Initializing vector search manager...")
-            await manager.initialize()
             logger.info(f"✅ Vector search manager initialized successfully for KB: {kb_id}")
             logger.info("=" * 60)
-            _vector_search_managers[kb_id] = manager
+            _vector_indexes.publish(kb_id, manager)
         else:
             logger.warning(f"⚠️  Vector search manager could not be initialized for KB: {kb_id}")
             logger.info("=" * 60)
@@ -698,9 +1094,98 @@ async def get_vector_search_manager(kb_id: str = "default") -> Optional[VectorSe
         return None
 
 
+def _build_vector_search_manager(
+    app_settings: Any, index_path: Path, kb_id: str
+) -> Optional[VectorSearchManager]:
+    """Create and initialize a vector search manager (blocking, runs in a worker thread)"""
+    from src.mcp.vector_search import VectorSearchFactory
+
+    manager = VectorSearchFactory.create_from_settings(
+        settings=app_settings, index_path=index_path, kb_id=kb_id
+    )
+    if manager:
+        # Loads the existing index or prepares for indexing; the stores' I/O is synchronous
+        logger.info("🔄 Initializing vector search manager...")
+        asyncio.run(manager.initialize())
+    return manager
+
+
+def _load_recent_kbs() -> Dict[str, float]:
+    """Load last use times of KB indexes from the previous runs"""
+    try:
+        with open(_RECENT_KBS_PATH, "r", encoding="utf-8") as f:
+            return {str(kb_id): float(used) for kb_id, used in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to load recently used KBs: {e}")
+        return {}
+
+
+def _save_recent_kbs() -> None:
+    """Persist last use times of KB indexes (merged with previous runs)"""
+    try:
+        recent = _load_recent_kbs()
+        recent.update(_kb_last_used)
+        _RECENT_KBS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _RECENT_KBS_PATH.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(recent, f)
+        tmp_path.replace(_RECENT_KBS_PATH)
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to save recently used KBs: {e}")
+
+
+async def warmup_vector_search() -> None:
+    """
+    Preload the embedder and the most recently used KB indexes
+
+    AICODE-NOTE: Runs in the background after the server starts listening, so
+    /health is ready immediately and the first search does not pay model and
+    index load time. Without usage history the "default" KB is warmed up.
+    """
+    try:
+        from config import settings as app_settings
+
+        enabled = app_settings.MCP_HUB_WARMUP_ENABLED
+        kb_limit = app_settings.MCP_HUB_WARMUP_KB_LIMIT
+    except Exception:
+        enabled, kb_limit = True, 3
+
+    if not enabled or not check_vector_search_availability():
+        _warmup_status["state"] = "skipped"
+        return
+
+    recent = _load_recent_kbs()
+    kb_ids = sorted(recent, key=recent.get, reverse=True)[: max(0, kb_limit)] or ["default"]
+
+    _warmup_status["state"] = "running"
+    started = time.perf_counter()
+    logger.info(f"🔥 Warming up vector search for KBs: {kb_ids}")
+
+    for kb_id in kb_ids:
+        try:
+            manager = await get_vector_search_manager(kb_id=kb_id)
+            if manager:
+                await manager.embedder.warmup()
+                _warmup_status["kbs"].append(kb_id)
+        except Exception as e:
+            logger.warning(f"⚠️  Warmup failed for KB {kb_id}: {e}")
+
+    _warmup_status["state"] = "done"
+    _warmup_status["duration_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(f"🔥 Warmup complete in {_warmup_status['duration_seconds']}s")
+
+
 @mcp.tool()
 async def vector_search(
-    query: str, top_k: int = 5, user_id: int = None, kb_id: str = "default"
+    query: str,
+    top_k: int = 5,
+    user_id: int = None,
+    kb_id: str = "default",
+    fields: list[str] = None,
+    snippet_length: int = None,
+    group_by: str = None,
 ) -> dict:
     """
     Perform semantic vector search in knowledge base
@@ -710,6 +1195,10 @@ async def vector_search(
         top_k: Number of results to return (default: 5)
         user_id: User ID (optional, for logging purposes)
         kb_id: Knowledge base ID for isolation (default: "default")
+        fields: Only return these result fields, e.g. ["file_path"] (score is always kept)
+        snippet_length: Return a highlighted snippet of at most this many characters
+            instead of the full chunk text
+        group_by: "document" to return one result per document with its best score
 
     Returns:
         Search results with relevant documents
@@ -735,8 +1224,26 @@ async def vector_search(
         if not manager:
             return {"success": False, "error": "Vector search is not enabled or not configured"}
 
-        # Call the async search method
-        results = await manager.search(query=query, top_k=top_k)
+        # Call the async search method (identical concurrent searches share one call)
+        key = make_key(
+            "vector_search",
+            kb_id,
+            query=query,
+            top_k=top_k,
+            fields=fields,
+            snippet_length=snippet_length,
+            group_by=group_by,
+        )
+        results = await _search_flights.do(
+            key,
+            lambda: manager.search(
+                query=query,
+                top_k=top_k,
+                fields=fields,
+                snippet_length=snippet_length,
+                group_by=group_by,
+            ),
+        )
 
         logger.info(f"✅ Vector search successful: found {len(results)} results")
 
@@ -769,89 +1276,108 @@ async def vector_search(
 # ============================================================================
 # Vector Search HTTP API - For bot/docker integration without MCP client
 # ============================================================================
+# AICODE-NOTE: Indexing routes only validate and enqueue a background job and
+# reply immediately with its job_id. Jobs run in IndexingJobQueue (one at a time
+# per KB, bounded across KBs) and are persisted in data/vector_jobs/ so they
+# resume after a hub restart. Clients poll GET /vector/jobs/{job_id}
+# (optionally long-polling with ?wait=<seconds>).
+# Large requests arrive in parts carrying "upload": {"id", "part", "parts"}; the
+# parts are assembled and queued as one job when the last one arrives.
+
+# Operation name -> payload key holding the items the job processes
+_INDEXING_OPERATIONS = {
+    "reindex": "documents",
+    "add": "documents",
+    "update": "documents",
+    "delete": "document_ids",
+}
+
+
+def get_indexing_jobs() -> IndexingJobQueue:
+    """Get or create the background indexing job queue"""
+    global _indexing_jobs
+
+    if _indexing_jobs is None:
+        _indexing_jobs = IndexingJobQueue(
+            handler=_run_indexing_job,
+            jobs_dir=Path("data/vector_jobs"),
+            max_workers=_get_setting("VECTOR_INDEXING_MAX_WORKERS", 2),
+        )
+    return _indexing_jobs
+
+
+def _merge_indexing_stats(total: Dict[str, Any], batch: Dict[str, Any]) -> None:
+    """Accumulate statistics of one batch into the job statistics"""
+    for key, value in batch.items():
+        if key == "success":
+            total[key] = total.get(key, True) and bool(value)
+        elif isinstance(value, bool) or not isinstance(value, (int, float, list)):
+            total[key] = value
+        elif isinstance(value, list):
+            total[key] = total.get(key, []) + value
+        else:
+            total[key] = total.get(key, 0) + value
 
 
-@mcp.custom_route("/vector/reindex", methods=["POST"])
-async def http_reindex_vector(request: Request):
-    """HTTP: Reindex knowledge base for vector search"""
-    try:
-        payload = await request.json()
-        documents = payload.get("documents")
-        force = payload.get("force", False)
-        user_id = payload.get("user_id")
-        kb_id = payload.get("kb_id", "default")
+async def _run_indexing_job(job: IndexingJob, report_progress: ProgressCallback) -> Dict[str, Any]:
+    """
+    Execute an indexing job on a staged index generation
 
-        # Check availability first
-        if not check_vector_search_availability():
-            return JSONResponse(
-                {
-                    "success": False,
-                    "error": "Vector search is not available. Check config (VECTOR_SEARCH_ENABLED) and dependencies.",
-                },
-                status_code=503,
-            )
+    Items are processed in batches so progress can be reported; the new
+    generation is published only after the whole job succeeds.
 
-        logger.info("🔄 HTTP REINDEX_VECTOR called")
-        logger.info(f"  Force: {force}")
-        logger.info(f"  Documents count: {len(documents) if documents else 0}")
-        logger.info(f"  KB ID: {kb_id}")
-        if user_id:
-            logger.info(f"  User: {user_id}")
+    Args:
+        job: Indexing job to execute
+        report_progress: Callback receiving the number of processed items
 
-        manager = await get_vector_search_manager(kb_id=kb_id)
+    Returns:
+        Merged operation statistics
+    """
+    manager = await get_vector_search_manager(kb_id=job.kb_id)
+    if not manager:
+        raise RuntimeError("Vector search is not enabled or not configured")
 
-        if not manager:
-            return JSONResponse(
-                {"success": False, "error": "Vector search is not enabled or not configured"},
-                status_code=503,
-            )
+    items = job.payload.get(_INDEXING_OPERATIONS[job.operation]) or []
+    batch_size = max(1, _get_setting("VECTOR_INDEXING_BATCH_SIZE", 100))
+    stats: Dict[str, Any] = {}
 
-        # Clear index if force=True
-        if force:
+    async with _vector_indexes.write(job.kb_id) as staged:
+        if job.operation == "reindex" and job.payload.get("force"):
             logger.info("🗑️  Force=True: Clearing existing index")
-            await manager.clear_index()
+            await staged.clear_index()
 
-        # If documents provided, add them
-        if documents:
-            stats = await manager.add_documents(documents=documents)
+        operation = {
+            "reindex": staged.add_documents,
+            "add": staged.add_documents,
+            "update": staged.update_documents,
+            "delete": staged.delete_documents,
+        }[job.operation]
 
-            logger.info(
-                f"✅ Reindexing complete: "
-                f"{stats['documents_processed']} documents processed, "
-                f"{stats['chunks_created']} chunks created"
-            )
+        for start in range(0, len(items), batch_size):
+            batch = items[start : start + batch_size]
+            _merge_indexing_stats(stats, await operation(batch))
+            report_progress(start + len(batch))
 
-            return JSONResponse(
-                {
-                    "success": True,
-                    "stats": stats,
-                    "message": f"Successfully indexed {stats['documents_processed']} documents",
-                }
-            )
-        else:
-            logger.info("✅ Index cleared (no documents provided)")
-            return JSONResponse(
-                {
-                    "success": True,
-                    "stats": {"documents_processed": 0, "chunks_created": 0, "errors": []},
-                    "message": "Index cleared",
-                }
-            )
+    logger.info(f"✅ Indexing job {job.job_id} ({job.operation}) stats: {truncate_for_log(stats)}")
+    return stats
 
-    except Exception as e:
-        logger.error(f"❌ Error in HTTP reindexing: {e}", exc_info=True)
-        return JSONResponse(
-            {"success": False, "error": str(e), "error_type": type(e).__name__},
-            status_code=500,
-        )
 
+async def _enqueue_indexing_job(request: Request, operation: str, log_title: str) -> JSONResponse:
+    """
+    Validate an indexing request and queue it as a background job
 
-@mcp.custom_route("/vector/documents", methods=["POST"])
-async def http_add_vector_documents(request: Request):
-    """HTTP: Add or update documents to vector search index"""
+    Args:
+        request: HTTP request with JSON payload
+        operation: Indexing operation name
+        log_title: Title logged for the call
+
+    Returns:
+        JSON response with job_id
+    """
     try:
         payload = await request.json()
-        documents = payload.get("documents", [])
+        items_key = _INDEXING_OPERATIONS[operation]
+        items = payload.get(items_key) or []
         user_id = payload.get("user_id")
         kb_id = payload.get("kb_id", "default")
 
@@ -865,151 +1391,137 @@ async def http_add_vector_documents(request: Request):
                 status_code=503,
             )
 
-        logger.info("➕ HTTP ADD_VECTOR_DOCUMENTS called")
-        logger.info(f"  Documents count: {len(documents)}")
+        job_payload = {}
+        if operation == "reindex":
+            job_payload["force"] = payload.get("force", False)
+
+        upload = payload.get("upload")
+        if upload:
+            items = _indexing_uploads.add_part(
+                upload_id=str(upload["id"]),
+                part=int(upload["part"]),
+                parts=int(upload["parts"]),
+                items=items,
+                request_key=(kb_id, operation, user_id, job_payload.get("force")),
+            )
+            if items is None:
+                return JSONResponse(
+                    {
+                        "success": True,
+                        "upload_id": upload["id"],
+                        "status": "receiving",
+                        "message": f"Received part {upload['part']} of upload {upload['id']}",
+                    }
+                )
+
+        logger.info(f"{log_title} called")
+        if operation == "reindex":
+            logger.info(f"  Force: {payload.get('force', False)}")
+        logger.info(f"  {items_key}: {len(items)}")
         logger.info(f"  KB ID: {kb_id}")
         if user_id:
             logger.info(f"  User: {user_id}")
 
-        manager = await get_vector_search_manager(kb_id=kb_id)
-
-        if not manager:
-            return JSONResponse(
-                {"success": False, "error": "Vector search is not enabled or not configured"},
-                status_code=503,
-            )
-
-        # Call the async add_documents method
-        stats = await manager.add_documents(documents=documents)
+        job_payload[items_key] = items
 
-        logger.info(
-            f"✅ Add documents complete: "
-            f"{stats['documents_processed']} documents processed, "
-            f"{stats['chunks_created']} chunks created"
+        job = await get_indexing_jobs().submit(
+            kb_id=kb_id,
+            operation=operation,
+            payload=job_payload,
+            items_total=len(items),
+            user_id=user_id,
         )
 
         return JSONResponse(
             {
                 "success": True,
-                "stats": stats,
-                "message": f"Successfully added {stats['documents_processed']} documents",
+                "job_id": job.job_id,
+                "status": job.status.value,
+                "message": f"Indexing job queued: {operation} of {len(items)} items",
             }
         )
 
+    except ValueError as e:
+        logger.warning(f"⚠️  Invalid indexing request ({operation}): {e}")
+        return JSONResponse(
+            {"success": False, "error": str(e), "error_type": type(e).__name__},
+            status_code=400,
+        )
     except Exception as e:
-        logger.error(f"❌ Error in HTTP adding documents: {e}", exc_info=True)
+        logger.error(f"❌ Error queueing indexing job ({operation}): {e}", exc_info=True)
         return JSONResponse(
             {"success": False, "error": str(e), "error_type": type(e).__name__},
             status_code=500,
         )
 
 
-@mcp.custom_route("/vector/documents", methods=["DELETE"])
-async def http_delete_vector_documents(request: Request):
-    """HTTP: Delete documents from vector search index"""
-    try:
-        payload = await request.json()
-        document_ids = payload.get("document_ids", [])
-        user_id = payload.get("user_id")
-        kb_id = payload.get("kb_id", "default")
+@http_route("/vector/reindex", methods=["POST"])
+async def http_reindex_vector(request: Request):
+    """HTTP: Queue reindexing of knowledge base for vector search"""
+    return await _enqueue_indexing_job(request, "reindex", "🔄 HTTP REINDEX_VECTOR")
 
-        # Check availability first
-        if not check_vector_search_availability():
-            return JSONResponse(
-                {
-                    "success": False,
-                    "error": "Vector search is not available. Check config (VECTOR_SEARCH_ENABLED) and dependencies.",
-                },
-                status_code=503,
-            )
 
-        logger.info("🗑️  HTTP DELETE_VECTOR_DOCUMENTS called")
-        logger.info(f"  Document IDs: {len(document_ids)}")
-        logger.info(f"  KB ID: {kb_id}")
-        if user_id:
-            logger.info(f"  User: {user_id}")
+@http_route("/vector/documents", methods=["POST"])
+async def http_add_vector_documents(request: Request):
+    """HTTP: Queue adding documents to vector search index"""
+    return await _enqueue_indexing_job(request, "add", "➕ HTTP ADD_VECTOR_DOCUMENTS")
 
-        manager = await get_vector_search_manager(kb_id=kb_id)
 
-        if not manager:
-            return JSONResponse(
-                {"success": False, "error": "Vector search is not enabled or not configured"},
-                status_code=503,
-            )
+@http_route("/vector/documents", methods=["DELETE"])
+async def http_delete_vector_documents(request: Request):
+    """HTTP: Queue deleting documents from vector search index"""
+    return await _enqueue_indexing_job(request, "delete", "🗑️  HTTP DELETE_VECTOR_DOCUMENTS")
+
 
-        # Call the async delete_documents method
-        stats = await manager.delete_documents(document_ids=document_ids)
+@http_route("/vector/documents", methods=["PUT"])
+async def http_update_vector_documents(request: Request):
+    """HTTP: Queue updating documents in vector search index"""
+    return await _enqueue_indexing_job(request, "update", "🔄 HTTP UPDATE_VECTOR_DOCUMENTS")
 
-        logger.info(f"✅ Delete documents complete: {stats['documents_deleted']} documents deleted")
 
+@http_route("/vector/jobs", methods=["GET"])
+async def http_list_vector_jobs(request: Request):
+    """HTTP: List indexing jobs (optionally filtered by ?kb_id=)"""
+    try:
+        kb_id = request.query_params.get("kb_id")
+        jobs = get_indexing_jobs().list_jobs(kb_id=kb_id)
         return JSONResponse(
-            {
-                "success": True,
-                "stats": stats,
-                "message": f"Successfully deleted {stats['documents_deleted']} documents",
-            }
+            {"success": True, "jobs": [job.to_dict() for job in jobs], "total": len(jobs)}
         )
-
     except Exception as e:
-        logger.error(f"❌ Error in HTTP deleting documents: {e}", exc_info=True)
+        logger.error(f"❌ Error listing indexing jobs: {e}", exc_info=True)
         return JSONResponse(
             {"success": False, "error": str(e), "error_type": type(e).__name__},
             status_code=500,
         )
 
 
-@mcp.custom_route("/vector/documents", methods=["PUT"])
-async def http_update_vector_documents(request: Request):
-    """HTTP: Update documents in vector search index"""
-    try:
-        payload = await request.json()
-        documents = payload.get("documents", [])
-        user_id = payload.get("user_id")
-        kb_id = payload.get("kb_id", "default")
-
-        # Check availability first
-        if not check_vector_search_availability():
-            return JSONResponse(
-                {
-                    "success": False,
-                    "error": "Vector search is not available. Check config (VECTOR_SEARCH_ENABLED) and dependencies.",
-                },
-                status_code=503,
-            )
+@http_route("/vector/jobs/{job_id}", methods=["GET"])
+async def http_get_vector_job(request: Request):
+    """HTTP: Get indexing job status and progress
 
-        logger.info("🔄 HTTP UPDATE_VECTOR_DOCUMENTS called")
-        logger.info(f"  Documents count: {len(documents)}")
-        logger.info(f"  KB ID: {kb_id}")
-        if user_id:
-            logger.info(f"  User: {user_id}")
+    Query parameter ``wait`` (seconds) holds the request until the job finishes
+    or the timeout expires.
+    """
+    try:
+        job_id = request.path_params["job_id"]
+        wait = request.query_params.get("wait")
+        jobs = get_indexing_jobs()
 
-        manager = await get_vector_search_manager(kb_id=kb_id)
+        if wait:
+            job = await jobs.wait(job_id, timeout=float(wait))
+        else:
+            job = jobs.get(job_id)
 
-        if not manager:
+        if job is None:
             return JSONResponse(
-                {"success": False, "error": "Vector search is not enabled or not configured"},
-                status_code=503,
+                {"success": False, "error": f"Indexing job '{job_id}' not found"},
+                status_code=404,
             )
 
-        # Call the async update_documents method
-        stats = await manager.update_documents(documents=documents)
-
-        logger.info(
-            f"✅ Update documents complete: "
-            f"{stats['documents_updated']} documents updated, "
-            f"{stats['chunks_created']} chunks created"
-        )
-
-        return JSONResponse(
-            {
-                "success": True,
-                "stats": stats,
-                "message": f"Successfully updated {stats['documents_updated']} documents",
-            }
-        )
-
+        return JSONResponse({"success": True, "job": job.to_dict()})
     except Exception as e:
-        logger.error(f"❌ Error in HTTP updating documents: {e}", exc_info=True)
+        logger.error(f"❌ Error getting indexing job: {e}", exc_info=True)
         return JSONResponse(
             {"success": False, "error": str(e), "error_type": type(e).__name__},
             status_code=500,
@@ -1021,7 +1533,7 @@ async def http_update_vector_documents(request: Request):
 # ============================================================================
 
 
-@mcp.custom_route("/registry/servers", methods=["GET"])
+@http_route("/registry/servers", methods=["GET"])
 async def http_list_servers(request: Request):
     """HTTP: List all registered MCP servers"""
     try:
@@ -1050,7 +1562,7 @@ async def http_list_servers(request: Request):
         return JSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
-@mcp.custom_route("/registry/servers", methods=["POST"])
+@http_route("/registry/servers", methods=["POST"])
 async def http_register_server(request: Request):
     """HTTP: Register a new MCP server from JSON body"""
     try:
@@ -1091,7 +1603,7 @@ async def http_register_server(request: Request):
         return JSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
-@mcp.custom_route("/registry/servers/{name}", methods=["GET"])
+@http_route("/registry/servers/{name}", methods=["GET"])
 async def http_get_server(request: Request):
     """HTTP: Get a specific MCP server details"""
     try:
@@ -1119,7 +1631,7 @@ async def http_get_server(request: Request):
         return JSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
-@mcp.custom_route("/registry/servers/{name}/enable", methods=["POST"])
+@http_route("/registry/servers/{name}/enable", methods=["POST"])
 async def http_enable_server(request: Request):
     """HTTP: Enable a server by name"""
     try:
@@ -1133,7 +1645,7 @@ async def http_enable_server(request: Request):
         return JSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
-@mcp.custom_route("/registry/servers/{name}/disable", methods=["POST"])
+@http_route("/registry/servers/{name}/disable", methods=["POST"])
 async def http_disable_server(request: Request):
     """HTTP: Disable a server by name"""
     try:
@@ -1147,7 +1659,7 @@ async def http_disable_server(request: Request):
         return JSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
-@mcp.custom_route("/registry/servers/{name}", methods=["DELETE"])
+@http_route("/registry/servers/{name}", methods=["DELETE"])
 async def http_remove_server(request: Request):
     """HTTP: Remove a server by name"""
     try:
@@ -1166,7 +1678,7 @@ async def http_remove_server(request: Request):
 # ============================================================================
 
 
-@mcp.custom_route("/config/client/{client_type}", methods=["GET"])
+@http_route("/config/client/{client_type}", methods=["GET"])
 async def http_get_client_config(request: Request):
     """
     HTTP: Get client configuration for a specific client type
@@ -1312,6 +1824,24 @@ def _generate_client_configs(host: str, port: int) -> None:
 # ============================================================================
 
 
+async def _run_server(host: str, port: int) -> None:
+    """Start background services and serve MCP over SSE"""
+    # Resume indexing jobs interrupted by a previous shutdown
+    get_indexing_jobs().start()
+    # Warm up in the background; the server starts listening right away
+    warmup_task = asyncio.create_task(warmup_vector_search())
+    sweep_task = asyncio.create_task(_sweep_idle_storages())
+    try:
+        await mcp.run_async(transport="sse", host=host, port=port)
+    finally:
+        warmup_task.cancel()
+        sweep_task.cancel()
+        _save_recent_kbs()
+        get_memory_executor().shutdown(wait=True)
+        # Flush every loaded storage before exit
+        get_storage_cache().close_all()
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -1399,7 +1929,8 @@ def main():
         logger.info(f"🏥 Health check: http://{args.host}:{args.port}/health")
         logger.info(f"📋 Registry API: http://{args.host}:{args.port}/registry/servers")
         logger.info(f"🔍 Vector Search API: http://{args.host}:{args.port}/vector/")
-        mcp.run(transport="sse", host=args.host, port=args.port)
+        logger.info(f"📈 Metrics: http://{args.host}:{args.port}/metrics")
+        asyncio.run(_run_server(args.host, args.port))
     except KeyboardInterrupt:
         logger.info("⏹️  Server stopped by user")
     except Exception as e:
@@ -17,6 +17,7 @@ Use Cases:
 Architecture (SOLID principles):
   - BaseMemoryStorage: Abstract interface for all storage implementations
   - JsonMemoryStorage: Simple JSON-based storage with substring search
+  - SqliteMemoryStorage: SQLite storage with FTS5 full-text search for large memories
   - VectorBasedMemoryStorage: AI-powered storage with semantic search using embeddings
   - MemAgentStorage: LLM-based agent for intelligent memory management (Obsidian-style)
   - MemoryStorageFactory: Factory for creating appropriate storage instances
@@ -24,6 +25,7 @@ Architecture (SOLID principles):
 
 Storage Types:
   - "json": Fast, lightweight, no ML dependencies (default)
+  - "sqlite": Transactional SQLite + FTS5, scales to tens of thousands of memories
   - "vector": Semantic search using embeddings, requires transformers/sentence-transformers
   - "mem-agent": LLM-based intelligent memory with Obsidian-style markdown
 
@@ -40,17 +42,34 @@ Installation:
 from .memory_base import BaseMemoryStorage
 from .memory_factory import MemoryStorageFactory, create_memory_storage
 from .memory_json_storage import JsonMemoryStorage
-from .memory_mem_agent_storage import MemAgentStorage
+from .memory_sqlite_storage import SqliteMemoryStorage
 
 # Legacy compatibility
 from .memory_storage import MemoryStorage
-from .memory_vector_storage import VectorBasedMemoryStorage
+
+# AICODE-NOTE: Heavy implementations (numpy embeddings, mem-agent LLM client) are
+# imported on first attribute access so importing this package stays cheap.
+_LAZY_EXPORTS = {
+    "VectorBasedMemoryStorage": ".memory_vector_storage",
+    "MemAgentStorage": ".memory_mem_agent_storage",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # Abstract interface
     "BaseMemoryStorage",
     # Concrete implementations
     "JsonMemoryStorage",
+    "SqliteMemoryStorage",
     "VectorBasedMemoryStorage",
     "MemAgentStorage",
     # Factory
@@ -9,6 +9,7 @@ from loguru import logger
 
 from src.core.log_utils import truncate_for_log
 from src.mcp.memory.mem_agent_impl.engine import execute_sandboxed_code
+from src.mcp.memory.mem_agent_impl.sandbox_pool import get_sandbox_pool
 
 # Configure logging for mem-agent
 log_dir = Path("logs")
@@ -79,6 +80,8 @@ class Agent:
 
         # Set the maximum number of tool turns
         self.max_tool_turns = max_tool_turns
+        # Model calls made by chat() so far (callers diff it to cost a request)
+        self.model_calls = 0
         logger.info(f"🔧 Max tool turns: {max_tool_turns}")
 
         # Set model: use provided model, or fallback to MEM_AGENT_MODEL
@@ -119,6 +122,9 @@ class Agent:
         self.memory_path = os.path.abspath(self.memory_path)
         logger.info(f"  Absolute memory path: {self.memory_path}")
 
+        # Start sandbox workers now so their imports overlap the first model call
+        get_sandbox_pool()
+
         logger.info("")
         logger.info("✅ MEM-AGENT INITIALIZED SUCCESSFULLY")
         logger.info("=" * 80)
@@ -335,6 +341,7 @@ class Agent:
 
             # Get the response from the agent using this instance's clients
             logger.info(f"🧠 Getting model response (model={self.model})")
+            self.model_calls += 1
             response = get_model_response(
                 messages=self.messages,
                 model=self.model,  # Pass the model if specified
@@ -394,6 +401,7 @@ class Agent:
             )
 
             logger.debug(f"    Getting model response for tool turn {tool_turn}...")
+            self.model_calls += 1
             response = get_model_response(
                 messages=self.messages,
                 model=self.model,  # Pass the model if specified
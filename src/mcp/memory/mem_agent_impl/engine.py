@@ -46,6 +46,17 @@ if not loguru_logger._core.handlers:
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)  # or DEBUG for more verbosity
 
+# Number of file operations blocked by the path restriction in this process.
+# Pooled sandbox workers compare it before and after a run to detect violations.
+violation_count = 0
+
+
+def _deny(message: str) -> PermissionError:
+    """Count a sandbox violation and build the error to raise"""
+    global violation_count
+    violation_count += 1
+    return PermissionError(message)
+
 
 def _run_user_code(
     code: str,
@@ -77,7 +88,7 @@ def _run_user_code(
                 path = file if isinstance(file, str) else getattr(file, "name", str(file))
                 full_path = os.path.abspath(path if path is not None else "")
                 if not full_path.startswith(allowed):
-                    raise PermissionError(f"Access to '{full_path}' is denied by sandbox.")
+                    raise _deny(f"Access to '{full_path}' is denied by sandbox.")
                 return orig_open(file, *args, **kwargs)
 
             builtins.open = secure_open
@@ -89,7 +100,7 @@ def _run_user_code(
             def secure_remove(path, *args, **kwargs):
                 full_path = os.path.abspath(path)
                 if not full_path.startswith(allowed):
-                    raise PermissionError(f"Removal of '{full_path}' is denied by sandbox.")
+                    raise _deny(f"Removal of '{full_path}' is denied by sandbox.")
                 return orig_remove(path, *args, **kwargs)
 
             os.remove = secure_remove
@@ -100,9 +111,7 @@ def _run_user_code(
                 full_src = os.path.abspath(src)
                 full_dst = os.path.abspath(dst)
                 if not full_src.startswith(allowed) or not full_dst.startswith(allowed):
-                    raise PermissionError(
-                        "Rename operation outside allowed path is denied by sandbox."
-                    )
+                    raise _deny("Rename operation outside allowed path is denied by sandbox.")
                 return orig_rename(src, dst, *args, **kwargs)
 
             os.rename = secure_rename
@@ -289,6 +298,14 @@ def execute_sandboxed_code(
         "log": log,
     }
 
+    # Warm worker processes when pooling is enabled (see sandbox_pool.py)
+    from src.mcp.memory.mem_agent_impl.sandbox_pool import get_sandbox_pool
+
+    pool = get_sandbox_pool()
+    if pool is not None:
+        loguru_logger.debug(f"Running sandboxed code on worker pool with timeout={timeout}s")
+        return pool.execute(params, timeout)
+
     env = os.environ.copy()
     env["SANDBOX_PARAMS"] = base64.b64encode(pickle.dumps(params)).decode()
 
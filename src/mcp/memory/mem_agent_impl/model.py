@@ -8,8 +8,10 @@ from config.settings import (
     MEM_AGENT_BASE_URL,
     MEM_AGENT_MODEL,
     MEM_AGENT_OPENAI_API_KEY,
+    MEM_AGENT_TEMPERATURE,
     OPENROUTER_API_KEY,
 )
+from src.core.llm_response_cache import get_llm_response_cache, is_cacheable, make_cache_key
 from src.core.log_utils import truncate_for_log
 from src.mcp.memory.mem_agent_impl.schemas import ChatMessage, Role
 
@@ -50,6 +52,7 @@ def get_model_response(
     system_prompt: Optional[str] = None,
     model: str = MEM_AGENT_MODEL,
     client: Optional[OpenAI] = None,
+    temperature: Optional[float] = MEM_AGENT_TEMPERATURE,
 ) -> Union[str, BaseModel]:
     """
     Get a response from a model using OpenAI-compatible endpoint.
@@ -61,6 +64,8 @@ def get_model_response(
         model: The model to use.
         schema: A Pydantic BaseModel for structured output (optional).
         client: Optional OpenAI client to use. If None, uses the global client.
+        temperature: Sampling temperature (None = endpoint default). Temperature 0
+            responses are reused from the LLM response cache when it is enabled.
 
     Returns:
         A string response from the model if schema is None, otherwise a BaseModel object.
@@ -94,11 +99,22 @@ def get_model_response(
     logger.debug(f"  Total message characters: {total_chars}")
     logger.debug("=" * 60)
 
+    params = {} if temperature is None else {"temperature": temperature}
+    cache = get_llm_response_cache() if is_cacheable(temperature) else None
+    cache_key = None
+    if cache is not None:
+        cache_key = make_cache_key(str(client.base_url), model, messages, params=params)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"💾 Model response served from cache: {len(cached)} chars")
+            return cached
+
     try:
         logger.info("📤 Sending request to model...")
         completion = client.chat.completions.create(
             model=model,
             messages=messages,
+            **params,
             # stop=["</reply>", "</python>"]
         )
 
@@ -106,6 +122,8 @@ def get_model_response(
         logger.info(f"✅ Model response received: {len(response_content)} chars")
         logger.debug(f"  Response preview: {response_content[:50]}...")
 
+        if cache_key is not None and response_content is not None:
+            cache.set(cache_key, response_content)
         return response_content
 
     except Exception as e:
@@ -0,0 +1,459 @@
+"""
+Sandbox Worker Pool
+
+Pre-started Python processes that execute mem-agent code blocks.
+"""
+
+import atexit
+import builtins
+import importlib
+import os
+import pickle
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import SANDBOX_MAX_EXECUTIONS, SANDBOX_POOL_SIZE
+from src.mcp.memory.mem_agent_impl import engine
+
+TOOLS_MODULE = "src.mcp.memory.mem_agent_impl.tools"
+
+# Time a fresh worker gets to import its preload modules
+_STARTUP_TIMEOUT = 60.0
+
+_HEADER = struct.Struct("!I")
+
+
+class SandboxWorkerError(Exception):
+    """Worker process died or broke the pipe protocol"""
+
+
+class _Timeout(Exception):
+    """Worker did not answer before the deadline"""
+
+
+def _write_frame(stream, obj: Any) -> None:
+    payload = pickle.dumps(obj)
+    stream.write(_HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def _read_frame(stream) -> Any:
+    """Blocking read of one frame (worker side); None on EOF"""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    (size,) = _HEADER.unpack(header)
+    payload = stream.read(size)
+    if len(payload) < size:
+        return None
+    return pickle.loads(payload)
+
+
+class _SandboxWorker:
+    """Parent-side handle of one worker process"""
+
+    def __init__(self, preload: Tuple[str, ...]):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", __name__, *preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+        )
+        self.executions = 0
+        self.ready = False
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        fd = self.process.stdout.fileno()
+        chunks = []
+        while size > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise _Timeout()
+            chunk = os.read(fd, size)
+            if not chunk:
+                raise SandboxWorkerError(
+                    f"Sandbox worker exited unexpectedly (code {self.process.wait()})"
+                )
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def _receive(self, deadline: float) -> Any:
+        (size,) = _HEADER.unpack(self._read_exact(_HEADER.size, deadline))
+        return pickle.loads(self._read_exact(size, deadline))
+
+    def wait_ready(self) -> None:
+        """Wait until the preload imports are done (raises SandboxWorkerError)"""
+        if not self.ready:
+            try:
+                self._receive(time.monotonic() + _STARTUP_TIMEOUT)
+            except _Timeout:
+                self.process.kill()
+                raise SandboxWorkerError(
+                    f"Sandbox worker failed to start within {_STARTUP_TIMEOUT:g} seconds"
+                )
+            self.ready = True
+
+    def run(self, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one job and wait for its reply (raises _Timeout)"""
+        try:
+            _write_frame(self.process.stdin, params)
+        except (BrokenPipeError, OSError) as e:
+            raise SandboxWorkerError(f"Sandbox worker pipe closed: {e}")
+        self.executions += 1
+        return self._receive(time.monotonic() + timeout)
+
+    def stop(self) -> None:
+        """Close the pipe and kill the process if it does not exit promptly"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+        finally:
+            self.process.stdout.close()
+
+
+class SandboxPool:
+    """
+    Pool of pre-started sandbox worker processes
+
+    AICODE-NOTE: Starting a "python -m" interpreter and importing the tools module
+    dominated every code block the mem-agent executed. Workers are started ahead
+    of use and run jobs one at a time: the job (the same params the one-shot
+    subprocess got) goes over stdin as a length-prefixed pickle, the reply comes
+    back over a dup of the original stdout (the worker points fd 1 at /dev/null,
+    so print() in user code cannot corrupt the protocol).
+
+    Isolation: a worker only ever runs code for one allowed_path (one user's
+    memory). Fresh workers are shared; the first job binds a worker to its
+    allowed_path and it returns to that path's idle list. When all size workers
+    are taken, the least recently used idle worker of another path is replaced.
+    After each run the worker restores builtins, os patches, blacklisted
+    attributes and cwd, then compares os.environ, sys.path, the number of live
+    threads, sys.modules and every module's globals with a snapshot taken before
+    the run; if user code changed anything else (e.g. patched os.path or a tools
+    function, set an environment variable or started a thread, which would keep
+    running with the real open/os.remove) the worker is replaced. Workers are
+    also replaced after max_executions runs, after a path violation, and on
+    timeout (killed like the one-shot subprocess). A replacement is started
+    immediately so the next job finds a warm worker. POSIX only (select() on pipes).
+
+    Not detected (and carried over to the next run of the same allowed_path):
+    in-place mutation of module-level containers and objects other than
+    os.environ and sys.path (a dict or list in the tools module, class
+    attributes), child processes started by user code, and process-level state
+    such as signal handlers, resource limits or open file descriptors.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_executions: int = 100,
+        preload: Tuple[str, ...] = (TOOLS_MODULE,),
+    ):
+        """
+        Initialize sandbox pool
+
+        Args:
+            size: Number of worker processes
+            max_executions: Runs after which a worker is replaced
+            preload: Modules each worker imports before accepting jobs
+        """
+        self.size = max(1, size)
+        self.max_executions = max(1, max_executions)
+        self.preload = tuple(preload)
+        self._cond = threading.Condition()
+        # Workers that never ran a job (usable for any allowed_path)
+        self._fresh: List[_SandboxWorker] = []
+        # allowed_path -> idle workers bound to it (least recently used path first)
+        self._idle: "OrderedDict[Optional[str], List[_SandboxWorker]]" = OrderedDict()
+        self._busy = 0
+        self._closed = False
+        self.executions = 0
+        self.recycled = 0
+        self.timeouts = 0
+        self.violations = 0
+        self.state_changes = 0
+
+    def _total(self) -> int:
+        return len(self._fresh) + sum(map(len, self._idle.values())) + self._busy
+
+    def start(self) -> "SandboxPool":
+        """Start all workers (they import their preload modules in the background)"""
+        with self._cond:
+            while self._total() < self.size:
+                self._fresh.append(_SandboxWorker(self.preload))
+        logger.info(f"🧰 Sandbox pool started with {self.size} workers")
+        return self
+
+    def _take_idle(self, key: Optional[str]) -> Optional[_SandboxWorker]:
+        """Pop a live idle worker of a path, or a fresh one (caller holds the lock)"""
+        for workers in (self._idle.get(key), self._fresh):
+            while workers:
+                worker = workers.pop()
+                if worker.alive():
+                    return worker
+                worker.stop()
+        if key in self._idle and not self._idle[key]:
+            del self._idle[key]
+        return None
+
+    def _acquire(self, key: Optional[str]) -> _SandboxWorker:
+        evicted = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise SandboxWorkerError("Sandbox pool is shut down")
+                worker = self._take_idle(key)
+                if worker is not None:
+                    self._busy += 1
+                    return worker
+                if self._total() >= self.size:
+                    # Replace the least recently used idle worker of another path
+                    for other, workers in self._idle.items():
+                        if workers:
+                            evicted = workers.pop(0)
+                            if not workers:
+                                del self._idle[other]
+                            break
+                if self._total() < self.size:
+                    self._busy += 1
+                    break
+                self._cond.wait()
+        if evicted is not None:
+            evicted.stop()
+        return _SandboxWorker(self.preload)
+
+    def _release(self, worker: _SandboxWorker, key: Optional[str], recycle: bool) -> None:
+        if recycle:
+            worker.stop()
+            self.recycled += 1
+        with self._cond:
+            self._busy -= 1
+            self.executions += 1
+            if self._closed:
+                if not recycle:
+                    worker.stop()
+            elif recycle:
+                self._fresh.append(_SandboxWorker(self.preload))
+            else:
+                self._idle.setdefault(key, []).append(worker)
+                self._idle.move_to_end(key)
+            self._cond.notify()
+
+    def execute(self, params: Dict[str, Any], timeout: float) -> Tuple[Optional[dict], str]:
+        """
+        Execute code on a pooled worker
+
+        Args:
+            params: Sandbox parameters (code, allowed_path, blacklist, ...)
+            timeout: Maximum execution time in seconds
+
+        Returns:
+            (locals, error message) like execute_sandboxed_code
+        """
+        key = params.get("allowed_path")
+        worker = self._acquire(key)
+        reply = None
+        try:
+            worker.wait_ready()
+            reply = worker.run(params, timeout)
+        except _Timeout:
+            self.timeouts += 1
+            logger.error(f"⏱️ Sandboxed code exceeded time limit of {timeout} seconds; killing")
+            worker.process.kill()
+            return None, f"TimeoutError: Code execution exceeded {timeout} seconds."
+        except SandboxWorkerError as e:
+            logger.error(f"❌ {e}")
+            return None, str(e)
+        finally:
+            recycle = (
+                reply is None
+                or reply["violation"]
+                or reply["state_changed"] is not None
+                or not worker.alive()
+                or worker.executions >= self.max_executions
+            )
+            self._release(worker, key, recycle)
+
+        if reply["violation"]:
+            self.violations += 1
+        if reply["state_changed"] is not None:
+            self.state_changes += 1
+            logger.info(
+                f"🧰 Sandbox code changed interpreter state ({reply['state_changed']}); "
+                "worker replaced"
+            )
+        local_vars, error_msg = reply["result"]
+        if error_msg:
+            logger.warning(f"⚠️ Sandbox execution completed with error: {error_msg}")
+        return local_vars, error_msg or ""
+
+    def shutdown(self) -> None:
+        """Stop all idle workers; busy ones are stopped when their job ends"""
+        with self._cond:
+            self._closed = True
+            workers = self._fresh + [w for idle in self._idle.values() for w in idle]
+            self._fresh, self._idle = [], OrderedDict()
+            self._cond.notify_all()
+        for worker in workers:
+            worker.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Get pool statistics"""
+        with self._cond:
+            return {
+                "size": self.size,
+                "idle": len(self._fresh) + sum(map(len, self._idle.values())),
+                "busy": self._busy,
+                "executions": self.executions,
+                "recycled": self.recycled,
+                "timeouts": self.timeouts,
+                "violations": self.violations,
+                "state_changes": self.state_changes,
+            }
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> Optional[SandboxPool]:
+    """
+    Get the process-wide sandbox pool, starting it on first use
+
+    Returns:
+        Pool, or None if pooling is disabled (MEM_AGENT_SANDBOX_POOL_SIZE=0) or
+        unsupported on this platform
+    """
+    global _pool
+    if SANDBOX_POOL_SIZE <= 0 or os.name != "posix":
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = SandboxPool(SANDBOX_POOL_SIZE, SANDBOX_MAX_EXECUTIONS).start()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+class _RestoreState:
+    """Snapshot of the interpreter state a sandbox run patches (worker side)"""
+
+    def __init__(self, blacklist: List[str]):
+        self.builtins = dict(builtins.__dict__)
+        self.os_funcs = (os.remove, os.rename)
+        self.cwd = os.getcwd()
+        self.attributes = []
+        for name in blacklist:
+            if "." in name:
+                mod_name, attr_name = name.split(".", 1)
+                try:
+                    module = importlib.import_module(mod_name)
+                except ImportError:
+                    continue
+                if hasattr(module, attr_name):
+                    self.attributes.append((module, attr_name, getattr(module, attr_name)))
+        # Compared after restore() (see changed_state)
+        self.environ = dict(os.environ)
+        self.path = list(sys.path)
+        self.threads = threading.active_count()
+        self.modules = dict(sys.modules)
+        self.namespaces = {
+            name: dict(module.__dict__)
+            for name, module in self.modules.items()
+            if isinstance(getattr(module, "__dict__", None), dict)
+        }
+
+    def restore(self) -> None:
+        for name in set(builtins.__dict__) - set(self.builtins):
+            del builtins.__dict__[name]
+        builtins.__dict__.update(self.builtins)
+        os.remove, os.rename = self.os_funcs
+        for module, attr_name, value in self.attributes:
+            setattr(module, attr_name, value)
+        os.chdir(self.cwd)
+
+    def changed_state(self) -> Optional[str]:
+        """What differs from the snapshot after restore() (module name, ...), if anything"""
+        if threading.active_count() > self.threads:
+            return "threads"
+        if os.environ != self.environ:
+            return "os.environ"
+        if sys.path != self.path:
+            return "sys.path"
+        if sys.modules.keys() != self.modules.keys():
+            return "sys.modules"
+        for name, module in self.modules.items():
+            if sys.modules[name] is not module:
+                return name
+            namespace = self.namespaces.get(name)
+            if namespace is None:
+                continue
+            current = module.__dict__
+            if current.keys() != namespace.keys() or any(
+                current[attr] is not value for attr, value in namespace.items()
+            ):
+                return name
+        return None
+
+
+def _worker_main(preload: List[str]) -> None:
+    """Worker process loop: run jobs from stdin until EOF"""
+    proto_in = os.fdopen(os.dup(0), "rb")
+    proto_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    for module_name in preload:
+        importlib.import_module(module_name)
+    _write_frame(proto_out, {"ready": True})
+
+    while True:
+        params = _read_frame(proto_in)
+        if params is None:
+            return
+        violations = engine.violation_count
+        state = _RestoreState(params.get("blacklist", []))
+        try:
+            result = engine._run_user_code(
+                params["code"],
+                params.get("allow_installs", False),
+                params.get("allowed_path"),
+                params.get("blacklist", []),
+                params.get("available_functions", {}),
+                params.get("log", False),
+            )
+        finally:
+            state.restore()
+        reply = {
+            "result": result,
+            "violation": engine.violation_count > violations,
+            "state_changed": state.changed_state(),
+        }
+        try:
+            _write_frame(proto_out, reply)
+        except pickle.PicklingError as e:
+            reply["result"] = (None, f"Failed to encode sandbox output: {e}")
+            _write_frame(proto_out, reply)
+
+
+if __name__ == "__main__":
+    _worker_main(sys.argv[1:])
@@ -56,6 +56,34 @@ class BaseMemoryStorage(ABC):
         """
         pass
 
+    def store_many(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store several memories at once
+
+        The default implementation calls store() for each item; storages that
+        can batch work (e.g. embeddings) override it.
+
+        Args:
+            items: Dicts with "content" and optional "category", "metadata", "tags"
+
+        Returns:
+            Result with the list of memory IDs
+        """
+        memory_ids = []
+        for item in items:
+            result = self.store(
+                content=item["content"],
+                category=item.get("category", "general"),
+                metadata=item.get("metadata"),
+                tags=item.get("tags"),
+            )
+            memory_ids.append(result.get("memory_id"))
+        return {
+            "success": True,
+            "memory_ids": memory_ids,
+            "message": f"Stored {len(memory_ids)} memories",
+        }
+
     @abstractmethod
     def retrieve(
         self,
@@ -141,6 +169,31 @@ class BaseMemoryStorage(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """
+        Flush pending writes and release resources (files, connections)
+
+        Storages without such resources keep the default no-op.
+        """
+
+    def retrieval_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get statistics of the retrieval result cache
+
+        Returns:
+            Cache statistics, or None for storages that do not cache retrievals
+        """
+        return None
+
+    def memory_count(self) -> Optional[int]:
+        """
+        Get the number of memories held in memory (cheap enough for every metrics scrape)
+
+        Returns:
+            Number of memories, or None for storages that keep no in-memory index
+        """
+        return None
+
     def _create_memory_entry(
         self, memory_id: int, content: str, category: str, metadata: Dict, tags: List[str]
     ) -> Dict[str, Any]:
@@ -5,15 +5,15 @@ Factory for creating appropriate memory storage instances based on configuration
 Follows the Factory Pattern and Dependency Inversion Principle.
 """
 
+import importlib
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Type, Union
 
 from loguru import logger
 
 from .memory_base import BaseMemoryStorage
 from .memory_json_storage import JsonMemoryStorage
-from .memory_mem_agent_storage import MemAgentStorage
-from .memory_vector_storage import VectorBasedMemoryStorage
+from .memory_sqlite_storage import SqliteMemoryStorage
 
 
 class MemoryStorageFactory:
@@ -28,12 +28,26 @@ class MemoryStorageFactory:
     """
 
     # Registry of available storage types
-    STORAGE_TYPES = {
+    # AICODE-NOTE: Heavy implementations are registered as "module:Class" paths and
+    # imported on first use, so numpy/openai/mem-agent are not loaded unless the
+    # configured storage type needs them.
+    STORAGE_TYPES: dict = {
         "json": JsonMemoryStorage,
-        "vector": VectorBasedMemoryStorage,
-        "mem-agent": MemAgentStorage,
+        "sqlite": SqliteMemoryStorage,
+        "vector": "src.mcp.memory.memory_vector_storage:VectorBasedMemoryStorage",
+        "mem-agent": "src.mcp.memory.memory_mem_agent_storage:MemAgentStorage",
     }
 
+    @classmethod
+    def _get_storage_class(cls, storage_type: str) -> Type[BaseMemoryStorage]:
+        """Resolve (and import, if still lazy) the class registered for a storage type"""
+        storage_class: Union[str, Type[BaseMemoryStorage]] = cls.STORAGE_TYPES[storage_type]
+        if isinstance(storage_class, str):
+            module_name, class_name = storage_class.split(":")
+            storage_class = getattr(importlib.import_module(module_name), class_name)
+            cls.STORAGE_TYPES[storage_type] = storage_class
+        return storage_class
+
     @classmethod
     def create(
         cls,
@@ -47,7 +61,7 @@ class MemoryStorageFactory:
         Create a memory storage instance
 
         Args:
-            storage_type: Type of storage ("json", "vector", or "mem-agent")
+            storage_type: Type of storage ("json", "sqlite", "vector", or "mem-agent")
             data_dir: Directory for storing memory data
             model_name: Model name for vector-based storage or mem-agent (optional)
             backend: Backend for model execution ("auto", "vllm", "mlx", "transformers") (optional)
@@ -69,7 +83,7 @@ class MemoryStorageFactory:
                 f"Unknown storage type: '{storage_type}'. " f"Available types: {available}"
             )
 
-        storage_class = cls.STORAGE_TYPES[storage_type]
+        storage_class = cls._get_storage_class(storage_type)
 
         logger.info("=" * 60)
         logger.info(f"🏭 [MemoryStorageFactory] Creating storage")
@@ -86,6 +100,11 @@ class MemoryStorageFactory:
                 storage = storage_class(data_dir=data_dir)
                 logger.info(f"✅ JsonMemoryStorage created at {data_dir}")
 
+            elif storage_type == "sqlite":
+                logger.info("🔧 Creating SQLite storage...")
+                storage = storage_class(data_dir=data_dir)
+                logger.info(f"✅ SqliteMemoryStorage created at {data_dir}")
+
             elif storage_type == "vector":
                 # Vector-based storage requires model_name
                 logger.info("🔧 Creating vector-based storage...")
@@ -199,7 +218,7 @@ def create_memory_storage(
     This is a simplified interface to the factory for common use cases.
 
     Args:
-        storage_type: Type of storage ("json", "vector", or "mem-agent")
+        storage_type: Type of storage ("json", "sqlite", "vector", or "mem-agent")
         data_dir: Directory for storing memory data
         model_name: Model name for vector-based storage or mem-agent (optional)
         backend: Backend for model execution ("auto", "vllm", "mlx", "transformers") (optional)
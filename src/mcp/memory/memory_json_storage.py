@@ -6,13 +6,39 @@ Uses substring search for queries.
 """
 
 import json
+import os
+import re
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple
 
 from loguru import logger
 
 from .memory_base import BaseMemoryStorage
 
+# Minimal number of logged operations before the log is compacted
+DEFAULT_COMPACT_THRESHOLD = 1000
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Longest substrings of vocabulary tokens listed in the n-gram index
+GRAM_SIZE = 3
+
+
+def _tokenize(text: str) -> Set[str]:
+    """Lowercased word tokens of a text"""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def _grams(token: str) -> Set[str]:
+    """Substrings of a token with 1 to GRAM_SIZE characters"""
+    return {
+        token[start : start + size]
+        for size in range(1, GRAM_SIZE + 1)
+        for start in range(len(token) - size + 1)
+    }
+
 
 class JsonMemoryStorage(BaseMemoryStorage):
     """
@@ -29,37 +55,405 @@ class JsonMemoryStorage(BaseMemoryStorage):
     - Small to medium memory sizes
     - Simple search requirements
     - No ML dependencies needed
+
+    AICODE-NOTE: Writes are appended to an operation log (memory.jsonl), one JSON
+    object per line: {"op": "store", "memory": {...}}, {"op": "delete", "id": N},
+    {"op": "clear", "category": ...}. memory.json keeps a compacted snapshot in the
+    legacy list format. When the log outgrows the live memories, a background
+    thread rotates it to memory.jsonl.compacting, writes a new snapshot and drops
+    the rotated log. Replay is idempotent (stores upsert by ID, IDs are never
+    reused), so after a crash at any step loading snapshot + rotated log + log
+    yields the same state.
+
+    AICODE-NOTE: _apply also maintains inverted indexes (category, tag and content
+    token -> memory IDs), so filters cost in proportion to the matching set.
+    Queries keep substring semantics. A query token with non-word characters on
+    both sides must be a whole content token and is looked up directly;
+    otherwise the vocabulary tokens containing the query's longest token are
+    found through an n-gram index (substrings of up to GRAM_SIZE characters ->
+    vocabulary tokens): a short token is looked up directly, a longer one by
+    intersecting the tokens of its trigrams. The index grows linearly with
+    token length. Matching tokens' postings plus categories containing the
+    query are the candidates, and only candidates are substring-checked.
     """
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
         """
         Initialize JSON memory storage
 
         Args:
             data_dir: Directory for storing memory files
+            compact_threshold: Minimal number of logged operations before compaction
         """
         super().__init__(data_dir)
         self.memory_file = self.data_dir / "memory.json"
-
-        # Load existing memory
-        self.memories: List[Dict[str, Any]] = []
+        self.log_file = self.data_dir / "memory.jsonl"
+        self._rotated_log_file = self.data_dir / "memory.jsonl.compacting"
+        self.compact_threshold = compact_threshold
+
+        # Guards in-memory state and the log handle
+        self._lock = threading.RLock()
+        # Only one compaction at a time
+        self._compact_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._log_handle: Optional[TextIO] = None
+
+        self._memories: Dict[int, Dict[str, Any]] = {}
+        self._category_index: Dict[str, Set[int]] = {}
+        self._tag_index: Dict[str, Set[int]] = {}
+        self._token_index: Dict[str, Set[int]] = {}
+        # n-gram -> content vocabulary tokens containing it
+        self._gram_index: Dict[str, Set[str]] = {}
+        self._next_id = 1
+        self._log_ops = 0
+
+        self._load()
+
+    @property
+    def memories(self) -> List[Dict[str, Any]]:
+        """All memories in ID order"""
+        with self._lock:
+            return list(self._memories.values())
+
+    def memory_count(self) -> Optional[int]:
+        """Number of memories (without copying them like memories does)"""
+        with self._lock:
+            return len(self._memories)
+
+    def _load(self) -> None:
+        """Load snapshot and replay operation logs"""
         if self.memory_file.exists():
             try:
                 with open(self.memory_file, "r", encoding="utf-8") as f:
-                    self.memories = json.load(f)
-                logger.info(
-                    f"[JsonMemoryStorage] Loaded {len(self.memories)} memories from {self.memory_file}"
-                )
+                    memories = json.load(f)
+                if self._renumber_duplicates(memories):
+                    self._write_snapshot(memories)
+                for memory in memories:
+                    self._apply({"op": "store", "memory": memory})
             except Exception as e:
                 logger.error(f"[JsonMemoryStorage] Failed to load memories: {e}")
 
-    def _save(self) -> None:
-        """Save memories to file"""
+        interrupted_compaction = self._rotated_log_file.exists()
+        if interrupted_compaction:
+            self._replay(self._rotated_log_file)
+        self._log_ops = self._replay(self.log_file)
+
+        # Replayed stores may land out of order; keep list order stable by ID
+        self._memories = dict(sorted(self._memories.items()))
+
+        if self._memories or self._log_ops:
+            logger.info(
+                f"[JsonMemoryStorage] Loaded {len(self._memories)} memories from {self.data_dir} "
+                f"({self._log_ops} logged operations)"
+            )
+
+        if interrupted_compaction:
+            logger.warning("[JsonMemoryStorage] Finishing interrupted log compaction")
+            self.compact()
+
+    @staticmethod
+    def _renumber_duplicates(memories: List[Dict[str, Any]]) -> int:
+        """
+        Give fresh IDs to memories whose ID repeats an earlier one
+
+        Legacy snapshots assigned len + 1 as ID, which repeats after deletions;
+        loading them by ID would otherwise keep only the last of each duplicate.
+
+        Returns:
+            Number of renumbered memories
+        """
+        seen: Set[int] = set()
+        next_id = max((m.get("id", 0) for m in memories), default=0) + 1
+        renumbered = 0
+        for memory in memories:
+            if memory.get("id") in seen:
+                memory["id"] = next_id
+                next_id += 1
+                renumbered += 1
+            seen.add(memory["id"])
+        if renumbered:
+            logger.warning(
+                f"[JsonMemoryStorage] Renumbered {renumbered} memories with duplicate IDs"
+            )
+        return renumbered
+
+    def _replay(self, path: Path) -> int:
+        """
+        Apply operations from a log file
+
+        Args:
+            path: Operation log path
+
+        Returns:
+            Number of applied operations
+        """
+        if not path.exists():
+            return 0
+
+        applied = 0
         try:
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                json.dump(self.memories, f, indent=2, ensure_ascii=False)
+            with open(path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        operation = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line after a crash; everything before it is intact
+                        logger.warning(
+                            f"[JsonMemoryStorage] Skipping corrupt log line {line_number} in {path}"
+                        )
+                        continue
+                    self._apply(operation)
+                    applied += 1
+        except Exception as e:
+            logger.error(f"[JsonMemoryStorage] Failed to replay {path}: {e}")
+        return applied
+
+    def _apply(self, operation: Dict[str, Any]) -> None:
+        """Apply one logged operation to in-memory state and indexes"""
+        op = operation.get("op")
+        if op == "store":
+            memory = operation["memory"]
+            memory_id = memory["id"]
+            previous = self._memories.get(memory_id)
+            if previous is not None:
+                self._unindex(previous)
+            self._memories[memory_id] = memory
+            self._index(memory)
+            self._next_id = max(self._next_id, memory_id + 1)
+        elif op == "delete":
+            memory = self._memories.pop(operation["id"], None)
+            if memory is not None:
+                self._unindex(memory)
+        elif op == "clear":
+            category = operation.get("category")
+            if category is None:
+                self._memories.clear()
+                self._category_index.clear()
+                self._tag_index.clear()
+                self._token_index.clear()
+                self._gram_index.clear()
+            else:
+                for memory_id in list(self._category_index.get(category, ())):
+                    self._unindex(self._memories.pop(memory_id))
+        elif op == "meta":
+            # Written at the start of each log so IDs stay monotonic across compactions
+            self._next_id = max(self._next_id, operation.get("next_id", 1))
+
+    def _index_entries(self, memory: Dict[str, Any]) -> List[Tuple[Dict[str, Set[int]], str]]:
+        """(index, key) pairs a memory is listed under"""
+        entries = [(self._category_index, memory.get("category", "general"))]
+        entries.extend((self._tag_index, tag) for tag in set(memory.get("tags") or []))
+        entries.extend((self._token_index, token) for token in _tokenize(memory.get("content", "")))
+        return entries
+
+    def _index(self, memory: Dict[str, Any]) -> None:
+        """Add a memory to the inverted indexes"""
+        for index, key in self._index_entries(memory):
+            if index is self._token_index and key not in index:
+                self._add_grams(key)
+            index.setdefault(key, set()).add(memory["id"])
+
+    def _unindex(self, memory: Dict[str, Any]) -> None:
+        """Remove a memory from the inverted indexes"""
+        for index, key in self._index_entries(memory):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(memory["id"])
+                if not ids:
+                    del index[key]
+                    if index is self._token_index:
+                        self._remove_grams(key)
+
+    def _add_grams(self, token: str) -> None:
+        """List a new vocabulary token in the n-gram index"""
+        for gram in _grams(token):
+            self._gram_index.setdefault(gram, set()).add(token)
+
+    def _remove_grams(self, token: str) -> None:
+        """Drop a token that left the vocabulary from the n-gram index"""
+        for gram in _grams(token):
+            tokens = self._gram_index.get(gram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._gram_index[gram]
+
+    def _tokens_containing(self, part: str) -> Set[str]:
+        """Vocabulary tokens containing part (caller holds the lock)"""
+        if len(part) <= GRAM_SIZE:
+            return self._gram_index.get(part, set())
+        trigrams = sorted(
+            (
+                self._gram_index.get(part[start : start + GRAM_SIZE], set())
+                for start in range(len(part) - GRAM_SIZE + 1)
+            ),
+            key=len,
+        )
+        return {token for token in trigrams[0].intersection(*trigrams[1:]) if part in token}
+
+    def _filter_ids(
+        self, category: Optional[str] = None, tags: Optional[List[str]] = None
+    ) -> Optional[Set[int]]:
+        """
+        IDs matching category and tag filters (caller holds the lock)
+
+        Returns:
+            Matching IDs, or None if no filter is given
+        """
+        candidates: Optional[Set[int]] = None
+
+        # Filter by category
+        if category:
+            candidates = set(self._category_index.get(category, ()))
+
+        # Filter by tags (any of the tags)
+        if tags:
+            tagged: Set[int] = set()
+            for tag in tags:
+                tagged |= self._tag_index.get(tag, set())
+            candidates = tagged if candidates is None else candidates & tagged
+
+        return candidates
+
+    def matching_ids(
+        self, category: Optional[str] = None, tags: Optional[List[str]] = None
+    ) -> List[int]:
+        """
+        IDs of memories matching category and tag filters
+
+        Args:
+            category: Filter by category
+            tags: Filter by tags (any of the tags)
+
+        Returns:
+            Matching memory IDs in ascending order
+        """
+        with self._lock:
+            candidates = self._filter_ids(category, tags)
+            return list(self._memories) if candidates is None else sorted(candidates)
+
+    def get(self, memory_id: int) -> Optional[Dict[str, Any]]:
+        """Get a memory by ID"""
+        with self._lock:
+            return self._memories.get(memory_id)
+
+    def _query_candidates(self, query_lower: str) -> Optional[Set[int]]:
+        """
+        IDs of memories that may contain query_lower in content or category
+
+        Returns:
+            Candidate IDs, or None if the query has no word tokens (scan everything)
+        """
+        query_tokens = list(_TOKEN_RE.finditer(query_lower))
+        if not query_tokens:
+            return None
+
+        candidates: Set[int] = set()
+        # Bounded by non-word characters in the query, so a whole token of the content
+        whole = [
+            match.group(0)
+            for match in query_tokens
+            if match.start() > 0 and match.end() < len(query_lower)
+        ]
+        if whole:
+            candidates |= min((self._token_index.get(token, set()) for token in whole), key=len)
+        else:
+            longest = max((match.group(0) for match in query_tokens), key=len)
+            for token in self._tokens_containing(longest):
+                candidates |= self._token_index[token]
+        for category, ids in self._category_index.items():
+            if query_lower in category.lower():
+                candidates |= ids
+        return candidates
+
+    def _append(self, operation: Dict[str, Any]) -> None:
+        """Apply an operation and append it to the log (caller holds the lock)"""
+        self._apply(operation)
+        try:
+            if self._log_handle is None:
+                self._log_handle = open(self.log_file, "a", encoding="utf-8")
+            self._log_handle.write(json.dumps(operation, ensure_ascii=False) + "\n")
+            self._log_handle.flush()
+            self._log_ops += 1
         except Exception as e:
             logger.error(f"[JsonMemoryStorage] Failed to save memories: {e}")
+        self._maybe_compact()
+
+    def _close_log(self) -> None:
+        """Close the log handle (caller holds the lock)"""
+        if self._log_handle is not None:
+            self._log_handle.close()
+            self._log_handle = None
+
+    def _maybe_compact(self) -> None:
+        """Start background compaction when the log outgrows the live memories"""
+        if self._log_ops < self.compact_threshold or self._log_ops <= len(self._memories):
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self._compact_in_background, name="memory-json-compaction", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"[JsonMemoryStorage] Background compaction failed: {e}")
+
+    def compact(self) -> None:
+        """
+        Fold the operation log into the memory.json snapshot
+
+        Writers are blocked only while the log is rotated; the snapshot itself is
+        written outside the state lock.
+        """
+        with self._compact_lock:
+            with self._lock:
+                snapshot = list(self._memories.values())
+                next_id = self._next_id
+                self._close_log()
+                self._rotate_log()
+                with open(self.log_file, "w", encoding="utf-8") as f:
+                    f.write(json.dumps({"op": "meta", "next_id": next_id}) + "\n")
+                self._log_ops = 0
+
+            self._write_snapshot(snapshot)
+            self._rotated_log_file.unlink(missing_ok=True)
+
+        logger.info(f"[JsonMemoryStorage] Compacted log into snapshot ({len(snapshot)} memories)")
+
+    def _rotate_log(self) -> None:
+        """Move the current log aside (caller holds the lock)"""
+        if not self.log_file.exists():
+            return
+        if not self._rotated_log_file.exists():
+            os.replace(self.log_file, self._rotated_log_file)
+            return
+        # Leftover from an interrupted compaction: keep both logs in replay order
+        with open(self._rotated_log_file, "a", encoding="utf-8") as rotated:
+            with open(self.log_file, "r", encoding="utf-8") as current:
+                rotated.write(current.read())
+        self.log_file.unlink()
+
+    def _write_snapshot(self, memories: Iterable[Dict[str, Any]]) -> None:
+        """Atomically replace memory.json"""
+        tmp_file = self.memory_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(list(memories), f, ensure_ascii=False)
+        os.replace(tmp_file, self.memory_file)
+
+    def close(self) -> None:
+        """Wait for background compaction and close the log"""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._close_log()
 
     def store(
         self,
@@ -80,18 +474,18 @@ class JsonMemoryStorage(BaseMemoryStorage):
         Returns:
             Result with memory ID
         """
-        memory_id = len(self.memories) + 1
-
-        memory = self._create_memory_entry(
-            memory_id=memory_id,
-            content=content,
-            category=category,
-            metadata=metadata or {},
-            tags=tags or [],
-        )
+        with self._lock:
+            memory_id = self._next_id
+
+            memory = self._create_memory_entry(
+                memory_id=memory_id,
+                content=content,
+                category=category,
+                metadata=metadata or {},
+                tags=tags or [],
+            )
 
-        self.memories.append(memory)
-        self._save()
+            self._append({"op": "store", "memory": memory})
 
         logger.info(f"[JsonMemoryStorage] Stored memory #{memory_id} in category '{category}'")
 
@@ -122,28 +516,33 @@ class JsonMemoryStorage(BaseMemoryStorage):
         Returns:
             List of matching memories
         """
-        results = self.memories.copy()
-
-        # Filter by category
-        if category:
-            results = [m for m in results if m.get("category") == category]
-
-        # Filter by tags
-        if tags:
-            results = [m for m in results if any(tag in m.get("tags", []) for tag in tags)]
+        with self._lock:
+            candidates = self._filter_ids(category, tags)
+
+            # Filter by query (substring search over index candidates)
+            query_lower = query.lower() if query else ""
+            if query:
+                matched = self._query_candidates(query_lower)
+                if matched is not None:
+                    candidates = matched if candidates is None else candidates & matched
+
+            if candidates is None:
+                ordered = (self._memories[memory_id] for memory_id in reversed(self._memories))
+            else:
+                ordered = (
+                    self._memories[memory_id] for memory_id in sorted(candidates, reverse=True)
+                )
 
-        # Filter by query (simple substring search)
-        if query:
-            query_lower = query.lower()
-            results = [
-                m
-                for m in results
-                if query_lower in m.get("content", "").lower()
-                or query_lower in m.get("category", "").lower()
-            ]
+            if query:
+                ordered = (
+                    m
+                    for m in ordered
+                    if query_lower in m.get("content", "").lower()
+                    or query_lower in m.get("category", "").lower()
+                )
 
-        # Limit results
-        results = results[-limit:]  # Get last N results
+            # Get last N results in ID order
+            results = list(islice(ordered, limit))[::-1]
 
         logger.info(
             f"[JsonMemoryStorage] Retrieved {len(results)} memories "
@@ -175,7 +574,7 @@ class JsonMemoryStorage(BaseMemoryStorage):
         Returns:
             All memories (up to limit)
         """
-        results = self.memories.copy()
+        results = self.memories
         if limit:
             results = results[-limit:]
 
@@ -188,11 +587,8 @@ class JsonMemoryStorage(BaseMemoryStorage):
         Returns:
             List of categories with counts
         """
-        categories: Dict[str, int] = {}
-
-        for memory in self.memories:
-            cat = memory.get("category", "general")
-            categories[cat] = categories.get(cat, 0) + 1
+        with self._lock:
+            categories = {cat: len(ids) for cat, ids in self._category_index.items()}
 
         return {
             "success": True,
@@ -211,15 +607,13 @@ class JsonMemoryStorage(BaseMemoryStorage):
         Returns:
             Result of deletion
         """
-        original_count = len(self.memories)
-        self.memories = [m for m in self.memories if m.get("id") != memory_id]
+        with self._lock:
+            if memory_id not in self._memories:
+                return {"success": False, "error": f"Memory {memory_id} not found"}
+            self._append({"op": "delete", "id": memory_id})
 
-        if len(self.memories) < original_count:
-            self._save()
-            logger.info(f"[JsonMemoryStorage] Deleted memory #{memory_id}")
-            return {"success": True, "message": f"Memory {memory_id} deleted successfully"}
-        else:
-            return {"success": False, "error": f"Memory {memory_id} not found"}
+        logger.info(f"[JsonMemoryStorage] Deleted memory #{memory_id}")
+        return {"success": True, "message": f"Memory {memory_id} deleted successfully"}
 
     def clear(self, category: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -231,22 +625,20 @@ class JsonMemoryStorage(BaseMemoryStorage):
         Returns:
             Result of clearing
         """
-        original_count = len(self.memories)
+        with self._lock:
+            original_count = len(self._memories)
+            self._append({"op": "clear", "category": category})
+            deleted_count = original_count - len(self._memories)
 
         if category:
-            self.memories = [m for m in self.memories if m.get("category") != category]
-            message = (
-                f"Cleared {original_count - len(self.memories)} memories from category '{category}'"
-            )
+            message = f"Cleared {deleted_count} memories from category '{category}'"
         else:
-            self.memories = []
             message = f"Cleared all {original_count} memories"
 
-        self._save()
         logger.info(f"[JsonMemoryStorage] {message}")
 
         return {
             "success": True,
             "message": message,
-            "deleted_count": original_count - len(self.memories),
+            "deleted_count": deleted_count,
         }
@@ -36,13 +36,17 @@ Usage:
 
 import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from config.settings import RETRIEVAL_CACHE_SIZE
+
 from .memory_base import BaseMemoryStorage
+from .retrieval_cache import RetrievalCache
 
 # Import mem-agent components (lazy import to avoid circular dependencies)
 try:
@@ -74,6 +78,12 @@ class MemAgentStorage(BaseMemoryStorage):
     Implementation Note:
     This is an adapter pattern - we minimize changes to the original mem-agent code
     and instead wrap it to fit our SOLID architecture.
+
+    AICODE-NOTE: retrieve() answers are cached (RetrievalCache) because every
+    call costs several LLM calls. The cache generation is bumped by store() and
+    clear() and whenever the memory directory's signature (file count, total
+    size, latest mtime) changed since the last check, which also catches writes
+    by other processes or by the agent during a retrieval.
     """
 
     def __init__(
@@ -82,6 +92,7 @@ class MemAgentStorage(BaseMemoryStorage):
         use_vllm: bool = True,
         model: Optional[str] = None,
         max_tool_turns: int = 20,
+        retrieval_cache_size: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -92,6 +103,8 @@ class MemAgentStorage(BaseMemoryStorage):
             use_vllm: Whether to use vLLM backend (default True)
             model: Model name (default: driaforall/mem-agent)
             max_tool_turns: Maximum tool execution turns
+            retrieval_cache_size: Cached retrieval answers (default: MEM_AGENT_RETRIEVAL_CACHE_SIZE,
+                0 = disabled)
             **kwargs: Additional arguments (for compatibility)
         """
         if not MEM_AGENT_AVAILABLE:
@@ -122,6 +135,11 @@ class MemAgentStorage(BaseMemoryStorage):
             predetermined_memory_path=False,
         )
 
+        self._retrieval_cache = RetrievalCache(
+            RETRIEVAL_CACHE_SIZE if retrieval_cache_size is None else retrieval_cache_size
+        )
+        self._memory_signature: Optional[Tuple[int, int, int]] = None
+
         logger.info("✅ MemAgentStorage initialized successfully")
         logger.info("=" * 60)
 
@@ -143,6 +161,40 @@ class MemAgentStorage(BaseMemoryStorage):
             logger.error(f"Error chatting with agent: {e}", exc_info=True)
             raise
 
+    def _read_memory_signature(self) -> Tuple[int, int, int]:
+        """File count, total size and latest mtime of the memory directory"""
+        count = size = latest = 0
+        for dirpath, _, filenames in os.walk(self.data_dir):
+            try:
+                latest = max(latest, os.stat(dirpath).st_mtime_ns)
+            except OSError:
+                continue
+            for filename in filenames:
+                try:
+                    stat = os.stat(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+                count += 1
+                size += stat.st_size
+                latest = max(latest, stat.st_mtime_ns)
+        return count, size, latest
+
+    def _check_memory_changed(self) -> None:
+        """Invalidate cached retrievals if the memory directory changed"""
+        signature = self._read_memory_signature()
+        if signature != self._memory_signature:
+            self._memory_signature = signature
+            self._retrieval_cache.bump()
+
+    def _memory_written(self) -> None:
+        """Invalidate cached retrievals after a write"""
+        self._retrieval_cache.bump()
+        self._memory_signature = self._read_memory_signature()
+
+    def retrieval_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get retrieval cache statistics"""
+        return self._retrieval_cache.stats()
+
     def store(
         self,
         content: str,
@@ -210,6 +262,9 @@ class MemAgentStorage(BaseMemoryStorage):
             logger.error(f"❌ Error storing memory: {e}")
             logger.error("=" * 60, exc_info=True)
             return {"success": False, "error": str(e), "timestamp": datetime.now().isoformat()}
+        finally:
+            # Also after a failure: the agent may have written part of it
+            self._memory_written()
 
     def retrieve(
         self,
@@ -240,6 +295,21 @@ class MemAgentStorage(BaseMemoryStorage):
         logger.info(f"  Limit: {limit}")
         logger.info("=" * 60)
 
+        cache_key = RetrievalCache.make_key(query, category, tags, limit)
+        self._check_memory_changed()
+        cached = self._retrieval_cache.get(cache_key)
+        if cached is not None:
+            stats = self._retrieval_cache.stats()
+            logger.info(
+                f"♻️ Retrieval cache hit (hit rate {stats['hit_rate']:.0%}, "
+                f"{stats['saved_llm_calls']} LLM calls saved)"
+            )
+            cached["cached"] = True
+            cached["timestamp"] = datetime.now().isoformat()
+            return cached
+        generation = self._retrieval_cache.generation
+        model_calls = self.agent.model_calls
+
         try:
             # Build natural language query for the agent
             logger.debug("📝 Building query for agent...")
@@ -271,7 +341,7 @@ class MemAgentStorage(BaseMemoryStorage):
             # Parse agent response into structured format
             # Note: The agent's reply is natural language, we return it as-is
             # The consumer can parse it or use it directly
-            return {
+            result = {
                 "success": True,
                 "count": 1,  # We don't have exact count from agent
                 "memories": [
@@ -287,6 +357,13 @@ class MemAgentStorage(BaseMemoryStorage):
                 "timestamp": datetime.now().isoformat(),
             }
 
+            # Dropped by put() if the agent changed the memory while answering
+            self._check_memory_changed()
+            self._retrieval_cache.put(
+                cache_key, result, self.agent.model_calls - model_calls, generation
+            )
+            return result
+
         except Exception as e:
             logger.error(f"Error retrieving memory: {e}", exc_info=True)
             return {
@@ -438,3 +515,5 @@ class MemAgentStorage(BaseMemoryStorage):
         except Exception as e:
             logger.error(f"Error clearing memory: {e}", exc_info=True)
             return {"success": False, "error": str(e), "timestamp": datetime.now().isoformat()}
+        finally:
+            self._memory_written()
@@ -0,0 +1,394 @@
+"""
+SQLite-based Memory Storage Implementation
+
+Transactional storage in a single SQLite database (WAL mode).
+Uses an FTS5 full-text index for keyword queries.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .memory_base import BaseMemoryStorage
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content TEXT NOT NULL,
+    category TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    tags TEXT NOT NULL DEFAULT '[]',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memories_category ON memories(category, id);
+CREATE INDEX IF NOT EXISTS idx_memories_created_at ON memories(created_at);
+
+CREATE TABLE IF NOT EXISTS memory_tags (
+    tag TEXT NOT NULL,
+    memory_id INTEGER NOT NULL REFERENCES memories(id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, memory_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_memory_tags_memory ON memory_tags(memory_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    content, tags, content='memories', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts(rowid, content, tags) VALUES (new.id, new.content, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts(memories_fts, rowid, content, tags)
+    VALUES ('delete', old.id, old.content, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE ON memories BEGIN
+    INSERT INTO memories_fts(memories_fts, rowid, content, tags)
+    VALUES ('delete', old.id, old.content, old.tags);
+    INSERT INTO memories_fts(rowid, content, tags) VALUES (new.id, new.content, new.tags);
+END;
+"""
+
+
+class SqliteMemoryStorage(BaseMemoryStorage):
+    """
+    SQLite-based memory storage implementation
+
+    Features:
+    - Single-file SQLite database in WAL mode
+    - FTS5 full-text search over content and tags (ranked by BM25)
+    - Indexed category, tag and created_at lookups
+    - Transactional stores and deletes (no whole-file rewrites)
+    - No extra dependencies (sqlite3 is in the standard library)
+
+    Best for:
+    - Tens of thousands of memories and more
+    - Keyword search that has to stay fast as memory grows
+
+    AICODE-NOTE: memories_fts is an external-content FTS5 table kept in sync by
+    triggers, so content is stored once. IDs come from AUTOINCREMENT and are never
+    reused. Query text is split into word tokens and each one is matched as a
+    quoted prefix ("tok"*), which keeps FTS syntax out of user input and
+    approximates the substring matching of JsonMemoryStorage.
+    """
+
+    def __init__(self, data_dir: Path):
+        """
+        Initialize SQLite memory storage
+
+        Args:
+            data_dir: Directory for storing the memory database
+        """
+        super().__init__(data_dir)
+        self.db_file = self.data_dir / "memory.db"
+
+        # One connection shared by worker threads; sqlite3 calls are serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+        count = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+        logger.info(f"[SqliteMemoryStorage] Opened {self.db_file} ({count} memories)")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_to_memory(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a memories row to the standard memory entry dict"""
+        return {
+            "id": row["id"],
+            "content": row["content"],
+            "category": row["category"],
+            "metadata": json.loads(row["metadata"]),
+            "tags": json.loads(row["tags"]),
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def _insert(self, items: List[Dict[str, Any]]) -> List[int]:
+        """Insert memories in one transaction (caller holds the lock)"""
+        memory_ids = []
+        now = datetime.now().isoformat()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            for item in items:
+                tags = list(dict.fromkeys(item.get("tags") or []))
+                cursor = self._conn.execute(
+                    "INSERT INTO memories (content, category, metadata, tags, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        item["content"],
+                        item.get("category") or "general",
+                        json.dumps(item.get("metadata") or {}, ensure_ascii=False),
+                        json.dumps(tags, ensure_ascii=False),
+                        now,
+                        now,
+                    ),
+                )
+                memory_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO memory_tags (tag, memory_id) VALUES (?, ?)",
+                    [(tag, memory_id) for tag in tags],
+                )
+                memory_ids.append(memory_id)
+        return memory_ids
+
+    def store(
+        self,
+        content: str,
+        category: str = "general",
+        metadata: Optional[Dict] = None,
+        tags: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store information in memory
+
+        Args:
+            content: Content to store
+            category: Category for organization
+            metadata: Additional metadata
+            tags: Optional tags for categorization
+
+        Returns:
+            Result with memory ID
+        """
+        try:
+            with self._lock:
+                memory_id = self._insert(
+                    [{"content": content, "category": category, "metadata": metadata, "tags": tags}]
+                )[0]
+        except sqlite3.Error as e:
+            logger.error(f"[SqliteMemoryStorage] Failed to store memory: {e}")
+            return {"success": False, "error": str(e)}
+
+        logger.info(f"[SqliteMemoryStorage] Stored memory #{memory_id} in category '{category}'")
+
+        return {
+            "success": True,
+            "memory_id": memory_id,
+            "message": f"Memory stored successfully (ID: {memory_id})",
+        }
+
+    def store_many(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store several memories in a single transaction
+
+        Args:
+            items: Dicts with "content" and optional "category", "metadata", "tags"
+
+        Returns:
+            Result with the list of memory IDs
+        """
+        try:
+            with self._lock:
+                memory_ids = self._insert(items)
+        except sqlite3.Error as e:
+            logger.error(f"[SqliteMemoryStorage] Failed to store memories: {e}")
+            return {"success": False, "error": str(e)}
+
+        logger.info(f"[SqliteMemoryStorage] Stored {len(memory_ids)} memories")
+
+        return {
+            "success": True,
+            "memory_ids": memory_ids,
+            "message": f"Stored {len(memory_ids)} memories",
+        }
+
+    @staticmethod
+    def _filter_clause(
+        category: Optional[str], tags: Optional[List[str]]
+    ) -> Tuple[List[str], List[Any]]:
+        """SQL conditions (on alias m) and parameters for category/tag filters"""
+        conditions: List[str] = []
+        params: List[Any] = []
+        if category:
+            conditions.append("m.category = ?")
+            params.append(category)
+        if tags:
+            placeholders = ", ".join("?" for _ in tags)
+            conditions.append(
+                f"m.id IN (SELECT memory_id FROM memory_tags WHERE tag IN ({placeholders}))"
+            )
+            params.extend(tags)
+        return conditions, params
+
+    def retrieve(
+        self,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Retrieve information from memory
+
+        Uses the FTS5 index for queries (best BM25 matches first); without a
+        query returns the latest memories in ID order.
+
+        Args:
+            query: Search query (word prefix match over content and tags)
+            category: Filter by category
+            tags: Filter by tags
+            limit: Maximum number of results
+
+        Returns:
+            List of matching memories
+        """
+        conditions, params = self._filter_clause(category, tags)
+        query_tokens = _TOKEN_RE.findall(query or "")
+
+        if query_tokens:
+            match = " ".join('"' + token + '"*' for token in query_tokens)
+            where = " AND ".join(["memories_fts MATCH ?"] + conditions)
+            sql = (
+                "SELECT m.* FROM memories_fts JOIN memories m ON m.id = memories_fts.rowid "
+                f"WHERE {where} ORDER BY memories_fts.rank, m.id DESC LIMIT ?"
+            )
+            params = [match] + params + [limit]
+        else:
+            if query:
+                # No word characters to index (e.g. punctuation): plain substring scan
+                conditions.append("instr(lower(m.content), ?) > 0")
+                params.append(query.lower())
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            sql = f"SELECT m.* FROM memories m {where} ORDER BY m.id DESC LIMIT ?"
+            params.append(limit)
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"[SqliteMemoryStorage] Retrieve failed: {e}")
+            return {"success": False, "error": str(e)}
+
+        results = [self._row_to_memory(row) for row in rows]
+        if not query_tokens:
+            # Latest N in ID order, like the other storages
+            results.reverse()
+
+        logger.info(
+            f"[SqliteMemoryStorage] Retrieved {len(results)} memories "
+            f"(query='{query}', category='{category}', tags={tags})"
+        )
+
+        return {"success": True, "count": len(results), "memories": results}
+
+    def search(self, query: str, limit: int = 5) -> Dict[str, Any]:
+        """
+        Search memories (alias for retrieve with query)
+
+        Args:
+            query: Search query
+            limit: Maximum number of results
+
+        Returns:
+            Search results
+        """
+        return self.retrieve(query=query, limit=limit)
+
+    def list_all(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        List all memories
+
+        Args:
+            limit: Optional limit on number of results
+
+        Returns:
+            All memories (up to limit)
+        """
+        with self._lock:
+            if limit:
+                rows = self._conn.execute(
+                    "SELECT * FROM memories ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+                rows.reverse()
+            else:
+                rows = self._conn.execute("SELECT * FROM memories ORDER BY id").fetchall()
+
+        results = [self._row_to_memory(row) for row in rows]
+        return {"success": True, "count": len(results), "memories": results}
+
+    def list_categories(self) -> Dict[str, Any]:
+        """
+        List all available categories
+
+        Returns:
+            List of categories with counts
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, COUNT(*) FROM memories GROUP BY category ORDER BY category"
+            ).fetchall()
+
+        return {
+            "success": True,
+            "categories": [{"name": category, "count": count} for category, count in rows],
+        }
+
+    def delete(self, memory_id: int) -> Dict[str, Any]:
+        """
+        Delete a memory by ID
+
+        Args:
+            memory_id: ID of memory to delete
+
+        Returns:
+            Result of deletion
+        """
+        with self._lock:
+            with self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM memories WHERE id = ?", (memory_id,)
+                ).rowcount
+
+        if not deleted:
+            return {"success": False, "error": f"Memory {memory_id} not found"}
+
+        logger.info(f"[SqliteMemoryStorage] Deleted memory #{memory_id}")
+        return {"success": True, "message": f"Memory {memory_id} deleted successfully"}
+
+    def clear(self, category: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Clear memories (all or by category)
+
+        Args:
+            category: Optional category to clear (clears all if None)
+
+        Returns:
+            Result of clearing
+        """
+        with self._lock:
+            with self._conn:
+                if category:
+                    deleted_count = self._conn.execute(
+                        "DELETE FROM memories WHERE category = ?", (category,)
+                    ).rowcount
+                else:
+                    deleted_count = self._conn.execute("DELETE FROM memories").rowcount
+
+        if category:
+            message = f"Cleared {deleted_count} memories from category '{category}'"
+        else:
+            message = f"Cleared all {deleted_count} memories"
+
+        logger.info(f"[SqliteMemoryStorage] {message}")
+
+        return {
+            "success": True,
+            "message": message,
+            "deleted_count": deleted_count,
+        }
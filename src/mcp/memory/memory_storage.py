@@ -159,6 +159,10 @@ class MemoryStorage(BaseMemoryStorage):
         """Retrieve information from memory"""
         return self._storage.retrieve(query, category, tags, limit)
 
+    def store_many(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store several memories at once"""
+        return self._storage.store_many(items)
+
     def search(self, query: str, limit: int = 5) -> Dict[str, Any]:
         """Search memories"""
         return self._storage.search(query, limit)
@@ -179,6 +183,18 @@ class MemoryStorage(BaseMemoryStorage):
         """Clear memories"""
         return self._storage.clear(category)
 
+    def close(self) -> None:
+        """Flush and release the underlying storage"""
+        self._storage.close()
+
+    def retrieval_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get retrieval cache statistics of the underlying storage"""
+        return self._storage.retrieval_cache_stats()
+
+    def memory_count(self) -> Optional[int]:
+        """Get the number of memories of the underlying storage"""
+        return self._storage.memory_count()
+
     # Compatibility: expose in-memory list if underlying storage has it (e.g., JsonMemoryStorage)
     @property
     def memories(self):
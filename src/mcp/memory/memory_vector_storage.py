@@ -6,13 +6,22 @@ Combines JSON storage with vector embeddings for semantic similarity search.
 """
 
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 from loguru import logger
 
 from .memory_base import BaseMemoryStorage
+from .memory_json_storage import JsonMemoryStorage
+
+# Initial number of rows reserved in the vectors file
+_INITIAL_CAPACITY = 64
+
+# Candidate rows read from the vectors file per step of a filtered search
+_SCORE_CHUNK_ROWS = 4096
 
 
 class VectorBasedMemoryStorage(BaseMemoryStorage):
@@ -34,6 +43,14 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
 
     Note:
     Requires additional dependencies: transformers, torch, sentence-transformers
+
+    AICODE-NOTE: Memory records live in a JsonMemoryStorage (append-only log with
+    category/tag indexes). Vectors live in vectors.f32, a raw float32 matrix that
+    is memory-mapped and grown by doubling. Row = memory ID - 1: IDs are
+    monotonic and never reused, so no row mapping has to be persisted. Deleted
+    rows are zeroed and never scored. Vectors are L2-normalized at insert, so a
+    query is one matrix-vector product plus argpartition for top-k. Legacy
+    embeddings.npy (rows aligned with memory.json positions) is migrated on load.
     """
 
     def __init__(self, data_dir: Path, model_name: str = "BAAI/bge-m3"):
@@ -48,20 +65,36 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         self.model_name = model_name
         self.memory_file = self.data_dir / "memory.json"
         self.embeddings_file = self.data_dir / "embeddings.npy"
+        self.vectors_file = self.data_dir / "vectors.f32"
+        self.vectors_meta_file = self.data_dir / "vectors.json"
 
         # Initialize model and embeddings
         self._model = None
-        self._embeddings: Optional[np.ndarray] = None
-        self.memories: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+        self._vectors: Optional[np.memmap] = None
+        self._dimension: Optional[int] = None
 
         # Load existing data
-        self._load_data()
+        legacy = self._read_legacy_embeddings()
+        self._records = JsonMemoryStorage(self.data_dir)
+        self._load_vectors()
+        if legacy is not None:
+            self._migrate_legacy_embeddings(legacy)
 
         logger.info(
             f"[VectorBasedMemoryStorage] Initialized with model '{model_name}' "
             f"({len(self.memories)} memories loaded)"
         )
 
+    @property
+    def memories(self) -> List[Dict[str, Any]]:
+        """All memories in ID order"""
+        return self._records.memories
+
+    def memory_count(self) -> Optional[int]:
+        """Number of memories"""
+        return self._records.memory_count()
+
     def _get_model(self):
         """
         Lazy load the embedding model
@@ -102,44 +135,123 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
 
         return self._model
 
-    def _load_data(self) -> None:
-        """Load memories and embeddings from files"""
-        # Load memories from JSON
-        if self.memory_file.exists():
-            try:
-                with open(self.memory_file, "r", encoding="utf-8") as f:
-                    self.memories = json.load(f)
-                logger.debug(f"[VectorBasedMemoryStorage] Loaded {len(self.memories)} memories")
-            except Exception as e:
-                logger.error(f"[VectorBasedMemoryStorage] Failed to load memories: {e}")
-                self.memories = []
+    def _read_legacy_embeddings(self) -> Optional[tuple]:
+        """
+        Read pre-memmap data (memory.json list + embeddings.npy aligned by position)
 
-        # Load embeddings from numpy file
-        if self.embeddings_file.exists():
-            try:
-                self._embeddings = np.load(self.embeddings_file)
-                logger.debug(
-                    f"[VectorBasedMemoryStorage] Loaded embeddings with shape {self._embeddings.shape}"
-                )
-            except Exception as e:
-                logger.error(f"[VectorBasedMemoryStorage] Failed to load embeddings: {e}")
-                self._embeddings = None
+        Legacy IDs were len + 1 and could repeat after deletions; duplicates get
+        fresh IDs and memory.json is rewritten before JsonMemoryStorage loads it.
 
-    def _save_data(self) -> None:
-        """Save memories and embeddings to files"""
-        # Save memories to JSON
+        Returns:
+            (memory IDs, embeddings matrix) or None if there is nothing to migrate
+        """
+        if not self.embeddings_file.exists() or self.vectors_file.exists():
+            return None
         try:
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                json.dump(self.memories, f, indent=2, ensure_ascii=False)
+            embeddings = np.load(self.embeddings_file)
+            memories = []
+            if self.memory_file.exists():
+                with open(self.memory_file, "r", encoding="utf-8") as f:
+                    memories = json.load(f)
         except Exception as e:
-            logger.error(f"[VectorBasedMemoryStorage] Failed to save memories: {e}")
+            logger.error(f"[VectorBasedMemoryStorage] Failed to load embeddings: {e}")
+            return None
+
+        seen = set()
+        next_id = max((m.get("id", 0) for m in memories), default=0) + 1
+        for memory in memories:
+            if memory.get("id") in seen:
+                memory["id"] = next_id
+                next_id += 1
+            seen.add(memory["id"])
+
+        tmp_file = self.memory_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(memories, f, ensure_ascii=False)
+        os.replace(tmp_file, self.memory_file)
+
+        ids = [m["id"] for m in memories[: len(embeddings)]]
+        return ids, embeddings[: len(ids)]
+
+    def _migrate_legacy_embeddings(self, legacy: tuple) -> None:
+        """Write legacy embeddings into the vectors file and retire embeddings.npy"""
+        ids, embeddings = legacy
+        if len(ids):
+            self._write_vectors(ids, embeddings)
+            self.flush()
+        os.replace(self.embeddings_file, self.embeddings_file.with_suffix(".npy.migrated"))
+        logger.info(f"[VectorBasedMemoryStorage] Migrated {len(ids)} legacy embeddings")
+
+    def _load_vectors(self) -> None:
+        """Memory-map the vectors file"""
+        if not self.vectors_meta_file.exists() or not self.vectors_file.exists():
+            return
+        try:
+            with open(self.vectors_meta_file, "r", encoding="utf-8") as f:
+                self._dimension = int(json.load(f)["dimension"])
+            rows = self.vectors_file.stat().st_size // (self._dimension * 4)
+            if rows:
+                self._vectors = np.memmap(
+                    self.vectors_file, dtype=np.float32, mode="r+", shape=(rows, self._dimension)
+                )
+            logger.debug(
+                f"[VectorBasedMemoryStorage] Mapped vectors with shape ({rows}, {self._dimension})"
+            )
+        except Exception as e:
+            logger.error(f"[VectorBasedMemoryStorage] Failed to load embeddings: {e}")
+            self._vectors = None
+
+    def _ensure_capacity(self, rows: int, dimension: int) -> None:
+        """Grow (or create) the vectors file to hold at least rows rows"""
+        if self._dimension is None:
+            self._dimension = dimension
+            with open(self.vectors_meta_file, "w", encoding="utf-8") as f:
+                json.dump({"dimension": dimension, "model_name": self.model_name}, f)
+        elif dimension != self._dimension:
+            raise ValueError(
+                f"Embedding dimension {dimension} does not match stored vectors "
+                f"({self._dimension}); clear the storage to switch models"
+            )
 
-        # Save embeddings to numpy file
-        if self._embeddings is not None:
-            try:
-                np.save(self.embeddings_file, self._embeddings)
-            except Exception as e:
-                logger.error(f"[VectorBasedMemoryStorage] Failed to save embeddings: {e}")
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if rows <= capacity:
+            return
+
+        new_capacity = max(rows, capacity * 2, _INITIAL_CAPACITY)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        # Extending with truncate keeps the new region sparse (zeros, no writes)
+        with open(self.vectors_file, "ab") as f:
+            f.truncate(new_capacity * dimension * 4)
+        self._vectors = np.memmap(
+            self.vectors_file, dtype=np.float32, mode="r+", shape=(new_capacity, dimension)
+        )
+
+    def _write_vectors(self, memory_ids: List[int], embeddings: np.ndarray) -> None:
+        """Normalize embeddings and write them to their rows"""
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(memory_ids), -1)
+        self._ensure_capacity(max(memory_ids), embeddings.shape[1])
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        self._vectors[np.asarray(memory_ids) - 1] = embeddings / (norms + 1e-8)
+
+    def _zero_vectors(self, memory_ids: List[int]) -> None:
+        """Zero rows of deleted memories"""
+        if self._vectors is None or not memory_ids:
+            return
+        rows = np.asarray(memory_ids) - 1
+        self._vectors[rows[rows < self._vectors.shape[0]]] = 0.0
+
+    def flush(self) -> None:
+        """Flush vectors to disk"""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+
+    def close(self) -> None:
+        """Flush vectors and close the memory log"""
+        self.flush()
+        self._records.close()
 
     def _compute_embedding(self, text: str) -> np.ndarray:
         """
@@ -155,29 +267,21 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         embedding = model.encode(text, convert_to_numpy=True)
         return embedding
 
-    def _compute_similarity(
-        self, query_embedding: np.ndarray, memory_embeddings: np.ndarray
-    ) -> np.ndarray:
+    def _compute_embeddings(self, texts: List[str]) -> np.ndarray:
         """
-        Compute cosine similarity between query and memory embeddings
+        Compute embeddings for several texts in one model call
 
         Args:
-            query_embedding: Query embedding vector
-            memory_embeddings: Matrix of memory embeddings
+            texts: Texts to embed
 
         Returns:
-            Array of similarity scores
+            Matrix of embeddings (one row per text)
         """
-        # Normalize vectors
-        query_norm = query_embedding / (np.linalg.norm(query_embedding) + 1e-8)
-        memories_norm = memory_embeddings / (
-            np.linalg.norm(memory_embeddings, axis=1, keepdims=True) + 1e-8
+        model = self._get_model()
+        return np.asarray(
+            model.encode(texts, convert_to_numpy=True, show_progress_bar=len(texts) > 100)
         )
 
-        # Compute cosine similarity
-        similarities = np.dot(memories_norm, query_norm)
-        return similarities
-
     def store(
         self,
         content: str,
@@ -197,35 +301,10 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         Returns:
             Result with memory ID
         """
-        memory_id = len(self.memories) + 1
-
-        # Create memory entry
-        memory = self._create_memory_entry(
-            memory_id=memory_id,
-            content=content,
-            category=category,
-            metadata=metadata or {},
-            tags=tags or [],
+        result = self.store_many(
+            [{"content": content, "category": category, "metadata": metadata, "tags": tags}]
         )
-
-        # Compute embedding for content
-        try:
-            embedding = self._compute_embedding(content)
-
-            # Add embedding to embeddings matrix
-            if self._embeddings is None:
-                self._embeddings = embedding.reshape(1, -1)
-            else:
-                self._embeddings = np.vstack([self._embeddings, embedding])
-
-            logger.debug(f"[VectorBasedMemoryStorage] Computed embedding for memory #{memory_id}")
-
-        except Exception as e:
-            logger.error(f"[VectorBasedMemoryStorage] Failed to compute embedding: {e}")
-            # Continue without embedding (will fall back to keyword search)
-
-        self.memories.append(memory)
-        self._save_data()
+        memory_id = result["memory_ids"][0]
 
         logger.info(
             f"[VectorBasedMemoryStorage] Stored memory #{memory_id} in category '{category}'"
@@ -237,6 +316,63 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
             "message": f"Memory stored successfully (ID: {memory_id})",
         }
 
+    def store_many(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store several memories with a single batched embedding call
+
+        Args:
+            items: Dicts with "content" and optional "category", "metadata", "tags"
+
+        Returns:
+            Result with the list of memory IDs
+        """
+        if not items:
+            return {"success": True, "memory_ids": [], "message": "Stored 0 memories"}
+
+        # Compute embeddings for all contents at once
+        embeddings = None
+        try:
+            embeddings = self._compute_embeddings([item["content"] for item in items])
+        except Exception as e:
+            logger.error(f"[VectorBasedMemoryStorage] Failed to compute embedding: {e}")
+            # Continue without embeddings (zero rows score 0; keyword fallback still works)
+
+        with self._lock:
+            memory_ids = [
+                self._records.store(
+                    content=item["content"],
+                    category=item.get("category", "general"),
+                    metadata=item.get("metadata"),
+                    tags=item.get("tags"),
+                )["memory_id"]
+                for item in items
+            ]
+            if embeddings is not None:
+                try:
+                    self._write_vectors(memory_ids, embeddings)
+                    logger.debug(
+                        f"[VectorBasedMemoryStorage] Computed embeddings for {len(memory_ids)} memories"
+                    )
+                except Exception as e:
+                    logger.error(f"[VectorBasedMemoryStorage] Failed to save embeddings: {e}")
+
+        return {
+            "success": True,
+            "memory_ids": memory_ids,
+            "message": f"Stored {len(memory_ids)} memories",
+        }
+
+    def _keyword_scores(self, query: str, memory_ids: List[int]) -> np.ndarray:
+        """Substring match scores (1.0 / 0.0) used when semantic search is unavailable"""
+        query_lower = query.lower()
+        return np.array(
+            [
+                1.0 if query_lower in self._records.get(i).get("content", "").lower() else 0.0
+                for i in memory_ids
+            ],
+            dtype=np.float32,
+        )
+
     def retrieve(
         self,
         query: Optional[str] = None,
@@ -259,73 +395,59 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         Returns:
             List of matching memories ranked by relevance
         """
-        # Start with all memories
-        candidates = list(enumerate(self.memories))
-
-        # Filter by category
-        if category:
-            candidates = [(i, m) for i, m in candidates if m.get("category") == category]
-
-        # Filter by tags
-        if tags:
-            candidates = [
-                (i, m) for i, m in candidates if any(tag in m.get("tags", []) for tag in tags)
-            ]
-
-        # If no query, return filtered results
-        if not query:
-            results = [m for _, m in candidates[-limit:]]
-            logger.info(
-                f"[VectorBasedMemoryStorage] Retrieved {len(results)} memories "
-                f"(no query, category='{category}', tags={tags})"
-            )
-            return {"success": True, "count": len(results), "memories": results}
-
-        # Semantic search with query
-        if self._embeddings is None or len(candidates) == 0:
-            # No embeddings available, fall back to keyword search
-            logger.warning(
-                "[VectorBasedMemoryStorage] No embeddings, falling back to keyword search"
-            )
-            query_lower = query.lower()
-            scored_results = [
-                (i, m, 1.0 if query_lower in m.get("content", "").lower() else 0.0)
-                for i, m in candidates
-            ]
-        else:
+        # Embed the query before taking the lock: the model call is the slow part
+        query_embedding = None
+        if query and self._vectors is not None:
             try:
-                # Compute query embedding
-                query_embedding = self._compute_embedding(query)
+                query_embedding = np.asarray(self._compute_embedding(query), dtype=np.float32)
+                query_embedding /= np.linalg.norm(query_embedding) + 1e-8
+            except Exception as e:
+                logger.error(f"[VectorBasedMemoryStorage] Semantic search failed: {e}")
 
-                # Get embeddings for candidate memories
-                candidate_indices = [i for i, _ in candidates]
-                candidate_embeddings = self._embeddings[candidate_indices]
+        with self._lock:
+            # Candidate IDs from the category/tag indexes
+            candidate_ids = self._records.matching_ids(category, tags)
 
-                # Compute similarities
-                similarities = self._compute_similarity(query_embedding, candidate_embeddings)
+            # If no query, return filtered results
+            if not query:
+                results = [self._records.get(i) for i in candidate_ids[-limit:]]
+                logger.info(
+                    f"[VectorBasedMemoryStorage] Retrieved {len(results)} memories "
+                    f"(no query, category='{category}', tags={tags})"
+                )
+                return {"success": True, "count": len(results), "memories": results}
 
-                # Create scored results
-                scored_results = [
-                    (idx, mem, float(sim)) for (idx, mem), sim in zip(candidates, similarities)
-                ]
+            if not candidate_ids or limit <= 0:
+                return {"success": True, "count": 0, "memories": []}
+
+            # Semantic search with query
+            if self._vectors is None:
+                # No embeddings available, fall back to keyword search
+                logger.warning(
+                    "[VectorBasedMemoryStorage] No embeddings, falling back to keyword search"
+                )
+                scores = self._keyword_scores(query, candidate_ids)
+            elif query_embedding is None:
+                # Query embedding failed, fall back to keyword search
+                scores = self._keyword_scores(query, candidate_ids)
+            else:
+                rows = np.asarray(candidate_ids) - 1
+                scores = self._similarities(
+                    rows, query_embedding, every_memory=not category and not tags
+                )
 
                 logger.debug(
                     f"[VectorBasedMemoryStorage] Computed semantic similarities "
-                    f"(top score: {max(similarities):.3f})"
+                    f"(top score: {scores.max():.3f})"
                 )
 
-            except Exception as e:
-                logger.error(f"[VectorBasedMemoryStorage] Semantic search failed: {e}")
-                # Fall back to keyword search
-                query_lower = query.lower()
-                scored_results = [
-                    (i, m, 1.0 if query_lower in m.get("content", "").lower() else 0.0)
-                    for i, m in candidates
-                ]
-
-        # Sort by score and take top results
-        scored_results.sort(key=lambda x: x[2], reverse=True)
-        results = [{**mem, "_score": score} for _, mem, score in scored_results[:limit]]
+            # Select top results without sorting all scores
+            k = min(limit, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            results = [
+                {**self._records.get(candidate_ids[i]), "_score": float(scores[i])} for i in top
+            ]
 
         logger.info(
             f"[VectorBasedMemoryStorage] Retrieved {len(results)} memories "
@@ -334,6 +456,38 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
 
         return {"success": True, "count": len(results), "memories": results}
 
+    def _similarities(
+        self, rows: np.ndarray, query_embedding: np.ndarray, every_memory: bool
+    ) -> np.ndarray:
+        """
+        Cosine similarities of the query with the stored vectors (caller holds the lock)
+
+        AICODE-NOTE: Fancy indexing a memmap copies the selected rows into RAM.
+        Without a filter the product runs over the file itself; filtered
+        candidates are read in chunks of _SCORE_CHUNK_ROWS rows.
+
+        Args:
+            rows: Vector rows of the candidates in ascending order
+            query_embedding: Normalized query embedding
+            every_memory: Whether the candidates are all memories (no filter)
+
+        Returns:
+            Score per candidate (0 for rows not in the vectors file)
+        """
+        scores = np.zeros(len(rows), dtype=np.float32)
+        in_file = np.flatnonzero(rows < self._vectors.shape[0])
+        if not len(in_file):
+            return scores
+        # Stored vectors are unit length: cosine similarity is a dot product
+        if every_memory:
+            end = rows[in_file[-1]] + 1
+            scores[in_file] = (self._vectors[:end] @ query_embedding)[rows[in_file]]
+        else:
+            for start in range(0, len(in_file), _SCORE_CHUNK_ROWS):
+                chunk = in_file[start : start + _SCORE_CHUNK_ROWS]
+                scores[chunk] = self._vectors[rows[chunk]] @ query_embedding
+        return scores
+
     def search(self, query: str, limit: int = 5) -> Dict[str, Any]:
         """
         Search memories using semantic similarity
@@ -357,11 +511,7 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         Returns:
             All memories (up to limit)
         """
-        results = self.memories.copy()
-        if limit:
-            results = results[-limit:]
-
-        return {"success": True, "count": len(results), "memories": results}
+        return self._records.list_all(limit)
 
     def list_categories(self) -> Dict[str, Any]:
         """
@@ -370,18 +520,7 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         Returns:
             List of categories with counts
         """
-        categories: Dict[str, int] = {}
-
-        for memory in self.memories:
-            cat = memory.get("category", "general")
-            categories[cat] = categories.get(cat, 0) + 1
-
-        return {
-            "success": True,
-            "categories": [
-                {"name": cat, "count": count} for cat, count in sorted(categories.items())
-            ],
-        }
+        return self._records.list_categories()
 
     def delete(self, memory_id: int) -> Dict[str, Any]:
         """
@@ -395,24 +534,14 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         Returns:
             Result of deletion
         """
-        # Find memory index
-        memory_index = None
-        for i, m in enumerate(self.memories):
-            if m.get("id") == memory_id:
-                memory_index = i
-                break
-
-        if memory_index is None:
-            return {"success": False, "error": f"Memory {memory_id} not found"}
+        with self._lock:
+            result = self._records.delete(memory_id)
+            if not result.get("success"):
+                return result
 
-        # Remove memory
-        self.memories.pop(memory_index)
+            # Remove corresponding embedding
+            self._zero_vectors([memory_id])
 
-        # Remove corresponding embedding
-        if self._embeddings is not None and memory_index < len(self._embeddings):
-            self._embeddings = np.delete(self._embeddings, memory_index, axis=0)
-
-        self._save_data()
         logger.info(f"[VectorBasedMemoryStorage] Deleted memory #{memory_id}")
 
         return {"success": True, "message": f"Memory {memory_id} deleted successfully"}
@@ -429,34 +558,17 @@ class VectorBasedMemoryStorage(BaseMemoryStorage):
         Returns:
             Result of clearing
         """
-        original_count = len(self.memories)
-
-        if category:
-            # Find indices to keep
-            indices_to_keep = [
-                i for i, m in enumerate(self.memories) if m.get("category") != category
-            ]
-
-            # Update memories
-            self.memories = [self.memories[i] for i in indices_to_keep]
-
-            # Update embeddings
-            if self._embeddings is not None:
-                self._embeddings = self._embeddings[indices_to_keep]
-
-            deleted_count = original_count - len(self.memories)
-            message = f"Cleared {deleted_count} memories from category '{category}'"
-        else:
-            # Clear all
-            self.memories = []
-            self._embeddings = None
-            message = f"Cleared all {original_count} memories"
+        with self._lock:
+            if category:
+                cleared_ids = self._records.matching_ids(category=category)
+                result = self._records.clear(category)
+                self._zero_vectors(cleared_ids)
+            else:
+                result = self._records.clear()
+                # Rows of future IDs start past the old ones; drop the file and let it regrow
+                self._vectors = None
+                self.vectors_file.unlink(missing_ok=True)
 
-        self._save_data()
-        logger.info(f"[VectorBasedMemoryStorage] {message}")
+        logger.info(f"[VectorBasedMemoryStorage] {result['message']}")
 
-        return {
-            "success": True,
-            "message": message,
-            "deleted_count": original_count - len(self.memories),
-        }
+        return result
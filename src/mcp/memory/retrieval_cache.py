@@ -0,0 +1,121 @@
+"""
+Retrieval Cache
+
+Generation-checked cache of retrieve() results for LLM-backed memory storages.
+"""
+
+import copy
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """
+    Normalize a query for cache lookups
+
+    Case, punctuation and whitespace differences do not change the key:
+    "What is my name?" and "what is  my name" are the same question.
+    """
+    return " ".join(_WORD_RE.findall((query or "").lower()))
+
+
+class RetrievalCache:
+    """
+    Per-storage cache of retrieval results
+
+    AICODE-NOTE: Every entry remembers the memory generation it was computed
+    at; the storage bumps the generation on every write (store, clear, or a
+    change of the memory directory it detects). Entries from an older
+    generation are dropped on lookup, so a stale answer is never served.
+    Each entry also records how many LLM calls producing it took, which is
+    what a hit saves.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize retrieval cache
+
+        Args:
+            max_entries: Maximum number of cached results (0 = disabled)
+        """
+        self.max_entries = max_entries
+        self.generation = 0
+        self._lock = threading.Lock()
+        # key -> (generation, result, llm calls), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[int, Dict[str, Any], int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved_llm_calls = 0
+
+    @staticmethod
+    def make_key(
+        query: Optional[str], category: Optional[str], tags: Optional[List[str]], limit: int
+    ) -> Hashable:
+        """Build the cache key of a retrieve() call"""
+        return (normalize_query(query), category or "", tuple(sorted(tags or ())), limit)
+
+    def bump(self) -> int:
+        """Invalidate every cached result (memory changed)"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            return self.generation
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached result of the current generation
+
+        Returns:
+            Copy of the result, or None on miss
+        """
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != self.generation:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_llm_calls += entry[2]
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: Hashable, result: Dict[str, Any], llm_calls: int, generation: int) -> None:
+        """
+        Cache a result
+
+        Args:
+            key: Cache key from make_key()
+            result: retrieve() result
+            llm_calls: LLM calls it took to compute
+            generation: Generation the computation started at; the result is
+                dropped if the memory changed meanwhile
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (generation, copy.deepcopy(result), llm_calls)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "saved_llm_calls": self.saved_llm_calls,
+            }
@@ -0,0 +1,161 @@
+"""
+Per-user Memory Storage Cache
+
+Bounded LRU/TTL cache of loaded storages with flush-on-evict.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from .memory_base import BaseMemoryStorage
+
+S = TypeVar("S", bound=BaseMemoryStorage)
+
+
+class UserStorageCache(Generic[S]):
+    """
+    LRU cache of per-user storages with idle expiry
+
+    AICODE-NOTE: Eviction is two-phase. collect_evictions() moves least recently
+    used (over max_size) and idle (over ttl_seconds) storages to a "closing" set;
+    the caller then runs close_evicted(user_id) serialized with that user's other
+    storage calls. Until it runs, get() hands the same object back (resurrects
+    it), so there are never two live storage objects for one user directory (two
+    JsonMemoryStorage instances would hand out the same IDs and fight over log
+    compaction). After close, the next get() misses and the caller reloads from
+    disk.
+    """
+
+    def __init__(self, max_size: int = 100, ttl_seconds: float = 3600.0):
+        """
+        Initialize storage cache
+
+        Args:
+            max_size: Maximum number of loaded storages (0 = unlimited)
+            ttl_seconds: Idle time after which a storage is evicted (0 = never)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # user_id -> (storage, last used monotonic time), least recently used first
+        self._entries: "OrderedDict[int, Tuple[S, float]]" = OrderedDict()
+        self._closing: Dict[int, S] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._entries
+
+    def items(self) -> List[Tuple[int, S]]:
+        """Snapshot of cached (user_id, storage) pairs"""
+        with self._lock:
+            return [(user_id, storage) for user_id, (storage, _) in self._entries.items()]
+
+    def get(self, user_id: int) -> Optional[S]:
+        """
+        Get a cached storage and mark it recently used
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Storage, or None if the caller has to load it
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            storage = entry[0] if entry else self._closing.pop(user_id, None)
+            if storage is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries[user_id] = (storage, time.monotonic())
+            self._entries.move_to_end(user_id)
+            return storage
+
+    def put(self, user_id: int, storage: S) -> None:
+        """Add a freshly loaded storage"""
+        with self._lock:
+            self._entries[user_id] = (storage, time.monotonic())
+            self._entries.move_to_end(user_id)
+
+    def collect_evictions(self) -> List[int]:
+        """
+        Move expired and over-capacity storages to the closing set
+
+        Returns:
+            User IDs whose storages must be passed to close_evicted()
+        """
+        evicted = []
+        with self._lock:
+            if self.ttl_seconds > 0:
+                deadline = time.monotonic() - self.ttl_seconds
+                # Entries are in last-use order: stop at the first fresh one
+                while self._entries:
+                    _, last_used = next(iter(self._entries.values()))
+                    if last_used > deadline:
+                        break
+                    evicted.append(self._evict_oldest())
+            while self.max_size > 0 and len(self._entries) > self.max_size:
+                evicted.append(self._evict_oldest())
+        return evicted
+
+    def _evict_oldest(self) -> int:
+        """Move the least recently used entry to the closing set (caller holds the lock)"""
+        user_id, (storage, _) = self._entries.popitem(last=False)
+        self._closing[user_id] = storage
+        self.evictions += 1
+        return user_id
+
+    def close_evicted(self, user_id: int) -> bool:
+        """
+        Flush and close an evicted storage unless it was used again meanwhile
+
+        Must run serialized with the user's storage calls.
+
+        Returns:
+            True if a storage was closed
+        """
+        with self._lock:
+            storage = self._closing.pop(user_id, None)
+        if storage is None:
+            return False
+        try:
+            storage.close()
+            logger.info(f"🧹 Evicted memory storage of user {user_id}")
+        except Exception as e:
+            logger.error(f"❌ Failed to close memory storage of user {user_id}: {e}")
+        return True
+
+    def close_all(self) -> None:
+        """Flush and close every storage (shutdown)"""
+        with self._lock:
+            storages = [storage for storage, _ in self._entries.values()]
+            storages.extend(self._closing.values())
+            self._entries.clear()
+            self._closing.clear()
+        for storage in storages:
+            try:
+                storage.close()
+            except Exception as e:
+                logger.error(f"❌ Failed to close memory storage: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "closing": len(self._closing),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
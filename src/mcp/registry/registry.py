@@ -4,13 +4,19 @@ MCP Server Registry
 Manages registration and discovery of MCP servers from JSON configuration files.
 """
 
+import dataclasses
 import json
+import os
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from src.mcp.tools_cache import invalidate_mcp_tools
+
 
 @dataclass
 class MCPServerSpec:
@@ -97,6 +103,181 @@ class MCPServerSpec:
         return result
 
 
+def _load_server_spec(json_file: Path, scope: str) -> Optional[MCPServerSpec]:
+    """
+    Parse and validate one server configuration file
+
+    Args:
+        json_file: JSON config file
+        scope: Scope label for logging (e.g., 'shared', 'user_123')
+
+    Returns:
+        Server spec, or None if the file is not a valid server config
+    """
+    try:
+        with open(json_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        # Skip client-style configs that use the standard MCP client format
+        # {"mcpServers": {"server-name": { ... }}}
+        if isinstance(data, dict) and "mcpServers" in data:
+            logger.info(
+                f"[MCPRegistry] Skipping {json_file}: detected client config format ('mcpServers')"
+            )
+            return None
+
+        # Create server spec
+        spec = MCPServerSpec.from_dict(data, config_file=json_file)
+
+        # Validate spec
+        if not spec.name:
+            logger.warning(f"[MCPRegistry] Skipping {json_file}: missing 'name' field")
+            return None
+
+        # Normalise transport type
+        transport = (spec.transport or "stdio").lower()
+
+        if transport not in {"stdio", "sse"}:
+            logger.warning(
+                f"[MCPRegistry] Skipping {json_file}: unsupported transport '{spec.transport}'"
+            )
+            return None
+
+        if transport == "stdio":
+            if not spec.command:
+                logger.warning(
+                    f"[MCPRegistry] Skipping {json_file}: missing 'command' field for stdio transport"
+                )
+                return None
+        elif transport == "sse":
+            if not spec.url:
+                if spec.enabled:
+                    logger.warning(
+                        f"[MCPRegistry] Skipping {json_file}: enabled SSE server missing 'url'"
+                    )
+                    return None
+                logger.info(
+                    f"[MCPRegistry] Loaded disabled SSE server '{spec.name}' without URL (scope={scope})"
+                )
+
+        spec.transport = transport
+        status = "enabled" if spec.enabled else "disabled"
+        logger.info(
+            f"[MCPRegistry] ✓ Registered server: {spec.name} "
+            f"(transport={transport}, {status}, scope={scope})"
+        )
+        return spec
+
+    except json.JSONDecodeError as e:
+        logger.error(f"[MCPRegistry] Failed to parse {json_file}: {e}")
+    except Exception as e:
+        logger.error(f"[MCPRegistry] Failed to load {json_file}: {e}")
+    return None
+
+
+FileStamp = Tuple[int, int]
+
+
+class _ConfigDirectory:
+    """
+    Parsed server configs of one directory, shared by all registries of the process
+
+    AICODE-NOTE: Registries are created per agent/request and used to re-read and
+    re-parse every JSON config on each discover_servers(). Parsed specs are now
+    kept per file together with the file's (mtime_ns, size) stamp. The directory
+    is re-listed at most once per recheck interval, and then only new or changed
+    files are parsed; within the interval discovery is a lookup of the parsed
+    specs. Tool listings are invalidated only for servers whose file changed or
+    disappeared. Writes through a registry refresh their file immediately.
+    """
+
+    def __init__(self, directory: Path, scope: str):
+        self.directory = directory
+        self.scope = scope
+        self.files: Dict[Path, Tuple[FileStamp, Optional[MCPServerSpec]]] = {}
+        self.checked_at: Optional[float] = None
+        self.parses = 0
+        self._lock = threading.Lock()
+
+    def specs(self, recheck_interval: float) -> List[MCPServerSpec]:
+        """
+        Get the valid specs of the directory, rechecking files if the interval passed
+
+        Args:
+            recheck_interval: Seconds for which the last check is trusted
+
+        Returns:
+            Parsed specs (shared: callers must copy before mutating)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.checked_at is None or now - self.checked_at >= recheck_interval:
+                self._refresh(notify=self.checked_at is not None)
+                self.checked_at = now
+            return [spec for _, spec in self.files.values() if spec is not None]
+
+    def _refresh(self, notify: bool) -> None:
+        stamps: Dict[Path, FileStamp] = {}
+        if self.directory.is_dir():
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        stamps[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = set()
+        for path in [path for path in self.files if path not in stamps]:
+            _, spec = self.files.pop(path)
+            if spec is not None:
+                logger.info(f"[MCPRegistry] Server config removed: {path}")
+                changed.add(spec.name)
+
+        for path in sorted(stamps):
+            cached = self.files.get(path)
+            if cached is not None and cached[0] == stamps[path]:
+                continue
+            spec = _load_server_spec(path, self.scope)
+            self.parses += 1
+            self.files[path] = (stamps[path], spec)
+            changed.update(s.name for s in (cached and cached[1], spec) if s is not None)
+
+        if notify:
+            for name in changed:
+                invalidate_mcp_tools(name)
+
+    def update(self, path: Path) -> None:
+        """Re-read a file written or removed through a registry"""
+        path = Path(os.path.abspath(path))
+        with self._lock:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self.files.pop(path, None)
+                return
+            spec = _load_server_spec(path, self.scope)
+            self.files[path] = ((stat.st_mtime_ns, stat.st_size), spec)
+
+
+_config_directories: Dict[str, _ConfigDirectory] = {}
+_config_directories_lock = threading.Lock()
+
+
+def _get_config_directory(directory: Path, scope: str) -> _ConfigDirectory:
+    """Get the process-wide parsed configs of a directory"""
+    key = os.path.abspath(directory)
+    with _config_directories_lock:
+        config_directory = _config_directories.get(key)
+        if config_directory is None:
+            config_directory = _config_directories[key] = _ConfigDirectory(Path(key), scope)
+        return config_directory
+
+
+def _recheck_interval() -> float:
+    from config.settings import settings
+
+    return float(settings.MCP_REGISTRY_RECHECK_INTERVAL)
+
+
 class MCPServerRegistry:
     """
     Registry for MCP servers
@@ -118,16 +299,26 @@ class MCPServerRegistry:
     }
     """
 
-    def __init__(self, servers_dir: Path, user_id: Optional[int] = None):
+    def __init__(
+        self,
+        servers_dir: Path,
+        user_id: Optional[int] = None,
+        recheck_interval: Optional[float] = None,
+    ):
         """
         Initialize registry
 
         Args:
             servers_dir: Directory containing MCP server JSON configs
             user_id: Optional user ID for per-user server discovery
+            recheck_interval: Seconds config files are trusted without checking them for
+                changes (default: MCP_REGISTRY_RECHECK_INTERVAL)
         """
         self.servers_dir = Path(servers_dir)
         self.user_id = user_id
+        self.recheck_interval = (
+            _recheck_interval() if recheck_interval is None else recheck_interval
+        )
         self.servers: Dict[str, MCPServerSpec] = {}
 
         # Ensure servers directory exists
@@ -145,8 +336,13 @@ class MCPServerRegistry:
         2. User-specific servers in servers_dir/user_{user_id}/ (if user_id is set)
 
         User-specific servers override shared servers with the same name.
+
+        Parsed configs are shared process-wide and only new or changed files are
+        parsed again, so calling this repeatedly (e.g. per request) is cheap and
+        picks up edits, additions and removals of config files.
         """
-        logger.info(f"[MCPRegistry] Discovering MCP servers in {self.servers_dir}")
+        logger.debug(f"[MCPRegistry] Discovering MCP servers in {self.servers_dir}")
+        self.servers = {}
 
         # Discover shared servers
         self._discover_from_directory(self.servers_dir, scope="shared")
@@ -154,15 +350,13 @@ class MCPServerRegistry:
         # Discover user-specific servers if user_id is set
         if self.user_id is not None:
             user_dir = self.servers_dir / f"user_{self.user_id}"
-            if user_dir.exists():
-                logger.info(
-                    f"[MCPRegistry] Discovering user-specific MCP servers for user {self.user_id}"
-                )
-                self._discover_from_directory(user_dir, scope=f"user_{self.user_id}")
-            else:
-                logger.debug(
-                    f"[MCPRegistry] No user-specific servers directory for user {self.user_id}"
-                )
+            self._discover_from_directory(user_dir, scope=f"user_{self.user_id}")
+
+    def _refresh_config_file(self, config_file: Path) -> None:
+        """Refresh the process-wide parsed config of a file written or removed here"""
+        directory = config_file.parent
+        scope = "shared" if directory == self.servers_dir else f"user_{self.user_id}"
+        _get_config_directory(directory, scope).update(config_file)
 
     def _discover_from_directory(self, directory: Path, scope: str) -> None:
         """
@@ -172,82 +366,16 @@ class MCPServerRegistry:
             directory: Directory to scan for JSON configs
             scope: Scope label for logging (e.g., 'shared', 'user_123')
         """
-        if not directory.exists():
-            logger.debug(f"[MCPRegistry] Directory does not exist: {directory}")
-            return
-
-        # Find all JSON files (non-recursive)
-        json_files = list(directory.glob("*.json"))
-
-        if not json_files:
-            logger.debug(f"[MCPRegistry] No MCP server configuration files in {directory}")
-            return
-
-        # Load each JSON file
-        for json_file in json_files:
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                # Skip client-style configs that use the standard MCP client format
-                # {"mcpServers": {"server-name": { ... }}}
-                if isinstance(data, dict) and "mcpServers" in data:
-                    logger.info(
-                        f"[MCPRegistry] Skipping {json_file}: detected client config format ('mcpServers')"
-                    )
-                    continue
-
-                # Create server spec
-                spec = MCPServerSpec.from_dict(data, config_file=json_file)
-
-                # Validate spec
-                if not spec.name:
-                    logger.warning(f"[MCPRegistry] Skipping {json_file}: missing 'name' field")
-                    continue
-
-                # Normalise transport type
-                transport = (spec.transport or "stdio").lower()
-
-                if transport not in {"stdio", "sse"}:
-                    logger.warning(
-                        f"[MCPRegistry] Skipping {json_file}: unsupported transport '{spec.transport}'"
-                    )
-                    continue
-
-                if transport == "stdio":
-                    if not spec.command:
-                        logger.warning(
-                            f"[MCPRegistry] Skipping {json_file}: missing 'command' field for stdio transport"
-                        )
-                        continue
-                elif transport == "sse":
-                    if not spec.url:
-                        if spec.enabled:
-                            logger.warning(
-                                f"[MCPRegistry] Skipping {json_file}: enabled SSE server missing 'url'"
-                            )
-                            continue
-                        logger.info(
-                            f"[MCPRegistry] Loaded disabled SSE server '{spec.name}' without URL (scope={scope})"
-                        )
-
-                # Register server (user-specific servers override shared ones)
-                if spec.name in self.servers:
-                    logger.info(
-                        f"[MCPRegistry] Overriding server '{spec.name}' with {scope} version"
-                    )
-                spec.transport = transport
-                self.servers[spec.name] = spec
-                status = "enabled" if spec.enabled else "disabled"
-                logger.info(
-                    f"[MCPRegistry] ✓ Registered server: {spec.name} "
-                    f"(transport={transport}, {status}, scope={scope})"
-                )
-
-            except json.JSONDecodeError as e:
-                logger.error(f"[MCPRegistry] Failed to parse {json_file}: {e}")
-            except Exception as e:
-                logger.error(f"[MCPRegistry] Failed to load {json_file}: {e}")
+        for spec in _get_config_directory(directory, scope).specs(self.recheck_interval):
+            # Register server (user-specific servers override shared ones)
+            if spec.name in self.servers:
+                logger.debug(f"[MCPRegistry] Overriding server '{spec.name}' with {scope} version")
+            # Each registry gets its own copy: enable/disable mutate specs
+            self.servers[spec.name] = dataclasses.replace(
+                spec,
+                args=list(spec.args),
+                env=dict(spec.env) if spec.env is not None else None,
+            )
 
     def get_server(self, name: str) -> Optional[MCPServerSpec]:
         """
@@ -366,6 +494,9 @@ class MCPServerRegistry:
 
         # Remove from registry
         del self.servers[name]
+        if spec.config_file:
+            self._refresh_config_file(spec.config_file)
+        invalidate_mcp_tools(name)
         logger.info(f"[MCPRegistry] Removed server: {name}")
         return True
 
@@ -383,5 +514,7 @@ class MCPServerRegistry:
             with open(spec.config_file, "w", encoding="utf-8") as f:
                 json.dump(spec.to_dict(), f, indent=2, ensure_ascii=False)
             logger.debug(f"[MCPRegistry] Saved config: {spec.config_file}")
+            self._refresh_config_file(spec.config_file)
+            invalidate_mcp_tools(spec.name)
         except Exception as e:
             logger.error(f"[MCPRegistry] Failed to save config for {spec.name}: {e}")
@@ -5,16 +5,47 @@ Connects MCP tools to the MCP servers registry.
 Automatically discovers and connects to enabled MCP servers.
 """
 
+import asyncio
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from config.settings import settings
+from src.core.circuit_breaker import CircuitBreaker
 from src.mcp.registry import MCPServersManager, MCPServerSpec
 
 from .client import MCPClient, MCPServerConfig
+from .session_pool import server_key
+
+# Process-wide: a server that keeps failing is skipped by every user's startup
+_server_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_server_breaker(name: str, config: MCPServerConfig) -> CircuitBreaker:
+    """
+    Get the circuit breaker of a server
+
+    Breakers are keyed by the server's transport (URL or stdio command line), so
+    users sharing a server share its state.
+
+    Args:
+        name: Server name (for logs)
+        config: Client configuration
+
+    Returns:
+        Circuit breaker of the server
+    """
+    key = server_key(config)
+    breaker = _server_breakers.get(key)
+    if breaker is None:
+        breaker = _server_breakers[key] = CircuitBreaker(
+            f"MCP server {name}",
+            failure_threshold=settings.MCP_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.MCP_CIRCUIT_RECOVERY_TIMEOUT,
+        )
+    return breaker
 
 
 class MCPRegistryClient:
@@ -36,6 +67,9 @@ class MCPRegistryClient:
         self.user_id = user_id
         self.manager = MCPServersManager(servers_dir, user_id=user_id)
         self.clients: Dict[str, MCPClient] = {}
+        # Outcome of the last connect_all_enabled() per server:
+        # connected, failed, timeout or circuit_open
+        self.last_connect_report: Dict[str, str] = {}
         self._initialized = False
 
     def initialize(self) -> None:
@@ -60,15 +94,15 @@ class MCPRegistryClient:
 
         return self.manager.get_enabled_servers()
 
-    def create_client_for_server(self, spec: MCPServerSpec) -> Optional[MCPClient]:
+    def create_config_for_server(self, spec: MCPServerSpec) -> Optional[MCPServerConfig]:
         """
-        Create an MCP client for a server spec
+        Build the client configuration for a server spec
 
         Args:
             spec: Server specification
 
         Returns:
-            MCP client or None if creation failed
+            Client configuration or None if the spec is incomplete
         """
         try:
             transport = (spec.transport or "stdio").lower()
@@ -114,81 +148,153 @@ class MCPRegistryClient:
                 )  # fastmcp.Client auto-detects stdio from command
                 logger.debug(f"[MCPRegistryClient] Created stdio client for: {spec.name}")
 
-            timeout = spec.timeout or settings.MCP_TIMEOUT
+            return config
+
+        except Exception as e:
+            logger.error(f"[MCPRegistryClient] Failed to build client config for {spec.name}: {e}")
+            return None
+
+    def create_client_for_server(self, spec: MCPServerSpec) -> Optional[MCPClient]:
+        """
+        Create an MCP client for a server spec
 
-            # Create and return client
-            client = MCPClient(config, timeout=timeout)
-            return client
+        Args:
+            spec: Server specification
 
+        Returns:
+            MCP client or None if creation failed
+        """
+        config = self.create_config_for_server(spec)
+        if config is None:
+            return None
+        try:
+            return MCPClient(config, timeout=spec.timeout or settings.MCP_TIMEOUT)
         except Exception as e:
             logger.error(f"[MCPRegistryClient] Failed to create client for {spec.name}: {e}")
             return None
 
-    async def connect_to_server(self, spec: MCPServerSpec) -> Optional[MCPClient]:
+    async def connect_to_server(
+        self, spec: MCPServerSpec, timeout: Optional[float] = None
+    ) -> Optional[MCPClient]:
         """
         Connect to an MCP server
 
+        Servers whose circuit breaker is open (failed repeatedly) are skipped
+        without a connection attempt.
+
         Args:
             spec: Server specification
+            timeout: Maximum seconds for the connection (default: no extra limit)
 
         Returns:
             Connected MCP client or None if connection failed
         """
+        return (await self._connect(spec, timeout))[0]
+
+    async def _connect(
+        self, spec: MCPServerSpec, timeout: Optional[float]
+    ) -> Tuple[Optional[MCPClient], str]:
+        """Connect to a server, returning (client, connected/failed/timeout/circuit_open)"""
         # Check if already connected
         if spec.name in self.clients:
             client = self.clients[spec.name]
             if client.is_connected:
-                return client
+                return client, "connected"
 
         # Create new client
         client = self.create_client_for_server(spec)
         if not client:
-            return None
+            return None, "failed"
+
+        breaker = get_server_breaker(spec.name, client.config)
+        if not breaker.allow():
+            logger.info(
+                f"[MCPRegistryClient] Skipping server {spec.name}: marked as down, "
+                f"next attempt in {breaker.retry_in():.0f}s"
+            )
+            return None, "circuit_open"
 
         # Connect
         try:
-            if await client.connect():
+            if await asyncio.wait_for(client.connect(), timeout=timeout):
+                breaker.record_success()
                 self.clients[spec.name] = client
                 logger.info(f"[MCPRegistryClient] ✓ Connected to server: {spec.name}")
-                return client
+                return client, "connected"
             else:
+                breaker.record_failure()
                 logger.warning(
                     f"[MCPRegistryClient] Failed to connect to server: {spec.name}. "
                     f"Check if the server command '{spec.command}' is available and the server is running."
                 )
-                return None
+                return None, "failed"
+        except asyncio.CancelledError:
+            # Give back a half-open trial, otherwise the server stays skipped for good
+            breaker.cancel_trial()
+            await client.disconnect()
+            raise
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            logger.warning(
+                f"[MCPRegistryClient] Timed out connecting to server {spec.name} after {timeout}s"
+            )
+            await client.disconnect()
+            return None, "timeout"
         except Exception as e:
+            breaker.record_failure()
             logger.error(
                 f"[MCPRegistryClient] Error connecting to server {spec.name}: {e}", exc_info=True
             )
-            return None
+            return None, "failed"
 
-    async def connect_all_enabled(self) -> Dict[str, MCPClient]:
+    async def connect_all_enabled(self, timeout: Optional[float] = None) -> Dict[str, MCPClient]:
         """
         Connect to all enabled MCP servers
 
+        AICODE-NOTE: Servers are connected concurrently, each bounded by its own
+        timeout, so startup takes as long as the slowest healthy server instead
+        of the sum of all connection times. Failed servers do not fail the call:
+        the connected subset is returned and every server's outcome is kept in
+        last_connect_report. Servers failing repeatedly are skipped by later
+        startups (of any user) until their circuit breaker allows a retry.
+
+        Args:
+            timeout: Maximum seconds per server (default: MCP_CONNECT_TIMEOUT)
+
         Returns:
-            Dict of server name -> connected client
+            Dict of server name -> connected client (servers that connected)
         """
         if not self._initialized:
             self.initialize()
 
         enabled_servers = self.get_enabled_servers()
+        self.last_connect_report = {}
 
         if not enabled_servers:
             logger.info("[MCPRegistryClient] No enabled MCP servers found")
             return {}
 
+        if timeout is None:
+            timeout = settings.MCP_CONNECT_TIMEOUT or None
+
         logger.info(f"[MCPRegistryClient] Connecting to {len(enabled_servers)} enabled servers...")
 
+        results = await asyncio.gather(*(self._connect(spec, timeout) for spec in enabled_servers))
+
         connected = {}
-        for spec in enabled_servers:
-            client = await self.connect_to_server(spec)
+        for spec, (client, status) in zip(enabled_servers, results):
+            self.last_connect_report[spec.name] = status
             if client:
                 connected[spec.name] = client
 
+        failed = {
+            name: status
+            for name, status in self.last_connect_report.items()
+            if status != "connected"
+        }
         logger.info(
             f"[MCPRegistryClient] Connected to {len(connected)} / {len(enabled_servers)} servers"
+            + (f", unavailable: {failed}" if failed else "")
         )
         return connected
 
@@ -0,0 +1,278 @@
+"""
+MCP Session Pool
+
+Per-process pool of connected MCP client sessions shared by all agents.
+"""
+
+import asyncio
+import dataclasses
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import settings
+
+from .client import MCPClient, MCPServerConfig
+from .tools_cache import config_fingerprint
+
+
+class MCPServerUnavailable(Exception):
+    """Server could not be connected (or is in reconnect backoff)"""
+
+
+def server_key(config: MCPServerConfig) -> str:
+    """Pool key of a server: its URL/transport or full stdio command line"""
+    return config_fingerprint(dataclasses.asdict(config))
+
+
+class _ServerSessions:
+    """Sessions of one server"""
+
+    def __init__(self, name: str, max_sessions: int):
+        self.name = name
+        self.semaphore = asyncio.Semaphore(max_sessions)
+        # (client, last used monotonic time); most recently used last
+        self.idle: List[Tuple[MCPClient, float]] = []
+        self.in_use = 0
+        self.failures = 0
+        self.retry_at = 0.0
+        self.connects = 0
+        self.borrows = 0
+
+
+class MCPSessionPool:
+    """
+    Pool of connected MCP sessions keyed by server URL/transport
+
+    AICODE-NOTE: Tools used to open a new MCPClient (an SSE/HTTP handshake or a
+    stdio subprocess) for discovery and often per call. Callers now borrow a
+    connected client with "async with pool.session(config)" and give it back:
+    - at most max_sessions_per_server sessions per server are lent at a time,
+      further callers wait (bounded concurrency per server);
+    - a session idle for more than health_check_interval is pinged before it
+      is lent again, and dropped if the ping fails;
+    - a failed connect puts the server into exponential backoff; until it
+      ends, borrowing fails fast with MCPServerUnavailable;
+    - sessions idle for more than idle_timeout are disconnected by a sweeper
+      task that runs while there are idle sessions.
+    MCP sessions are bound to the event loop they were opened on, so there is
+    one pool per running loop (get_session_pool()).
+    """
+
+    def __init__(
+        self,
+        max_sessions_per_server: int = 4,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        """
+        Initialize session pool
+
+        Args:
+            max_sessions_per_server: Sessions lent at the same time per server
+            idle_timeout: Seconds after which an unused session is disconnected
+            health_check_interval: Idle seconds after which a session is pinged before reuse
+            backoff_base: First reconnect delay after a failed connect (doubles per failure)
+            backoff_max: Maximum reconnect delay
+        """
+        self.max_sessions_per_server = max(1, max_sessions_per_server)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._servers: Dict[str, _ServerSessions] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self.evicted = 0
+
+    def _get_server(self, config: MCPServerConfig) -> _ServerSessions:
+        key = server_key(config)
+        server = self._servers.get(key)
+        if server is None:
+            name = config.url or " ".join([config.command, *config.args])
+            server = self._servers[key] = _ServerSessions(name, self.max_sessions_per_server)
+        return server
+
+    async def _checkout(
+        self, server: _ServerSessions, config: MCPServerConfig, timeout: Optional[int]
+    ) -> MCPClient:
+        while server.idle:
+            client, last_used = server.idle.pop()
+            if client.is_connected and (
+                time.monotonic() - last_used < self.health_check_interval or await client.ping()
+            ):
+                return client
+            logger.info(f"[MCPSessionPool] Dropping unhealthy session to {server.name}")
+            await client.disconnect()
+
+        now = time.monotonic()
+        if now < server.retry_at:
+            raise MCPServerUnavailable(
+                f"MCP server {server.name} is unavailable, next reconnect attempt in "
+                f"{server.retry_at - now:.0f}s"
+            )
+
+        client = MCPClient(config, timeout=timeout or settings.MCP_TIMEOUT)
+        server.connects += 1
+        try:
+            connected = await client.connect()
+        except asyncio.CancelledError:
+            # e.g. a connect timeout of the caller: do not leak a half-open connection
+            await client.disconnect()
+            raise
+        if connected:
+            server.failures = 0
+            server.retry_at = 0.0
+            return client
+
+        server.failures += 1
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (server.failures - 1))
+        server.retry_at = time.monotonic() + delay
+        raise MCPServerUnavailable(
+            f"Failed to connect to MCP server {server.name} "
+            f"(attempt {server.failures}, retrying in {delay:.0f}s)"
+        )
+
+    @asynccontextmanager
+    async def session(
+        self, config: MCPServerConfig, timeout: Optional[int] = None
+    ) -> AsyncIterator[MCPClient]:
+        """
+        Borrow a connected client for a server
+
+        Args:
+            config: Server configuration
+            timeout: Request timeout for a newly created client (default: MCP_TIMEOUT)
+
+        Yields:
+            Connected MCP client (do not disconnect it)
+
+        Raises:
+            MCPServerUnavailable: If the server cannot be connected
+        """
+        server = self._get_server(config)
+        async with server.semaphore:
+            client = await self._checkout(server, config, timeout)
+            server.in_use += 1
+            server.borrows += 1
+            try:
+                yield client
+            finally:
+                server.in_use -= 1
+                if client.is_connected:
+                    server.idle.append((client, time.monotonic()))
+                    self._ensure_sweeper()
+                else:
+                    await client.disconnect()
+
+    async def call_tool(
+        self,
+        config: MCPServerConfig,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Call a tool on a pooled session
+
+        Returns:
+            MCPClient.call_tool result, or {"success": False, "error": ...} if
+            the server is unavailable
+        """
+        try:
+            async with self.session(config, timeout) as client:
+                return await client.call_tool(tool_name, arguments, timeout=timeout)
+        except MCPServerUnavailable as e:
+            return {"success": False, "error": str(e)}
+
+    async def list_tools(
+        self, config: MCPServerConfig, timeout: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        List a server's tools on a pooled session
+
+        Returns:
+            Tool schemas, or None if the server is unavailable
+        """
+        try:
+            async with self.session(config, timeout) as client:
+                return await client.list_tools()
+        except MCPServerUnavailable as e:
+            logger.warning(f"[MCPSessionPool] {e}")
+            return None
+
+    def _ensure_sweeper(self) -> None:
+        if self.idle_timeout > 0 and (self._sweeper is None or self._sweeper.done()):
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        """Evict idle sessions until none are left"""
+        while any(server.idle for server in self._servers.values()):
+            await asyncio.sleep(self.idle_timeout / 2)
+            await self.evict_idle()
+
+    async def evict_idle(self) -> int:
+        """
+        Disconnect sessions unused for longer than idle_timeout
+
+        Returns:
+            Number of sessions disconnected
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        expired = []
+        for server in self._servers.values():
+            expired.extend(client for client, last_used in server.idle if last_used <= deadline)
+            server.idle = [entry for entry in server.idle if entry[1] > deadline]
+        for client in expired:
+            await client.disconnect()
+        if expired:
+            self.evicted += len(expired)
+            logger.debug(f"[MCPSessionPool] Evicted {len(expired)} idle session(s)")
+        return len(expired)
+
+    async def close_all(self) -> None:
+        """Disconnect all idle sessions and stop the sweeper"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for server in self._servers.values():
+            idle, server.idle = server.idle, []
+            for client, _ in idle:
+                await client.disconnect()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool statistics per server"""
+        return {
+            "evicted": self.evicted,
+            "servers": {
+                server.name: {
+                    "idle": len(server.idle),
+                    "in_use": server.in_use,
+                    "connects": server.connects,
+                    "borrows": server.borrows,
+                    "failures": server.failures,
+                }
+                for server in self._servers.values()
+            },
+        }
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_session_pool() -> MCPSessionPool:
+    """Get or create the session pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = MCPSessionPool(
+            max_sessions_per_server=settings.MCP_SESSION_POOL_SIZE,
+            idle_timeout=settings.MCP_SESSION_IDLE_TIMEOUT,
+        )
+    return pool
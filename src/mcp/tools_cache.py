@@ -0,0 +1,149 @@
+"""
+MCP Tools Cache
+
+Process-wide cache of MCP server tool listings.
+"""
+
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.core.singleflight import SingleFlight, make_key
+
+ToolListing = List[Dict[str, Any]]
+
+
+def config_fingerprint(config: Any) -> str:
+    """
+    Build a stable fingerprint of a server configuration
+
+    Args:
+        config: JSON-serializable configuration (spec dict, URL)
+
+    Returns:
+        Fingerprint string; a different one means the configuration changed
+    """
+    return json.dumps(config, sort_keys=True, default=str)
+
+
+class MCPToolsCache:
+    """
+    Tool listings per (server, user)
+
+    AICODE-NOTE: Building an MCP tools description used to connect to the hub
+    or to every registry server and call list_tools for each new agent. Listings
+    are now kept per (server name, user ID) together with a fingerprint of the
+    server configuration they were fetched with: an entry is reused until its TTL
+    expires or the configuration differs (server edited, MCP_HUB_URL changed).
+    The registry calls invalidate() when a server is added, saved or removed.
+    Concurrent loads of the same listing share one connection (SingleFlight).
+    Failed loads (None) are not cached. Listings are shared between callers and
+    must not be mutated.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        """
+        Initialize tools cache
+
+        Args:
+            ttl_seconds: Lifetime of a listing in seconds (0 = no caching)
+        """
+        self.ttl_seconds = ttl_seconds
+        # (server, user_id) -> (fingerprint, tools, expires at monotonic time)
+        self._entries: Dict[Tuple[str, Optional[int]], Tuple[str, ToolListing, float]] = {}
+        self._flights = SingleFlight("mcp_list_tools")
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get_or_load(
+        self,
+        server: str,
+        user_id: Optional[int],
+        fingerprint: str,
+        load: Callable[[], Awaitable[Optional[ToolListing]]],
+    ) -> Optional[ToolListing]:
+        """
+        Get a server's tool listing, loading it on miss
+
+        Args:
+            server: Server name
+            user_id: User the listing was discovered for
+            fingerprint: Fingerprint of the server configuration (config_fingerprint)
+            load: Coroutine factory connecting to the server and listing its tools;
+                returns None if the server is unavailable
+
+        Returns:
+            Tool listing, or None if the server is unavailable
+        """
+        key = (server, user_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint and entry[2] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        tools = await self._flights.do(
+            make_key("list_tools", user_id, server=server, fingerprint=fingerprint), load
+        )
+        if tools is not None and self.ttl_seconds > 0:
+            self._entries[key] = (fingerprint, tools, time.monotonic() + self.ttl_seconds)
+        return tools
+
+    def invalidate(self, server: Optional[str] = None) -> int:
+        """
+        Drop cached listings
+
+        Args:
+            server: Server name (all users), or None to drop everything
+
+        Returns:
+            Number of listings dropped
+        """
+        if server is None:
+            keys = list(self._entries)
+        else:
+            keys = [key for key in self._entries if key[0] == server]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            self.invalidations += len(keys)
+            logger.debug(f"[MCPToolsCache] Invalidated {len(keys)} listing(s) of {server or 'all'}")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+_tools_cache: Optional[MCPToolsCache] = None
+
+
+def get_tools_cache() -> MCPToolsCache:
+    """Get or create the process-wide tools cache"""
+    global _tools_cache
+
+    if _tools_cache is None:
+        from config.settings import settings
+
+        _tools_cache = MCPToolsCache(ttl_seconds=settings.MCP_TOOLS_CACHE_TTL)
+    return _tools_cache
+
+
+def invalidate_mcp_tools(server: Optional[str] = None) -> None:
+    """
+    Drop cached tool listings after an MCP configuration change
+
+    Args:
+        server: Changed server name, or None if anything may have changed
+    """
+    if _tools_cache is not None:
+        _tools_cache.invalidate(server)
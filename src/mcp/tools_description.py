@@ -5,16 +5,138 @@ Generates human-readable descriptions of available MCP servers and their tools.
 This is used to inform LLMs about available MCP tools in their system prompts.
 """
 
+import asyncio
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from config.settings import settings
 
-from .client import MCPClient, MCPServerConfig
-from .registry_client import MCPRegistryClient
+from .client import MCPServerConfig
+from .registry_client import MCPRegistryClient, get_server_breaker
+from .session_pool import get_session_pool, server_key
+from .tools_cache import get_tools_cache
+
+
+def get_mcp_server_configs(
+    user_id: Optional[int] = None, servers_dir: Optional[Path] = None
+) -> Dict[str, Tuple[MCPServerConfig, int]]:
+    """
+    Get client configurations of the MCP servers available to a user
+
+    Docker mode (MCP_HUB_URL set) uses only the MCP Hub; standalone mode uses the
+    enabled servers of the local registry (shared + per-user).
+
+    Args:
+        user_id: Optional user ID for per-user MCP server discovery
+        servers_dir: Optional custom servers directory
+
+    Returns:
+        Dict of server name -> (client configuration, request timeout)
+    """
+    mcp_hub_url = os.getenv("MCP_HUB_URL")
+    if mcp_hub_url:
+        # fastmcp.Client auto-detects transport from URL
+        return {"mcp-hub": (MCPServerConfig(url=mcp_hub_url), settings.MCP_TIMEOUT)}
+
+    registry_client = MCPRegistryClient(servers_dir=servers_dir, user_id=user_id)
+    registry_client.initialize()
+    configs = {}
+    for spec in registry_client.get_enabled_servers():
+        config = registry_client.create_config_for_server(spec)
+        if config is not None:
+            configs[spec.name] = (config, spec.timeout or settings.MCP_TIMEOUT)
+    return configs
+
+
+async def get_server_tools(
+    server_name: str, config: MCPServerConfig, user_id: Optional[int], timeout: int
+) -> Optional[List[Dict]]:
+    """
+    Get a server's tool listing from the tools cache, listing it on a pooled session on miss
+
+    Args:
+        server_name: Server name
+        config: Client configuration
+        user_id: User the server was discovered for
+        timeout: Request timeout
+
+    Returns:
+        Tool schemas, or None if the server is unavailable
+    """
+    return await get_tools_cache().get_or_load(
+        server_name,
+        user_id,
+        server_key(config),
+        lambda: _load_server_tools(server_name, config, timeout),
+    )
+
+
+async def _load_server_tools(
+    server_name: str, config: MCPServerConfig, timeout: int
+) -> Optional[List[Dict]]:
+    """
+    List a server's tools on a pooled session, within MCP_CONNECT_TIMEOUT
+
+    AICODE-NOTE: This is the connect path of agent startup, so it shares the
+    server's circuit breaker with MCPRegistryClient: a server that keeps failing
+    or hanging is skipped without a connection attempt until a trial is due.
+    """
+    breaker = get_server_breaker(server_name, config)
+    if not breaker.allow():
+        logger.info(
+            f"[MCPToolsDescription] Skipping server {server_name}: marked as down, "
+            f"next attempt in {breaker.retry_in():.0f}s"
+        )
+        return None
+
+    try:
+        tools = await asyncio.wait_for(
+            get_session_pool().list_tools(config, timeout),
+            timeout=settings.MCP_CONNECT_TIMEOUT or None,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"[MCPToolsDescription] Timed out listing tools of {server_name} "
+            f"after {settings.MCP_CONNECT_TIMEOUT}s"
+        )
+        tools = None
+    except asyncio.CancelledError:
+        breaker.cancel_trial()
+        raise
+
+    if tools is None:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return tools
+
+
+async def get_all_server_tools(
+    server_configs: Dict[str, Tuple[MCPServerConfig, int]], user_id: Optional[int]
+) -> Dict[str, Optional[List[Dict]]]:
+    """
+    Get the tool listings of several servers concurrently
+
+    Startup then takes as long as the slowest server (at most MCP_CONNECT_TIMEOUT)
+    instead of the sum of all of them.
+
+    Args:
+        server_configs: Server name -> (client configuration, request timeout)
+        user_id: User the servers were discovered for
+
+    Returns:
+        Dict of server name -> tool schemas, or None if the server is unavailable
+    """
+    listings = await asyncio.gather(
+        *(
+            get_server_tools(server_name, config, user_id, timeout)
+            for server_name, (config, timeout) in server_configs.items()
+        )
+    )
+    return dict(zip(server_configs, listings))
 
 
 async def get_mcp_tools_description(
@@ -25,9 +147,9 @@ async def get_mcp_tools_description(
 
     This function:
     1. Discovers available MCP servers (shared + per-user)
-    2. Connects to enabled servers
-    3. Queries each server for available tools
-    4. Generates a formatted description for use in LLM prompts
+    2. Gets the enabled servers' tools from the process-wide tools cache,
+       concurrently listing servers whose listing is missing or stale (on pooled sessions)
+    3. Generates a formatted description for use in LLM prompts
 
     Args:
         user_id: Optional user ID for per-user MCP server discovery
@@ -37,38 +159,23 @@ async def get_mcp_tools_description(
         Formatted description of MCP tools, or empty string if no tools available
     """
     try:
-        # Docker mode: connect directly to MCP Hub via HTTP/SSE and avoid local registry
-        mcp_hub_url = os.getenv("MCP_HUB_URL")
-        connected_clients: Dict[str, MCPClient] = {}
-
-        if mcp_hub_url:
-            try:
-                client = MCPClient(
-                    MCPServerConfig(url=mcp_hub_url), timeout=settings.MCP_TIMEOUT
-                )  # fastmcp.Client auto-detects transport from URL
-                if await client.connect():
-                    connected_clients["mcp-hub"] = client
-                else:
-                    logger.warning(
-                        f"[MCPToolsDescription] Failed to connect to MCP Hub at {mcp_hub_url}. "
-                        f"Check if the MCP Hub server is running and accessible."
-                    )
-            except Exception as e:
-                logger.error(
-                    f"[MCPToolsDescription] Error connecting to MCP Hub at {mcp_hub_url}: {e}. "
+        server_tools: Dict[str, List[Dict]] = {}
+        server_configs = get_mcp_server_configs(user_id, servers_dir)
+        listings = await get_all_server_tools(server_configs, user_id)
+        for server_name, tools in listings.items():
+            config, _ = server_configs[server_name]
+            if tools is not None:
+                server_tools[server_name] = tools
+            elif config.url and server_name == "mcp-hub":
+                logger.warning(
+                    f"[MCPToolsDescription] Failed to connect to MCP Hub at {config.url}. "
                     f"Verify that:\n"
                     f"  1. MCP Hub container/service is running\n"
                     f"  2. Network connectivity is available\n"
-                    f"  3. MCP_HUB_URL environment variable is correct: {mcp_hub_url}",
-                    exc_info=True,
+                    f"  3. MCP_HUB_URL environment variable is correct: {config.url}"
                 )
-        else:
-            # Standalone mode: discover via local registry
-            registry_client = MCPRegistryClient(servers_dir=servers_dir, user_id=user_id)
-            registry_client.initialize()
-            connected_clients = await registry_client.connect_all_enabled()
 
-        if not connected_clients:
+        if not server_tools:
             logger.debug("[MCPToolsDescription] No MCP servers connected")
             return ""
 
@@ -84,11 +191,8 @@ async def get_mcp_tools_description(
         total_tools = 0
 
         # For each connected server, list its tools
-        for server_name, client in connected_clients.items():
+        for server_name, available_tools in server_tools.items():
             try:
-                # List available tools from the MCP server
-                available_tools = await client.list_tools()
-
                 if not available_tools:
                     continue
 
@@ -141,7 +245,7 @@ async def get_mcp_tools_description(
         lines.append("---")
         lines.append("")
         lines.append(
-            f"**Total MCP tools available**: {total_tools} from {len(connected_clients)} server(s)"
+            f"**Total MCP tools available**: {total_tools} from {len(server_tools)} server(s)"
         )
         lines.append("")
         lines.append(
@@ -20,6 +20,8 @@ to trigger reindexing based on KB changes. This module provides the core functio
 from .chunking import ChunkingStrategy, DocumentChunker
 from .embeddings import BaseEmbedder, InfinityEmbedder, OpenAIEmbedder, SentenceTransformerEmbedder
 from .factory import VectorSearchFactory
+from .generations import VectorIndexGenerations
+from .jobs import IndexingJob, IndexingJobQueue, IndexingJobStatus, IndexingUploads
 from .manager import VectorSearchManager
 from .vector_stores import BaseVectorStore, FAISSVectorStore, QdrantVectorStore
 
@@ -39,4 +41,10 @@ __all__ = [
     # Manager and factory
     "VectorSearchManager",
     "VectorSearchFactory",
+    "VectorIndexGenerations",
+    # Background indexing
+    "IndexingJob",
+    "IndexingJobQueue",
+    "IndexingJobStatus",
+    "IndexingUploads",
 ]
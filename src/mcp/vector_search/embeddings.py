@@ -3,8 +3,10 @@ Embedding Models
 Supports multiple embedding backends: sentence-transformers, OpenAI API, Infinity API
 """
 
+import asyncio
 import hashlib
 import json
+import threading
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
@@ -48,6 +50,13 @@ class BaseEmbedder(ABC):
         """Get the dimension of embeddings"""
         pass
 
+    async def warmup(self) -> None:
+        """
+        Load model weights ahead of the first request
+
+        Remote embedders have nothing to load, so the default is a no-op.
+        """
+
     def get_model_hash(self) -> str:
         """Get a hash identifying the model configuration"""
         config = {"model_type": self.__class__.__name__, "model_name": self.model_name}
@@ -68,18 +77,26 @@ class SentenceTransformerEmbedder(BaseEmbedder):
         super().__init__(model_name)
         self._model = None
         self._dimension: Optional[int] = None
+        # Warmup loads the model in a worker thread; a concurrent request must not load it twice
+        self._load_lock = threading.Lock()
 
     def _load_model(self):
         """Lazy load the model"""
-        if self._model is None:
+        if self._model is not None:
+            return
+        with self._load_lock:
+            if self._model is not None:
+                return
             try:
                 from sentence_transformers import SentenceTransformer
 
                 logger.info(f"Loading sentence-transformer model: {self.model_name}")
-                self._model = SentenceTransformer(self.model_name)
+                model = SentenceTransformer(self.model_name)
                 # Get dimension from first embedding
-                test_emb = self._model.encode(["test"], show_progress_bar=False)
+                test_emb = model.encode(["test"], show_progress_bar=False)
                 self._dimension = len(test_emb[0])
+                # Publish the model last so other threads never see it without a dimension
+                self._model = model
                 logger.info(f"Model loaded. Dimension: {self._dimension}")
             except ImportError:
                 raise ImportError(
@@ -87,6 +104,10 @@ class SentenceTransformerEmbedder(BaseEmbedder):
                     "Install with: pip install sentence-transformers"
                 )
 
+    async def warmup(self) -> None:
+        """Load the model in a worker thread without blocking the event loop"""
+        await asyncio.to_thread(self._load_model)
+
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """Embed multiple texts"""
         self._load_model()
@@ -0,0 +1,106 @@
+"""
+Vector Index Generations
+Per-knowledge-base coordination between searches and index writers
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from loguru import logger
+
+from .manager import VectorSearchManager
+
+
+class VectorIndexGenerations:
+    """
+    Holds the published index generation of every knowledge base
+
+    AICODE-NOTE: Readers never wait. A search takes the currently published
+    VectorSearchManager and keeps using it even if a writer publishes a new one
+    in the meantime. Writers for the same KB are serialized by a per-KB lock;
+    each writer mutates a staged clone of the current generation and the clone is
+    swapped in atomically once the write completes. Neither the published files
+    nor the published store contents change before that (see
+    VectorSearchManager.commit and BaseVectorStore.clone). Writers for different KBs
+    run independently.
+    """
+
+    def __init__(self):
+        self._current: Dict[str, VectorSearchManager] = {}
+        self._write_locks: Dict[str, asyncio.Lock] = {}
+
+    def get(self, kb_id: str) -> Optional[VectorSearchManager]:
+        """
+        Get the currently published generation for a knowledge base
+
+        Args:
+            kb_id: Knowledge base ID
+
+        Returns:
+            VectorSearchManager or None if the KB is not loaded
+        """
+        return self._current.get(kb_id)
+
+    def publish(self, kb_id: str, manager: VectorSearchManager) -> None:
+        """
+        Make a manager the current generation for a knowledge base
+
+        Args:
+            kb_id: Knowledge base ID
+            manager: Fully initialized manager
+        """
+        self._current[kb_id] = manager
+
+    def write_lock(self, kb_id: str) -> asyncio.Lock:
+        """Get the lock that serializes writers of a knowledge base"""
+        lock = self._write_locks.get(kb_id)
+        if lock is None:
+            lock = self._write_locks[kb_id] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def write(self, kb_id: str) -> AsyncIterator[VectorSearchManager]:
+        """
+        Stage a new generation of a knowledge base index
+
+        Yields a clone of the current generation. When the block exits normally the
+        clone is committed (saved into its own generation directory, store changes
+        published) and swapped in; if the block raises, its changes are discarded.
+
+        Args:
+            kb_id: Knowledge base ID (must already be loaded)
+
+        Yields:
+            Staged VectorSearchManager to mutate
+        """
+        async with self.write_lock(kb_id):
+            current = self._current.get(kb_id)
+            if current is None:
+                raise KeyError(f"Vector index for KB '{kb_id}' is not loaded")
+
+            staged = current.clone()
+            try:
+                yield staged
+                await staged.commit()
+            except BaseException:
+                try:
+                    await staged.discard()
+                except Exception as e:
+                    logger.warning(f"Failed to discard staged vector index for KB '{kb_id}': {e}")
+                raise
+
+            self._current[kb_id] = staged
+            logger.debug(f"Published vector index generation {staged.generation} for KB '{kb_id}'")
+            # Searches still running on the old generation only use its in-memory state
+            await current.retire()
+
+    def kb_ids(self) -> List[str]:
+        """IDs of loaded knowledge bases"""
+        return list(self._current)
+
+    def __contains__(self, kb_id: str) -> bool:
+        return kb_id in self._current
+
+    def __len__(self) -> int:
+        return len(self._current)
@@ -0,0 +1,490 @@
+"""
+Indexing Jobs
+Background queue for vector indexing operations with progress tracking and restart recovery
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+class IndexingJobStatus(str, Enum):
+    """Lifecycle states of an indexing job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+FINISHED_STATUSES = (IndexingJobStatus.COMPLETED, IndexingJobStatus.FAILED)
+
+
+@dataclass
+class IndexingJob:
+    """
+    Vector indexing job
+
+    Attributes:
+        job_id: Unique job identifier
+        kb_id: Knowledge base the job writes to
+        operation: Operation name (reindex, add, update, delete)
+        payload: Operation arguments (documents, document_ids, force)
+        user_id: User who requested the job (optional)
+        status: Current job status
+        items_total: Number of documents (or document IDs) to process
+        items_done: Number of documents processed so far
+        result: Operation statistics once completed
+        error: Error message if the job failed
+        created_at: Submission timestamp (unix seconds)
+        started_at: Start timestamp (unix seconds)
+        finished_at: Completion timestamp (unix seconds)
+    """
+
+    job_id: str
+    kb_id: str
+    operation: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    user_id: Optional[int] = None
+    status: IndexingJobStatus = IndexingJobStatus.QUEUED
+    items_total: int = 0
+    items_done: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has completed or failed"""
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self, include_payload: bool = False) -> Dict[str, Any]:
+        """
+        Convert job to dictionary
+
+        Args:
+            include_payload: Include operation arguments (used for persistence)
+
+        Returns:
+            Job state dictionary
+        """
+        data = {
+            "job_id": self.job_id,
+            "kb_id": self.kb_id,
+            "operation": self.operation,
+            "user_id": self.user_id,
+            "status": self.status.value,
+            "progress": {
+                "items_total": self.items_total,
+                "items_done": self.items_done,
+                "percent": (
+                    round(100.0 * self.items_done / self.items_total, 1)
+                    if self.items_total
+                    else (100.0 if self.finished else 0.0)
+                ),
+            },
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if include_payload:
+            data["payload"] = self.payload
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndexingJob":
+        """Restore job from its persisted dictionary"""
+        progress = data.get("progress", {})
+        return cls(
+            job_id=data["job_id"],
+            kb_id=data["kb_id"],
+            operation=data["operation"],
+            payload=data.get("payload") or {},
+            user_id=data.get("user_id"),
+            status=IndexingJobStatus(data.get("status", IndexingJobStatus.QUEUED.value)),
+            items_total=progress.get("items_total", 0),
+            items_done=progress.get("items_done", 0),
+            result=data.get("result"),
+            error=data.get("error"),
+            created_at=data.get("created_at", time.time()),
+            started_at=data.get("started_at"),
+            finished_at=data.get("finished_at"),
+        )
+
+
+# Handler receives the job and a callback reporting the number of processed items
+ProgressCallback = Callable[[int], None]
+JobHandler = Callable[[IndexingJob, ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+class IndexingJobQueue:
+    """
+    Queue of background indexing jobs
+
+    AICODE-NOTE: Jobs of the same KB run strictly one after another in submission
+    order; jobs of different KBs run in parallel, bounded by max_workers. Every job
+    is persisted to jobs_dir (with its payload until it finishes), so unfinished
+    jobs are re-queued when the hub restarts.
+
+    A submission identical to the last unfinished job of its KB (same operation
+    and payload) is coalesced into that job: the caller gets the existing job
+    instead of queueing the same work twice. Only the last job is considered so
+    that e.g. add A, delete A, add A keeps its order.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        jobs_dir: Path,
+        max_workers: int = 2,
+        history_limit: int = 100,
+    ):
+        """
+        Initialize indexing job queue
+
+        Args:
+            handler: Coroutine executing a job and returning its statistics
+            jobs_dir: Directory for persisted job files
+            max_workers: Maximum number of jobs running at the same time
+            history_limit: Number of finished jobs kept for status queries
+        """
+        self._handler = handler
+        self.jobs_dir = Path(jobs_dir)
+        self.max_workers = max(1, max_workers)
+        self.history_limit = history_limit
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: Dict[str, IndexingJob] = {}
+        self._pending: Dict[str, Deque[str]] = {}  # kb_id -> queued job IDs (FIFO)
+        self._runners: Dict[str, "asyncio.Task[None]"] = {}  # kb_id -> runner task
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._submit_lock: Optional[asyncio.Lock] = None
+        self._started = False
+        self.coalesced = 0
+
+    def start(self) -> int:
+        """
+        Load persisted jobs and resume unfinished ones
+
+        Must be called from a running event loop. Safe to call more than once.
+
+        Returns:
+            Number of resumed jobs
+        """
+        if self._started:
+            return 0
+        self._started = True
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._submit_lock = asyncio.Lock()
+
+        if not self.jobs_dir.exists():
+            return 0
+
+        jobs = []
+        for job_file in self.jobs_dir.glob("*.json"):
+            try:
+                with open(job_file, "r", encoding="utf-8") as f:
+                    jobs.append(IndexingJob.from_dict(json.load(f)))
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to load indexing job {job_file.name}: {e}")
+
+        resumed = 0
+        for job in sorted(jobs, key=lambda j: j.created_at):
+            self._jobs[job.job_id] = job
+            if job.finished:
+                continue
+            # Interrupted while running: start over from the beginning
+            job.status = IndexingJobStatus.QUEUED
+            job.items_done = 0
+            job.started_at = None
+            self._enqueue(job)
+            resumed += 1
+
+        if resumed:
+            logger.info(f"🔁 Resumed {resumed} unfinished indexing jobs")
+        return resumed
+
+    async def submit(
+        self,
+        kb_id: str,
+        operation: str,
+        payload: Dict[str, Any],
+        items_total: int = 0,
+        user_id: Optional[int] = None,
+    ) -> IndexingJob:
+        """
+        Persist and queue a new indexing job
+
+        Args:
+            kb_id: Knowledge base ID
+            operation: Operation name
+            payload: Operation arguments
+            items_total: Number of items the job will process
+            user_id: Requesting user (optional)
+
+        Returns:
+            Queued job (or the identical in-flight job it was coalesced into)
+        """
+        self.start()
+
+        # Submissions are serialized so queue order matches submission order
+        async with self._submit_lock:
+            duplicate = self._find_duplicate(kb_id, operation, payload)
+            if duplicate is not None:
+                self.coalesced += 1
+                logger.info(f"🔗 Coalesced {operation} on KB '{kb_id}' into job {duplicate.job_id}")
+                return duplicate
+
+            job = IndexingJob(
+                job_id=uuid.uuid4().hex,
+                kb_id=kb_id,
+                operation=operation,
+                payload=payload,
+                user_id=user_id,
+                items_total=items_total,
+            )
+            self._jobs[job.job_id] = job
+            await asyncio.to_thread(self._persist, job)
+            self._enqueue(job)
+
+        logger.info(f"📥 Queued indexing job {job.job_id}: {operation} on KB '{kb_id}'")
+        return job
+
+    def _find_duplicate(
+        self, kb_id: str, operation: str, payload: Dict[str, Any]
+    ) -> Optional[IndexingJob]:
+        """Return the last unfinished job of a KB if it does exactly the same work"""
+        queue = self._pending.get(kb_id)
+        if not queue:
+            return None
+        last = self._jobs.get(queue[-1])
+        if (
+            last is not None
+            and not last.finished
+            and last.operation == operation
+            and last.payload == payload
+        ):
+            return last
+        return None
+
+    def get(self, job_id: str) -> Optional[IndexingJob]:
+        """Get job by ID"""
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, kb_id: Optional[str] = None) -> List[IndexingJob]:
+        """
+        List known jobs, newest first
+
+        Args:
+            kb_id: Only list jobs of this knowledge base
+
+        Returns:
+            Jobs ordered by submission time (newest first)
+        """
+        jobs = [job for job in self._jobs.values() if kb_id is None or job.kb_id == kb_id]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[IndexingJob]:
+        """
+        Wait until a job finishes or the timeout expires
+
+        Args:
+            job_id: Job ID
+            timeout: Maximum wait in seconds (None waits indefinitely)
+
+        Returns:
+            The job in its current state, or None if unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        event = self._done_events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        counts = {status.value: 0 for status in IndexingJobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        return {
+            "max_workers": self.max_workers,
+            "jobs": counts,
+            "coalesced": self.coalesced,
+            "kbs_pending": sorted(kb_id for kb_id, queue in self._pending.items() if queue),
+        }
+
+    def _enqueue(self, job: IndexingJob) -> None:
+        """Append job to its KB queue and make sure the KB runner is active"""
+        self._pending.setdefault(job.kb_id, deque()).append(job.job_id)
+        runner = self._runners.get(job.kb_id)
+        if runner is None or runner.done():
+            self._runners[job.kb_id] = asyncio.create_task(self._run_kb(job.kb_id))
+
+    async def _run_kb(self, kb_id: str) -> None:
+        """Run queued jobs of one knowledge base sequentially"""
+        queue = self._pending[kb_id]
+        while queue:
+            job = self._jobs[queue[0]]
+            async with self._semaphore:
+                await self._run_job(job)
+            queue.popleft()
+
+    async def _run_job(self, job: IndexingJob) -> None:
+        """Execute one job and record its outcome"""
+        job.status = IndexingJobStatus.RUNNING
+        job.started_at = time.time()
+        logger.info(f"⚙️  Running indexing job {job.job_id}: {job.operation} on KB '{job.kb_id}'")
+
+        def report_progress(items_done: int) -> None:
+            job.items_done = items_done
+
+        try:
+            job.result = await self._handler(job, report_progress)
+            job.status = IndexingJobStatus.COMPLETED
+            logger.info(f"✅ Indexing job {job.job_id} completed")
+        except Exception as e:
+            job.error = str(e)
+            job.status = IndexingJobStatus.FAILED
+            logger.error(f"❌ Indexing job {job.job_id} failed: {e}", exc_info=True)
+        # AICODE-NOTE: On cancellation (hub shutdown) we never get here, so the
+        # persisted file keeps the payload and the job is resumed on restart.
+
+        job.finished_at = time.time()
+        # Payload is only needed to resume the job; drop it once finished
+        job.payload = {}
+        try:
+            await asyncio.to_thread(self._persist, job)
+            self._prune_history()
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to persist indexing job {job.job_id}: {e}")
+
+        event = self._done_events.pop(job.job_id, None)
+        if event:
+            event.set()
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _persist(self, job: IndexingJob) -> None:
+        """Write job state (and payload while unfinished) to disk"""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._job_path(job.job_id).with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job.to_dict(include_payload=not job.finished), f, ensure_ascii=False)
+        tmp_path.replace(self._job_path(job.job_id))
+
+    def _prune_history(self) -> None:
+        """Forget the oldest finished jobs beyond history_limit"""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished),
+            key=lambda j: j.finished_at or 0,
+        )
+        for job in finished[: max(0, len(finished) - self.history_limit)]:
+            self._jobs.pop(job.job_id, None)
+            self._job_path(job.job_id).unlink(missing_ok=True)
+
+
+@dataclass
+class _Upload:
+    """Parts of a multi-part indexing request received so far"""
+
+    request_key: Tuple[Any, ...]
+    parts: int
+    received: Dict[int, List[Any]] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.monotonic)
+
+
+class IndexingUploads:
+    """
+    Multi-part indexing requests assembled before queueing
+
+    AICODE-NOTE: Clients split large document lists into size-bounded parts and
+    send them concurrently. The parts are collected here and the request is queued
+    as one job once all of them arrived, so a large reindex publishes a single
+    index generation instead of exposing a partial index after its first part.
+    Parts are keyed by index (a retried part replaces itself); uploads still
+    incomplete after ttl seconds are dropped.
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        """
+        Initialize upload assembler
+
+        Args:
+            ttl: Seconds an incomplete upload is kept after its last part
+        """
+        self.ttl = ttl
+        self._uploads: Dict[str, _Upload] = {}
+
+    def add_part(
+        self,
+        upload_id: str,
+        part: int,
+        parts: int,
+        items: List[Any],
+        request_key: Tuple[Any, ...],
+    ) -> Optional[List[Any]]:
+        """
+        Store a part of an upload
+
+        Args:
+            upload_id: Upload identifier chosen by the client
+            part: Index of this part (0-based)
+            parts: Total number of parts
+            items: Items (documents or document IDs) of this part
+            request_key: Fields all parts must agree on (KB, operation, options)
+
+        Returns:
+            Items of all parts in order once the upload is complete, otherwise None
+
+        Raises:
+            ValueError: If the part does not belong to the upload
+        """
+        self._expire()
+        if parts < 1 or not 0 <= part < parts:
+            raise ValueError(f"Invalid upload part {part} of {parts}")
+
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            upload = self._uploads[upload_id] = _Upload(request_key=request_key, parts=parts)
+        elif upload.parts != parts or upload.request_key != request_key:
+            raise ValueError(f"Part {part} does not match upload {upload_id}")
+
+        upload.received[part] = items
+        upload.updated_at = time.monotonic()
+        if len(upload.received) < parts:
+            return None
+
+        del self._uploads[upload_id]
+        return [item for index in range(parts) for item in upload.received[index]]
+
+    def pending(self) -> int:
+        """Number of incomplete uploads"""
+        return len(self._uploads)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for upload_id, upload in list(self._uploads.items()):
+            if now - upload.updated_at > self.ttl:
+                del self._uploads[upload_id]
+                logger.warning(
+                    f"Dropped incomplete indexing upload {upload_id} "
+                    f"({len(upload.received)}/{upload.parts} parts)"
+                )
@@ -5,14 +5,44 @@ Manages indexing and searching of documents using configurable embedding models
 
 import hashlib
 import json
+import os
+import shutil
+import time
+import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from loguru import logger
 
+from src.core.metrics import DEFAULT_SIZE_BUCKETS, metrics
+
 from .chunking import DocumentChunk, DocumentChunker
 from .embeddings import BaseEmbedder
-from .vector_stores import BaseVectorStore
+from .results import GROUP_BY_DOCUMENT, shape_results
+from .vector_stores import BaseVectorStore, matches_filter
+
+# Embedder instrumentation (kind: "documents" for indexing, "query" for search)
+_EMBED_LATENCY = metrics.histogram(
+    "vector_embedder_latency_seconds", "Embedder call latency", ("kind",)
+)
+_EMBED_BATCH_SIZE = metrics.histogram(
+    "vector_embedder_batch_size", "Texts per embedder call", ("kind",), DEFAULT_SIZE_BUCKETS
+)
+_EMBED_ITEMS = metrics.counter("vector_embedder_items_total", "Texts embedded", ("kind",))
+_SEARCH_LATENCY = metrics.histogram(
+    "vector_search_latency_seconds", "Vector search latency (embedding included)"
+)
+
+# File in index_path naming the directory of the published generation
+CURRENT_GENERATION_FILE = "CURRENT"
+
+# Stores that cannot delete keep orphaned chunks; they are rebuilt once orphans
+# exceed this share of the stored chunks
+ORPHAN_COMPACT_RATIO = 0.25
+
+# Largest chunk hash list sent to a store as a search filter; larger filters are
+# applied client-side
+MAX_FILTER_CHUNKS = 1000
 
 
 class VectorSearchManager:
@@ -53,6 +83,102 @@ class VectorSearchManager:
         self._indexed_documents: Dict[str, str] = {}  # document_id -> content_hash
         self._config_hash: Optional[str] = None
 
+        # AICODE-NOTE: Cross-document chunk deduplication.
+        # Each unique chunk text is embedded and stored once (keyed by content hash);
+        # every (document_id, chunk_index) that contains it is recorded as a reference
+        # and search hits are expanded back to the referencing documents.
+        self._chunk_refs: Dict[str, List[Dict[str, Any]]] = {}  # chunk_hash -> references
+        self._document_chunks: Dict[str, List[str]] = {}  # document_id -> chunk hashes
+        self._stored_chunks: Set[str] = set()  # chunk hashes present in the vector store
+
+        # Incremented each time a staged copy is made (see VectorIndexGenerations)
+        self.generation = 0
+
+        # AICODE-NOTE: Every published generation keeps its files (metadata.json and
+        # the store's files) in its own directory under index_path/generations;
+        # index_path/CURRENT names the published one. Indexes saved before
+        # generations existed live directly in index_path until the first write.
+        # A staged copy writes nothing until commit(), which saves it into a new
+        # directory and switches CURRENT atomically.
+        self.generation_path = self._read_current_generation()
+        self._staged = False
+
+    def clone(self) -> "VectorSearchManager":
+        """
+        Create an independent copy for staging index changes
+
+        The copy shares the embedder and chunker, gets its own tracking state and
+        a clone of the vector store, so mutating it does not affect searches that
+        are still running against this instance.
+
+        Returns:
+            New VectorSearchManager with generation + 1
+        """
+        staged = VectorSearchManager(
+            embedder=self.embedder,
+            vector_store=self.vector_store.clone(),
+            chunker=self.chunker,
+            kb_root_path=self.kb_root_path,
+            index_path=self.index_path,
+            kb_id=self.kb_id,
+        )
+        staged._config_hash = self._config_hash
+        staged._indexed_documents = dict(self._indexed_documents)
+        staged._chunk_refs = {h: list(refs) for h, refs in self._chunk_refs.items()}
+        staged._document_chunks = {d: list(h) for d, h in self._document_chunks.items()}
+        staged._stored_chunks = set(self._stored_chunks)
+        staged.generation = self.generation + 1
+        staged.generation_path = (
+            self.index_path / "generations" / f"{staged.generation}-{uuid.uuid4().hex[:8]}"
+        )
+        staged._staged = True
+        return staged
+
+    def _read_current_generation(self) -> Path:
+        """Directory of the published generation's files"""
+        try:
+            name = (self.index_path / CURRENT_GENERATION_FILE).read_text(encoding="utf-8").strip()
+        except OSError:
+            return self.index_path
+        return self.index_path / name if name else self.index_path
+
+    async def commit(self) -> None:
+        """
+        Save a staged copy into its generation directory and make it current
+
+        Unchanged store files are linked rather than copied (see the stores' save).
+        """
+        if not self._staged:
+            return
+        await self.vector_store.save(self.generation_path)
+        await self._save_metadata()
+        await self.vector_store.publish()
+
+        current_file = self.index_path / CURRENT_GENERATION_FILE
+        temp_file = current_file.with_suffix(".tmp")
+        temp_file.write_text(
+            str(self.generation_path.relative_to(self.index_path)), encoding="utf-8"
+        )
+        os.replace(temp_file, current_file)
+        self._staged = False
+
+    async def discard(self) -> None:
+        """Drop a staged copy: its store changes and its generation directory"""
+        if not self._staged:
+            return
+        await self.vector_store.discard()
+        self._remove_generation_files()
+
+    async def retire(self) -> None:
+        """Delete the files of a generation that was replaced by a newer one"""
+        if self.generation_path != self.index_path:
+            self._remove_generation_files()
+
+    def _remove_generation_files(self) -> None:
+        if self.generation_path.exists():
+            shutil.rmtree(self.generation_path, ignore_errors=True)
+            logger.debug(f"Removed vector index generation files {self.generation_path}")
+
     def _get_config_hash(self) -> str:
         """Get hash of current configuration"""
         # Include embedding dimension so changes trigger reindex even if model name stays same
@@ -70,6 +196,8 @@ class VectorSearchManager:
             "chunk_size": self.chunker.chunk_size,
             "chunk_overlap": self.chunker.chunk_overlap,
             "respect_headers": self.chunker.respect_headers,
+            # Index layout version: chunks are stored once per unique text
+            "chunk_dedup": True,
         }
         config_str = json.dumps(config, sort_keys=True)
         return hashlib.md5(config_str.encode()).hexdigest()
@@ -84,9 +212,11 @@ class VectorSearchManager:
             "kb_id": self.kb_id,
             "config_hash": self._config_hash,
             "indexed_documents": self._indexed_documents,
+            "chunk_refs": self._chunk_refs,
+            "stored_chunks": sorted(self._stored_chunks),
         }
 
-        metadata_path = self.index_path / "metadata.json"
+        metadata_path = self.generation_path / "metadata.json"
         metadata_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(metadata_path, "w") as f:
@@ -94,6 +224,18 @@ class VectorSearchManager:
 
         logger.debug(f"Saved metadata for KB '{self.kb_id}' to {metadata_path}")
 
+    async def _persist(self, store_changed: bool) -> None:
+        """
+        Save metadata (and the store if it changed) into the generation directory
+
+        Staged copies are saved once by commit().
+        """
+        if self._staged:
+            return
+        if store_changed:
+            await self.vector_store.save(self.generation_path)
+        await self._save_metadata()
+
     async def _load_metadata(self) -> bool:
         """
         Load indexing metadata
@@ -101,7 +243,7 @@ class VectorSearchManager:
         Returns:
             True if metadata loaded successfully and config matches
         """
-        metadata_path = self.index_path / "metadata.json"
+        metadata_path = self.generation_path / "metadata.json"
 
         if not metadata_path.exists():
             logger.info(f"No existing index metadata found for KB '{self.kb_id}'")
@@ -131,6 +273,9 @@ class VectorSearchManager:
 
             self._config_hash = saved_config_hash
             self._indexed_documents = metadata.get("indexed_documents", {})
+            self._chunk_refs = metadata.get("chunk_refs", {})
+            self._stored_chunks = set(metadata.get("stored_chunks", []))
+            self._rebuild_document_chunks()
 
             logger.info(
                 f"Loaded metadata for KB '{self.kb_id}': {len(self._indexed_documents)} indexed documents"
@@ -148,20 +293,103 @@ class VectorSearchManager:
         # Try to load existing index
         if await self._load_metadata():
             try:
-                await self.vector_store.load(self.index_path)
+                await self.vector_store.load(self.generation_path)
                 logger.info("Vector store loaded successfully")
             except Exception as e:
                 logger.warning(f"Failed to load vector store: {e}. Will re-index.")
                 await self.vector_store.clear()
-                self._indexed_documents = {}
+                self._reset_tracking()
         else:
             # Configuration changed or no index exists
             logger.info("Initializing new vector index")
             await self.vector_store.clear()
-            self._indexed_documents = {}
+            self._reset_tracking()
+
+    def _reset_tracking(self) -> None:
+        """Forget all indexed documents and chunk references"""
+        self._indexed_documents = {}
+        self._chunk_refs = {}
+        self._document_chunks = {}
+        self._stored_chunks = set()
+
+    def _rebuild_document_chunks(self) -> None:
+        """Rebuild document_id -> chunk hashes map from chunk references"""
+        self._document_chunks = {}
+        for chunk_hash, refs in self._chunk_refs.items():
+            for ref in refs:
+                doc_chunks = self._document_chunks.setdefault(ref["document_id"], [])
+                if chunk_hash not in doc_chunks:
+                    doc_chunks.append(chunk_hash)
+
+    def _release_document_chunks(self, doc_id: str) -> List[str]:
+        """
+        Drop all chunk references held by a document
+
+        Args:
+            doc_id: Document identifier
+
+        Returns:
+            Hashes of chunks that are no longer referenced by any document
+        """
+        orphaned = []
+        for chunk_hash in self._document_chunks.pop(doc_id, []):
+            refs = [
+                ref for ref in self._chunk_refs.get(chunk_hash, []) if ref["document_id"] != doc_id
+            ]
+            if refs:
+                self._chunk_refs[chunk_hash] = refs
+            else:
+                self._chunk_refs.pop(chunk_hash, None)
+                orphaned.append(chunk_hash)
+        return orphaned
+
+    def _chunks_matching(self, filter_dict: Dict[str, Any]) -> Set[str]:
+        """Hashes of chunks referenced by at least one document matching the filters"""
+        return {
+            chunk_hash
+            for chunk_hash, refs in self._chunk_refs.items()
+            if any(matches_filter(ref, filter_dict) for ref in refs)
+        }
+
+    def _expand_hit(self, hit: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Expand a stored chunk hit into one result per referencing document
+
+        Args:
+            hit: Result returned by the vector store
+
+        Returns:
+            Results carrying each referencing document's own metadata
+        """
+        chunk_hash = hit.get("chunk_hash")
+        refs = self._chunk_refs.get(chunk_hash) if chunk_hash else None
+        if refs is None:
+            # Stored chunk no longer referenced (stores without deletion keep orphans)
+            return [] if chunk_hash else [hit]
+
+        results = []
+        seen_documents: Set[str] = set()
+        for ref in refs:
+            if ref["document_id"] in seen_documents:
+                continue
+            seen_documents.add(ref["document_id"])
+            result = dict(ref)
+            result["text"] = hit.get("text", "")
+            result["chunk_hash"] = chunk_hash
+            for key in ("score", "_distance", "_id"):
+                if key in hit:
+                    result[key] = hit[key]
+            results.append(result)
+        return results
 
     async def search(
-        self, query: str, top_k: int = 5, filter_dict: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        snippet_length: Optional[int] = None,
+        group_by: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Search for documents similar to the query
@@ -170,20 +398,78 @@ class VectorSearchManager:
             query: Search query
             top_k: Number of results to return
             filter_dict: Optional metadata filters
+            fields: Only return these result fields (score is always kept)
+            snippet_length: Replace chunk text with a highlighted snippet of at most
+                this many characters
+            group_by: "document" to return one result per document with its best score
 
         Returns:
             List of matching documents with scores
         """
         logger.debug(f"Searching for: {query}")
 
+        if group_by is not None and group_by != GROUP_BY_DOCUMENT:
+            raise ValueError(f"Unsupported group_by: {group_by}. Supported: {GROUP_BY_DOCUMENT}")
+
         # Embed query
+        search_started = time.perf_counter()
         query_embedding = await self.embedder.embed_query(query)
+        _EMBED_LATENCY.observe(time.perf_counter() - search_started, "query")
+        _EMBED_BATCH_SIZE.observe(1, "query")
+        _EMBED_ITEMS.inc("query")
+
+        # AICODE-NOTE: Filters apply to the referencing documents, not to the shared
+        # stored payload (which carries the metadata of the first document only).
+        # They are translated into the chunk hashes referenced by matching documents;
+        # stores that filter server-side (supports_filter) get that list, so top_k
+        # counts matching chunks only. Otherwise the store is over-fetched, and the
+        # fetch grows until enough results match or the store runs out of hits.
+        store_filter = None
+        if filter_dict:
+            matching_chunks = self._chunks_matching(filter_dict)
+            if not matching_chunks:
+                _SEARCH_LATENCY.observe(time.perf_counter() - search_started)
+                logger.info("Found 0 results for query (no document matches the filters)")
+                return []
+            if self.vector_store.supports_filter() and len(matching_chunks) <= MAX_FILTER_CHUNKS:
+                store_filter = {"chunk_hash": sorted(matching_chunks)}
+
+        if store_filter:
+            fetch_k = top_k
+        else:
+            # Orphaned chunks (stores without deletion) are skipped after the fetch
+            fetch_k = top_k + max(0, len(self._stored_chunks) - len(self._chunk_refs))
+        if group_by:
+            # Several chunks may collapse into one document
+            fetch_k *= 4
+
+        while True:
+            hits = await self.vector_store.search(
+                query_embedding=query_embedding, top_k=fetch_k, filter_dict=store_filter
+            )
 
-        # Search vector store
-        results = await self.vector_store.search(
-            query_embedding=query_embedding, top_k=top_k, filter_dict=filter_dict
+            results: List[Dict[str, Any]] = []
+            for hit in hits:
+                for result in self._expand_hit(hit):
+                    if filter_dict and not matches_filter(result, filter_dict):
+                        continue
+                    results.append(result)
+
+            found = len({r.get("document_id") for r in results}) if group_by else len(results)
+            if found >= top_k or len(hits) < fetch_k:
+                break
+            fetch_k *= 4
+
+        results = shape_results(
+            results,
+            query=query,
+            top_k=top_k,
+            fields=fields,
+            snippet_length=snippet_length,
+            group_by=group_by,
         )
 
+        _SEARCH_LATENCY.observe(time.perf_counter() - search_started)
         logger.info(f"Found {len(results)} results for query")
         return results
 
@@ -191,8 +477,18 @@ class VectorSearchManager:
         """Clear the vector index"""
         logger.info("Clearing vector index")
         await self.vector_store.clear()
-        self._indexed_documents = {}
-        await self._save_metadata()
+        self._reset_tracking()
+        await self._persist(store_changed=False)
+
+    @property
+    def document_count(self) -> int:
+        """Number of indexed documents (no store round-trip)"""
+        return len(self._indexed_documents)
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of unique chunks stored in the vector store (no store round-trip)"""
+        return len(self._stored_chunks)
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get indexing statistics"""
@@ -201,6 +497,8 @@ class VectorSearchManager:
         return {
             "indexed_documents": len(self._indexed_documents),
             "total_chunks": count,
+            "unique_chunks": len(self._chunk_refs),
+            "chunk_references": sum(len(refs) for refs in self._chunk_refs.values()),
             "config_hash": self._config_hash,
             "embedder": self.embedder.__class__.__name__,
             "embedder_model": self.embedder.model_name,
@@ -217,6 +515,9 @@ class VectorSearchManager:
         Works with DATA, not FILES. Receives document content from caller (BOT),
         not file paths. This allows MCP HUB to run without file system access.
 
+        Chunks whose text is already stored (in this or any other document) are
+        recorded as references only and are not embedded again.
+
         Args:
             documents: List of documents with structure:
                 - id (str): Unique document identifier
@@ -231,10 +532,14 @@ class VectorSearchManager:
         stats = {
             "documents_processed": 0,
             "chunks_created": 0,
+            "chunks_embedded": 0,
+            "chunks_deduplicated": 0,
             "errors": [],
         }
 
-        all_chunks: List[DocumentChunk] = []
+        # Unique chunks that are not yet in the vector store (chunk_hash -> first occurrence)
+        new_chunks: Dict[str, DocumentChunk] = {}
+        released_chunks: Set[str] = set()
 
         for doc in documents:
             try:
@@ -263,7 +568,23 @@ class VectorSearchManager:
                     text=content, metadata=metadata, source_file=doc_id
                 )
 
-                all_chunks.extend(chunks)
+                # Re-adding a document replaces its previous chunk references
+                released_chunks.update(self._release_document_chunks(doc_id))
+
+                doc_chunk_hashes: List[str] = []
+                for chunk in chunks:
+                    chunk_hash = self._get_content_hash(chunk.text)
+                    ref = chunk.metadata.copy()
+                    ref["document_id"] = doc_id
+                    ref["chunk_index"] = chunk.chunk_index
+                    self._chunk_refs.setdefault(chunk_hash, []).append(ref)
+
+                    if chunk_hash not in doc_chunk_hashes:
+                        doc_chunk_hashes.append(chunk_hash)
+                    if chunk_hash not in self._stored_chunks and chunk_hash not in new_chunks:
+                        new_chunks[chunk_hash] = chunk
+
+                self._document_chunks[doc_id] = doc_chunk_hashes
                 self._indexed_documents[doc_id] = content_hash
                 stats["documents_processed"] += 1
                 stats["chunks_created"] += len(chunks)
@@ -275,48 +596,137 @@ class VectorSearchManager:
                 logger.error(error_msg)
                 stats["errors"].append(error_msg)
 
-        # Embed and store chunks
-        if all_chunks:
+        # Drop stored chunks that lost their last reference
+        orphaned = [h for h in released_chunks if h not in self._chunk_refs]
+        pruned = await self._delete_stored_chunks(orphaned, stats["errors"]) if orphaned else 0
+
+        # Embed and store only chunk texts that are not in the index yet
+        if new_chunks:
             try:
-                logger.info(f"Embedding {len(all_chunks)} chunks")
+                logger.info(
+                    f"Embedding {len(new_chunks)} unique chunks "
+                    f"({stats['chunks_created']} total chunks)"
+                )
 
                 # Extract texts
-                texts = [chunk.text for chunk in all_chunks]
+                texts = [chunk.text for chunk in new_chunks.values()]
 
                 # Get embeddings
+                embed_started = time.perf_counter()
                 embeddings = await self.embedder.embed_texts(texts)
+                _EMBED_LATENCY.observe(time.perf_counter() - embed_started, "documents")
+                _EMBED_BATCH_SIZE.observe(len(texts), "documents")
+                _EMBED_ITEMS.inc("documents", amount=len(texts))
 
                 # Prepare documents for storage
                 vector_documents = []
-                for chunk in all_chunks:
+                for chunk_hash, chunk in new_chunks.items():
                     doc = chunk.metadata.copy()
                     doc["text"] = chunk.text
                     doc["chunk_index"] = chunk.chunk_index
+                    doc["chunk_hash"] = chunk_hash
                     vector_documents.append(doc)
 
                 # Add to vector store
                 await self.vector_store.add_documents(
                     embeddings=embeddings, documents=vector_documents
                 )
+                self._stored_chunks.update(new_chunks.keys())
+                stats["chunks_embedded"] = len(new_chunks)
 
-                logger.info(f"Successfully added {len(all_chunks)} chunks to vector store")
-
-                # Save index and metadata
-                await self.vector_store.save(self.index_path)
-                await self._save_metadata()
+                logger.info(f"Successfully added {len(new_chunks)} chunks to vector store")
 
             except Exception as e:
                 error_msg = f"Error embedding/storing chunks: {e}"
                 logger.error(error_msg, exc_info=True)
                 stats["errors"].append(error_msg)
 
+        stats["chunks_deduplicated"] = stats["chunks_created"] - stats["chunks_embedded"]
+        compacted = await self._compact_orphans(stats["errors"]) if released_chunks else 0
+
+        # Save index and metadata
+        if stats["documents_processed"]:
+            try:
+                await self._persist(
+                    store_changed=bool(stats["chunks_embedded"] or pruned or compacted)
+                )
+            except Exception as e:
+                error_msg = f"Error saving vector index: {e}"
+                logger.error(error_msg, exc_info=True)
+                stats["errors"].append(error_msg)
+
         logger.info(
             f"Add documents complete: {stats['documents_processed']} documents, "
-            f"{stats['chunks_created']} chunks, {len(stats['errors'])} errors"
+            f"{stats['chunks_created']} chunks ({stats['chunks_deduplicated']} deduplicated), "
+            f"{len(stats['errors'])} errors"
         )
 
         return stats
 
+    async def _compact_orphans(self, errors: List[str]) -> int:
+        """
+        Rebuild the store without orphaned chunks once they exceed ORPHAN_COMPACT_RATIO
+
+        Only for stores that cannot delete (see _delete_stored_chunks).
+
+        Args:
+            errors: Error list to append failures to
+
+        Returns:
+            Number of chunks removed from the store
+        """
+        orphans = self._stored_chunks.difference(self._chunk_refs)
+        if len(orphans) <= ORPHAN_COMPACT_RATIO * len(self._stored_chunks):
+            return 0
+        if not self.vector_store.supports_compaction():
+            return 0
+
+        try:
+            removed = await self.vector_store.compact(
+                lambda doc: doc.get("chunk_hash") not in orphans
+            )
+        except Exception as e:
+            error_msg = f"Error compacting vector store: {e}"
+            logger.error(error_msg)
+            errors.append(error_msg)
+            return 0
+
+        self._stored_chunks -= orphans
+        logger.info(f"Compacted vector store: dropped {len(orphans)} orphaned chunks")
+        return removed
+
+    async def _delete_stored_chunks(self, chunk_hashes: List[str], errors: List[str]) -> int:
+        """
+        Remove unreferenced chunks from the vector store
+
+        Stores without deletion support keep them; such orphans are skipped at search time.
+
+        Args:
+            chunk_hashes: Hashes of chunks no longer referenced by any document
+            errors: Error list to append failures to
+
+        Returns:
+            Number of chunks removed from the store
+        """
+        supports_delete = (
+            hasattr(self.vector_store, "supports_delete_by_filter")
+            and self.vector_store.supports_delete_by_filter()
+        )
+        if not supports_delete:
+            return 0
+
+        deleted = 0
+        for chunk_hash in chunk_hashes:
+            try:
+                await self.vector_store.delete_by_filter({"chunk_hash": chunk_hash})
+                self._stored_chunks.discard(chunk_hash)
+                deleted += 1
+            except Exception as e:
+                error_msg = f"Error deleting chunk {chunk_hash}: {e}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+        return deleted
+
     async def delete_documents(self, document_ids: List[str]) -> Dict[str, Any]:
         """
         Delete documents from vector index
@@ -355,8 +765,10 @@ class VectorSearchManager:
 
         for doc_id in document_ids:
             try:
-                # Delete from vector store by document_id
-                await self.vector_store.delete_by_filter({"document_id": doc_id})
+                # Delete only chunks that no other document references
+                # (chunks that fail to delete stay as orphans and are skipped by search)
+                orphaned = self._release_document_chunks(doc_id)
+                await self._delete_stored_chunks(orphaned, stats["errors"])
 
                 # Remove from metadata
                 if doc_id in self._indexed_documents:
@@ -373,8 +785,7 @@ class VectorSearchManager:
 
         # Save updated metadata
         if stats["documents_deleted"] > 0:
-            await self._save_metadata()
-            await self.vector_store.save(self.index_path)
+            await self._persist(store_changed=True)
 
         if stats["errors"]:
             stats["success"] = False
@@ -0,0 +1,157 @@
+"""
+Search Result Shaping
+Field projection, highlighted snippets and document-level grouping for search results
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+# Group results by their source document
+GROUP_BY_DOCUMENT = "document"
+
+# Fields kept in every projected result
+ALWAYS_INCLUDED_FIELDS = ("score",)
+
+# Markers wrapped around query terms inside snippets
+HIGHLIGHT_START = "**"
+HIGHLIGHT_END = "**"
+
+_MIN_TERM_LENGTH = 3
+
+
+def _query_terms(query: str) -> List[str]:
+    """Extract distinct lowercase query terms worth highlighting"""
+    terms: List[str] = []
+    for term in re.findall(r"\w+", query.lower()):
+        if len(term) >= _MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    # Longest first so overlapping terms highlight the longer match
+    return sorted(terms, key=len, reverse=True)
+
+
+def make_snippet(text: str, query: str, max_length: int) -> str:
+    """
+    Cut a snippet around the first query match and highlight matched terms
+
+    Args:
+        text: Full chunk text
+        query: Search query
+        max_length: Maximum snippet length in characters (before highlighting)
+
+    Returns:
+        Snippet with "…" marking truncated ends and query terms wrapped in ** **
+    """
+    text = " ".join(text.split())
+    terms = _query_terms(query)
+    pattern = (
+        re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE) if terms else None
+    )
+
+    start = 0
+    if len(text) > max_length and pattern:
+        match = pattern.search(text)
+        if match:
+            # Keep some leading context before the first match
+            start = max(0, min(match.start() - max_length // 4, len(text) - max_length))
+
+    snippet = text[start : start + max_length]
+    if pattern:
+        snippet = pattern.sub(lambda m: f"{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_END}", snippet)
+
+    if start > 0:
+        snippet = "…" + snippet
+    if start + max_length < len(text):
+        snippet = snippet + "…"
+    return snippet
+
+
+def group_by_document(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse chunk results into one result per document
+
+    The best-scoring chunk represents the document; the number of matching
+    chunks and their indices are attached.
+
+    Args:
+        results: Chunk-level results
+
+    Returns:
+        Document-level results ordered by best score
+    """
+    groups: Dict[Any, Dict[str, Any]] = {}
+    for result in results:
+        key = result.get("document_id") or result.get("_id")
+        group = groups.get(key)
+        if group is None:
+            group = dict(result)
+            group["match_count"] = 0
+            group["chunk_indices"] = []
+            groups[key] = group
+        elif result.get("score", 0.0) > group.get("score", 0.0):
+            best = dict(result)
+            best["match_count"] = group["match_count"]
+            best["chunk_indices"] = group["chunk_indices"]
+            group = groups[key] = best
+        group["match_count"] += 1
+        if result.get("chunk_index") is not None:
+            group["chunk_indices"].append(result["chunk_index"])
+
+    return sorted(groups.values(), key=lambda g: g.get("score", 0.0), reverse=True)
+
+
+def project_fields(result: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Keep only requested fields of a result (plus the score)
+
+    Args:
+        result: Search result
+        fields: Field names to keep
+
+    Returns:
+        Projected result
+    """
+    keep = set(fields).union(ALWAYS_INCLUDED_FIELDS)
+    return {key: value for key, value in result.items() if key in keep}
+
+
+def shape_results(
+    results: List[Dict[str, Any]],
+    query: str,
+    top_k: int,
+    fields: Optional[Sequence[str]] = None,
+    snippet_length: Optional[int] = None,
+    group_by: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Apply grouping, snippets and projection to raw search results
+
+    Args:
+        results: Chunk-level results ordered by score
+        query: Search query (used for highlighting)
+        top_k: Number of results to return
+        fields: Fields to keep (all fields if None)
+        snippet_length: Replace full chunk text with a highlighted snippet of this length
+        group_by: Optional grouping ("document")
+
+    Returns:
+        Shaped results
+    """
+    if group_by is not None and group_by != GROUP_BY_DOCUMENT:
+        raise ValueError(f"Unsupported group_by: {group_by}. Supported: {GROUP_BY_DOCUMENT}")
+
+    if group_by == GROUP_BY_DOCUMENT:
+        results = group_by_document(results)
+    results = results[:top_k]
+
+    shaped = []
+    for result in results:
+        result = dict(result)
+        if snippet_length:
+            result["snippet"] = make_snippet(result.pop("text", ""), query, snippet_length)
+        if fields:
+            projected_fields = list(fields)
+            if snippet_length:
+                projected_fields.append("snippet")
+            result = project_fields(result, projected_fields)
+        shaped.append(result)
+    return shaped
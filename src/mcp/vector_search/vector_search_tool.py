@@ -54,6 +54,26 @@ class VectorSearchMCPTool(BaseMCPTool):
                     "description": "Number of results to return (default: 5)",
                     "default": 5,
                 },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        'Only return these result fields, e.g. ["file_path"] '
+                        "(score is always included)"
+                    ),
+                },
+                "snippet_length": {
+                    "type": "integer",
+                    "description": (
+                        "Return a snippet of at most this many characters with query terms "
+                        "highlighted instead of the full chunk text"
+                    ),
+                },
+                "group_by": {
+                    "type": "string",
+                    "enum": ["document"],
+                    "description": "Return one result per document with its best score",
+                },
             },
             "required": ["query"],
         }
@@ -179,7 +199,7 @@ class VectorSearchMCPTool(BaseMCPTool):
         Execute vector search
 
         Args:
-            params: Search parameters (query, top_k)
+            params: Search parameters (query, top_k, fields, snippet_length, group_by)
             context: Tool execution context
 
         Returns:
@@ -205,6 +225,10 @@ class VectorSearchMCPTool(BaseMCPTool):
         if user_id:
             mcp_params["user_id"] = user_id
 
+        for option in ("fields", "snippet_length", "group_by"):
+            if params.get(option):
+                mcp_params[option] = params[option]
+
         result = await super().execute(mcp_params, context)
 
         # Add helpful information to the result
@@ -3,11 +3,14 @@ Vector Stores
 Supports multiple vector store backends: FAISS (local), Qdrant (API)
 """
 
+import copy
 import json
+import os
 import pickle
+import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from loguru import logger
 
@@ -45,7 +48,8 @@ class BaseVectorStore(ABC):
         Args:
             query_embedding: Query vector
             top_k: Number of results to return
-            filter_dict: Optional metadata filters
+            filter_dict: Optional metadata filters (exact match; a list value
+                matches any of its items, see matches_filter)
 
         Returns:
             List of documents with scores
@@ -73,6 +77,28 @@ class BaseVectorStore(ABC):
         pass
 
     # Optional capabilities (not abstract to keep subclasses compatible)
+    def clone(self) -> "BaseVectorStore":
+        """
+        Return a staged copy whose changes stay invisible to readers of this store
+
+        Changes become visible when publish() is called on the copy and are
+        dropped by discard(). The default returns the same instance (no
+        isolation); stores used with index generations must override this.
+        """
+        return self
+
+    async def publish(self) -> None:
+        """Make the changes of a staged copy (see clone) visible to readers"""
+        pass
+
+    async def discard(self) -> None:
+        """Drop the changes of a staged copy that will not be published"""
+        pass
+
+    def supports_filter(self) -> bool:
+        """Return True if search applies filter_dict before selecting the top_k hits"""
+        return False
+
     def supports_delete_by_filter(self) -> bool:
         """Return True if store supports deletion by metadata filter"""
         return False
@@ -81,9 +107,63 @@ class BaseVectorStore(ABC):
         """Delete documents matching metadata filter. Returns number deleted if known."""
         raise NotImplementedError("delete_by_filter is not supported by this vector store")
 
+    def supports_compaction(self) -> bool:
+        """Return True if store can be rebuilt without some of its documents"""
+        return False
+
+    async def compact(self, keep: Callable[[Dict[str, Any]], bool]) -> int:
+        """Rebuild the store with only the documents keep() accepts. Returns number removed."""
+        raise NotImplementedError("compact is not supported by this vector store")
+
+
+def matches_filter(document: Dict[str, Any], filter_dict: Dict[str, Any]) -> bool:
+    """
+    Check a document against metadata filters
+
+    Args:
+        document: Document metadata
+        filter_dict: Field -> required value; a list value matches any of its items
+
+    Returns:
+        True if every filter field matches
+    """
+    for key, value in filter_dict.items():
+        if isinstance(value, (list, tuple, set)):
+            if document.get(key) not in value:
+                return False
+        elif document.get(key) != value:
+            return False
+    return True
+
+
+class _FAISSSegment:
+    """Part of a FAISS store: an index and the documents of its vectors"""
+
+    def __init__(self, index, uid: Optional[str] = None):
+        self.index = index
+        self.documents: List[Dict[str, Any]] = []
+        self.ids: List[str] = []
+        self.uid = uid or uuid.uuid4().hex[:12]
+        # Directory already holding this segment's files (None once changed after saving)
+        self.saved_in: Optional[Path] = None
+
+    @property
+    def file_names(self) -> Tuple[str, str]:
+        return f"segment-{self.uid}.faiss", f"segment-{self.uid}.pkl"
+
 
 class FAISSVectorStore(BaseVectorStore):
-    """FAISS-based local vector store"""
+    """
+    FAISS-based local vector store
+
+    AICODE-NOTE: Vectors are kept in segments (an IndexFlatL2 plus the documents
+    of its vectors). A staged clone shares the existing segments read-only and
+    appends into a segment of its own, so staging a write does not copy the index
+    and readers of the published store never see staged vectors. A trailing
+    segment is merged into its predecessor once it reaches half of its size, which
+    keeps the number of segments logarithmic. save() hard-links the files of
+    segments that did not change since they were saved.
+    """
 
     def __init__(self, dimension: int):
         """
@@ -93,25 +173,58 @@ class FAISSVectorStore(BaseVectorStore):
             dimension: Embedding dimension
         """
         self.dimension = dimension
-        self._index = None
-        self._documents: List[Dict[str, Any]] = []
-        self._ids: List[str] = []
+        self._segments: List[_FAISSSegment] = []
+        # Whether the last segment belongs to this store alone and may be appended to
+        self._tail_owned = False
+
+    def clone(self) -> "FAISSVectorStore":
+        """Share the current segments with a staged copy that appends to its own segment"""
+        staged = FAISSVectorStore(dimension=self.dimension)
+        staged._segments = list(self._segments)
+        # Segments are shared from now on; neither store may append to them
+        self._tail_owned = False
+        return staged
+
+    def _new_index(self):
+        """Create an empty FAISS index"""
+        try:
+            import faiss
+        except ImportError:
+            raise ImportError(
+                "faiss not installed. "
+                "Install with: pip install faiss-cpu (or faiss-gpu for GPU support)"
+            )
 
-    def _get_index(self):
-        """Lazy load FAISS index"""
-        if self._index is None:
-            try:
-                import faiss
-
-                logger.info(f"Creating FAISS index with dimension {self.dimension}")
-                # Use IndexFlatL2 for exact search (can be changed to IVF for large datasets)
-                self._index = faiss.IndexFlatL2(self.dimension)
-            except ImportError:
-                raise ImportError(
-                    "faiss not installed. "
-                    "Install with: pip install faiss-cpu (or faiss-gpu for GPU support)"
-                )
-        return self._index
+        logger.debug(f"Creating FAISS index with dimension {self.dimension}")
+        # Use IndexFlatL2 for exact search (can be changed to IVF for large datasets)
+        return faiss.IndexFlatL2(self.dimension)
+
+    def _writable_segment(self) -> _FAISSSegment:
+        """Get the segment new vectors are appended to"""
+        if not self._segments or not self._tail_owned:
+            self._segments.append(_FAISSSegment(self._new_index()))
+            self._tail_owned = True
+        return self._segments[-1]
+
+    def _merge_segments(self, segments: List[_FAISSSegment]) -> _FAISSSegment:
+        """Copy segments into a new one (the given segments are not modified)"""
+        merged = _FAISSSegment(self._new_index())
+        for segment in segments:
+            if segment.index.ntotal:
+                merged.index.add(segment.index.reconstruct_n(0, segment.index.ntotal))
+            merged.documents.extend(segment.documents)
+            merged.ids.extend(segment.ids)
+        return merged
+
+    def _merge_tail(self) -> None:
+        """Merge trailing segments that are not much smaller than their predecessor"""
+        while len(self._segments) > 1 and (
+            self._segments[-1].index.ntotal * 2 >= self._segments[-2].index.ntotal
+        ):
+            newer = self._segments.pop()
+            older = self._segments.pop()
+            self._segments.append(self._merge_segments([older, newer]))
+            self._tail_owned = True
 
     async def add_documents(
         self,
@@ -122,25 +235,24 @@ class FAISSVectorStore(BaseVectorStore):
         """Add documents to FAISS index"""
         import numpy as np
 
-        index = self._get_index()
-
         if len(embeddings) != len(documents):
             raise ValueError("Number of embeddings must match number of documents")
 
+        if not ids:
+            # Generate IDs
+            start_id = sum(len(segment.ids) for segment in self._segments)
+            ids = [f"doc_{start_id + i}" for i in range(len(documents))]
+
         # Convert to numpy array
         embeddings_array = np.array(embeddings, dtype=np.float32)
 
-        # Add to index
-        index.add(embeddings_array)
-
-        # Store documents and IDs
-        self._documents.extend(documents)
-        if ids:
-            self._ids.extend(ids)
-        else:
-            # Generate IDs
-            start_id = len(self._ids)
-            self._ids.extend([f"doc_{start_id + i}" for i in range(len(documents))])
+        # Add to this store's own segment
+        segment = self._writable_segment()
+        segment.index.add(embeddings_array)
+        segment.documents.extend(documents)
+        segment.ids.extend(ids)
+        segment.saved_in = None
+        self._merge_tail()
 
         logger.info(f"Added {len(embeddings)} documents to FAISS index")
 
@@ -153,34 +265,35 @@ class FAISSVectorStore(BaseVectorStore):
         """Search FAISS index"""
         import numpy as np
 
-        index = self._get_index()
-
-        if index.ntotal == 0:
+        if not any(segment.index.ntotal for segment in self._segments):
             logger.warning("FAISS index is empty")
             return []
 
         # Convert query to numpy array
         query_array = np.array([query_embedding], dtype=np.float32)
 
-        # Search
-        distances, indices = index.search(query_array, min(top_k, index.ntotal))
+        # Search every segment and keep the overall nearest vectors
+        candidates = []
+        for segment in self._segments:
+            if not segment.index.ntotal:
+                continue
+            distances, indices = segment.index.search(query_array, min(top_k, segment.index.ntotal))
+            for distance, idx in zip(distances[0], indices[0]):
+                if 0 <= idx < len(segment.documents):
+                    candidates.append((float(distance), segment, int(idx)))
+        candidates.sort(key=lambda candidate: candidate[0])
 
         # Prepare results
         results = []
-        for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-            if idx < 0 or idx >= len(self._documents):
-                continue
-
-            doc = self._documents[idx].copy()
+        for distance, segment, idx in candidates[:top_k]:
+            doc = segment.documents[idx].copy()
             doc["score"] = float(1 / (1 + distance))  # Convert distance to similarity score
-            doc["_distance"] = float(distance)
-            doc["_id"] = self._ids[idx]
+            doc["_distance"] = distance
+            doc["_id"] = segment.ids[idx]
 
             # Apply filter if provided
-            if filter_dict:
-                match = all(doc.get(key) == value for key, value in filter_dict.items())
-                if not match:
-                    continue
+            if filter_dict and not matches_filter(doc, filter_dict):
+                continue
 
             results.append(doc)
 
@@ -189,9 +302,8 @@ class FAISSVectorStore(BaseVectorStore):
 
     async def clear(self) -> None:
         """Clear FAISS index"""
-        self._index = None
-        self._documents = []
-        self._ids = []
+        self._segments = []
+        self._tail_owned = False
         logger.info("Cleared FAISS index")
 
     def supports_delete_by_filter(self) -> bool:
@@ -204,54 +316,134 @@ class FAISSVectorStore(BaseVectorStore):
             "FAISS store does not support delete_by_filter; perform full reindex"
         )
 
+    def supports_compaction(self) -> bool:
+        return True
+
+    async def compact(self, keep: Callable[[Dict[str, Any]], bool]) -> int:
+        """Copy the accepted documents into a single new segment"""
+        compacted = _FAISSSegment(self._new_index())
+        removed = 0
+        for segment in self._segments:
+            rows = [i for i, doc in enumerate(segment.documents) if keep(doc)]
+            removed += len(segment.documents) - len(rows)
+            if rows:
+                vectors = segment.index.reconstruct_n(0, segment.index.ntotal)[rows]
+                compacted.index.add(vectors)
+                compacted.documents.extend(segment.documents[i] for i in rows)
+                compacted.ids.extend(segment.ids[i] for i in rows)
+        # Shared segments are left untouched for readers of other generations
+        self._segments = [compacted] if compacted.documents else []
+        self._tail_owned = bool(self._segments)
+        logger.info(f"Compacted FAISS index: removed {removed}, kept {len(compacted.documents)}")
+        return removed
+
     async def get_count(self) -> int:
         """Get number of documents"""
-        if self._index is None:
-            return 0
-        return self._index.ntotal
+        return sum(segment.index.ntotal for segment in self._segments)
 
     async def save(self, path: Path) -> None:
-        """Save FAISS index and metadata"""
+        """Save FAISS segments and metadata"""
         import faiss
 
         path.mkdir(parents=True, exist_ok=True)
 
-        # Save FAISS index
-        if self._index is not None:
-            index_path = path / "index.faiss"
-            faiss.write_index(self._index, str(index_path))
-            logger.info(f"Saved FAISS index to {index_path}")
-
-        # Save documents and IDs
-        metadata = {"documents": self._documents, "ids": self._ids, "dimension": self.dimension}
+        written = 0
+        for segment in self._segments:
+            if segment.saved_in == path:
+                continue
+            if segment.saved_in is None or not _link_files(
+                segment.saved_in, path, segment.file_names
+            ):
+                index_name, documents_name = segment.file_names
+                faiss.write_index(segment.index, str(path / index_name))
+                with open(path / documents_name, "wb") as f:
+                    pickle.dump({"documents": segment.documents, "ids": segment.ids}, f)
+                written += 1
+            segment.saved_in = path
+
+        # Drop files of segments merged away since the last save into this directory
+        kept = {name for segment in self._segments for name in segment.file_names}
+        for stale in [*path.glob("segment-*"), path / "index.faiss"]:
+            if stale.name not in kept and stale.exists():
+                stale.unlink()
+
+        metadata = {
+            "segments": [segment.uid for segment in self._segments],
+            "dimension": self.dimension,
+        }
         metadata_path = path / "metadata.pkl"
         with open(metadata_path, "wb") as f:
             pickle.dump(metadata, f)
-        logger.info(f"Saved metadata to {metadata_path}")
+        logger.info(
+            f"Saved FAISS index to {path} ({len(self._segments)} segments, {written} written)"
+        )
 
     async def load(self, path: Path) -> None:
-        """Load FAISS index and metadata"""
+        """Load FAISS segments and metadata"""
         import faiss
 
-        # Load FAISS index
-        index_path = path / "index.faiss"
-        if index_path.exists():
-            self._index = faiss.read_index(str(index_path))
-            logger.info(f"Loaded FAISS index from {index_path}")
-
-        # Load documents and IDs
         metadata_path = path / "metadata.pkl"
-        if metadata_path.exists():
-            with open(metadata_path, "rb") as f:
-                metadata = pickle.load(f)
-            self._documents = metadata["documents"]
-            self._ids = metadata["ids"]
-            self.dimension = metadata["dimension"]
-            logger.info(f"Loaded metadata from {metadata_path}")
+        if not metadata_path.exists():
+            return
+        with open(metadata_path, "rb") as f:
+            metadata = pickle.load(f)
+        self.dimension = metadata["dimension"]
+        self._segments = []
+        self._tail_owned = False
+
+        if "segments" not in metadata:
+            # Single index.faiss written before segments were introduced
+            segment = _FAISSSegment(faiss.read_index(str(path / "index.faiss")))
+            segment.documents = metadata["documents"]
+            segment.ids = metadata["ids"]
+            self._segments.append(segment)
+        for uid in metadata.get("segments", []):
+            segment = _FAISSSegment(None, uid=uid)
+            index_name, documents_name = segment.file_names
+            segment.index = faiss.read_index(str(path / index_name))
+            with open(path / documents_name, "rb") as f:
+                stored = pickle.load(f)
+            segment.documents = stored["documents"]
+            segment.ids = stored["ids"]
+            segment.saved_in = path
+            self._segments.append(segment)
+
+        logger.info(f"Loaded FAISS index from {path} ({len(self._segments)} segments)")
+
+
+def _link_files(source: Path, target: Path, names: Tuple[str, ...]) -> bool:
+    """
+    Hard-link files into another directory
+
+    Returns:
+        False if a file could not be linked (missing source, other file system)
+    """
+    try:
+        for name in names:
+            destination = target / name
+            if destination.exists():
+                destination.unlink()
+            os.link(source / name, destination)
+        return True
+    except OSError as e:
+        logger.debug(f"Could not link {names} from {source}: {e}")
+        return False
 
 
 class QdrantVectorStore(BaseVectorStore):
-    """Qdrant API-based vector store"""
+    """
+    Qdrant API-based vector store
+
+    AICODE-NOTE: Readers query collection_name, an alias of a concrete collection
+    ("<name>__<token>"). A staged clone keeps its changes invisible until publish():
+    - clear() creates a fresh concrete collection that receives all later writes;
+      publish() switches the alias to it in one alias update and deletes the old
+      collection (full reindex);
+    - otherwise points are added to the live collection under new chunk hashes,
+      which the published generation does not reference and skips, and deletions
+      are queued as point ids; publish() applies them, discard() removes the
+      added points.
+    """
 
     def __init__(
         self,
@@ -280,68 +472,134 @@ class QdrantVectorStore(BaseVectorStore):
         self.api_key = api_key
         self._client = None
 
+        # Staging state of clones (see clone)
+        self._staged = False
+        self._staged_collection: Optional[str] = None
+        self._added_ids: List[str] = []
+        self._pending_deletes: List[Any] = []
+
     def _get_client(self):
         """Lazy load Qdrant client"""
         if self._client is None:
             try:
                 from qdrant_client import QdrantClient
-                from qdrant_client.models import Distance, VectorParams
 
                 logger.info(f"Connecting to Qdrant at {self.url}")
                 self._client = QdrantClient(url=self.url, api_key=self.api_key)
-
-                # Create collection if it doesn't exist
-                try:
-                    info = self._client.get_collection(self.collection_name)
-                    # Validate collection vector dimension; recreate if mismatched
-                    current_size = None
-                    try:
-                        # Single vector configuration
-                        current_size = info.config.params.vectors.size  # type: ignore[attr-defined]
-                    except Exception:
-                        try:
-                            # Named vectors configuration
-                            vectors_cfg = info.config.params.vectors  # type: ignore[attr-defined]
-                            if isinstance(vectors_cfg, dict) and vectors_cfg:
-                                # Take the first vector's size
-                                current_size = next(iter(vectors_cfg.values())).size
-                        except Exception:
-                            current_size = None
-
-                    if current_size is not None and int(current_size) != int(self.dimension):
-                        logger.warning(
-                            "Qdrant collection exists but dimension differs "
-                            f"(have {current_size}, need {self.dimension}). Recreating collection."
-                        )
-                        try:
-                            self._client.delete_collection(self.collection_name)
-                        except Exception as del_e:
-                            logger.warning(f"Failed to delete existing collection: {del_e}")
-                        self._client.create_collection(
-                            collection_name=self.collection_name,
-                            vectors_config=VectorParams(
-                                size=self.dimension, distance=Distance.COSINE
-                            ),
-                        )
-                        logger.info(
-                            f"Recreated collection {self.collection_name} with dimension {self.dimension}"
-                        )
-                    else:
-                        logger.info(f"Using existing collection: {self.collection_name}")
-                except Exception:
-                    logger.info(f"Creating collection: {self.collection_name}")
-                    self._client.create_collection(
-                        collection_name=self.collection_name,
-                        vectors_config=VectorParams(size=self.dimension, distance=Distance.COSINE),
-                    )
-
             except ImportError:
                 raise ImportError(
                     "qdrant-client not installed. " "Install with: pip install qdrant-client"
                 )
+            self._ensure_collection()
 
         return self._client
 
+    def _ensure_collection(self) -> None:
+        """Create the aliased collection, or recreate it if its dimension differs"""
+        try:
+            info = self._client.get_collection(self.collection_name)
+        except Exception:
+            logger.info(f"Creating collection: {self.collection_name}")
+            self._replace_collection(self._create_collection())
+            return
+
+        # Validate collection vector dimension; recreate if mismatched
+        current_size = None
+        try:
+            # Single vector configuration
+            current_size = info.config.params.vectors.size  # type: ignore[attr-defined]
+        except Exception:
+            try:
+                # Named vectors configuration
+                vectors_cfg = info.config.params.vectors  # type: ignore[attr-defined]
+                if isinstance(vectors_cfg, dict) and vectors_cfg:
+                    # Take the first vector's size
+                    current_size = next(iter(vectors_cfg.values())).size
+            except Exception:
+                current_size = None
+
+        if current_size is not None and int(current_size) != int(self.dimension):
+            logger.warning(
+                "Qdrant collection exists but dimension differs "
+                f"(have {current_size}, need {self.dimension}). Recreating collection."
+            )
+            self._replace_collection(self._create_collection())
+            logger.info(
+                f"Recreated collection {self.collection_name} with dimension {self.dimension}"
+            )
+        else:
+            logger.info(f"Using existing collection: {self.collection_name}")
+
+    def _create_collection(self) -> str:
+        """Create an empty concrete collection and return its name"""
+        from qdrant_client.models import Distance, VectorParams
+
+        name = f"{self.collection_name}__{uuid.uuid4().hex[:8]}"
+        self._client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(size=self.dimension, distance=Distance.COSINE),
+        )
+        return name
+
+    def _alias_target(self) -> Optional[str]:
+        """Concrete collection the alias points to (None if it is not an alias)"""
+        for alias in self._client.get_aliases().aliases:
+            if alias.alias_name == self.collection_name:
+                return alias.collection_name
+        return None
+
+    def _replace_collection(self, new_collection: str) -> None:
+        """Point the alias at another concrete collection and delete the previous one"""
+        from qdrant_client.models import (
+            CreateAlias,
+            CreateAliasOperation,
+            DeleteAlias,
+            DeleteAliasOperation,
+        )
+
+        previous = self._alias_target()
+        operations = []
+        if previous is not None:
+            operations.append(
+                DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=self.collection_name))
+            )
+        else:
+            # Collection created before aliases were used; an alias cannot share its name
+            try:
+                self._client.delete_collection(self.collection_name)
+            except Exception as del_e:
+                logger.warning(f"Failed to delete existing collection: {del_e}")
+        operations.append(
+            CreateAliasOperation(
+                create_alias=CreateAlias(
+                    collection_name=new_collection, alias_name=self.collection_name
+                )
+            )
+        )
+        # All alias operations of one request are applied atomically
+        self._client.update_collection_aliases(change_aliases_operations=operations)
+
+        if previous is not None and previous != new_collection:
+            try:
+                self._client.delete_collection(previous)
+            except Exception as del_e:
+                logger.warning(f"Failed to delete replaced collection {previous}: {del_e}")
+
+    @property
+    def _target_collection(self) -> str:
+        """Collection this store reads and writes"""
+        return self._staged_collection or self.collection_name
+
+    def clone(self) -> "QdrantVectorStore":
+        """Create a staged copy sharing the client (see class notes)"""
+        staged = copy.copy(self)
+        staged._client = self._get_client()
+        staged._staged = True
+        staged._staged_collection = None
+        staged._added_ids = []
+        staged._pending_deletes = []
+        return staged
+
     async def add_documents(
         self,
         embeddings: List[List[float]],
@@ -349,8 +607,6 @@ class QdrantVectorStore(BaseVectorStore):
         ids: Optional[List[str]] = None,
     ) -> None:
         """Add documents to Qdrant"""
-        import uuid
-
         from qdrant_client.models import PointStruct
 
         client = self._get_client()
@@ -365,9 +621,13 @@ class QdrantVectorStore(BaseVectorStore):
             points.append(PointStruct(id=point_id, vector=embedding, payload=doc))
 
         # Upload to Qdrant
-        client.upsert(collection_name=self.collection_name, points=points)
+        client.upsert(collection_name=self._target_collection, points=points)
+        if self._staged and not self._staged_collection:
+            self._added_ids.extend(point.id for point in points)
 
-        logger.info(f"Added {len(points)} documents to Qdrant collection: {self.collection_name}")
+        logger.info(
+            f"Added {len(points)} documents to Qdrant collection: {self._target_collection}"
+        )
 
     async def search(
         self,
@@ -376,25 +636,14 @@ class QdrantVectorStore(BaseVectorStore):
         filter_dict: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """Search Qdrant"""
-        from qdrant_client.models import FieldCondition, Filter, MatchValue
-
         client = self._get_client()
 
-        # Build filter
-        query_filter = None
-        if filter_dict:
-            conditions = [
-                FieldCondition(key=key, match=MatchValue(value=value))
-                for key, value in filter_dict.items()
-            ]
-            query_filter = Filter(must=conditions)
-
         # Search
         search_results = client.search(
-            collection_name=self.collection_name,
+            collection_name=self._target_collection,
             query_vector=query_embedding,
             limit=top_k,
-            query_filter=query_filter,
+            query_filter=_build_filter(filter_dict),
         )
 
         # Format results
@@ -409,19 +658,20 @@ class QdrantVectorStore(BaseVectorStore):
         return results
 
     async def clear(self) -> None:
-        """Clear Qdrant collection"""
+        """Clear Qdrant collection (a staged copy switches to a fresh collection)"""
         client = self._get_client()
 
         try:
-            # Delete and recreate collection
-            from qdrant_client.models import Distance, VectorParams
-
-            client.delete_collection(self.collection_name)
-            client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(size=self.dimension, distance=Distance.COSINE),
-            )
-            logger.info(f"Cleared Qdrant collection: {self.collection_name}")
+            if self._staged:
+                await self.discard()
+                self._staged_collection = self._create_collection()
+                logger.info(
+                    f"Staging Qdrant collection {self._staged_collection} "
+                    f"for {self.collection_name}"
+                )
+            else:
+                self._replace_collection(self._create_collection())
+                logger.info(f"Cleared Qdrant collection: {self.collection_name}")
         except Exception as e:
             logger.error(f"Error clearing Qdrant collection: {e}")
             raise
@@ -431,7 +681,7 @@ class QdrantVectorStore(BaseVectorStore):
         client = self._get_client()
 
         try:
-            collection_info = client.get_collection(self.collection_name)
+            collection_info = client.get_collection(self._target_collection)
             return int(collection_info.points_count)
         except Exception as e:
             logger.error(f"Error getting count from Qdrant: {e}")
@@ -445,28 +695,113 @@ class QdrantVectorStore(BaseVectorStore):
         """Load not needed for Qdrant (persists on server)"""
         logger.info("Qdrant collections are loaded from the server automatically")
 
+    async def publish(self) -> None:
+        """Switch the alias to the staged collection or apply queued deletions"""
+        if not self._staged:
+            return
+        from qdrant_client.models import PointIdsList
+
+        client = self._get_client()
+        if self._staged_collection:
+            self._replace_collection(self._staged_collection)
+            logger.info(
+                f"Published Qdrant collection {self._staged_collection} as {self.collection_name}"
+            )
+        elif self._pending_deletes:
+            client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=self._pending_deletes),
+            )
+            logger.info(
+                f"Deleted {len(self._pending_deletes)} staged points from {self.collection_name}"
+            )
+        self._staged = False
+        self._staged_collection = None
+        self._added_ids = []
+        self._pending_deletes = []
+
+    async def discard(self) -> None:
+        """Delete the staged collection and points added to the live collection"""
+        if not self._staged:
+            return
+        from qdrant_client.models import PointIdsList
+
+        client = self._get_client()
+        try:
+            if self._staged_collection:
+                client.delete_collection(self._staged_collection)
+            if self._added_ids:
+                client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=PointIdsList(points=self._added_ids),
+                )
+        except Exception as e:
+            logger.warning(f"Failed to discard staged Qdrant changes: {e}")
+        self._staged_collection = None
+        self._added_ids = []
+        self._pending_deletes = []
+
+    def supports_filter(self) -> bool:
+        return True
+
     def supports_delete_by_filter(self) -> bool:
         return True
 
     async def delete_by_filter(self, filter_dict: Dict[str, Any]) -> int:
         """Delete points in Qdrant matching payload filter"""
-        from qdrant_client.models import FieldCondition, Filter, MatchValue
-
         client = self._get_client()
-
-        # Build conditions from exact-match payload fields
-        conditions = [
-            FieldCondition(key=k, match=MatchValue(value=v)) for k, v in filter_dict.items()
-        ]
-        q_filter = Filter(must=conditions) if conditions else None
+        q_filter = _build_filter(filter_dict)
 
         try:
+            if self._staged and not self._staged_collection:
+                # Readers still use these points; resolve them now, delete on publish
+                point_ids = self._find_point_ids(q_filter)
+                self._pending_deletes.extend(point_ids)
+                return len(point_ids)
+
             # Delete by filter; Qdrant does not return count synchronously
-            client.delete(collection_name=self.collection_name, points_selector=q_filter)
+            client.delete(collection_name=self._target_collection, points_selector=q_filter)
             logger.info(
-                f"Deleted documents from Qdrant where {filter_dict} in collection {self.collection_name}"
+                f"Deleted documents from Qdrant where {filter_dict} in collection {self._target_collection}"
             )
             return -1  # unknown count
         except Exception as e:
             logger.error(f"Error deleting by filter in Qdrant: {e}")
             raise
+
+    def _find_point_ids(self, q_filter) -> List[Any]:
+        """IDs of live points matching a filter"""
+        point_ids: List[Any] = []
+        offset = None
+        while True:
+            points, offset = self._client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=q_filter,
+                limit=256,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            point_ids.extend(point.id for point in points)
+            if offset is None:
+                return point_ids
+
+
+def _build_filter(filter_dict: Optional[Dict[str, Any]]):
+    """Build a Qdrant filter from payload fields (see matches_filter)"""
+    if not filter_dict:
+        return None
+    from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue
+
+    conditions = [
+        FieldCondition(
+            key=key,
+            match=(
+                MatchAny(any=list(value))
+                if isinstance(value, (list, tuple, set))
+                else MatchValue(value=value)
+            ),
+        )
+        for key, value in filter_dict.items()
+    ]
+    return Filter(must=conditions)
@@ -0,0 +1,158 @@
+"""
+Answer Streamer
+Shows the answer of the agent in a Telegram message while the LLM is still generating it
+"""
+
+import asyncio
+import json
+import re
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from loguru import logger
+
+from src.core.metrics import metrics
+
+# Time from receiving a question until the user sees the first part of the answer
+# (recorded in the bot process, served by its /metrics: see start_metrics_server)
+_TIME_TO_FIRST_VISIBLE_OUTPUT = metrics.histogram(
+    "ask_time_to_first_visible_output_seconds",
+    "Time from a question until the first streamed answer edit",
+)
+
+# Opening fence of the agent-result block holding the answer
+_RESULT_FENCE = "```agent-result"
+# Start of the (possibly unfinished) "answer" string inside the agent-result block
+_ANSWER_START = re.compile(r'```agent-result.*?"answer"\s*:\s*"', re.DOTALL)
+# JSON string body up to the closing quote (or the end of the text generated so far)
+_STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*', re.DOTALL)
+# Unicode escape cut off by the end of the stream
+_PARTIAL_UNICODE_ESCAPE = re.compile(r"\\u[0-9a-fA-F]{0,3}$")
+
+# Telegram message limit is 4096 characters
+MAX_PREVIEW_CHARS = 4000
+STREAMING_MARK = " ▌"
+
+
+def extract_answer_preview(text: str) -> Optional[str]:
+    """
+    Extract the answer generated so far from a partial agent response
+
+    Args:
+        text: Agent response text as streamed so far
+
+    Returns:
+        Decoded (possibly unfinished) "answer" field, or None if it has not started yet
+    """
+    start = _ANSWER_START.search(text)
+    if not start:
+        return None
+
+    body = _STRING_BODY.match(text, start.end()).group(0)
+    try:
+        return json.loads(f'"{body}"', strict=False)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(f'"{_PARTIAL_UNICODE_ESCAPE.sub("", body)}"', strict=False)
+    except json.JSONDecodeError:
+        return None
+
+
+class AnswerStreamer:
+    """
+    Streams the agent answer into a placeholder message through throttled edits
+
+    AICODE-NOTE: Telegram rate-limits message edits, so the streamed answer is
+    shown at most once per min_interval and never while the previous edit is
+    still in flight; intermediate texts are simply skipped. Edits run in a
+    background task so the LLM stream is never blocked by Telegram. The final,
+    formatted answer is still sent by _send_result after close().
+
+    Deltas are only kept from the latest agent-result fence on, and the answer
+    is extracted after the throttle and in-flight checks, so a long response
+    costs linear time rather than a full re-parse per token.
+    """
+
+    def __init__(
+        self,
+        edit_message: Callable[[str], Awaitable[bool]],
+        min_interval: float = 1.0,
+        started_at: Optional[float] = None,
+    ):
+        """
+        Initialize streamer
+
+        Args:
+            edit_message: Async callback editing the placeholder, returns True on success
+            min_interval: Minimum seconds between two edits
+            started_at: time.monotonic() when the question was received
+        """
+        self.edit_message = edit_message
+        self.min_interval = min_interval
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.edits = 0
+        self._last_edit_at: Optional[float] = None
+        self._last_text: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        # End of the text before the block, to find a fence split across deltas
+        self._tail = ""
+        # Text from the latest agent-result fence on
+        self._block: List[str] = []
+
+    async def update(self, delta: str) -> None:
+        """
+        Receive the next part of the LLM response (agent stream_callback)
+
+        Args:
+            delta: Text generated since the previous call
+        """
+        window = self._tail + delta
+        fence = window.rfind(_RESULT_FENCE)
+        if fence >= 0:
+            self._block = [window[fence:]]
+        elif self._block:
+            self._block.append(delta)
+        self._tail = window[-(len(_RESULT_FENCE) - 1) :]
+
+        if not self._block or (self._task and not self._task.done()):
+            return
+        now = time.monotonic()
+        if self._last_edit_at is not None and now - self._last_edit_at < self.min_interval:
+            return
+
+        text = "".join(self._block)
+        self._block = [text]
+        answer = extract_answer_preview(text)
+        if not answer or not answer.strip():
+            return
+
+        # Once the answer has started, parse it at most once per interval
+        self._last_edit_at = now
+        if len(answer) > MAX_PREVIEW_CHARS:
+            answer = answer[:MAX_PREVIEW_CHARS] + "…"
+        preview = answer + STREAMING_MARK
+        if preview == self._last_text:
+            return
+
+        self._last_text = preview
+        self._task = asyncio.create_task(self._edit(preview))
+
+    async def _edit(self, text: str) -> None:
+        try:
+            if not await self.edit_message(text):
+                return
+        except Exception as e:
+            logger.warning(f"[AnswerStreamer] Failed to show streamed answer: {e}")
+            return
+
+        if self.edits == 0:
+            elapsed = time.monotonic() - self.started_at
+            _TIME_TO_FIRST_VISIBLE_OUTPUT.observe(elapsed)
+            logger.debug(f"[AnswerStreamer] ⚡ First part of the answer shown after {elapsed:.2f}s")
+        self.edits += 1
+
+    async def close(self) -> None:
+        """Wait for the edit in flight so it cannot overwrite the final answer"""
+        if self._task:
+            await self._task
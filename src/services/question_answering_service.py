@@ -7,6 +7,7 @@ AICODE-NOTE: This service uses file-first prompt management via PromptService.
 Prompts are exported to data/prompts/ on mode switch and read from there.
 """
 
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -22,6 +23,7 @@ from src.knowledge_base.repository import RepositoryManager
 from src.processor.content_parser import ContentParser
 from src.processor.message_aggregator import MessageGroup
 from src.prompts import PromptService
+from src.services.answer_streamer import AnswerStreamer
 from src.services.base_kb_service import BaseKBService
 from src.services.interfaces import IQuestionAnsweringService, IUserContextManager
 
@@ -83,6 +85,7 @@ class QuestionAnsweringService(BaseKBService, IQuestionAnsweringService):
             user_id: User ID
             user_kb: User's knowledge base configuration
         """
+        started_at = time.monotonic()
         try:
             # Get KB path
             kb_path = self.repo_manager.get_kb_path(user_kb["kb_name"])
@@ -223,18 +226,24 @@ class QuestionAnsweringService(BaseKBService, IQuestionAnsweringService):
             self.logger.info(
                 f"[ASK_SERVICE] Querying KB for user {user_id}, question: {question_text[:50]}..."
             )
-            processed_content = await self._query_kb(
-                kb_path,
-                question_text,
-                user_id,
-                log_callback=log_callback,
-                chat_id=chat_id,
-                error_callback=error_callback,
+            answer_streamer = self._create_answer_streamer(
+                user_id, chat_id, primary_processing_id, started_at
             )
+            try:
+                processed_content = await self._query_kb(
+                    kb_path,
+                    question_text,
+                    user_id,
+                    log_callback=log_callback,
+                    chat_id=chat_id,
+                    error_callback=error_callback,
+                    stream_callback=answer_streamer.update if answer_streamer else None,
+                )
+            finally:
+                if answer_streamer:
+                    await answer_streamer.close()
 
             # Save assistant response to context
-            import time
-
             response_timestamp = int(time.time())
             self.user_context_manager.add_assistant_message_to_context(
                 user_id,
@@ -258,6 +267,35 @@ class QuestionAnsweringService(BaseKBService, IQuestionAnsweringService):
                 )
             await self._send_error_notification(processing_msg_id, chat_id, error_message)
 
+    def _create_answer_streamer(
+        self, user_id: int, chat_id: int, message_id: int, started_at: float
+    ) -> Optional[AnswerStreamer]:
+        """
+        Create a streamer showing the answer in the primary processing message
+
+        Args:
+            user_id: User ID
+            chat_id: Chat ID
+            message_id: Primary processing message ID
+            started_at: time.monotonic() when the question was received
+
+        Returns:
+            AnswerStreamer, or None if streaming is disabled for the user
+        """
+        if not self.settings_manager.get_setting(user_id, "AGENT_STREAM_ANSWERS"):
+            return None
+
+        async def edit_answer(text: str) -> bool:
+            # Plain text: the partial answer may contain unbalanced markdown
+            return await self._safe_edit_message(text, chat_id=chat_id, message_id=message_id)
+
+        interval = self.settings_manager.get_setting(user_id, "AGENT_STREAM_EDIT_INTERVAL")
+        return AnswerStreamer(
+            edit_answer,
+            min_interval=1.0 if interval is None else float(interval),
+            started_at=started_at,
+        )
+
     async def _query_kb(
         self,
         kb_path: Path,
@@ -266,6 +304,7 @@ class QuestionAnsweringService(BaseKBService, IQuestionAnsweringService):
         log_callback=None,
         chat_id: int = None,
         error_callback=None,
+        stream_callback=None,
     ) -> str:
         """
         Query knowledge base with a question.
@@ -279,6 +318,7 @@ class QuestionAnsweringService(BaseKBService, IQuestionAnsweringService):
             user_id: User ID
             log_callback: Optional async callback function to receive log snippets
             chat_id: Chat ID for log updates (optional)
+            stream_callback: Optional async callback receiving the answer while it is generated
 
         Returns:
             Answer text formatted for user
@@ -350,6 +390,7 @@ class QuestionAnsweringService(BaseKBService, IQuestionAnsweringService):
             "prompt": query_prompt,
             "log_callback": log_callback,
             "error_callback": error_callback,
+            "stream_callback": stream_callback,
             "log_chars": 1000,  # Default: last 1000 characters
             "log_update_interval": 30.0,  # Default: update every 30 seconds
         }
@@ -105,6 +105,9 @@ class TestAgentFactory:
         mock_settings.AGENT_ENABLE_MCP_MEMORY = False
         mock_settings.AGENT_QWEN_CLI_PATH = "qwen"
         mock_settings.AGENT_TIMEOUT = 300
+        mock_settings.AGENT_MAX_PARALLEL_TOOL_CALLS = 4
+        mock_settings.AGENT_HISTORY_MAX_TOKENS = 8000
+        mock_settings.AGENT_TOOL_RESULT_MAX_TOKENS = 2000
         mock_settings.KB_PATH = "./knowledge_base"
         mock_settings.KB_TOPICS_ONLY = True
 
@@ -117,6 +120,9 @@ class TestAgentFactory:
         assert agent.enable_git
         assert not agent.enable_github
         assert not agent.enable_shell
+        assert agent.max_parallel_tool_calls == 4
+        assert agent.history_max_tokens == 8000
+        assert agent.tool_result_max_tokens == 2000
 
     def test_agent_types_registered(self):
         """Test that all agent types are registered"""
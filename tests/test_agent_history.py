@@ -0,0 +1,88 @@
+"""
+Tests for the bounded, structured autonomous agent history
+"""
+
+import json
+
+import pytest
+
+from src.agents import AutonomousAgent
+from src.agents.agent_history import build_history_messages, estimate_tokens
+from src.agents.autonomous_agent import AgentContext, ToolExecution
+from src.agents.llm_connectors.base_connector import BaseLLMConnector, LLMResponse
+
+
+def _turn_context(turns, output_chars):
+    context = AgentContext(task="task")
+    for n in range(turns):
+        execution = ToolExecution(
+            tool_name="kb_read_file",
+            params={"paths": [f"{n}.md"]},
+            result={"content": str(n) * output_chars},
+            success=True,
+        )
+        context.add_turn(f"step {n}", [execution])
+    return context
+
+
+def test_latest_results_full_older_ones_previewed():
+    context = _turn_context(turns=3, output_chars=1000)
+
+    messages = build_history_messages(context.turns, max_tokens=10_000, result_max_tokens=2000)
+
+    assert [m["role"] for m in messages] == ["assistant", "tool"] * 3
+    assert messages[0]["tool_calls"][0]["id"] == messages[1]["tool_call_id"] == "call_1"
+    assert json.loads(messages[0]["tool_calls"][0]["function"]["arguments"]) == {"paths": ["0.md"]}
+    assert "full output is kept as execution #1" in messages[1]["content"]
+    assert len(messages[1]["content"]) < 400
+    assert messages[-1]["content"] == json.dumps({"content": "2" * 1000})
+
+
+def test_history_stays_within_budget():
+    context = _turn_context(turns=50, output_chars=5000)
+
+    messages = build_history_messages(context.turns, max_tokens=1000, result_max_tokens=200)
+
+    assert messages[0]["role"] == "user" and "earlier step(s) omitted" in messages[0]["content"]
+    assert sum(estimate_tokens(json.dumps(m)) for m in messages) < 1500
+    assert messages[-1]["content"].endswith("full output is kept as execution #50]")
+    assert len(context.executions[0].result["content"]) == 5000
+
+
+class LoopingConnector(BaseLLMConnector):
+    """Reads a large file on every step, then ends"""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.prompt_sizes = []
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        self.prompt_sizes.append(len(json.dumps(messages)))
+        if len(self.prompt_sizes) > self.steps:
+            return LLMResponse(content="# Done")
+        call = {
+            "id": f"llm-{len(self.prompt_sizes)}",
+            "function": {"name": "analyze_content", "arguments": {"text": "word " * 2000}},
+        }
+        return LLMResponse(tool_calls=[call])
+
+    def get_model_name(self) -> str:
+        return "looping"
+
+
+@pytest.mark.asyncio
+async def test_prompt_size_is_bounded_on_long_runs(tmp_path):
+    connector = LoopingConnector(steps=20)
+    agent = AutonomousAgent(
+        llm_connector=connector,
+        kb_root_path=tmp_path,
+        max_iterations=25,
+        history_max_tokens=3000,
+        tool_result_max_tokens=500,
+    )
+
+    result = await agent._agent_loop("Analyze a lot")
+
+    assert result.context.executions[0].call_id == "llm-1"
+    assert max(connector.prompt_sizes[10:]) < 1.2 * max(connector.prompt_sizes[:10])
+    assert result.context.prompt_tokens > 0
@@ -0,0 +1,82 @@
+"""
+Tests for streaming the ask-mode answer into Telegram
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import answer_streamer
+from src.services.answer_streamer import AnswerStreamer, extract_answer_preview
+
+
+def test_extract_answer_preview_from_partial_block():
+    head = 'Found it.\n```agent-result\n{"summary": "ok", "answer": '
+
+    assert extract_answer_preview(head) is None
+    assert extract_answer_preview('"answer": "not in the block"') is None
+    assert extract_answer_preview(head + '"Line one\\nLine \\"two') == 'Line one\nLine "two'
+    assert extract_answer_preview(head + '"Caf\\u00e9 and \\') == "Café and "
+    assert extract_answer_preview(head + '"Caf\\u00') == "Caf"
+    assert extract_answer_preview(head + '"Done.", "links": []}\n```') == "Done."
+
+
+@pytest.mark.asyncio
+async def test_edits_are_throttled_and_skip_while_in_flight(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(answer_streamer, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    release = asyncio.Event()
+    edits = []
+
+    async def edit(text):
+        edits.append(text)
+        await release.wait()
+        return True
+
+    streamer = AnswerStreamer(edit, min_interval=1.0, started_at=0.0)
+    extracted = []
+    extract = answer_streamer.extract_answer_preview
+    monkeypatch.setattr(
+        answer_streamer,
+        "extract_answer_preview",
+        lambda text: extracted.append(text) or extract(text),
+    )
+
+    # The fence is split across deltas and preceded by text outside the block
+    await streamer.update("Found it.\n``")
+    await streamer.update('`agent-result\n{"answer": "Hel')
+    await asyncio.sleep(0)
+    now[0] = 5.0
+    await streamer.update("lo")  # previous edit still in flight
+    release.set()
+    await asyncio.sleep(0)
+    await streamer.update(", wor")
+    now[0] = 5.5
+    await streamer.update("ld")  # within min_interval
+    await streamer.close()
+
+    assert edits == ["Hel ▌", "Hello, wor ▌"]
+    assert streamer.edits == 2
+    # Skipped deltas are not parsed
+    assert extracted == [
+        '```agent-result\n{"answer": "Hel',
+        '```agent-result\n{"answer": "Hello, wor',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_first_visible_output_is_recorded_once():
+    histogram = answer_streamer._TIME_TO_FIRST_VISIBLE_OUTPUT
+    before = sum(series[2] for series in histogram._values.values())
+
+    async def edit(text):
+        return True
+
+    streamer = AnswerStreamer(edit, min_interval=0)
+    for delta in ('```agent-result\n{"answer": "a', "b", "c"):
+        await streamer.update(delta)
+        await streamer.close()
+
+    assert streamer.edits == 3
+    assert sum(series[2] for series in histogram._values.values()) == before + 1
@@ -0,0 +1,105 @@
+"""
+Tests for executing all tool calls of one LLM response
+"""
+
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from src.agents import AgentContext, AutonomousAgent
+from src.agents.llm_connectors.base_connector import BaseLLMConnector, LLMResponse
+from src.agents.tools.base_tool import BaseTool
+
+
+class SlowTool(BaseTool):
+    """Records concurrency; parallel-safe unless told otherwise"""
+
+    def __init__(self, name: str, log: Dict[str, Any], parallel_safe: bool = True):
+        self._name = name
+        self.log = log
+        self.parallel_safe = parallel_safe
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._name
+
+    @property
+    def parameters_schema(self) -> Dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, params, context):
+        self.log["active"] += 1
+        self.log["peak"] = max(self.log["peak"], self.log["active"])
+        self.log["order"].append(f"{self._name}:{params['n']}")
+        await asyncio.sleep(0.05)
+        self.log["active"] -= 1
+        return {"success": True, "n": params["n"]}
+
+
+class ScriptedConnector(BaseLLMConnector):
+    """First response requests several tools, the second one ends"""
+
+    def __init__(self, tool_calls):
+        self.responses = [
+            LLMResponse(content=None, tool_calls=tool_calls),
+            LLMResponse(content="# Done\n\nAll files read."),
+        ]
+        self.calls = 0
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    def get_model_name(self) -> str:
+        return "scripted"
+
+
+def _call(name, n):
+    return {"id": f"{name}-{n}", "function": {"name": name, "arguments": {"n": n}}}
+
+
+@pytest.fixture
+def make_agent(tmp_path):
+    def make(tool_calls, max_parallel_tool_calls=2):
+        log = {"active": 0, "peak": 0, "order": []}
+        connector = ScriptedConnector(tool_calls)
+        agent = AutonomousAgent(
+            llm_connector=connector,
+            kb_root_path=tmp_path,
+            max_parallel_tool_calls=max_parallel_tool_calls,
+        )
+        agent.tool_manager.register(SlowTool("read", log))
+        agent.tool_manager.register(SlowTool("write", log, parallel_safe=False))
+        return agent, connector, log
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_all_tool_calls_run_in_one_iteration_with_bounded_concurrency(make_agent):
+    agent, connector, log = make_agent([_call("read", n) for n in range(5)])
+
+    result = await agent._agent_loop("Read five files")
+
+    assert connector.calls == 2
+    assert result.iterations == 2
+    assert [e.result["n"] for e in result.context.executions] == [0, 1, 2, 3, 4]
+    assert log["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_state_changing_tools_run_alone_and_in_order(make_agent):
+    calls = [_call("read", 0), _call("read", 1), _call("write", 2), _call("read", 3)]
+    agent, _, log = make_agent(calls, max_parallel_tool_calls=4)
+
+    decision = await agent._make_decision(AgentContext(task="Edit a file"))
+    executions = await agent._execute_tool_calls(decision)
+
+    assert [e.tool_name for e in executions] == ["read", "read", "write", "read"]
+    assert log["order"].index("write:2") == 2
+    assert log["peak"] == 2
@@ -0,0 +1,100 @@
+"""
+Tests for request body compression shared by MCPHubClient and MCP Hub
+"""
+
+import gzip
+
+import pytest
+
+from src.core.compression import (
+    GZIP,
+    BodyTooLargeError,
+    CorruptBodyError,
+    IDENTITY,
+    UnsupportedEncodingError,
+    compress,
+    decompress,
+    supported_encodings,
+)
+
+
+def test_round_trip_for_supported_encodings():
+    """Every advertised encoding decodes back to the original body"""
+    body = ("# Note\n\nSome markdown content. " * 200).encode("utf-8")
+
+    assert supported_encodings()[-1] == GZIP
+    for encoding in supported_encodings() + [IDENTITY]:
+        assert decompress(compress(body, encoding), encoding) == body
+
+    # Header values are matched case-insensitively
+    assert decompress(gzip.compress(body), " GZIP ") == body
+
+
+def test_unknown_encoding_is_rejected():
+    """Unknown encodings raise a dedicated error (hub answers 415)"""
+    with pytest.raises(UnsupportedEncodingError):
+        decompress(b"data", "br")
+    with pytest.raises(UnsupportedEncodingError):
+        compress(b"data", "br")
+
+
+def test_corrupt_and_oversized_bodies_are_rejected():
+    """Decoding stops at max_size; invalid data raises a dedicated error"""
+    body = b"a" * 100_000
+    encoded = compress(body, GZIP)
+
+    # Every gzip member is decoded, like gzip.decompress
+    assert decompress(encoded + compress(b"tail", GZIP), GZIP) == body + b"tail"
+    assert decompress(encoded, GZIP, max_size=len(body)) == body
+    with pytest.raises(BodyTooLargeError):
+        decompress(encoded, GZIP, max_size=len(body) - 1)
+    with pytest.raises(BodyTooLargeError):
+        decompress(body, IDENTITY, max_size=10)
+    for corrupt in (b"not gzip", encoded[:-10], encoded + b"junk"):
+        with pytest.raises(CorruptBodyError):
+            decompress(corrupt, GZIP)
+
+
+def test_hub_decodes_compressed_request_bodies():
+    """Hub routes receive decoded JSON for gzip bodies and reject unknown encodings"""
+    import json
+    from unittest.mock import patch
+
+    from starlette.testclient import TestClient
+
+    import src.mcp.mcp_hub_server as hub
+
+    payload = {"documents": [{"id": "a", "content": "text " * 100}], "kb_id": "kb"}
+    body = gzip.compress(json.dumps(payload).encode("utf-8"))
+
+    with patch.object(hub, "check_vector_search_availability", return_value=False):
+        with TestClient(hub.mcp.http_app(transport="sse")) as http:
+            # Availability is checked after the body is parsed, so 503 proves decoding worked
+            response = http.post(
+                "/vector/documents",
+                content=body,
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
+            assert response.status_code == 503
+
+            response = http.post(
+                "/vector/documents",
+                content=b"data",
+                headers={"Content-Type": "application/json", "Content-Encoding": "br"},
+            )
+            assert response.status_code == 415
+
+            response = http.post(
+                "/vector/documents",
+                content=body[:-10],
+                headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            )
+            assert response.status_code == 400
+
+            with patch.object(hub, "MAX_DECODED_BODY_SIZE", 100):
+                response = http.post(
+                    "/vector/documents",
+                    content=body,
+                    headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+                )
+            assert response.status_code == 413
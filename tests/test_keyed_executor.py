@@ -0,0 +1,89 @@
+"""
+Tests for KeyedExecutor and the MCP Hub memory tools running on it
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.core.keyed_executor import KeyedExecutor
+
+
+@pytest.mark.asyncio
+async def test_same_key_serialized_different_keys_parallel():
+    executor = KeyedExecutor("test", max_workers=4)
+    active = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0, "total": 0}
+    lock = threading.Lock()
+
+    def work(key):
+        with lock:
+            active[key] += 1
+            peak[key] = max(peak[key], active[key])
+            peak["total"] = max(peak["total"], active["a"] + active["b"])
+        time.sleep(0.05)
+        with lock:
+            active[key] -= 1
+        return key
+
+    results = await asyncio.gather(*(executor.run(key, work, key) for key in "abab"))
+
+    assert results == list("abab")
+    assert peak["a"] == 1 and peak["b"] == 1
+    assert peak["total"] == 2
+    assert executor.stats()["active_keys"] == 0
+    assert executor.stats()["completed"] == 4
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_keeps_key_busy_until_thread_finishes():
+    executor = KeyedExecutor("test", max_workers=2)
+    order = []
+
+    def slow():
+        time.sleep(0.1)
+        order.append("slow")
+
+    task = asyncio.create_task(executor.run(1, slow))
+    await asyncio.sleep(0.02)
+    task.cancel()
+    await executor.run(1, order.append, "next")
+
+    assert order == ["slow", "next"]
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hub_memory_tools_do_not_block_event_loop(monkeypatch):
+    import src.mcp.mcp_hub_server as hub
+
+    class SlowStorage:
+        def store(self, content, category, tags, metadata):
+            time.sleep(0.2)
+            return {"success": True, "memory_id": 1}
+
+        def list_categories(self):
+            return {"success": True, "categories": [{"name": "general", "count": 1}]}
+
+    slow = SlowStorage()
+    monkeypatch.setattr(hub, "check_memory_tools_availability", lambda: True)
+    monkeypatch.setattr(hub, "get_storage", lambda user_id: slow)
+    monkeypatch.setattr(hub, "_memory_executor", KeyedExecutor("memory", max_workers=2))
+
+    store_task = asyncio.create_task(hub.store_memory(content="x", user_id=1))
+    await asyncio.sleep(0.02)
+
+    # Another user's call completes while the first store is still running
+    started = time.perf_counter()
+    categories = await hub.list_categories(user_id=2)
+    assert time.perf_counter() - started < 0.15
+    assert categories["categories"] == [{"name": "general", "count": 1}]
+    assert not store_task.done()
+
+    assert (await store_task)["memory_id"] == 1
+    hub._memory_executor.shutdown()
@@ -0,0 +1,163 @@
+"""
+Tests for the shared LLM gateway
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.llm_connectors import llm_gateway
+from src.agents.llm_connectors.llm_gateway import (
+    LLMGateway,
+    LLMUnavailableError,
+    get_llm_gateway,
+)
+
+
+class APIError(Exception):
+    """Mimics openai.APIStatusError (status_code and response headers)"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def _flaky(errors, result="ok"):
+    calls = []
+
+    async def request():
+        calls.append(time.monotonic())
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return request, calls
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_are_admitted_round_robin_across_users():
+    gateway = LLMGateway(max_concurrency=1)
+    order = []
+
+    def request(name):
+        async def run():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+        return run
+
+    calls = [gateway.call(request(f"a{n}"), user_id="alice") for n in range(3)]
+    calls.append(gateway.call(request("b0"), user_id="bob"))
+    await asyncio.gather(*calls)
+
+    assert order == ["a0", "a1", "b0", "a2"]
+    assert gateway.stats()["active"] == 0 and gateway.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_are_retried_after_retry_after():
+    gateway = LLMGateway(retry_base_delay=0.01)
+    request, calls = _flaky([APIError(429, {"retry-after": "0.1"}), APIError(502)])
+
+    assert await gateway.call(request) == "ok"
+    assert len(calls) == 3
+    assert calls[1] - calls[0] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_and_delivered_streams_are_not_retried():
+    gateway = LLMGateway(retry_base_delay=0)
+
+    request, calls = _flaky([APIError(400)])
+    with pytest.raises(APIError):
+        await gateway.call(request)
+    assert len(calls) == 1
+
+    request, calls = _flaky([APIError(503)])
+    with pytest.raises(APIError):
+        await gateway.call(request, can_retry=lambda: False)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_repeated_server_errors():
+    gateway = LLMGateway(max_retries=1, retry_base_delay=0, failure_threshold=2)
+    request, calls = _flaky([APIError(500), APIError(500)])
+
+    with pytest.raises(APIError):
+        await gateway.call(request, provider="https://llm.example")
+    with pytest.raises(LLMUnavailableError):
+        await gateway.call(request, provider="https://llm.example")
+    assert len(calls) == 2
+
+    # Other providers are not affected
+    assert await gateway.call(request, provider="https://other.example") == "ok"
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_requests(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "BUDGET_WINDOW", 0.2)
+    gateway = LLMGateway(tokens_per_minute=100)
+    request, calls = _flaky([])
+
+    await gateway.call(request, estimated_tokens=80)
+    await gateway.call(request, estimated_tokens=80)
+
+    assert calls[1] - calls[0] >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_requests_waiting_for_budget_do_not_hold_a_slot(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "BUDGET_WINDOW", 0.3)
+    gateway = LLMGateway(max_concurrency=1, tokens_per_minute=100)
+    order = []
+
+    def request(name):
+        async def run():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+        return run
+
+    await asyncio.gather(
+        gateway.call(request("a"), user_id="alice", estimated_tokens=80),
+        gateway.call(request("b"), user_id="alice", estimated_tokens=80),
+        gateway.call(request("c"), user_id="bob"),
+    )
+
+    assert order == ["a", "c", "b"]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_is_shared_round_robin_across_users(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "BUDGET_WINDOW", 0.2)
+    gateway = LLMGateway(max_concurrency=8, tokens_per_minute=100)
+    order = []
+
+    def request(name):
+        async def run():
+            order.append(name)
+
+        return run
+
+    calls = [gateway.call(request(f"a{n}"), user_id="alice", estimated_tokens=40) for n in range(5)]
+    calls.append(gateway.call(request("b0"), user_id="bob", estimated_tokens=40))
+    await asyncio.gather(*calls)
+
+    # Alice's burst does not take the budget ahead of Bob's request
+    assert order == ["a0", "a1", "a2", "b0", "a3", "a4"]
+    assert gateway.stats()["active"] == 0 and gateway.stats()["queued"] == 0
+
+
+def test_each_event_loop_gets_its_own_gateway():
+    async def get_twice():
+        return get_llm_gateway(), get_llm_gateway()
+
+    first, same = asyncio.run(get_twice())
+    other, _ = asyncio.run(get_twice())
+
+    assert first is same
+    assert other is not first
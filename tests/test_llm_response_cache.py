@@ -0,0 +1,94 @@
+"""
+Tests for the disk-backed LLM response cache
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import src.core.llm_response_cache as llm_response_cache
+from config.settings import settings
+from src.core.llm_response_cache import LLMResponseCache, is_cacheable, make_cache_key
+from src.mcp.memory.mem_agent_impl.model import get_model_response
+
+MESSAGES = [{"role": "user", "content": "Summarize"}]
+
+
+def test_key_covers_request_inputs():
+    key = make_cache_key("https://llm", "m", MESSAGES, params={"temperature": 0, "max_tokens": 5})
+
+    assert key == make_cache_key(
+        "https://llm", "m", MESSAGES, params={"max_tokens": 5, "temperature": 0}
+    )
+    assert key != make_cache_key("https://llm", "other", MESSAGES, params={"temperature": 0})
+    assert key != make_cache_key(
+        "https://llm", "m", MESSAGES, tools=[{"type": "function"}], params={"temperature": 0}
+    )
+    assert is_cacheable(0) and not is_cacheable(0.7) and not is_cacheable(None)
+
+
+def test_entries_expire_and_survive_reopening(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_response_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    cache = LLMResponseCache(tmp_path / "llm.db", ttl=60)
+    cache.set("k", {"content": "answer"})
+    cache.close()
+
+    reopened = LLMResponseCache(tmp_path / "llm.db", ttl=60)
+    assert reopened.get("k") == {"content": "answer"}
+    now[0] += 60
+    assert reopened.get("k") is None
+    assert reopened.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.db", max_entries=2, max_bytes=1000)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+
+    cache.set("big", "x" * 990)
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.get("big") == "x" * 990
+
+
+@pytest.fixture
+def enabled_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_RESPONSE_CACHE_PATH", str(tmp_path / "llm.db"))
+    monkeypatch.setattr(llm_response_cache, "_cache", None)
+    yield
+    if llm_response_cache._cache is not None:
+        llm_response_cache._cache.close()
+
+
+def _fake_client(requests):
+    def create(**params):
+        requests.append(params)
+        message = SimpleNamespace(content=f"reply {len(requests)}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    completions = SimpleNamespace(create=create)
+    return SimpleNamespace(
+        base_url="http://mem-agent/v1", chat=SimpleNamespace(completions=completions)
+    )
+
+
+def test_repeated_deterministic_mem_agent_query_costs_no_llm_call(enabled_cache):
+    requests = []
+    client = _fake_client(requests)
+
+    first = get_model_response(message="Find Bob", model="mem", client=client, temperature=0)
+    second = get_model_response(message="Find Bob", model="mem", client=client, temperature=0)
+
+    assert first == second == "reply 1"
+    assert len(requests) == 1 and requests[0]["temperature"] == 0
+
+    # Sampled requests are never served from the cache
+    get_model_response(message="Find Bob", model="mem", client=client, temperature=0.7)
+    get_model_response(message="Find Bob", model="mem", client=client)
+    assert len(requests) == 3 and "temperature" not in requests[2]
@@ -0,0 +1,115 @@
+"""
+Tests for streamed LLM responses in the connector and the autonomous agent
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents import AutonomousAgent
+from src.agents.llm_connectors import openai_connector
+from src.agents.llm_connectors.base_connector import BaseLLMConnector, LLMResponse
+from src.agents.llm_connectors.openai_connector import OpenAIConnector
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+def _tool_delta(index, id=None, name=None, arguments=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(index=index, id=id, function=function)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _connector(chunks):
+    connector = OpenAIConnector(api_key="test", model="test-model")
+    requests = []
+
+    async def create(**params):
+        requests.append(params)
+        return FakeStream(chunks)
+
+    connector.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    return connector, requests
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_reports_deltas_and_assembles_tool_calls():
+    connector, requests = _connector(
+        [
+            _chunk(content="Let me "),
+            _chunk(content="look."),
+            _chunk(tool_calls=[_tool_delta(0, id="call_a", name="kb_read_file", arguments="")]),
+            _chunk(tool_calls=[_tool_delta(1, id="call_b", name="kb_list_directory")]),
+            _chunk(tool_calls=[_tool_delta(0, arguments='{"paths": ')]),
+            _chunk(tool_calls=[_tool_delta(0, arguments='["a.md"]}')]),
+            _chunk(finish_reason="tool_calls"),
+            SimpleNamespace(choices=[]),
+        ]
+    )
+    deltas = []
+
+    async def on_text(delta):
+        deltas.append(delta)
+
+    histogram = openai_connector._TIME_TO_FIRST_TOKEN
+    response = await connector.stream_chat_completion(
+        [{"role": "user", "content": "hi"}], on_text=on_text
+    )
+
+    assert requests[0]["stream"] is True
+    assert deltas == ["Let me ", "look."]
+    assert response.content == "Let me look."
+    assert response.finish_reason == "tool_calls"
+    assert [call["id"] for call in response.tool_calls] == ["call_a", "call_b"]
+    assert response.tool_calls[0]["function"]["arguments"] == {"paths": ["a.md"]}
+    assert response.tool_calls[1]["function"]["arguments"] == {}
+    assert histogram._values[("test-model",)][2] >= 1
+
+
+class AnswerConnector(BaseLLMConnector):
+    """Non-streaming connector: one tool call, then the final answer"""
+
+    def __init__(self):
+        self.responses = [
+            LLMResponse(
+                content="Reading",
+                tool_calls=[{"id": "c1", "function": {"name": "analyze_content", "arguments": {}}}],
+            ),
+            LLMResponse(content='```agent-result\n{"answer": "42"}\n```'),
+        ]
+
+    async def chat_completion(self, messages, tools=None, **kwargs):
+        return self.responses.pop(0)
+
+    def get_model_name(self) -> str:
+        return "answer"
+
+
+@pytest.mark.asyncio
+async def test_agent_streams_final_answer_text(tmp_path):
+    streamed = []
+
+    async def stream_callback(text):
+        streamed.append(text)
+
+    agent = AutonomousAgent(llm_connector=AnswerConnector(), kb_root_path=tmp_path)
+    result = await agent._agent_loop("Question", stream_callback=stream_callback)
+
+    assert streamed == ['```agent-result\n{"answer": "42"}\n```']
+    assert result.iterations == 2
@@ -5,6 +5,7 @@ Tests the unified HTTP client for MCP Hub communication.
 """
 
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -128,6 +129,81 @@ class TestMCPHubClient:
                 },
             )
 
+    @pytest.mark.asyncio
+    async def test_vector_job_status_long_polls(self, client):
+        """Test indexing job status request with wait parameter"""
+        mock_response = {"success": True, "job": {"job_id": "abc", "status": "running"}}
+
+        with patch.object(client, "_make_request", return_value=mock_response) as mock_request:
+            result = await client.vector_job_status("abc", wait=2.0)
+
+            assert result == mock_response
+            mock_request.assert_called_once_with("GET", "/vector/jobs/abc", params={"wait": 2.0})
+
+    @pytest.mark.asyncio
+    async def test_vector_wait_for_job_returns_finished_job(self, client):
+        """Test waiting polls until the job finishes"""
+        responses = [
+            {"success": True, "job": {"job_id": "abc", "status": "running"}},
+            {"success": True, "job": {"job_id": "abc", "status": "completed", "result": {}}},
+        ]
+
+        with patch.object(client, "_make_request", side_effect=responses) as mock_request:
+            job = await client.vector_wait_for_job("abc")
+
+            assert job["status"] == "completed"
+            assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_vector_wait_for_job_timeout(self, client):
+        """Test waiting raises timeout error when the job does not finish"""
+        running = {"success": True, "job": {"job_id": "abc", "status": "running"}}
+
+        with patch.object(client, "_make_request", return_value=running):
+            with pytest.raises(MCPHubTimeoutError):
+                await client.vector_wait_for_job("abc", timeout=0)
+
+    @pytest.mark.asyncio
+    async def test_encode_json_compresses_large_bodies(self, client):
+        """Small bodies are sent as-is, large ones compressed with the best encoding"""
+        from src.core.compression import decompress
+
+        body, headers = await client._encode_json({"a": 1})
+        assert "Content-Encoding" not in headers
+        assert json.loads(body) == {"a": 1}
+
+        payload = {"documents": [{"id": "doc", "content": "# Title\n\nText " * 500}]}
+        body, headers = await client._encode_json(payload)
+        encoding = headers["Content-Encoding"]
+        assert len(body) < len(json.dumps(payload)) / 5
+        assert json.loads(decompress(body, encoding)) == payload
+
+    @pytest.mark.asyncio
+    async def test_vector_reindex_splits_large_document_lists(self, client):
+        """Large reindexes are sent as size-bounded parts of one upload (a single job)"""
+        client.batch_max_bytes = 200
+        documents = [{"id": f"doc{i}", "content": "x" * 120} for i in range(3)]
+        responses = [
+            {"success": True, "status": "receiving"},
+            {"success": True, "status": "receiving"},
+            {"success": True, "job_id": "job0"},
+        ]
+
+        with patch.object(client, "_make_request", side_effect=responses) as mock_request:
+            result = await client.vector_reindex(documents, force=True, kb_id="kb")
+
+        sent = [call.kwargs["json_data"] for call in mock_request.call_args_list]
+        assert [len(p["documents"]) for p in sent] == [1, 1, 1]
+        assert all(p["force"] is True and p["kb_id"] == "kb" for p in sent)
+        assert len({p["upload"]["id"] for p in sent}) == 1
+        assert [(p["upload"]["part"], p["upload"]["parts"]) for p in sent] == [
+            (0, 3),
+            (1, 3),
+            (2, 3),
+        ]
+        assert result["success"] is True
+        assert result["job_ids"] == ["job0"]
+
     @pytest.mark.asyncio
     async def test_registry_list_servers_success(self, client):
         """Test successful registry list servers"""
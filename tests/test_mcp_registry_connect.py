@@ -0,0 +1,156 @@
+"""
+Tests for concurrent MCP server connections with circuit breaking
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+import src.mcp.registry_client as registry_client
+import src.mcp.tools_cache as tools_cache
+from src.core.circuit_breaker import CircuitBreaker
+from src.mcp.client import MCPClient
+from src.mcp.registry_client import MCPRegistryClient
+from src.mcp.tools_description import get_all_server_tools, get_mcp_server_configs
+
+
+def _write_server(servers_dir, name):
+    servers_dir.mkdir(parents=True, exist_ok=True)
+    config = {"name": name, "description": name, "command": name, "enabled": True}
+    (servers_dir / f"{name}.json").write_text(json.dumps(config), encoding="utf-8")
+
+
+@pytest.fixture
+def servers(tmp_path, monkeypatch):
+    """Three servers: fast, slow (hangs) and dead (refuses)"""
+    monkeypatch.setattr(registry_client, "_server_breakers", {})
+    attempts = []
+    delays = {"fast": 0.05, "fast2": 0.05, "slow": 10, "dead": 0}
+
+    async def connect(self):
+        attempts.append(self.config.command)
+        await asyncio.sleep(delays[self.config.command])
+        if self.config.command == "dead":
+            return False
+        self.is_connected = True
+        return True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    monkeypatch.setattr(MCPClient, "connect", connect)
+    monkeypatch.setattr(MCPClient, "disconnect", disconnect)
+
+    servers_dir = tmp_path / "mcp_servers"
+    for name in delays:
+        _write_server(servers_dir, name)
+    return servers_dir, attempts
+
+
+@pytest.mark.asyncio
+async def test_servers_connect_concurrently_with_partial_success(servers):
+    servers_dir, _ = servers
+    client = MCPRegistryClient(servers_dir=servers_dir)
+
+    started = time.monotonic()
+    connected = await client.connect_all_enabled(timeout=0.5)
+    elapsed = time.monotonic() - started
+
+    assert sorted(connected) == ["fast", "fast2"]
+    assert client.last_connect_report == {
+        "dead": "failed",
+        "fast": "connected",
+        "fast2": "connected",
+        "slow": "timeout",
+    }
+    assert elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_failing_servers_are_skipped_until_recovery(servers, monkeypatch):
+    servers_dir, attempts = servers
+    monkeypatch.setattr(registry_client.settings, "MCP_CIRCUIT_FAILURE_THRESHOLD", 2)
+
+    for _ in range(2):
+        await MCPRegistryClient(servers_dir=servers_dir).connect_all_enabled(timeout=0.2)
+    assert attempts.count("dead") == 2
+
+    # Next startup (another user) skips the dead and the hanging server
+    client = MCPRegistryClient(servers_dir=servers_dir, user_id=7)
+    await client.connect_all_enabled(timeout=0.2)
+    assert attempts.count("dead") == 2 and attempts.count("slow") == 2
+    assert client.last_connect_report["dead"] == "circuit_open"
+    assert client.last_connect_report["slow"] == "circuit_open"
+
+
+@pytest.mark.asyncio
+async def test_tool_listings_load_concurrently_within_the_connect_timeout(servers, monkeypatch):
+    servers_dir, attempts = servers
+    monkeypatch.delenv("MCP_HUB_URL", raising=False)
+    monkeypatch.setattr(tools_cache, "_tools_cache", tools_cache.MCPToolsCache())
+    monkeypatch.setattr(registry_client.settings, "MCP_CONNECT_TIMEOUT", 1)
+    monkeypatch.setattr(registry_client.settings, "MCP_CIRCUIT_FAILURE_THRESHOLD", 1)
+
+    async def list_tools(self):
+        return [{"name": f"{self.config.command}_tool"}]
+
+    monkeypatch.setattr(MCPClient, "list_tools", list_tools)
+    configs = get_mcp_server_configs(servers_dir=servers_dir)
+
+    started = time.monotonic()
+    listings = await get_all_server_tools(configs, None)
+    assert time.monotonic() - started < 2.0
+    assert listings == {
+        "dead": None,
+        "fast": [{"name": "fast_tool"}],
+        "fast2": [{"name": "fast2_tool"}],
+        "slow": None,
+    }
+
+    # The hanging server's circuit is open: the next startup does not wait for it
+    listings = await get_all_server_tools(configs, 7)
+    assert listings["slow"] is None and attempts.count("slow") == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_connect_gives_back_the_half_open_trial(servers, monkeypatch):
+    servers_dir, _ = servers
+    monkeypatch.setattr(registry_client.settings, "MCP_CIRCUIT_FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr(registry_client.settings, "MCP_CIRCUIT_RECOVERY_TIMEOUT", 0)
+    client = MCPRegistryClient(servers_dir=servers_dir)
+    client.initialize()
+    spec = next(spec for spec in client.get_enabled_servers() if spec.name == "slow")
+    breaker = registry_client.get_server_breaker("slow", client.create_config_for_server(spec))
+    breaker.record_failure()
+
+    task = asyncio.create_task(client.connect_to_server(spec))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breaker.allow()
+
+
+def test_circuit_breaker_half_open_trial(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.core.circuit_breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker("server", failure_threshold=2, recovery_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    now[0] += 30
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial call
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.retry_in() == 30
+
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
@@ -0,0 +1,73 @@
+"""
+Tests for incremental reload of the MCP server registry
+"""
+
+import json
+import os
+
+import pytest
+
+import src.mcp.registry.registry as registry_module
+import src.mcp.tools_cache as tools_cache
+from src.mcp.registry import MCPServerRegistry
+
+
+def _write_server(directory, name, command="cmd", enabled=True):
+    directory.mkdir(parents=True, exist_ok=True)
+    config = {"name": name, "description": name, "command": command, "enabled": enabled}
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(registry_module, "invalidate_mcp_tools", invalidated.append)
+    monkeypatch.setattr(tools_cache, "_tools_cache", None)
+    return invalidated
+
+
+def test_only_changed_files_are_parsed_and_invalidated(tmp_path, invalidated):
+    _write_server(tmp_path, "alpha")
+    _write_server(tmp_path, "beta")
+    _write_server(tmp_path / "user_1", "gamma")
+
+    registry = MCPServerRegistry(tmp_path, user_id=1, recheck_interval=0)
+    registry.discover_servers()
+    shared = registry_module._get_config_directory(tmp_path, "shared")
+    assert sorted(registry.servers) == ["alpha", "beta", "gamma"]
+    assert shared.parses == 2 and invalidated == []
+
+    # Nothing changed: another registry (next agent) parses nothing
+    MCPServerRegistry(tmp_path, user_id=1, recheck_interval=0).discover_servers()
+    assert shared.parses == 2
+
+    beta = _write_server(tmp_path, "beta", command="new-cmd")
+    os.utime(beta, ns=(1, 1))
+    (tmp_path / "alpha.json").unlink()
+    _write_server(tmp_path, "delta")
+    registry.discover_servers()
+
+    assert sorted(registry.servers) == ["beta", "delta", "gamma"]
+    assert registry.get_server("beta").command == "new-cmd"
+    assert shared.parses == 4
+    assert sorted(invalidated) == ["alpha", "beta", "delta"]
+
+
+def test_recheck_interval_and_own_writes(tmp_path, invalidated):
+    _write_server(tmp_path, "alpha")
+    registry = MCPServerRegistry(tmp_path, recheck_interval=3600)
+    registry.discover_servers()
+
+    # External edits are picked up after the interval only...
+    _write_server(tmp_path, "beta")
+    other = MCPServerRegistry(tmp_path, recheck_interval=3600)
+    other.discover_servers()
+    assert sorted(other.servers) == ["alpha"]
+
+    # ...but changes made through a registry are visible right away
+    registry.disable_server("alpha")
+    other.discover_servers()
+    assert other.get_server("alpha").enabled is False
+    assert registry.get_server("alpha") is not other.get_server("alpha")
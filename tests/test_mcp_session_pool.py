@@ -0,0 +1,129 @@
+"""
+Tests for the per-process MCP session pool
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import src.mcp.session_pool as session_pool
+import src.mcp.tools_cache as tools_cache
+from src.mcp.client import MCPServerConfig
+from src.mcp.session_pool import MCPSessionPool
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Replace fastmcp.Client with a fake server that records sessions"""
+    server = SimpleNamespace(connects=0, active=0, peak=0, up=True, alive=True, closed=0)
+
+    class FakeClient:
+        def __init__(self, transport, timeout, init_timeout):
+            self._connected = False
+
+        async def __aenter__(self):
+            if not server.up:
+                raise ConnectionError("refused")
+            server.connects += 1
+            self._connected = True
+            return self
+
+        async def __aexit__(self, *exc):
+            if self._connected:
+                server.closed += 1
+            self._connected = False
+
+        def is_connected(self):
+            return self._connected
+
+        async def ping(self):
+            return server.alive
+
+        async def list_tools(self):
+            return [SimpleNamespace(name="echo", description="Echo", inputSchema={})]
+
+        async def call_tool(self, name, arguments, timeout=None):
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            await asyncio.sleep(0.02)
+            server.active -= 1
+            return [SimpleNamespace(type="text", text=arguments["text"])]
+
+    monkeypatch.setattr("src.mcp.client.Client", FakeClient)
+    return server
+
+
+CONFIG = MCPServerConfig(url="http://mcp-hub:8765/sse")
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_reused_with_bounded_concurrency(fake_server):
+    pool = MCPSessionPool(max_sessions_per_server=2)
+
+    for text in ("a", "b"):
+        result = await pool.call_tool(CONFIG, "echo", {"text": text})
+        assert result["output"] == text
+    assert fake_server.connects == 1
+
+    results = await asyncio.gather(
+        *(pool.call_tool(CONFIG, "echo", {"text": str(i)}) for i in range(5))
+    )
+    assert [r["output"] for r in results] == [str(i) for i in range(5)]
+    assert fake_server.peak == 2
+    assert fake_server.connects == 2
+
+    stats = pool.stats()["servers"]["http://mcp-hub:8765/sse"]
+    assert stats["idle"] == 2 and stats["borrows"] == 7
+    await pool.close_all()
+    assert fake_server.closed == 2
+
+
+@pytest.mark.asyncio
+async def test_health_check_backoff_and_idle_eviction(fake_server, monkeypatch):
+    now = [1000.0]
+    # Only the pool's clock: the event loop keeps the real one
+    monkeypatch.setattr(session_pool, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    pool = MCPSessionPool(idle_timeout=300, health_check_interval=30, backoff_base=2)
+
+    await pool.call_tool(CONFIG, "echo", {"text": "x"})
+
+    # Dead session is detected by the ping and replaced; server is down now
+    now[0] += 60
+    fake_server.alive = False
+    fake_server.up = False
+    result = await pool.call_tool(CONFIG, "echo", {"text": "x"})
+    assert "Failed to connect" in result["error"]
+
+    # Within the backoff window no connection is attempted
+    result = await pool.call_tool(CONFIG, "echo", {"text": "x"})
+    assert "next reconnect attempt" in result["error"]
+
+    now[0] += 3
+    fake_server.up = True
+    fake_server.alive = True
+    assert (await pool.call_tool(CONFIG, "echo", {"text": "y"}))["output"] == "y"
+    assert fake_server.connects == 2
+
+    now[0] += 301
+    assert await pool.evict_idle() == 1
+    assert pool.stats()["servers"]["http://mcp-hub:8765/sse"]["idle"] == 0
+    await pool.close_all()
+
+
+@pytest.mark.asyncio
+async def test_discovery_and_calls_share_pooled_session(fake_server, monkeypatch):
+    from src.mcp.tools_description import get_mcp_tools_description
+
+    monkeypatch.setenv("MCP_HUB_URL", "http://mcp-hub:8765/sse")
+    monkeypatch.setattr(tools_cache, "_tools_cache", tools_cache.MCPToolsCache(ttl_seconds=0))
+
+    for _ in range(2):
+        description = await get_mcp_tools_description(user_id=1)
+        assert "mcp_mcp-hub_echo" in description
+
+    pool = session_pool.get_session_pool()
+    result = await pool.call_tool(CONFIG, "echo", {"text": "hello"})
+    assert result["output"] == "hello"
+    assert fake_server.connects == 1
+    await pool.close_all()
@@ -0,0 +1,83 @@
+"""
+Tests for the process-wide MCP tools cache
+"""
+
+import json
+
+import pytest
+
+import src.mcp.tools_cache as tools_cache
+from config.settings import settings
+from src.mcp.registry import MCPServerRegistry
+from src.mcp.session_pool import MCPSessionPool
+from src.mcp.tools_description import get_mcp_tools_description
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = tools_cache.MCPToolsCache(ttl_seconds=300)
+    monkeypatch.setattr(tools_cache, "_tools_cache", cache)
+    monkeypatch.delenv("MCP_HUB_URL", raising=False)
+    # Server edits must be seen by the next discovery
+    monkeypatch.setattr(settings, "MCP_REGISTRY_RECHECK_INTERVAL", 0)
+    return cache
+
+
+def _write_server(servers_dir, name, command="server-cmd"):
+    servers_dir.mkdir(parents=True, exist_ok=True)
+    config = {"name": name, "description": name, "command": command, "enabled": True}
+    (servers_dir / f"{name}.json").write_text(json.dumps(config), encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_tool_listings_are_shared_until_config_changes(cache, tmp_path, monkeypatch):
+    servers_dir = tmp_path / "mcp_servers"
+    _write_server(servers_dir, "alpha")
+    _write_server(servers_dir, "beta")
+    connects = []
+
+    async def list_tools(pool, config, timeout=None):
+        connects.append(config.command)
+        return [{"name": f"{config.command}_tool", "description": "Tool"}]
+
+    monkeypatch.setattr(MCPSessionPool, "list_tools", list_tools)
+
+    first = await get_mcp_tools_description(user_id=1, servers_dir=servers_dir)
+    second = await get_mcp_tools_description(user_id=1, servers_dir=servers_dir)
+    assert first == second
+    assert "mcp_alpha_server-cmd_tool" in first
+    assert connects == ["server-cmd", "server-cmd"]
+
+    # Another user gets their own listings
+    await get_mcp_tools_description(user_id=2, servers_dir=servers_dir)
+    assert len(connects) == 4
+
+    # Edited server config: only that server is listed again
+    _write_server(servers_dir, "beta", command="new-cmd")
+    third = await get_mcp_tools_description(user_id=1, servers_dir=servers_dir)
+    assert connects[4:] == ["new-cmd"]
+    assert "mcp_beta_new-cmd_tool" in third
+
+    assert cache.stats()["hits"] == 3
+
+
+@pytest.mark.asyncio
+async def test_registry_changes_invalidate_and_failures_are_not_cached(cache, tmp_path):
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return None if len(loads) == 1 else [{"name": "tool"}]
+
+    assert await cache.get_or_load("alpha", None, "fp", load) is None
+    assert await cache.get_or_load("alpha", None, "fp", load) == [{"name": "tool"}]
+    assert await cache.get_or_load("alpha", None, "fp", load) == [{"name": "tool"}]
+    assert len(loads) == 2
+
+    registry = MCPServerRegistry(tmp_path / "mcp_servers")
+    _write_server(tmp_path / "mcp_servers", "alpha")
+    registry.discover_servers()
+    registry.disable_server("alpha")
+
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["invalidations"] == 1
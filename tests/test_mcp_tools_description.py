@@ -13,12 +13,20 @@ from promptic import render
 
 from src.agents.autonomous_agent import AutonomousAgent
 from src.agents.qwen_code_cli_agent import QwenCodeCLIAgent
+from src.mcp.client import MCPServerConfig
 from src.mcp.tools_description import format_mcp_tools_for_prompt, get_mcp_tools_description
 
 
 class TestMCPToolsDescription:
     """Test MCP tools description generation"""
 
+    @pytest.fixture(autouse=True)
+    def fresh_tools_cache(self, monkeypatch):
+        """Tool listings are cached process-wide: start each test with an empty cache"""
+        import src.mcp.tools_cache as tools_cache
+
+        monkeypatch.setattr(tools_cache, "_tools_cache", tools_cache.MCPToolsCache())
+
     @pytest.mark.asyncio
     async def test_get_mcp_tools_description_no_servers(self):
         """Test description generation when no MCP servers are available"""
@@ -26,7 +34,7 @@ class TestMCPToolsDescription:
         with patch("src.mcp.tools_description.MCPRegistryClient") as mock_registry:
             mock_instance = Mock()
             mock_instance.initialize = Mock()
-            mock_instance.connect_all_enabled = AsyncMock(return_value={})
+            mock_instance.get_enabled_servers = Mock(return_value=[])
             mock_registry.return_value = mock_instance
 
             description = await get_mcp_tools_description()
@@ -38,27 +46,32 @@ class TestMCPToolsDescription:
     async def test_get_mcp_tools_description_with_servers(self):
         """Test description generation with mock MCP servers"""
         # Mock a server with tools
-        mock_client = Mock()
-        mock_client.list_tools = AsyncMock(
-            return_value=[
-                {
-                    "name": "test_tool",
-                    "description": "A test tool",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "param1": {"type": "string", "description": "First parameter"}
-                        },
-                        "required": ["param1"],
-                    },
-                }
-            ]
-        )
-
-        with patch("src.mcp.tools_description.MCPRegistryClient") as mock_registry:
+        tools = [
+            {
+                "name": "test_tool",
+                "description": "A test tool",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {"param1": {"type": "string", "description": "First parameter"}},
+                    "required": ["param1"],
+                },
+            }
+        ]
+
+        spec = Mock()
+        spec.name = "test_server"
+        spec.timeout = None
+
+        with (
+            patch("src.mcp.tools_description.MCPRegistryClient") as mock_registry,
+            patch("src.mcp.session_pool.MCPSessionPool.list_tools", AsyncMock(return_value=tools)),
+        ):
             mock_instance = Mock()
             mock_instance.initialize = Mock()
-            mock_instance.connect_all_enabled = AsyncMock(return_value={"test_server": mock_client})
+            mock_instance.get_enabled_servers = Mock(return_value=[spec])
+            mock_instance.create_config_for_server = Mock(
+                return_value=MCPServerConfig(command="test")
+            )
             mock_registry.return_value = mock_instance
 
             description = await get_mcp_tools_description()
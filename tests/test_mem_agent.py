@@ -220,5 +220,26 @@ def test_sandbox_safety():
     assert FILE_SIZE_LIMIT > 0, "File size limit should be positive"
 
 
+def test_memory_package_imports_heavy_storages_lazily():
+    """Importing the memory package must not load vector or mem-agent storages"""
+    import subprocess
+
+    code = (
+        "import sys\n"
+        "from src.mcp.memory import MemoryStorageFactory\n"
+        "assert 'src.mcp.memory.memory_vector_storage' not in sys.modules\n"
+        "assert 'src.mcp.memory.memory_mem_agent_storage' not in sys.modules\n"
+        "from src.mcp.memory import VectorBasedMemoryStorage\n"
+        "assert MemoryStorageFactory._get_storage_class('vector') is VectorBasedMemoryStorage\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+"""
+Tests for the mem-agent retrieval cache
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.mcp.memory.retrieval_cache import RetrievalCache, normalize_query
+
+
+def test_normalized_keys_and_stale_generation():
+    assert normalize_query("  What is MY name? ") == normalize_query("what is my name")
+
+    cache = RetrievalCache(max_entries=2)
+    key = cache.make_key("What is my name?", None, ["b", "a"], 10)
+    assert key == cache.make_key("what is my name", None, ["a", "b"], 10)
+
+    generation = cache.generation
+    cache.put(key, {"memories": ["Alice"]}, llm_calls=3, generation=generation)
+    assert cache.get(key) == {"memories": ["Alice"]}
+
+    # A result computed before a write is never cached
+    cache.bump()
+    cache.put(key, {"memories": ["old"]}, llm_calls=3, generation=generation)
+    assert cache.get(key) is None
+    assert cache.stats()["saved_llm_calls"] == 3
+
+
+@pytest.fixture
+def make_storage(monkeypatch):
+    import src.mcp.memory.memory_mem_agent_storage as module
+
+    class FakeAgent:
+        def __init__(self, memory_path, **kwargs):
+            self.memory_path = memory_path
+            self.model_calls = 0
+            self.messages = []
+            self.on_chat = None
+
+        def chat(self, message):
+            self.messages.append(message)
+            self.model_calls += 3
+            if self.on_chat:
+                self.on_chat(message)
+            return SimpleNamespace(
+                reply=f"answer {len(self.messages)}", thoughts="", python_block=""
+            )
+
+    monkeypatch.setattr(module, "MEM_AGENT_AVAILABLE", True)
+    monkeypatch.setattr(module, "Agent", FakeAgent)
+    return lambda data_dir: module.MemAgentStorage(data_dir=data_dir, retrieval_cache_size=8)
+
+
+def test_repeated_retrieval_is_served_from_cache(make_storage, tmp_path):
+    storage = make_storage(tmp_path)
+
+    first = storage.retrieve(query="What is my name?")
+    second = storage.retrieve(query="what is my name")
+
+    assert len(storage.agent.messages) == 1
+    assert second["cached"] is True
+    assert second["memories"][0]["content"] == first["memories"][0]["content"]
+    stats = storage.retrieval_cache_stats()
+    assert stats["hits"] == 1 and stats["hit_rate"] == 0.5
+    assert stats["saved_llm_calls"] == 3
+
+
+def test_writes_invalidate_cached_retrievals(make_storage, tmp_path):
+    storage = make_storage(tmp_path)
+    storage.retrieve(query="name")
+
+    storage.agent.on_chat = lambda message: (tmp_path / "user.md").write_text("# User\n- Alice")
+    storage.store("My name is Alice")
+    storage.agent.on_chat = None
+    assert "cached" not in storage.retrieve(query="name")
+
+    # Changed by someone else (another process editing the files)
+    (tmp_path / "entities").mkdir()
+    (tmp_path / "entities" / "bob.md").write_text("# Bob")
+    assert "cached" not in storage.retrieve(query="name")
+    assert storage.retrieve(query="name")["cached"] is True
+
+    # An answer during which the agent changed the memory is not cached
+    storage.agent.on_chat = lambda message: (tmp_path / "user.md").write_text("# User\n- Carol")
+    storage.retrieve(query="other")
+    storage.agent.on_chat = None
+    assert "cached" not in storage.retrieve(query="other")
+    assert len(storage.agent.messages) == 6
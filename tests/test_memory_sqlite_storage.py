@@ -0,0 +1,71 @@
+"""
+Tests for SqliteMemoryStorage (SQLite + FTS5 memory backend)
+"""
+
+import sqlite3
+
+from src.mcp.memory import MemoryStorageFactory, SqliteMemoryStorage
+
+
+def test_factory_creates_sqlite_storage_in_wal_mode(tmp_path):
+    storage = MemoryStorageFactory.create("sqlite", tmp_path)
+
+    assert isinstance(storage, SqliteMemoryStorage)
+    mode = sqlite3.connect(tmp_path / "memory.db").execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_store_retrieve_and_filters(tmp_path):
+    storage = SqliteMemoryStorage(tmp_path)
+    storage.store("Python programming tips", "tech", tags=["python"])
+    storage.store("Machine learning basics", "ai", tags=["ml"])
+    result = storage.store_many(
+        [
+            {"content": "Python ML libraries", "category": "ai", "tags": ["python", "ml"]},
+            {"content": "Cooking pasta", "category": "food", "metadata": {"source": "book"}},
+        ]
+    )
+    assert result["memory_ids"] == [3, 4]
+
+    found = storage.retrieve(query="pyth")
+    assert sorted(m["id"] for m in found["memories"]) == [1, 3]
+
+    # Tags are indexed for full-text search too
+    found = storage.retrieve(query="ml", category="ai")
+    assert sorted(m["id"] for m in found["memories"]) == [2, 3]
+
+    assert [m["id"] for m in storage.retrieve(tags=["python"])["memories"]] == [1, 3]
+    assert [m["id"] for m in storage.retrieve(limit=2)["memories"]] == [3, 4]
+    assert storage.retrieve(query="pasta")["memories"][0]["metadata"] == {"source": "book"}
+
+    # FTS syntax in user input is treated as plain words
+    assert storage.retrieve(query='tips")*(')["count"] == 1
+
+    assert storage.list_categories()["categories"] == [
+        {"name": "ai", "count": 2},
+        {"name": "food", "count": 1},
+        {"name": "tech", "count": 1},
+    ]
+
+
+def test_delete_and_clear_keep_indexes_in_sync(tmp_path):
+    storage = SqliteMemoryStorage(tmp_path)
+    storage.store("alpha note", "cat1", tags=["t"])
+    storage.store("beta note", "cat1")
+    storage.store("gamma note", "cat2", tags=["t"])
+
+    assert storage.delete(1)["success"] is True
+    assert storage.delete(1)["success"] is False
+    assert sorted(m["id"] for m in storage.retrieve(query="note")["memories"]) == [2, 3]
+    assert [m["id"] for m in storage.retrieve(tags=["t"])["memories"]] == [3]
+
+    assert storage.clear("cat1")["deleted_count"] == 1
+    assert storage.retrieve(query="beta")["count"] == 0
+    storage.close()
+
+    # IDs are never reused, also after reopening
+    reopened = SqliteMemoryStorage(tmp_path)
+    assert reopened.store("delta note")["memory_id"] == 4
+    assert reopened.clear()["deleted_count"] == 2
+    assert reopened.list_all()["count"] == 0
+    assert reopened.retrieve(query="note")["count"] == 0
@@ -0,0 +1,111 @@
+"""
+Tests for VectorBasedMemoryStorage (memory-mapped normalized vectors)
+"""
+
+import json
+
+import numpy as np
+
+from src.mcp.memory.memory_vector_storage import VectorBasedMemoryStorage
+
+VOCABULARY = ["python", "cooking", "music", "travel"]
+
+
+def _make_storage(tmp_path):
+    class FakeModel:
+        def __init__(self):
+            self.calls = []
+
+        def encode(self, texts, convert_to_numpy=True, **kwargs):
+            single = isinstance(texts, str)
+            batch = [texts] if single else list(texts)
+            self.calls.append(len(batch))
+            # Unnormalized bag-of-words vectors: storage must normalize them
+            vectors = np.array(
+                [[text.lower().count(word) * 3.0 for word in VOCABULARY] for text in batch]
+            )
+            return vectors[0] if single else vectors
+
+    storage = VectorBasedMemoryStorage(tmp_path, model_name="fake")
+    storage._model = FakeModel()
+    return storage
+
+
+def test_store_many_embeds_in_one_batch_and_ranks_top_k(tmp_path):
+    storage = _make_storage(tmp_path)
+
+    result = storage.store_many(
+        [
+            {"content": "python python tips", "category": "tech"},
+            {"content": "cooking pasta", "category": "food"},
+            {"content": "python and music", "category": "tech", "tags": ["mix"]},
+            {"content": "travel notes"},
+        ]
+    )
+
+    assert result["memory_ids"] == [1, 2, 3, 4]
+    assert storage._model.calls == [4]
+    assert np.allclose(np.linalg.norm(storage._vectors[:4], axis=1), 1.0)
+
+    found = storage.retrieve(query="python", limit=2)["memories"]
+    assert [m["id"] for m in found] == [1, 3]
+    assert found[0]["_score"] > 0.99
+
+    filtered = storage.retrieve(query="python", tags=["mix"])["memories"]
+    assert [m["id"] for m in filtered] == [3]
+
+
+def test_vectors_persist_grow_and_skip_deleted_rows(tmp_path):
+    storage = _make_storage(tmp_path)
+    storage.store_many([{"content": f"music {i}"} for i in range(70)])
+    storage.store("python only")
+    storage.delete(71)
+    storage.close()
+
+    assert storage._vectors.shape[0] >= 71
+    reloaded = _make_storage(tmp_path)
+    assert reloaded.store("python again")["memory_id"] == 72
+
+    found = reloaded.retrieve(query="python", limit=3)["memories"]
+    assert found[0]["id"] == 72
+    assert 71 not in [m["id"] for m in found]
+
+    reloaded.clear()
+    assert reloaded.retrieve(query="python")["count"] == 0
+    assert reloaded.store("python fresh")["memory_id"] == 73
+    assert reloaded.retrieve(query="python", limit=1)["memories"][0]["id"] == 73
+
+
+def test_legacy_embeddings_are_migrated(tmp_path):
+    # Legacy format: rows aligned with memory.json positions, IDs could repeat
+    memories = [
+        {"id": 1, "content": "cooking", "category": "general", "tags": []},
+        {"id": 2, "content": "travel", "category": "general", "tags": []},
+        {"id": 2, "content": "python", "category": "general", "tags": []},
+    ]
+    (tmp_path / "memory.json").write_text(json.dumps(memories), encoding="utf-8")
+    np.save(tmp_path / "embeddings.npy", np.eye(4)[[1, 3, 0]])
+
+    storage = _make_storage(tmp_path)
+
+    assert [m["id"] for m in storage.memories] == [1, 2, 3]
+    assert not (tmp_path / "embeddings.npy").exists()
+    found = storage.retrieve(query="python", limit=1)["memories"]
+    assert found[0]["content"] == "python"
+
+
+def test_filtered_and_unfiltered_scoring_agree(tmp_path, monkeypatch):
+    import src.mcp.memory.memory_vector_storage as memory_vector_storage
+
+    monkeypatch.setattr(memory_vector_storage, "_SCORE_CHUNK_ROWS", 2)
+    storage = _make_storage(tmp_path)
+    storage.store_many(
+        [{"content": "python " * (i + 1) + "music " * (7 - i), "category": "mix"} for i in range(7)]
+    )
+    storage.delete(7)
+
+    unfiltered = storage.retrieve(query="python", limit=3)["memories"]
+    filtered = storage.retrieve(query="python", category="mix", limit=3)["memories"]
+
+    assert [m["id"] for m in unfiltered] == [m["id"] for m in filtered] == [6, 5, 4]
+    assert np.allclose([m["_score"] for m in unfiltered], [m["_score"] for m in filtered])
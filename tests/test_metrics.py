@@ -0,0 +1,78 @@
+"""
+Tests for in-process metrics and Prometheus exposition
+"""
+
+import socket
+
+import aiohttp
+import pytest
+
+from src.core.metrics import MetricsRegistry, process_rss_bytes
+from src.core.metrics_server import start_metrics_server
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    """Counters and histograms render cumulative buckets, sum and count"""
+    registry = MetricsRegistry()
+    calls = registry.counter("tool_calls_total", "Tool calls", ("tool", "outcome"))
+    latency = registry.histogram("tool_latency_seconds", "Latency", ("tool",), buckets=(0.1, 1.0))
+
+    calls.inc("search", "ok")
+    calls.inc("search", "ok")
+    latency.observe(0.05, "search")
+    latency.observe(0.5, "search")
+    latency.observe(5.0, "search")
+
+    assert registry.counter("tool_calls_total", "ignored") is calls
+    assert calls.value("search", "ok") == 2
+
+    text = registry.render()
+    assert "# TYPE tool_calls_total counter" in text
+    assert 'tool_calls_total{tool="search",outcome="ok"} 2' in text
+    assert 'tool_latency_seconds_bucket{tool="search",le="0.1"} 1' in text
+    assert 'tool_latency_seconds_bucket{tool="search",le="1.0"} 2' in text
+    assert 'tool_latency_seconds_bucket{tool="search",le="+Inf"} 3' in text
+    assert 'tool_latency_seconds_count{tool="search"} 3' in text
+
+
+def test_gauges_are_collected_at_scrape_time_and_failures_are_isolated():
+    """Gauge collectors run on render; a failing collector does not break the scrape"""
+    registry = MetricsRegistry()
+    sizes = {"kb1": 3}
+    registry.gauge(
+        "index_size", "Index size", lambda: [((k,), v) for k, v in sizes.items()], ("kb_id",)
+    )
+
+    def broken():
+        raise RuntimeError("boom")
+
+    registry.gauge("broken_gauge", "Broken", broken)
+
+    sizes["kb2"] = 7
+    text = registry.render()
+    assert 'index_size{kb_id="kb1"} 3' in text
+    assert 'index_size{kb_id="kb2"} 7' in text
+    assert "# broken_gauge collection failed: RuntimeError" in text
+    assert process_rss_bytes() > 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_server_exposes_the_process_registry():
+    """The bot process serves its own registry on /metrics"""
+    registry = MetricsRegistry()
+    registry.histogram("ask_time_to_first_visible_output_seconds", "TTFVO").observe(0.4)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    assert await start_metrics_server("127.0.0.1", 0, registry) is None
+    runner = await start_metrics_server("127.0.0.1", port, registry)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                text = await response.text()
+    finally:
+        await runner.cleanup()
+
+    assert response.status == 200
+    assert "ask_time_to_first_visible_output_seconds_count 1" in text
@@ -11,6 +11,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.mcp.memory.memory_json_storage import JsonMemoryStorage
 from src.mcp.memory.memory_server import MemoryMCPServer
 from src.mcp.memory.memory_storage import MemoryStorage
 from src.mcp.qwen_config_generator import QwenMCPConfigGenerator, setup_qwen_mcp_config
@@ -136,6 +137,178 @@ class TestMemoryStorage:
         assert len(storage2.memories) == 2
         assert storage2.memories[0]["content"] == "Persistent memory"
 
+    def test_ids_not_reused_after_delete(self, temp_dir):
+        """Test that IDs stay monotonic across deletes, compaction and reloads"""
+        storage = JsonMemoryStorage(temp_dir)
+        storage.store("M1")
+        storage.store("M2")
+        assert storage.delete(2)["success"] is True
+        storage.compact()
+        storage.close()
+
+        reloaded = JsonMemoryStorage(temp_dir)
+        assert reloaded.store("M3")["memory_id"] == 3
+        assert [m["id"] for m in reloaded.memories] == [1, 3]
+
+    def test_store_appends_to_log(self, temp_dir):
+        """Test that stores append operations instead of rewriting the snapshot"""
+        storage = JsonMemoryStorage(temp_dir)
+        storage.store("M1", "cat1")
+        storage.store("M2", "cat2")
+        storage.clear("cat1")
+        storage.close()
+
+        lines = (temp_dir / "memory.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["store", "store", "clear"]
+        assert not (temp_dir / "memory.json").exists()
+        assert [m["content"] for m in JsonMemoryStorage(temp_dir).memories] == ["M2"]
+
+    def test_background_compaction(self, temp_dir):
+        """Test that a log larger than the live memories is compacted"""
+        storage = JsonMemoryStorage(temp_dir, compact_threshold=4)
+        for i in range(3):
+            memory_id = storage.store(f"Memory {i}")["memory_id"]
+            storage.delete(memory_id)
+        storage.store("Kept")
+        # close() joins the compaction thread; when it ran relative to the later
+        # operations is up to the scheduler, so only its outcome is checked
+        storage.close()
+
+        assert (temp_dir / "memory.json").exists()
+        log_lines = (temp_dir / "memory.jsonl").read_text(encoding="utf-8").splitlines()
+        # Started after the fourth operation: the meta line plus at most three later ones
+        assert json.loads(log_lines[0])["op"] == "meta"
+        assert len(log_lines) <= 4
+        reloaded = JsonMemoryStorage(temp_dir)
+        assert reloaded.memories == storage.memories
+        assert reloaded.store("Next")["memory_id"] == 5
+        reloaded.close()
+
+    def test_compact_folds_log_into_snapshot(self, temp_dir):
+        """Test that compaction leaves only the next ID in the log"""
+        storage = JsonMemoryStorage(temp_dir)
+        for i in range(3):
+            memory_id = storage.store(f"Memory {i}")["memory_id"]
+            storage.delete(memory_id)
+        storage.store("Kept")
+
+        storage.compact()
+        storage.close()
+
+        log_lines = (temp_dir / "memory.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in log_lines] == [{"op": "meta", "next_id": 5}]
+        snapshot = json.loads((temp_dir / "memory.json").read_text(encoding="utf-8"))
+        assert [m["content"] for m in snapshot] == ["Kept"]
+        assert JsonMemoryStorage(temp_dir).memories == storage.memories
+
+    def test_indexed_retrieve_matches_substring_scan(self, temp_dir):
+        """Test that index-backed retrieval returns what a full substring scan would"""
+        storage = JsonMemoryStorage(temp_dir)
+        storage.store("Python programming tips", "tech", tags=["python", "tips"])
+        storage.store("Machine learning with PyTorch", "ai", tags=["ml"])
+        storage.store("python-dotenv loads .env files", "tech", tags=["python"])
+        storage.store("Notes about cooking", "hobby")
+        storage.store("Deleted python note", "tech", tags=["python"])
+        storage.delete(5)
+
+        def scan(query=None, category=None, tags=None):
+            found = storage.memories
+            if category:
+                found = [m for m in found if m["category"] == category]
+            if tags:
+                found = [m for m in found if any(t in m["tags"] for t in tags)]
+            if query:
+                q = query.lower()
+                found = [m for m in found if q in m["content"].lower() or q in m["category"]]
+            return [m["id"] for m in found]
+
+        cases = [
+            {"query": "pyth"},
+            {"query": "ython prog"},
+            {"query": "TECH"},
+            {"query": ".env"},
+            {"query": "--"},
+            {"category": "tech"},
+            {"tags": ["python", "ml"]},
+            {"query": "python", "category": "tech", "tags": ["tips"]},
+            {"query": "learning with pytorch"},
+            {"query": "ython"},
+        ]
+        for case in cases:
+            result = storage.retrieve(limit=10, **case)
+            assert [m["id"] for m in result["memories"]] == scan(**case), case
+
+        # The n-gram index follows later writes
+        storage.store("Jython scripting with ML", "tech")
+        storage.delete(1)
+        for case in cases:
+            result = storage.retrieve(limit=10, **case)
+            assert [m["id"] for m in result["memories"]] == scan(**case), case
+
+    def test_indexes_follow_deletes_and_clears(self, temp_dir):
+        """Test that category counts and lookups reflect deletes and clears"""
+        storage = JsonMemoryStorage(temp_dir)
+        storage.store("Alpha", "cat1", tags=["t"])
+        storage.store("Beta", "cat1")
+        storage.store("Gamma", "cat2", tags=["t"])
+
+        storage.delete(1)
+        assert storage.list_categories()["categories"] == [
+            {"name": "cat1", "count": 1},
+            {"name": "cat2", "count": 1},
+        ]
+
+        storage.clear("cat1")
+        assert storage.retrieve(query="beta")["count"] == 0
+        assert [m["id"] for m in storage.retrieve(tags=["t"])["memories"]] == [3]
+
+        storage.clear()
+        assert storage.list_categories()["categories"] == []
+        assert storage.retrieve(query="gamma")["count"] == 0
+
+    def test_interrupted_compaction_and_legacy_snapshot(self, temp_dir):
+        """Test recovery from a crash between log rotation and snapshot write"""
+        legacy = [{"id": 1, "content": "Legacy", "category": "general", "tags": []}]
+        (temp_dir / "memory.json").write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+        rotated = [
+            {"op": "store", "memory": {"id": 2, "content": "Rotated", "category": "general"}},
+            {"op": "delete", "id": 1},
+        ]
+        (temp_dir / "memory.jsonl.compacting").write_text(
+            "".join(json.dumps(op) + "\n" for op in rotated), encoding="utf-8"
+        )
+        current = {"op": "store", "memory": {"id": 3, "content": "Current", "category": "x"}}
+        (temp_dir / "memory.jsonl").write_text(
+            json.dumps(current) + "\n" + '{"op": "sto', encoding="utf-8"
+        )
+
+        storage = JsonMemoryStorage(temp_dir)
+        assert [m["content"] for m in storage.memories] == ["Rotated", "Current"]
+        assert not (temp_dir / "memory.jsonl.compacting").exists()
+        assert storage.store("New")["memory_id"] == 4
+
+    def test_legacy_snapshot_with_duplicate_ids_keeps_every_memory(self, temp_dir):
+        """Test that IDs repeated by the old len + 1 numbering are renumbered on load"""
+        legacy = [
+            {"id": 1, "content": "First", "category": "general", "tags": []},
+            {"id": 3, "content": "Third", "category": "general", "tags": []},
+            {"id": 3, "content": "Stored after a delete", "category": "general", "tags": []},
+        ]
+        (temp_dir / "memory.json").write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+
+        storage = JsonMemoryStorage(temp_dir)
+        assert [(m["id"], m["content"]) for m in storage.memories] == [
+            (1, "First"),
+            (3, "Third"),
+            (4, "Stored after a delete"),
+        ]
+        assert storage.store("New")["memory_id"] == 5
+
+        storage.compact()
+        storage.close()
+        reloaded = JsonMemoryStorage(temp_dir)
+        assert [m["id"] for m in reloaded.memories] == [1, 3, 4, 5]
+
 
 class TestMemoryMCPServer:
     """Test MemoryMCPServer class"""
@@ -0,0 +1,164 @@
+"""
+Tests for the mem-agent sandbox worker pool
+"""
+
+import os
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="sandbox pool needs POSIX pipes")
+
+
+@pytest.fixture
+def pool():
+    from src.mcp.memory.mem_agent_impl.sandbox_pool import SandboxPool
+
+    pool = SandboxPool(size=1, max_executions=3, preload=()).start()
+    yield pool
+    pool.shutdown()
+
+
+def _params(code, allowed_path, blacklist=None):
+    return {
+        "code": code,
+        "allow_installs": False,
+        "allowed_path": str(allowed_path),
+        "blacklist": blacklist or [],
+        "available_functions": {},
+        "log": False,
+    }
+
+
+def _worker_pid(pool):
+    workers = pool._fresh + [w for idle in pool._idle.values() for w in idle]
+    return workers[0].pid
+
+
+def test_worker_is_reused_and_state_restored(pool, tmp_path):
+    (tmp_path / "note.md").write_text("hello")
+    first_pid = _worker_pid(pool)
+
+    # Blacklisting and prints only affect the run that asked for them
+    local_vars, error = pool.execute(
+        _params("print('noise')\nx = open('note.md').read()", tmp_path, ["len"]), timeout=10
+    )
+    assert error == ""
+    assert local_vars == {"x": "hello"}
+
+    started = time.perf_counter()
+    local_vars, error = pool.execute(_params("n = len('abc')", tmp_path), timeout=10)
+    assert time.perf_counter() - started < 0.5
+    assert local_vars == {"n": 3}
+    assert _worker_pid(pool) == first_pid
+
+    # Replaced after max_executions runs
+    pool.execute(_params("y = 1", tmp_path), timeout=10)
+    assert _worker_pid(pool) != first_pid
+    assert pool.stats()["recycled"] == 1
+
+
+def test_path_violation_recycles_worker(pool, tmp_path):
+    allowed = tmp_path / "memory"
+    allowed.mkdir()
+    (tmp_path / "secret.txt").write_text("secret")
+    first_pid = _worker_pid(pool)
+
+    local_vars, error = pool.execute(
+        _params(f"data = open({str(tmp_path / 'secret.txt')!r}).read()", allowed), timeout=10
+    )
+
+    assert "denied by sandbox" in error
+    assert pool.stats()["violations"] == 1
+    assert _worker_pid(pool) != first_pid
+
+
+def test_timeout_kills_worker(pool, tmp_path):
+    first_pid = _worker_pid(pool)
+
+    local_vars, error = pool.execute(_params("while True: pass", tmp_path), timeout=1)
+
+    assert local_vars is None
+    assert error.startswith("TimeoutError")
+    assert pool.stats()["timeouts"] == 1
+    assert _worker_pid(pool) != first_pid
+
+    # The replacement worker serves the next job
+    local_vars, error = pool.execute(_params("z = 2", tmp_path), timeout=10)
+    assert local_vars == {"z": 2}
+
+
+def test_module_state_changes_recycle_worker(pool, tmp_path):
+    first_pid = _worker_pid(pool)
+
+    pool.execute(_params("import os.path\nos.path.abspath = lambda p: '/'", tmp_path), timeout=10)
+
+    assert pool.stats()["state_changes"] == 1
+    assert _worker_pid(pool) != first_pid
+    local_vars, error = pool.execute(
+        _params("import os.path\np = os.path.abspath('x')", tmp_path), timeout=10
+    )
+    assert local_vars["p"] == os.path.join(str(tmp_path), "x")
+
+
+def test_workers_are_not_shared_between_allowed_paths(tmp_path):
+    from src.mcp.memory.mem_agent_impl.sandbox_pool import SandboxPool
+
+    pids = {}
+    code = "import os\npid = os.getpid()"
+    pool = SandboxPool(size=2, max_executions=10, preload=()).start()
+    try:
+        for user in ("alice", "bob", "alice", "bob"):
+            (tmp_path / user).mkdir(exist_ok=True)
+            local_vars, _ = pool.execute(_params(code, tmp_path / user), timeout=10)
+            pids.setdefault(user, set()).add(local_vars["pid"])
+    finally:
+        pool.shutdown()
+
+    assert len(pids["alice"]) == len(pids["bob"]) == 1
+    assert pids["alice"] != pids["bob"]
+
+    # With a single worker, another path gets a new process instead of a used one
+    pool = SandboxPool(size=1, max_executions=10, preload=()).start()
+    try:
+        alice, _ = pool.execute(_params(code, tmp_path / "alice"), timeout=10)
+        bob, _ = pool.execute(_params(code, tmp_path / "bob"), timeout=10)
+    finally:
+        pool.shutdown()
+    assert alice["pid"] != bob["pid"]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import os\nos.environ['SANDBOX_LEAK'] = '1'",
+        "import sys\nsys.path.append('/tmp/leak')",
+        "import threading, time\nthreading.Thread(target=time.sleep, args=(5,), daemon=True).start()",
+    ],
+    ids=["environ", "sys_path", "thread"],
+)
+def test_in_place_state_changes_recycle_worker(pool, tmp_path, code):
+    first_pid = _worker_pid(pool)
+
+    local_vars, error = pool.execute(_params(code, tmp_path), timeout=10)
+
+    assert error == ""
+    assert pool.stats()["state_changes"] == 1
+    assert _worker_pid(pool) != first_pid
+
+
+def test_worker_startup_timeout_is_not_reported_as_code_timeout(monkeypatch, tmp_path):
+    from src.mcp.memory.mem_agent_impl import sandbox_pool
+
+    monkeypatch.setattr(sandbox_pool, "_STARTUP_TIMEOUT", 0)
+    pool = sandbox_pool.SandboxPool(size=1, max_executions=3, preload=()).start()
+    try:
+        local_vars, error = pool.execute(_params("x = 1", tmp_path), timeout=10)
+        stats = pool.stats()
+    finally:
+        pool.shutdown()
+
+    assert local_vars is None
+    assert error == "Sandbox worker failed to start within 0 seconds"
+    assert stats["timeouts"] == 0
+    assert stats["recycled"] == 1
@@ -0,0 +1,70 @@
+"""
+Tests for request coalescing (SingleFlight)
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.singleflight import SingleFlight, make_key
+
+
+def test_make_key_normalizes_arguments():
+    """Whitespace and omitted None arguments do not change the key"""
+    assert make_key("search", "kb", query="  neural   networks ", top_k=5) == make_key(
+        "search", "kb", query="neural networks", top_k=5, fields=None
+    )
+    assert make_key("search", "kb", query="a") != make_key("search", "other", query="a")
+    assert make_key("search", "kb", query="a", top_k=5) != make_key("search", "kb", query="a")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_call():
+    """Concurrent callers with the same key await a single computation"""
+    flight = SingleFlight("test")
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return {"value": value}
+
+    results = await asyncio.gather(
+        flight.do("a", lambda: compute(1)),
+        flight.do("a", lambda: compute(1)),
+        flight.do("b", lambda: compute(2)),
+    )
+
+    assert calls == [1, 2]
+    assert results[0] is results[1]
+    assert flight.stats() == {"calls": 3, "coalesced": 1, "in_flight": 0}
+
+    # Finished calls are not cached
+    await flight.do("a", lambda: compute(1))
+    assert calls == [1, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_cancellation_is_isolated():
+    """Exceptions reach every waiter; a cancelled waiter does not cancel the others"""
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    outcomes = await asyncio.gather(
+        flight.do("x", fail), flight.do("x", fail), return_exceptions=True
+    )
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return 42
+
+    first = asyncio.ensure_future(flight.do("y", slow))
+    second = asyncio.ensure_future(flight.do("y", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 42
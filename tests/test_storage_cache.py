@@ -0,0 +1,86 @@
+"""
+Tests for the per-user memory storage cache (LRU/TTL with flush-on-evict)
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.keyed_executor import KeyedExecutor
+from src.mcp.memory.memory_json_storage import JsonMemoryStorage
+from src.mcp.memory.storage_cache import UserStorageCache
+
+
+def test_lru_and_ttl_eviction_with_resurrection(monkeypatch):
+    import src.mcp.memory.storage_cache as storage_cache
+
+    class FakeStorage:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    now = [1000.0]
+    monkeypatch.setattr(storage_cache.time, "monotonic", lambda: now[0])
+    cache = UserStorageCache(max_size=2, ttl_seconds=60)
+    storages = {user_id: FakeStorage() for user_id in (1, 2, 3)}
+
+    cache.put(1, storages[1])
+    cache.put(2, storages[2])
+    assert cache.get(1) is storages[1]  # user 2 is now least recently used
+    cache.put(3, storages[3])
+    assert cache.collect_evictions() == [2]
+
+    # Used again before the close ran: same object comes back, nothing is closed
+    assert cache.get(2) is storages[2]
+    assert cache.close_evicted(2) is False
+    assert not storages[2].closed
+
+    now[0] += 61
+    cache.get(3)
+    assert sorted(cache.collect_evictions()) == [1, 2]
+    assert cache.close_evicted(1) is True
+    assert storages[1].closed
+    assert cache.get(1) is None
+
+    stats = cache.stats()
+    assert stats["size"] == 1
+    assert stats["evictions"] == 3
+    assert stats["closing"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hub_flushes_evicted_storage_and_reloads_it(monkeypatch, tmp_path):
+    import src.mcp.mcp_hub_server as hub
+
+    loads = []
+
+    def get_storage(user_id):
+        cache = hub.get_storage_cache()
+        storage = cache.get(user_id)
+        if storage is None:
+            loads.append(user_id)
+            storage = JsonMemoryStorage(tmp_path / f"user_{user_id}")
+            cache.put(user_id, storage)
+        return storage
+
+    monkeypatch.setattr(hub, "check_memory_tools_availability", lambda: True)
+    monkeypatch.setattr(hub, "get_storage", get_storage)
+    monkeypatch.setattr(hub, "_memory_executor", KeyedExecutor("memory", max_workers=2))
+    monkeypatch.setattr(hub, "_storages", UserStorageCache(max_size=1, ttl_seconds=0))
+
+    evictions = hub._STORAGE_EVICTIONS.value()
+
+    await hub.store_memory(content="first user note", user_id=1)
+    await hub.store_memory(content="second user note", user_id=2)
+    await asyncio.gather(*hub._storage_close_tasks)
+
+    assert len(hub.get_storage_cache()) == 1
+    assert hub.get_storage_cache().stats()["evictions"] == 1
+    assert hub._STORAGE_EVICTIONS.value() == evictions + 1
+    assert list(hub._collect_memory_counts()) == [(("2", "JsonMemoryStorage"), 1)]
+
+    result = await hub.retrieve_memory(user_id=1, query="first")
+    assert result["count"] == 1
+    assert loads == [1, 2, 1]
+    hub._memory_executor.shutdown()
@@ -229,9 +229,12 @@ async def test_manager_deletion_support():
             return True
 
         async def delete_by_filter(self, filter_dict):
-            doc_id = filter_dict.get("document_id")
             before = len(self.documents)
-            self.documents = [doc for doc in self.documents if doc.get("document_id") != doc_id]
+            self.documents = [
+                doc
+                for doc in self.documents
+                if not all(doc.get(key) == value for key, value in filter_dict.items())
+            ]
             return before - len(self.documents)
 
     # Create a mock embedder
@@ -371,5 +374,672 @@ async def test_update_documents_aborts_when_delete_not_supported():
         assert vector_store.documents == []
 
 
+@pytest.mark.asyncio
+async def test_manager_deduplicates_chunks_across_documents():
+    """Identical chunks are embedded once and expanded back to every referencing document"""
+    from src.mcp.vector_search.manager import VectorSearchManager
+    from src.mcp.vector_search.vector_stores import BaseVectorStore
+
+    class InMemoryVectorStore(BaseVectorStore):
+        """In-memory store returning every stored chunk as a hit"""
+
+        def __init__(self):
+            self.documents = []
+
+        async def add_documents(self, embeddings, documents, ids=None):
+            self.documents.extend(documents)
+
+        async def search(self, query_embedding, top_k=5, filter_dict=None):
+            return [{**doc, "score": 1.0} for doc in self.documents[:top_k]]
+
+        async def clear(self):
+            self.documents = []
+
+        async def get_count(self):
+            return len(self.documents)
+
+        async def save(self, path):
+            return None
+
+        async def load(self, path):
+            return None
+
+        def supports_delete_by_filter(self) -> bool:
+            return True
+
+        async def delete_by_filter(self, filter_dict):
+            before = len(self.documents)
+            self.documents = [
+                doc
+                for doc in self.documents
+                if not all(doc.get(key) == value for key, value in filter_dict.items())
+            ]
+            return before - len(self.documents)
+
+    class MockEmbedder:
+        def __init__(self):
+            self.model_name = "mock"
+            self.embedded_texts = []
+
+        async def embed_texts(self, texts):
+            self.embedded_texts.extend(texts)
+            return [[0.0, 0.0] for _ in texts]
+
+        async def embed_query(self, query):
+            return [0.0, 0.0]
+
+        def get_dimension(self):
+            return 2
+
+        def get_model_hash(self):
+            return "mock_hash"
+
+    boilerplate = "Shared boilerplate footer."
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        embedder = MockEmbedder()
+        vector_store = InMemoryVectorStore()
+        chunker = DocumentChunker(strategy=ChunkingStrategy.FIXED_SIZE, chunk_size=100)
+
+        manager = VectorSearchManager(
+            embedder=embedder,
+            vector_store=vector_store,
+            chunker=chunker,
+            index_path=Path(tmpdir) / "index",
+        )
+        await manager.initialize()
+
+        stats = await manager.add_documents(
+            [
+                {"id": "a.md", "content": boilerplate, "metadata": {"file_path": "a.md"}},
+                {"id": "b.md", "content": boilerplate, "metadata": {"file_path": "b.md"}},
+            ]
+        )
+
+        assert stats["chunks_created"] == 2
+        assert stats["chunks_embedded"] == 1
+        assert stats["chunks_deduplicated"] == 1
+        assert embedder.embedded_texts == [boilerplate]
+        assert await vector_store.get_count() == 1
+
+        results = await manager.search("footer", top_k=5)
+        assert sorted(r["document_id"] for r in results) == ["a.md", "b.md"]
+        assert {r["file_path"] for r in results} == {"a.md", "b.md"}
+        assert all(r["text"] == boilerplate for r in results)
+
+        filtered = await manager.search("footer", top_k=5, filter_dict={"document_id": "b.md"})
+        assert [r["document_id"] for r in filtered] == ["b.md"]
+
+        # Shared chunk survives while still referenced, then is removed with its last reference
+        await manager.delete_documents(["a.md"])
+        assert await vector_store.get_count() == 1
+        assert [r["document_id"] for r in await manager.search("footer")] == ["b.md"]
+
+        await manager.delete_documents(["b.md"])
+        assert await vector_store.get_count() == 0
+
+        # Metadata round-trips chunk references
+        await manager.add_documents([{"id": "c.md", "content": boilerplate}])
+        reloaded = VectorSearchManager(
+            embedder=embedder,
+            vector_store=vector_store,
+            chunker=chunker,
+            index_path=Path(tmpdir) / "index",
+        )
+        await reloaded.initialize()
+        assert [r["document_id"] for r in await reloaded.search("footer")] == ["c.md"]
+
+
+def test_make_snippet_highlights_query_terms():
+    """Snippets are cut around the first match and highlight query terms"""
+    from src.mcp.vector_search.results import make_snippet
+
+    text = "Intro sentence. " * 20 + "Neural networks learn representations. " + "Tail. " * 20
+    snippet = make_snippet(text, "neural networks", max_length=60)
+
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "**Neural**" in snippet and "**networks**" in snippet
+    assert len(snippet.replace("**", "")) <= 62
+
+
+def test_shape_results_groups_by_document_and_projects_fields():
+    """Grouping keeps the best chunk per document; projection keeps requested fields"""
+    from src.mcp.vector_search.results import shape_results
+
+    results = [
+        {
+            "document_id": "a.md",
+            "file_path": "a.md",
+            "text": "alpha one",
+            "chunk_index": 0,
+            "score": 0.9,
+        },
+        {
+            "document_id": "b.md",
+            "file_path": "b.md",
+            "text": "beta",
+            "chunk_index": 0,
+            "score": 0.8,
+        },
+        {
+            "document_id": "a.md",
+            "file_path": "a.md",
+            "text": "alpha two",
+            "chunk_index": 3,
+            "score": 0.7,
+        },
+    ]
+
+    grouped = shape_results(results, query="alpha", top_k=5, group_by="document")
+    assert [r["document_id"] for r in grouped] == ["a.md", "b.md"]
+    assert grouped[0]["score"] == 0.9
+    assert grouped[0]["match_count"] == 2
+    assert grouped[0]["chunk_indices"] == [0, 3]
+
+    projected = shape_results(
+        results, query="alpha", top_k=1, fields=["file_path"], snippet_length=20
+    )
+    assert projected == [{"file_path": "a.md", "score": 0.9, "snippet": "**alpha** one"}]
+
+    with pytest.raises(ValueError):
+        shape_results(results, query="alpha", top_k=5, group_by="chunk")
+
+
+@pytest.mark.asyncio
+async def test_search_filters_in_the_store_or_fetches_until_enough_match():
+    """Filters reach stores that support them; other stores are fetched until top_k match"""
+    from src.mcp.vector_search.manager import VectorSearchManager
+    from src.mcp.vector_search.vector_stores import BaseVectorStore, matches_filter
+
+    class InMemoryVectorStore(BaseVectorStore):
+        """In-memory store returning stored chunks in insertion order"""
+
+        def __init__(self, server_side_filter):
+            self.documents = []
+            self.server_side_filter = server_side_filter
+            self.searches = []
+
+        def supports_filter(self):
+            return self.server_side_filter
+
+        async def add_documents(self, embeddings, documents, ids=None):
+            self.documents.extend(documents)
+
+        async def search(self, query_embedding, top_k=5, filter_dict=None):
+            self.searches.append((top_k, filter_dict))
+            docs = [d for d in self.documents if not filter_dict or matches_filter(d, filter_dict)]
+            return [{**doc, "score": 1.0} for doc in docs[:top_k]]
+
+        async def clear(self):
+            self.documents = []
+
+        async def get_count(self):
+            return len(self.documents)
+
+        async def save(self, path):
+            return None
+
+        async def load(self, path):
+            return None
+
+    class MockEmbedder:
+        model_name = "mock"
+
+        async def embed_texts(self, texts):
+            return [[0.0, 0.0] for _ in texts]
+
+        async def embed_query(self, query):
+            return [0.0, 0.0]
+
+        def get_dimension(self):
+            return 2
+
+        def get_model_hash(self):
+            return "mock_hash"
+
+    documents = [{"id": f"other{i}.md", "content": f"Other note {i}"} for i in range(20)]
+    documents += [
+        {"id": "a.md", "content": "Shared footer", "metadata": {"topic": "x"}},
+        {"id": "b.md", "content": "Shared footer", "metadata": {"topic": "y"}},
+        {"id": "c.md", "content": "Own text", "metadata": {"topic": "y"}},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for server_side_filter in (True, False):
+            store = InMemoryVectorStore(server_side_filter)
+            manager = VectorSearchManager(
+                embedder=MockEmbedder(),
+                vector_store=store,
+                chunker=DocumentChunker(strategy=ChunkingStrategy.FIXED_SIZE, chunk_size=100),
+                index_path=Path(tmpdir) / str(server_side_filter),
+            )
+            await manager.initialize()
+            await manager.add_documents(documents)
+
+            # The shared chunk is stored with a.md's metadata but still matches b.md
+            results = await manager.search("footer", top_k=2, filter_dict={"topic": "y"})
+            assert sorted(r["document_id"] for r in results) == ["b.md", "c.md"]
+            assert await manager.search("x", filter_dict={"topic": "z"}) == []
+
+            if server_side_filter:
+                assert len(store.searches) == 1
+                top_k, store_filter = store.searches[0]
+                assert top_k == 2 and len(store_filter["chunk_hash"]) == 2
+            else:
+                assert [top_k for top_k, _ in store.searches] == [2, 8, 32]
+
+
+@pytest.mark.asyncio
+async def test_orphaned_chunks_are_compacted_in_stores_without_deletion():
+    """Re-indexed documents do not grow a FAISS index without bound"""
+    pytest.importorskip("faiss")
+
+    from src.mcp.vector_search.manager import VectorSearchManager
+    from src.mcp.vector_search.vector_stores import FAISSVectorStore
+
+    class MockEmbedder:
+        model_name = "mock"
+
+        async def embed_texts(self, texts):
+            return [[float(len(text)), 1.0] for text in texts]
+
+        async def embed_query(self, query):
+            return [float(len(query)), 1.0]
+
+        def get_dimension(self):
+            return 2
+
+        def get_model_hash(self):
+            return "mock_hash"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = VectorSearchManager(
+            embedder=MockEmbedder(),
+            vector_store=FAISSVectorStore(dimension=2),
+            chunker=DocumentChunker(strategy=ChunkingStrategy.FIXED_SIZE, chunk_size=100),
+            index_path=Path(tmpdir) / "index",
+        )
+        await manager.initialize()
+        await manager.add_documents(
+            [{"id": f"doc{i}.md", "content": f"Stable note {i}"} for i in range(4)]
+        )
+
+        for version in range(10):
+            await manager.add_documents([{"id": "doc0.md", "content": f"Revision {version}"}])
+            assert await manager.vector_store.get_count() <= 6
+
+        assert manager.chunk_count == await manager.vector_store.get_count()
+        results = await manager.search("Revision 9", top_k=1)
+        assert results[0]["document_id"] == "doc0.md"
+        assert results[0]["text"] == "Revision 9"
+
+
+@pytest.mark.asyncio
+async def test_index_generations_isolate_searches_from_writers():
+    """Searches keep reading the published generation while a writer stages a new one"""
+    import asyncio
+
+    from src.mcp.vector_search import VectorIndexGenerations
+    from src.mcp.vector_search.manager import VectorSearchManager
+    from src.mcp.vector_search.vector_stores import BaseVectorStore
+
+    class InMemoryVectorStore(BaseVectorStore):
+        """In-memory store returning every stored chunk as a hit"""
+
+        def __init__(self, documents=None):
+            self.documents = list(documents or [])
+
+        def clone(self):
+            return InMemoryVectorStore(self.documents)
+
+        async def add_documents(self, embeddings, documents, ids=None):
+            self.documents.extend(documents)
+
+        async def search(self, query_embedding, top_k=5, filter_dict=None):
+            return [{**doc, "score": 1.0} for doc in self.documents[:top_k]]
+
+        async def clear(self):
+            self.documents = []
+
+        async def get_count(self):
+            return len(self.documents)
+
+        async def save(self, path):
+            return None
+
+        async def load(self, path):
+            return None
+
+    class SlowEmbedder:
+        def __init__(self):
+            self.model_name = "mock"
+            self.release = asyncio.Event()
+
+        async def embed_texts(self, texts):
+            await self.release.wait()
+            return [[0.0, 0.0] for _ in texts]
+
+        async def embed_query(self, query):
+            return [0.0, 0.0]
+
+        def get_dimension(self):
+            return 2
+
+        def get_model_hash(self):
+            return "mock_hash"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        embedder = SlowEmbedder()
+        manager = VectorSearchManager(
+            embedder=embedder,
+            vector_store=InMemoryVectorStore(),
+            chunker=DocumentChunker(strategy=ChunkingStrategy.FIXED_SIZE, chunk_size=100),
+            index_path=Path(tmpdir) / "index",
+        )
+        await manager.initialize()
+
+        generations = VectorIndexGenerations()
+        generations.publish("kb", manager)
+
+        async def write(doc_id):
+            async with generations.write("kb") as staged:
+                await staged.add_documents([{"id": doc_id, "content": f"Content of {doc_id}"}])
+
+        first = asyncio.create_task(write("a.md"))
+        second = asyncio.create_task(write("b.md"))
+        await asyncio.sleep(0)
+
+        # Writer is blocked mid-indexing; search completes against the old generation
+        results = await asyncio.wait_for(generations.get("kb").search("content"), timeout=1)
+        assert results == []
+        assert generations.write_lock("kb").locked()
+
+        embedder.release.set()
+        await asyncio.gather(first, second)
+
+        published = generations.get("kb")
+        assert published.generation == 2
+        assert sorted(r["document_id"] for r in await published.search("content")) == [
+            "a.md",
+            "b.md",
+        ]
+        assert manager.vector_store.documents == []
+
+        # A failed write leaves the published generation untouched
+        with pytest.raises(RuntimeError):
+            async with generations.write("kb") as staged:
+                await staged.clear_index()
+                raise RuntimeError("boom")
+        assert generations.get("kb") is published
+
+
+@pytest.mark.asyncio
+async def test_faiss_generations_are_staged_in_their_own_directory():
+    """Staged FAISS writes touch neither the published store nor its files"""
+    pytest.importorskip("faiss")
+
+    from src.mcp.vector_search import VectorIndexGenerations
+    from src.mcp.vector_search.manager import VectorSearchManager
+    from src.mcp.vector_search.vector_stores import FAISSVectorStore
+
+    class HashEmbedder:
+        model_name = "hash"
+
+        async def embed_texts(self, texts):
+            return [[float(len(text)), float(sum(map(ord, text)) % 97)] for text in texts]
+
+        async def embed_query(self, query):
+            return (await self.embed_texts([query]))[0]
+
+        def get_dimension(self):
+            return 2
+
+        def get_model_hash(self):
+            return "hash"
+
+    def create_manager(index_path):
+        return VectorSearchManager(
+            embedder=HashEmbedder(),
+            vector_store=FAISSVectorStore(dimension=2),
+            chunker=DocumentChunker(strategy=ChunkingStrategy.FIXED_SIZE, chunk_size=100),
+            index_path=index_path,
+        )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index_path = Path(tmpdir) / "index"
+        manager = create_manager(index_path)
+        await manager.initialize()
+        await manager.add_documents([{"id": "a.md", "content": "Alpha content"}])
+
+        generations = VectorIndexGenerations()
+        generations.publish("kb", manager)
+
+        async with generations.write("kb") as staged:
+            await staged.add_documents([{"id": "b.md", "content": "Beta content"}])
+            # Nothing is visible or written before publish
+            assert await manager.vector_store.get_count() == 1
+            assert not staged.generation_path.exists()
+
+        published = generations.get("kb")
+        assert await published.vector_store.get_count() == 2
+        assert (index_path / "CURRENT").read_text() == "generations/" + (
+            published.generation_path.name
+        )
+        first_generation = published.generation_path
+
+        with pytest.raises(RuntimeError):
+            async with generations.write("kb") as staged:
+                await staged.clear_index()
+                await staged.add_documents([{"id": "c.md", "content": "Gamma content"}])
+                raise RuntimeError("boom")
+        assert await generations.get("kb").vector_store.get_count() == 2
+        assert sorted(p.name for p in (index_path / "generations").iterdir()) == [
+            first_generation.name
+        ]
+
+        async with generations.write("kb") as staged:
+            await staged.add_documents([{"id": "c.md", "content": "Gamma content"}])
+        assert not first_generation.exists()
+
+        # A restarted hub loads the published generation
+        reloaded = create_manager(index_path)
+        await reloaded.initialize()
+        assert reloaded.document_count == 3
+        assert await reloaded.vector_store.get_count() == 3
+        results = await reloaded.search("Gamma content", top_k=1)
+        assert results[0]["document_id"] == "c.md"
+
+
+@pytest.mark.asyncio
+async def test_indexing_jobs_serialize_per_kb_and_report_progress():
+    """Jobs of one KB run in order; progress and results are recorded"""
+    import asyncio
+
+    from src.mcp.vector_search import IndexingJobQueue, IndexingJobStatus
+
+    order = []
+
+    async def handler(job, report_progress):
+        order.append((job.kb_id, job.payload["n"], "start"))
+        await asyncio.sleep(0.01)
+        report_progress(job.items_total)
+        order.append((job.kb_id, job.payload["n"], "end"))
+        if job.payload["n"] == 2:
+            raise RuntimeError("boom")
+        return {"success": True, "documents_processed": job.items_total}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        queue = IndexingJobQueue(handler=handler, jobs_dir=Path(tmpdir), max_workers=2)
+        first = await queue.submit("kb", "add", {"n": 1}, items_total=3)
+        second = await queue.submit("kb", "add", {"n": 2}, items_total=1)
+
+        assert (await queue.wait(first.job_id, timeout=5)).status == IndexingJobStatus.COMPLETED
+        assert (await queue.wait(second.job_id, timeout=5)).status == IndexingJobStatus.FAILED
+
+        # Second job of the same KB starts only after the first one ended
+        assert order == [("kb", 1, "start"), ("kb", 1, "end"), ("kb", 2, "start"), ("kb", 2, "end")]
+
+        state = first.to_dict()
+        assert state["progress"] == {"items_total": 3, "items_done": 3, "percent": 100.0}
+        assert state["result"]["documents_processed"] == 3
+        assert second.error == "boom"
+        assert queue.stats()["jobs"]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_indexing_jobs_resume_after_restart():
+    """Unfinished persisted jobs are re-queued by a new queue instance"""
+    import asyncio
+
+    from src.mcp.vector_search import IndexingJobQueue, IndexingJobStatus
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        started = asyncio.Event()
+
+        async def hanging_handler(job, report_progress):
+            started.set()
+            await asyncio.Event().wait()
+
+        queue = IndexingJobQueue(handler=hanging_handler, jobs_dir=Path(tmpdir))
+        job = await queue.submit("kb", "reindex", {"documents": [{"id": "a"}], "force": True})
+        await started.wait()
+        # Simulate hub shutdown in the middle of the job
+        for runner in queue._runners.values():
+            runner.cancel()
+
+        seen = []
+
+        async def handler(job, report_progress):
+            seen.append(job.payload)
+            return {"success": True}
+
+        restarted = IndexingJobQueue(handler=handler, jobs_dir=Path(tmpdir))
+        assert restarted.start() == 1
+        resumed = await restarted.wait(job.job_id, timeout=5)
+
+        assert resumed.status == IndexingJobStatus.COMPLETED
+        assert seen == [{"documents": [{"id": "a"}], "force": True}]
+
+
+@pytest.mark.asyncio
+async def test_indexing_jobs_coalesce_identical_last_job():
+    """An identical submission joins the last pending job; order-changing ones do not"""
+    import asyncio
+
+    from src.mcp.vector_search import IndexingJobQueue
+
+    release = asyncio.Event()
+    runs = []
+
+    async def handler(job, report_progress):
+        runs.append(job.operation)
+        await release.wait()
+        return {"success": True}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        queue = IndexingJobQueue(handler=handler, jobs_dir=Path(tmpdir))
+        docs = {"documents": [{"id": "a", "content": "text"}], "force": False}
+
+        first = await queue.submit("kb", "reindex", docs)
+        duplicate = await queue.submit("kb", "reindex", dict(docs))
+        assert duplicate is first
+
+        deleted = await queue.submit("kb", "delete", {"document_ids": ["a"]})
+        readded = await queue.submit("kb", "reindex", docs)
+        assert readded.job_id not in (first.job_id, deleted.job_id)
+
+        release.set()
+        await queue.wait(readded.job_id, timeout=5)
+
+        assert runs == ["reindex", "delete", "reindex"]
+        assert queue.stats()["coalesced"] == 1
+
+
+def test_indexing_uploads_assemble_parts_in_order():
+    """A multi-part request is released once, with all parts in order"""
+    from src.mcp.vector_search import IndexingUploads
+
+    uploads = IndexingUploads()
+    key = ("kb", "reindex", None, True)
+
+    assert uploads.add_part("u1", 1, 3, ["b"], key) is None
+    assert uploads.add_part("u1", 1, 3, ["b"], key) is None  # retried part
+    assert uploads.add_part("u1", 0, 3, ["a"], key) is None
+    with pytest.raises(ValueError):
+        uploads.add_part("u1", 2, 3, ["c"], ("kb", "reindex", None, False))
+    assert uploads.add_part("u1", 2, 3, ["c"], key) == ["a", "b", "c"]
+    assert uploads.pending() == 0
+
+    uploads.ttl = -1
+    assert uploads.add_part("u2", 0, 2, ["a"], key) is None
+    assert uploads.add_part("u3", 0, 2, ["a"], key) is None
+    assert uploads.pending() == 1
+
+
+@pytest.mark.asyncio
+async def test_hub_warmup_preloads_most_recently_used_kbs(monkeypatch):
+    """Warmup loads the most recently used KB indexes and their embedders"""
+    import json
+    from unittest.mock import AsyncMock, MagicMock
+
+    import src.mcp.mcp_hub_server as hub
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        recent_path = Path(tmpdir) / "recent.json"
+        recent_path.write_text(json.dumps({"old": 1.0, "newest": 3.0, "middle": 2.0}))
+
+        manager = MagicMock()
+        manager.embedder.warmup = AsyncMock()
+        get_manager = AsyncMock(return_value=manager)
+        settings = MagicMock(MCP_HUB_WARMUP_ENABLED=True, MCP_HUB_WARMUP_KB_LIMIT=2)
+
+        monkeypatch.setattr(hub, "_RECENT_KBS_PATH", recent_path)
+        monkeypatch.setattr(hub, "_warmup_status", {"state": "pending", "kbs": []})
+        monkeypatch.setattr(hub, "check_vector_search_availability", lambda: True)
+        monkeypatch.setattr(hub, "get_vector_search_manager", get_manager)
+        monkeypatch.setattr("config.settings", settings)
+
+        await hub.warmup_vector_search()
+
+        assert [call.kwargs["kb_id"] for call in get_manager.await_args_list] == [
+            "newest",
+            "middle",
+        ]
+        assert manager.embedder.warmup.await_count == 2
+        assert hub._warmup_status["state"] == "done"
+        assert hub._warmup_status["kbs"] == ["newest", "middle"]
+
+
+@pytest.mark.asyncio
+async def test_hub_loads_kb_indexes_off_the_event_loop(monkeypatch):
+    """Creating and initializing a manager (model and index load) runs in a worker thread"""
+    import threading
+    from unittest.mock import MagicMock
+
+    import src.mcp.mcp_hub_server as hub
+    from src.mcp.vector_search import VectorSearchFactory
+    from src.mcp.vector_search.generations import VectorIndexGenerations
+
+    threads = []
+
+    class Manager:
+        async def initialize(self):
+            threads.append(threading.get_ident())
+
+    def create_from_settings(settings, index_path, kb_id):
+        threads.append(threading.get_ident())
+        return Manager()
+
+    monkeypatch.setattr(VectorSearchFactory, "create_from_settings", create_from_settings)
+    monkeypatch.setattr(hub, "_vector_indexes", VectorIndexGenerations())
+    monkeypatch.setattr("config.settings", MagicMock(VECTOR_SEARCH_ENABLED=True))
+
+    manager = await hub._create_vector_search_manager("kb1")
+
+    assert isinstance(manager, Manager)
+    assert hub._vector_indexes.get("kb1") is manager
+    assert len(threads) == 2 and threading.get_ident() not in threads
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])